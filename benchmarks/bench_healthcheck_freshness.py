@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark: per-measurement vs. batched freshness scan.
+
+Starts a local stub InfluxDB (aiohttp) that answers ``/query`` with a fixed
+newest row per statement, adds a configurable per-request latency (the Pi's
+InfluxDB under load), and counts round trips. Compares the former one query
+per measurement with ``InfluxDBRepository.get_latest_timestamps``.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_healthcheck_freshness.py [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+from aioinflux import InfluxDBClient
+from home_monitoring.config import Settings
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+
+NEWEST_NS = 1_760_000_000_000_000_000
+MAX_MEASUREMENTS = 200
+
+
+class StubInflux:
+    """Minimal ``/query`` endpoint counting round trips."""
+
+    def __init__(self, latency: float) -> None:
+        self.round_trips = 0
+        self._latency = latency
+
+    async def query(self, request: web.Request) -> web.Response:
+        """Answer every statement of a (multi-statement) query with one row."""
+        self.round_trips += 1
+        await asyncio.sleep(self._latency)
+        form = await request.post()
+        if form["q"] == "SHOW FIELD KEYS":
+            series = [
+                {"name": f"measurement_{i}", "values": [["v", "float"]]}
+                for i in range(MAX_MEASUREMENTS)
+            ]
+            return web.json_response({"results": [{"series": series}]})
+        statements = str(form["q"]).split(";")
+        results = [
+            {
+                "statement_id": i,
+                "series": [
+                    {"name": "m", "columns": ["time", "v"], "values": [[NEWEST_NS, 1]]}
+                ],
+            }
+            for i in range(len(statements))
+        ]
+        return web.json_response({"results": results})
+
+
+async def run(latency: float) -> None:
+    """Run both scan strategies for 20 and 200 measurements."""
+    stub = StubInflux(latency)
+    app = web.Application()
+    app.router.add_post("/query", stub.query)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    settings = Settings(influxdb_host="127.0.0.1", influxdb_port=port)
+    client = InfluxDBClient(host="127.0.0.1", port=port, db="bench")
+    repository = InfluxDBRepository(settings=settings, client=client)
+    try:
+        for count in (20, MAX_MEASUREMENTS):
+            names = [f"measurement_{i}" for i in range(count)]
+
+            stub.round_trips = 0
+            start = time.perf_counter()
+            for name in names:
+                await repository.get_latest_timestamp(name)
+            serial = time.perf_counter() - start
+            serial_trips = stub.round_trips
+
+            stub.round_trips = 0
+            start = time.perf_counter()
+            await repository.get_latest_timestamps(names)
+            batched = time.perf_counter() - start
+            batched_trips = stub.round_trips
+
+            print(
+                f"{count:4d} measurements | per-measurement: {serial_trips:4d} trips "
+                f"{serial * 1000:8.1f} ms | batched: {batched_trips:2d} trips "
+                f"{batched * 1000:7.1f} ms"
+            )
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark: pydantic ``Measurement`` vs. lightweight ``Point`` on the write path.
+
+Builds SolarEdge-like power rows (five meter fields, 15-minute timestamps) the
+way the details mapper does and reports points/sec for construction alone and
+for construction plus line protocol encoding. No database is involved.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_measurement_types.py [--points 50000]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from home_monitoring.models.base import Measurement, MeasurementLike, Point
+from home_monitoring.repositories.line_protocol import encode_chunks
+
+METERS = ("FeedIn", "SelfConsumption", "Purchased", "Consumption", "Production")
+TAGS = {"site_id": "123456"}
+
+
+def make_rows(count: int) -> list[tuple[datetime, list[float]]]:
+    """Merged mapper rows: a timestamp and one value per meter."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        (start + timedelta(minutes=15 * i), [float(i % 500) + 0.5] * len(METERS))
+        for i in range(count)
+    ]
+
+
+def build_measurements(rows: list[tuple[datetime, list[float]]]) -> list[Any]:
+    """Former path: one validated pydantic model per row."""
+    return [
+        Measurement(
+            measurement="electricity_power_watt",
+            tags=TAGS,
+            timestamp=timestamp,
+            fields=dict(zip(METERS, values, strict=True)),
+        )
+        for timestamp, values in rows
+    ]
+
+
+def build_points(rows: list[tuple[datetime, list[float]]]) -> list[Any]:
+    """New path: unvalidated named tuples."""
+    return [
+        Point(
+            "electricity_power_watt",
+            TAGS,
+            dict(zip(METERS, values, strict=True)),
+            timestamp,
+        )
+        for timestamp, values in rows
+    ]
+
+
+def encode(points: list[MeasurementLike]) -> int:
+    """Encode to line protocol chunks as the repository does."""
+    return sum(len(chunk) for chunk in encode_chunks(points))
+
+
+def best_of(fn: Callable[[], object], n: int) -> float:
+    """Return the best wall time of ``n`` runs in seconds."""
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print points/sec for both types."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.points)
+    print(f"points: {args.points}")
+    results = {}
+    for name, build in (("Measurement", build_measurements), ("Point", build_points)):
+        construct = best_of(lambda build=build: build(rows), args.repeat)
+        end_to_end = best_of(lambda build=build: encode(build(rows)), args.repeat)
+        results[name] = (construct, end_to_end)
+        print(
+            f"{name:11s}: construct {args.points / construct:10.0f} pts/s  "
+            f"construct+encode {args.points / end_to_end:10.0f} pts/s"
+        )
+    before, after = results["Measurement"], results["Point"]
+    print(
+        f"speedup    : construct {before[0] / after[0]:.2f}x  "
+        f"construct+encode {before[1] / after[1]:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
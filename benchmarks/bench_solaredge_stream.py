@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark: decoded vs. streamed parsing of a SolarEdge powerDetails payload.
+
+Builds a synthetic powerDetails response (five meters, 15-minute values) and
+compares peak Python heap (tracemalloc) and wall time of the former path,
+``json.loads`` of the whole body plus one ``Measurement`` list, with the
+streaming path, ``JsonEventParser`` fed 64 KiB text chunks into a
+``SolarEdgeDetailsMerger`` that emits batches of 1000 measurements. Each batch
+is dropped after "writing", as the repository would.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_solaredge_stream.py [--days 30]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from home_monitoring.core.mappers.solaredge import (
+    METER_TYPES,
+    SolarEdgeDetailsMerger,
+    SolarEdgeMapper,
+)
+from home_monitoring.utils.json_stream import JsonEventParser
+
+CHUNK_CHARS = 64 * 1024
+
+
+def make_body(days: int) -> bytes:
+    """Serialize a powerDetails response covering ``days`` days."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    dates = [
+        (start + timedelta(minutes=15 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        for i in range(days * 96)
+    ]
+    meters = [
+        {
+            "type": meter,
+            "values": [
+                {"date": d, "value": 1000.0 + i * 0.5} for i, d in enumerate(dates)
+            ],
+        }
+        for meter in METER_TYPES
+    ]
+    payload = {
+        "powerDetails": {
+            "timeUnit": "QUARTER_OF_AN_HOUR",
+            "unit": "W",
+            "meters": meters,
+        }
+    }
+    return json.dumps(payload).encode()
+
+
+def decoded_path(body: bytes) -> int:
+    """Former path: decode the whole body, then map it in one list."""
+    measurements = SolarEdgeMapper.to_measurements(
+        datetime.now(UTC), json.loads(body), site_id="123456"
+    )
+    return len(measurements)
+
+
+def streamed_path(body: bytes) -> int:
+    """New path: parse text chunks incrementally and emit batches."""
+    merger = SolarEdgeDetailsMerger("powerDetails")
+    parser = JsonEventParser(materialize=[merger.value_prefix])
+    # the HTTP response decodes chunk by chunk; only one chunk is live here
+    for offset in range(0, len(body), CHUNK_CHARS):
+        merger.feed(parser.feed(body[offset : offset + CHUNK_CHARS].decode()))
+    merger.feed(parser.close())
+    return sum(len(batch) for batch in merger.batches(site_id="123456"))
+
+
+def measure(fn: Callable[[bytes], int], body: bytes) -> tuple[int, float, float]:
+    """Return points, peak heap in MiB and wall time in ms for one run."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    points = fn(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return points, peak / 2**20, elapsed * 1000
+
+
+def main() -> None:
+    """Run both paths and print peak memory and time."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    body = make_body(args.days)
+    print(f"payload: {len(body) / 2**20:.1f} MiB, {args.days} days x 96 x 5 meters")
+    results = {}
+    for name, fn in (("json.loads + list", decoded_path), ("streamed", streamed_path)):
+        points, peak, elapsed = measure(fn, body)
+        results[name] = peak
+        print(
+            f"{name:18s}: {points:6d} points  peak {peak:7.1f} MiB  {elapsed:7.1f} ms"
+        )
+    ratio = results["json.loads + list"] / results["streamed"]
+    print(f"peak memory reduction: {ratio:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark: cold import time of every collector entry point, with budgets.
+
+Runs ``python -X importtime -c "import <entry point>"`` in fresh interpreters
+(the cost cron paid on every tick before the collector daemon), takes the
+median cumulative import time per entry point and lists its heaviest direct
+imports. Each entry point has a budget in startup_budget.json: a list of
+modules it must not import eagerly (vendor SDKs and aioinflux), which is the
+actual regression check, and a time budget in ms. The time budget is about
+twice the median measured on a development machine, so it only catches gross
+regressions rather than machine noise; multiply it by ``--scale`` on slower
+hosts (about 5 on a Raspberry Pi 4). Exits 1 if any budget is broken.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_startup.py [--runs 5] [--scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("startup_budget.json")
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def import_profile(module: str) -> list[tuple[int, int, str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns:
+        ``(cumulative_us, depth, name)`` for every module imported
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # one separator space, then two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+
+def direct_imports(
+    rows: list[tuple[int, int, str]], module: str
+) -> list[tuple[int, int, str]]:
+    """Rows imported directly by ``module`` (printed just before it)."""
+    end = max(i for i, row in enumerate(rows) if row[2] == module)
+    children = []
+    for row in reversed(rows[:end]):
+        if row[1] == 0:
+            break
+        if row[1] == 1:
+            children.append(row)
+    return children
+
+
+def measure(module: str, runs: int) -> tuple[float, list[tuple[int, int, str]]]:
+    """Median cumulative import time in ms, plus the profile of the last run."""
+    timings = []
+    rows: list[tuple[int, int, str]] = []
+    for _ in range(runs):
+        rows = import_profile(module)
+        total = next(c for c, _, name in reversed(rows) if name == module)
+        timings.append(total / 1000)
+    return statistics.median(timings), rows
+
+
+def main() -> None:
+    """Measure every entry point and compare against its budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args()
+
+    budgets = json.loads(BUDGET_FILE.read_text())
+    broken = []
+    for module, budget in budgets.items():
+        median, rows = measure(module, args.runs)
+        limit = budget["budget_ms"] * args.scale
+        loaded = {name for _, _, name in rows}
+        eager = sorted(set(budget.get("forbid", [])) & loaded)
+        ok = median <= limit and not eager
+        print(
+            f"{'ok  ' if ok else 'FAIL'} {module:48s} {median:7.1f} ms "
+            f"(budget {limit:6.0f} ms)"
+        )
+        heaviest = sorted(direct_imports(rows, module), reverse=True)[: args.top]
+        for cumulative, _, name in heaviest:
+            print(f"       {cumulative / 1000:7.1f} ms  {name}")
+        if eager:
+            print(f"       eagerly imports: {', '.join(eager)}")
+        if not ok:
+            broken.append(module)
+    if broken:
+        print(f"{len(broken)} entry point(s) over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
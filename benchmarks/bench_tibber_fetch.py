@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark: sequential vs. concurrent Tibber historic-data fetches.
+
+Runs ``TibberService._collect_measurements`` end to end against a fake Tibber
+home whose every API call sleeps for a fixed latency (the GraphQL round trip
+from the Pi). A concurrency limit of 1 issues the requests one after another;
+higher limits use the fetch planner as configured in prod. The call count
+shows the per-run memo collapsing overlapping windows (17 calls before).
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_tibber_fetch.py [--latency-ms 250]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock
+from zoneinfo import ZoneInfo
+
+import structlog
+from home_monitoring.config import Settings
+from home_monitoring.services.tibber.service import TibberService
+
+TZ = ZoneInfo("Europe/Berlin")
+NOW = datetime(2024, 12, 15, 20, 30, tzinfo=TZ)
+
+
+class FakeHome:
+    """Tibber home stand-in with per-call latency and a call counter."""
+
+    def __init__(self, latency: float) -> None:
+        self.calls = 0
+        self.price_total: dict[str, float] = {}
+        self._latency = latency
+
+    def current_price_data(self) -> tuple[float, datetime, float]:
+        return 0.30, NOW, 0.5
+
+    async def update_info_and_price_info(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self._latency)
+        self.price_total = {NOW.isoformat(): 0.30}
+
+    async def get_historic_data(
+        self, n_data: int, resolution: str = "HOURLY", production: bool = False
+    ) -> list[dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self._latency)
+        return [{"totalCost": 0.3, "cost": 0.25, "consumption": 1.0}] * n_data
+
+    async def get_historic_data_date(
+        self,
+        date_from: datetime,
+        n_data: int,
+        resolution: str = "HOURLY",
+        production: bool = False,
+    ) -> list[dict[str, Any]]:
+        return await self.get_historic_data(n_data, resolution, production)
+
+
+class FakeConnection:
+    """Connection stand-in providing the home timezone."""
+
+    time_zone = TZ
+
+
+async def run(latency: float) -> None:
+    """Collect once per concurrency limit and print wall time."""
+    baseline = None
+    for limit in (1, 2, 4, 8):
+        settings = Settings(
+            tibber_access_token="bench", tibber_max_concurrent_requests=limit
+        )
+        service = TibberService(settings=settings, repository=AsyncMock())
+        home = FakeHome(latency)
+
+        start = time.perf_counter()
+        measurements = await service._collect_measurements(home, FakeConnection())
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+
+        print(
+            f"concurrency {limit}: {home.calls:2d} calls {elapsed * 1000:8.1f} ms "
+            f"({len(measurements)} points, {baseline / elapsed:4.1f}x)"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    args = parser.parse_args()
+    # keep the collectors' debug logging out of the timings
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(run(args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark: dict write path vs. direct line protocol encoding.
+
+Simulates a SolarEdge 30-day backfill (15-minute energy and power points) and
+compares the former ``write_measurements`` path (dict per point with an
+ISO-8601 time string, serialized by aioinflux) with the repository's direct
+line protocol encoder, both per row and for columnar ``SeriesBatch`` blocks.
+No database is involved; only serialization is timed.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_write_path.py [--days 30] [--repeat 5]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from aioinflux import serialization
+from home_monitoring.models.base import Measurement, SeriesBatch
+from home_monitoring.repositories.line_protocol import encode_chunks
+
+METERS = ("FeedIn", "SelfConsumption", "Purchased", "Consumption", "Production")
+
+
+def make_measurements(days: int) -> list[Measurement]:
+    """Build SolarEdge-like energy and power points for ``days`` days."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    measurements = []
+    for i in range(days * 96):
+        timestamp = start + timedelta(minutes=15 * i)
+        for name in ("electricity_energy_watthour", "electricity_power_watt"):
+            measurements.append(
+                Measurement(
+                    measurement=name,
+                    tags={"site_id": "123456"},
+                    timestamp=timestamp,
+                    fields={meter: float(i % 500) + 0.5 for meter in METERS},
+                )
+            )
+    return measurements
+
+
+def make_batches(measurements: list[Measurement]) -> list[SeriesBatch]:
+    """The same points as one columnar batch per series."""
+    batches = []
+    for name in ("electricity_energy_watthour", "electricity_power_watt"):
+        rows = [m for m in measurements if m.measurement == name]
+        batches.append(
+            SeriesBatch.from_columns(
+                name,
+                {"site_id": "123456"},
+                [m.timestamp for m in rows],
+                {meter: [m.fields[meter] for m in rows] for meter in METERS},
+            )
+        )
+    return batches
+
+
+def dict_path(measurements: list[Measurement]) -> int:
+    """Former path: dicts with ISO time strings, serialized by aioinflux."""
+    points = [
+        {
+            "measurement": m.measurement,
+            "tags": m.tags,
+            "fields": m.fields,
+            "time": m.timestamp.isoformat(),
+        }
+        for m in measurements
+    ]
+    return len(serialization.serialize(points))
+
+
+def line_protocol_path(measurements: list[Measurement]) -> int:
+    """New path: direct line protocol chunks."""
+    return sum(len(chunk) for chunk in encode_chunks(measurements))
+
+
+def columnar_path(batches: list[SeriesBatch]) -> int:
+    """Columnar path: whole series encoded column-wise."""
+    return sum(len(chunk) for chunk in encode_chunks(batches))
+
+
+def best_of(fn: Callable[[Any], int], data: Any, n: int) -> float:
+    """Return the best wall time of ``n`` runs in seconds."""
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print points/sec for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    measurements = make_measurements(args.days)
+    count = len(measurements)
+    baseline = best_of(dict_path, measurements, args.repeat)
+    encoded = best_of(line_protocol_path, measurements, args.repeat)
+    columnar = best_of(columnar_path, make_batches(measurements), args.repeat)
+
+    print(f"points: {count}")
+    print(
+        f"dict + aioinflux : {baseline * 1000:8.1f} ms  {count / baseline:10.0f} pts/s"
+    )
+    print(f"line protocol    : {encoded * 1000:8.1f} ms  {count / encoded:10.0f} pts/s")
+    print(
+        f"columnar batches : {columnar * 1000:8.1f} ms  {count / columnar:10.0f} pts/s"
+    )
+    print(f"speedup          : {baseline / encoded:8.2f}x (per row)")
+    print(f"speedup          : {baseline / columnar:8.2f}x (columnar)")
+
+
+if __name__ == "__main__":
+    main()
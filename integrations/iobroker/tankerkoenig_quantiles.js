@@ -1,24 +1,30 @@
 /**
  * ioBroker JavaScript: Tankerkoenig Gas Price Quantiles
  * 
- * This script calculates statistical quantiles for gas prices from InfluxDB
- * and creates/updates ioBroker states for visualization in dashboards.
+ * This script reads precomputed gas price quantiles from InfluxDB and
+ * creates/updates ioBroker states for visualization in dashboards.
+ *
+ * The statistics are maintained by the Tankerkoenig collector
+ * (home_monitoring.services.tankerkoenig.stats) and written to the
+ * gas_prices_stats measurement on every run, one point per station with
+ * fields <fuel>_<stat>. Each refresh reads that station's latest point
+ * instead of scanning the gas_prices_euro window.
  * 
  * Data Source:
  * - Star station in Siegfriedstraße, Berlin-Lichtenberg
  * - Station ID: 005056ba-7cb6-1ed2-bceb-8e5fec1a0d35
  * 
- * Statistics Calculated:
- * - Min, Max, P20, P50 (median), P80 over 14-day window
+ * Statistics:
+ * - Min, Max, P20, P50 (median), P80 over 14-day window (time-weighted)
  * - Separate stats for E5 and Diesel fuel types
  * 
  * Schedule: Runs every 5 minutes (at 1, 6, 11, 16, 21, 26, 31, 36, 41, 46, 51, 56 minutes past the hour)
  * 
  * Dependencies:
  * - InfluxDB adapter (influxdb.0) must be configured
- * - home_monitoring database with gas_prices_euro measurement
+ * - home_monitoring database with gas_prices_stats measurement
  * 
- * @version 1.0.0
+ * @version 2.0.0
  * @author Home Monitoring System
  */
 
@@ -139,57 +145,41 @@ function createQuantileStates() {
 // ============================================================================
 
 /**
- * Query gas price quantiles from InfluxDB
+ * Read the latest precomputed gas price quantiles from InfluxDB
  */
 function queryInfluxDBTankerkoenigQuantiles() {
-    console.log('[Tankerkoenig Quantiles] Starting quantile calculation from InfluxDB');
+    console.log('[Tankerkoenig Quantiles] Reading precomputed quantiles from InfluxDB');
 
-    fuels.forEach(function(fuel) {
-        // Query 1: Get statistics over time window
-        var statsQuery = `SELECT MIN("${fuel.field}") AS min, MAX("${fuel.field}") AS max, PERCENTILE("${fuel.field}", 20) AS p20, PERCENTILE("${fuel.field}", 50) AS p50, PERCENTILE("${fuel.field}", 80) AS p80 FROM home_monitoring.autogen.gas_prices_euro WHERE station_id = '${stationId}' AND time > now() - ${statsConfig.timeWindow}`;
-
-        sendTo(influxAdapter, 'query', statsQuery, function(result) {
-            if (result.error) {
-                console.error(`[Tankerkoenig Quantiles ${fuel.name.toUpperCase()}] Query error:`, result.error);
-                console.error(`[Tankerkoenig Quantiles ${fuel.name.toUpperCase()}] Failed query: ${statsQuery}`);
-                return;
-            }
+    // One point per collector run; its time is when the stats were computed
+    var statsQuery = `SELECT * FROM home_monitoring.autogen.gas_prices_stats WHERE station_id = '${stationId}' ORDER BY time DESC LIMIT 1`;
 
-            if (!result.result || !result.result[0] || result.result[0].length === 0) {
-                console.warn(`[Tankerkoenig Quantiles ${fuel.name.toUpperCase()}] No data returned from InfluxDB`);
-                return;
-            }
+    sendTo(influxAdapter, 'query', statsQuery, function(result) {
+        if (result.error) {
+            console.error('[Tankerkoenig Quantiles] Query error:', result.error);
+            console.error(`[Tankerkoenig Quantiles] Failed query: ${statsQuery}`);
+            return;
+        }
 
-            var row = result.result[0][0];
+        if (!result.result || !result.result[0] || result.result[0].length === 0) {
+            console.warn('[Tankerkoenig Quantiles] No data returned from InfluxDB');
+            return;
+        }
 
-            // Update quantile states
+        var row = result.result[0][0];
+        var ts = new Date(row.ts !== undefined ? row.ts : row.time).getTime();
+
+        fuels.forEach(function(fuel) {
+            var updated = false;
             statsConfig.stats.forEach(function(stat) {
-                if (row[stat] !== undefined && row[stat] !== null) {
-                    setState(`${stateBasePath}.${fuel.name}_${stat}`, row[stat]);
+                var value = row[`${fuel.field}_${stat}`];
+                if (value !== undefined && value !== null) {
+                    setState(`${stateBasePath}.${fuel.name}_${stat}`, value);
+                    updated = true;
                 }
             });
-        });
-
-        // Query 2: Get latest timestamp
-        var latestQuery = `SELECT "${fuel.field}" FROM home_monitoring.autogen.gas_prices_euro WHERE station_id = '${stationId}' ORDER BY time DESC LIMIT 1`;
-
-        sendTo(influxAdapter, 'query', latestQuery, function(result) {
-            if (result.error) {
-                console.error(`[Tankerkoenig Latest ${fuel.name.toUpperCase()}] Query error:`, result.error);
-                console.error(`[Tankerkoenig Latest ${fuel.name.toUpperCase()}] Failed query: ${latestQuery}`);
-                return;
-            }
-
-            if (!result.result || !result.result[0] || result.result[0].length === 0) {
-                console.warn(`[Tankerkoenig Latest ${fuel.name.toUpperCase()}] No data returned from InfluxDB`);
-                return;
+            if (updated && !isNaN(ts)) {
+                setState(`${stateBasePath}.${fuel.name}_ts`, ts);
             }
-
-            var row = result.result[0][0];
-
-            // Update timestamp
-            var ts = new Date(row.ts).getTime();
-            setState(`${stateBasePath}.${fuel.name}_ts`, ts);
         });
     });
 }
@@ -8,6 +8,10 @@
  * - Current energy prices (with statistics)
  * - Energy consumption by period (with statistics)
  * - Energy costs by period (with statistics)
+ *
+ * The statistics are precomputed by the Tibber collector (rolling windows
+ * per period, see services/tibber/period_stats.py) and read from the latest
+ * electricity_stats point in a single query.
  * 
  * Schedule: Runs every 5 minutes (at 1, 6, 11, 16, 21, 26, 31, 36, 41, 46, 51, 56 minutes past the hour)
  * 
@@ -15,7 +19,7 @@
  * - InfluxDB adapter (influxdb.0) must be configured
  * - home_monitoring database with Tibber measurements
  * 
- * @version 1.0.0
+ * @version 2.0.0
  * @author Home Monitoring System
  */
 
@@ -26,7 +30,8 @@
 var stateBasePath = 'javascript.0.tibber_states';
 var influxAdapter = 'influxdb.0';
 
-// Statistics configuration per period
+// Statistics configuration per period (the time windows are those of the
+// collector's electricity_stats and only describe the states)
 var periodStatsConfig = {
     'this_hour': { stats: ['max'], timeWindow: '24h' },
     'this_day': { stats: ['max'], timeWindow: '30d' },
@@ -173,83 +178,17 @@ function createCostStates() {
 // ============================================================================
 
 /**
- * Build statistics query for a given period
- * @param {string} metric - Field name (e.g., 'consumption', 'cost')
- * @param {string} measurement - InfluxDB measurement name
- * @param {string} period - Period name
- * @param {Object} config - Period configuration
- * @param {string} sourceFilter - Optional WHERE clause for source filtering
- * @returns {string} InfluxDB query string
- */
-function buildStatsQuery(metric, measurement, period, config, sourceFilter) {
-    var whereClause = sourceFilter || '';
-    
-    if (period.startsWith('this_')) {
-        // For this_* periods, just get MAX from current period within time window
-        // Use alias 'max' to match INFLUX_FIELD_MAPPING
-        return `SELECT MAX("${metric}") AS max FROM home_monitoring.autogen.${measurement} WHERE ${whereClause}period = '${period}' AND time > now() - ${config.timeWindow}`;
-    } else {
-        // For last_* periods, get statistics from unique period values over time window
-        // Use aliases to match INFLUX_FIELD_MAPPING exactly
-        var groupByTime;
-        if (period === 'last_hour') {
-            groupByTime = '1h';
-        } else if (period === 'last_day') {
-            groupByTime = '1d';
-        } else if (period === 'last_month') {
-            groupByTime = '30d';
-        }
-        
-        return `SELECT MIN(last_val) AS min, MAX(last_val) AS max, PERCENTILE(last_val, 20) AS p20, PERCENTILE(last_val, 50) AS p50, PERCENTILE(last_val, 80) AS p80 FROM (SELECT LAST("${metric}") AS last_val FROM home_monitoring.autogen.${measurement} WHERE ${whereClause}period = '${period}' AND time > now() - ${config.timeWindow} GROUP BY time(${groupByTime}))`;
-    }
-}
-
-/**
- * Update statistics states for a given metric and period
- * @param {string} metricType - Type of metric ('consumption_grid' or 'cost')
- * @param {string} period - Period name
- * @param {Object} row - Query result row
- * @param {Object} config - Period configuration
- */
-function updatePeriodStats(metricType, period, row, config) {
-    config.stats.forEach(function(stat) {
-        if (row[stat] !== undefined) {
-            setState(`${stateBasePath}.${metricType}_${period}_${stat}`, row[stat]);
-        }
-    });
-}
-
-/**
- * Query statistics for all periods of a given metric
+ * Update statistics states for a given metric from the statistics row
  * @param {string} metricType - Type of metric ('consumption_grid' or 'cost')
- * @param {string} metric - Field name in InfluxDB
- * @param {string} measurement - InfluxDB measurement name
- * @param {string} sourceFilter - Optional WHERE clause for source filtering
+ * @param {Object} row - Row of SELECT last(*) FROM electricity_stats
  */
-function queryPeriodStatistics(metricType, metric, measurement, sourceFilter) {
+function updatePeriodStats(metricType, row) {
     periods.forEach(function(period) {
-        var config = periodStatsConfig[period];
-        
-        // Skip periods without statistics
-        if (!config || config.stats.length === 0) {
-            return;
-        }
-        
-        var statsQuery = buildStatsQuery(metric, measurement, period, config, sourceFilter);
-        
-        sendTo(influxAdapter, 'query', statsQuery, function(result) {
-            if (result.error) {
-                console.error(`[Tibber ${metricType} Stats ${period}] Query error: ${JSON.stringify(result.error)}`);
-                console.error(`[Tibber ${metricType} Stats ${period}] Failed query: ${statsQuery}`);
-                return;
-            }
-
-            if (!result.result || !result.result[0] || result.result[0].length === 0) {
-                console.warn(`[Tibber ${metricType} Stats ${period}] No statistics data returned`);
-                return;
+        periodStatsConfig[period].stats.forEach(function(stat) {
+            var name = `${metricType}_${period}_${stat}`;
+            if (row[`last_${name}`] !== undefined && row[`last_${name}`] !== null) {
+                setState(`${stateBasePath}.${name}`, row[`last_${name}`]);
             }
-
-            updatePeriodStats(metricType, period, result.result[0][0], config);
         });
     });
 }
@@ -259,10 +198,10 @@ function queryPeriodStatistics(metricType, metric, measurement, sourceFilter) {
 // ============================================================================
 
 /**
- * Query current energy price and statistics from InfluxDB
+ * Query current energy price from InfluxDB
  */
 function queryInfluxDBTibberPrices() {
-    // Query 1: Get latest energy price and rank
+    // Get latest energy price and rank
     sendTo(influxAdapter, 'query', 
         "SELECT * FROM home_monitoring.autogen.electricity_prices_euro ORDER BY time DESC LIMIT 1", 
         function(result) {
@@ -288,29 +227,42 @@ function queryInfluxDBTibberPrices() {
             }
         }
     );
+}
+
+// ============================================================================
+// QUERY FUNCTIONS - STATISTICS
+// ============================================================================
+
+/**
+ * Query price, consumption and cost statistics from InfluxDB
+ *
+ * One point per collector run holds every statistic, with fields named like
+ * the states (e.g. cost_last_day_p50, energy_price_euro_p20).
+ */
+function queryInfluxDBTibberStats() {
+    var statsQuery = "SELECT last(*) FROM home_monitoring.autogen.electricity_stats WHERE time > now() - 1d";
 
-    // Query 2: Get price statistics over time window
-    // Use stat names directly as aliases
-    var statsQuery = `SELECT MIN("total") AS min, MAX("total") AS max, PERCENTILE("total", 20) AS p20, PERCENTILE("total", 50) AS p50, PERCENTILE("total", 80) AS p80 FROM home_monitoring.autogen.electricity_prices_euro WHERE time > now() - ${priceStatsConfig.timeWindow}`;
-    
     sendTo(influxAdapter, 'query', statsQuery, function(result) {
         if (result.error) {
-            console.error('[Tibber Price Stats] Query error:', result.error);
+            console.error('[Tibber Stats] Query error:', result.error);
             return;
         }
 
-        if (result.result && result.result[0] && result.result[0].length > 0) {
-            var row = result.result[0][0];
-            
-            // Update statistics states directly using stat names
-            priceStatsConfig.stats.forEach(function(stat) {
-                if (row[stat] !== undefined) {
-                    setState(`${stateBasePath}.energy_price_euro_${stat}`, row[stat]);
-                }
-            });
-        } else {
-            console.warn('[Tibber Price Stats] No statistics data returned from InfluxDB');
+        if (!result.result || !result.result[0] || result.result[0].length === 0) {
+            console.warn('[Tibber Stats] No statistics data returned from InfluxDB');
+            return;
         }
+
+        var row = result.result[0][0];
+
+        priceStatsConfig.stats.forEach(function(stat) {
+            var value = row[`last_energy_price_euro_${stat}`];
+            if (value !== undefined && value !== null) {
+                setState(`${stateBasePath}.energy_price_euro_${stat}`, value);
+            }
+        });
+        updatePeriodStats('consumption_grid', row);
+        updatePeriodStats('cost', row);
     });
 }
 
@@ -359,9 +311,6 @@ function queryInfluxDBTibberConsumption() {
             }
         });
     });
-
-    // Query 2: Get consumption statistics using helper function
-    queryPeriodStatistics('consumption_grid', 'consumption', 'electricity_consumption_kwh', "source = 'grid' AND ");
 }
 
 // ============================================================================
@@ -409,9 +358,6 @@ function queryInfluxDBTibberCosts() {
             }
         });
     });
-
-    // Query 2: Get cost statistics using helper function
-    queryPeriodStatistics('cost', 'cost', 'electricity_costs_euro', '');
 }
 
 // ===========================================================================
@@ -427,6 +373,7 @@ function queryInfluxDBTibber() {
     queryInfluxDBTibberPrices();
     queryInfluxDBTibberConsumption();
     queryInfluxDBTibberCosts();
+    queryInfluxDBTibberStats();
 }
 
 // ============================================================================
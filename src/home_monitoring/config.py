@@ -1,5 +1,6 @@
 """Configuration management for home monitoring."""
 
+from pathlib import Path
 from typing import Any
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,18 +22,42 @@ class Settings(BaseSettings):
     influxdb_database: str = "home_monitoring"
     influxdb_username: str | None = None
     influxdb_password: str | None = None
+    # one pooled client per process: connection limit, idle keep-alive, and
+    # connect/read timeouts of every request
+    influxdb_max_connections: int = 4
+    influxdb_keepalive_seconds: float = 60.0
+    influxdb_connect_timeout: float = 5.0
+    influxdb_read_timeout: float = 30.0
+    # seconds before a write counts as failed (and is spooled)
+    influxdb_write_timeout: float = 10.0
+    # keep writes that fail while InfluxDB is down under state_dir/spool and
+    # replay them once it is back
+    influxdb_spool: bool = True
+    influxdb_spool_max_bytes: int = 64 * 2**20
+    # newest written timestamp per measurement/series under state_dir, so
+    # freshness lookups (healthcheck, incremental collectors) skip InfluxDB
+    influxdb_freshness_index: bool = True
+    # write-behind buffer of event-driven writers (Gardena): flush after this
+    # many seconds or this many distinct series, whichever comes first
+    influxdb_write_buffer_max_age: float = 5.0
+    influxdb_write_buffer_max_points: int = 5000
 
     # Netatmo settings
     netatmo_client_id: str | None = None
     netatmo_client_secret: str | None = None
     netatmo_refresh_token: str | None = None
-    # Legacy fields (no longer used by lnetatmo)
+    # Legacy fields (unused since the OAuth2 refresh-token flow)
     netatmo_username: str | None = None
     netatmo_password: str | None = None
 
     # SolarEdge settings
     solaredge_api_key: str | None = None
     solaredge_site_id: str | None = None
+    # backfill window per request (capped at the API's per-request limit)
+    solaredge_backfill_chunk_days: int = 7
+    # SolarEdge allows 3 concurrent requests per source IP
+    solaredge_max_concurrent_requests: int = 3
+    solaredge_daily_quota: int = 300
 
     # Gardena settings
     gardena_application_id: str | None = None
@@ -42,13 +67,42 @@ class Settings(BaseSettings):
 
     # Tibber settings
     tibber_access_token: str | None = None
+    # cache finalized daily/monthly totals under state_dir
+    tibber_rollup_cache: bool = True
+    # historic-data requests in flight at once (Tibber's GraphQL API is
+    # rate-limited, keep this small)
+    tibber_max_concurrent_requests: int = 4
+    # precompute the dashboard's period and price statistics
+    # (electricity_stats) instead of querying them from the raw points
+    tibber_stats: bool = True
 
     # Tankerkoenig settings
     tankerkoenig_api_key: str | None = None
+    # watch every station within these circles (JSON list of
+    # [lat, lng, radius_km], radius at most 25) instead of a fixed list
+    tankerkoenig_search_areas: list[tuple[float, float, float]] = []
+    # write only prices that changed since the last write, plus a full point
+    # per station at least this often (keep well below the gas_prices_euro
+    # freshness SLA in conf/healthcheck.json)
+    tankerkoenig_write_changes_only: bool = True
+    tankerkoenig_keyframe_minutes: int = 30
+    # rolling 14-day min/max/quantiles per station and fuel, written to
+    # gas_prices_stats (state under state_dir)
+    tankerkoenig_stats: bool = True
 
     # Sam Digital settings
     sam_digital_api_key: str | None = None
 
+    # Shared HTTP client pool (one pooled client per vendor host)
+    http_max_connections_per_host: int = 4
+    http_keepalive_seconds: float = 60.0
+    http_client_lifetime_seconds: float = 3600.0
+    # requires the optional "http2" extra (h2)
+    http2: bool = False
+
+    # Local state (caches, checkpoints) kept between runs
+    state_dir: Path = Path.home() / ".local" / "state" / "home_monitoring"
+
     # Logging
     log_level: str = "INFO"
     json_logs: bool = True
@@ -1,10 +1,11 @@
 """Base mapper interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
-from home_monitoring.models.base import Measurement
+from home_monitoring.models.base import MeasurementLike
 
 
 class BaseMapper(ABC):
@@ -16,7 +17,7 @@ class BaseMapper(ABC):
         timestamp: datetime,
         *args: Any,
         **kwargs: Any,
-    ) -> list[Measurement]:
+    ) -> Sequence[MeasurementLike]:
         """Map data to InfluxDB measurements.
 
         Implementations typically follow the pattern::
@@ -33,6 +34,7 @@ class BaseMapper(ABC):
             **kwargs: Mapper-specific keyword arguments
 
         Returns:
-            List of InfluxDB measurements
+            InfluxDB measurements; mappers for large series may return
+            unvalidated :class:`Point` instances instead
         """
         raise NotImplementedError
@@ -1,7 +1,7 @@
 """Netatmo data mapping utilities."""
 
 from collections.abc import Mapping, Sequence
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, ClassVar
 
 from home_monitoring.core.mappers.base import BaseMapper
@@ -25,6 +25,15 @@ class NetatmoMapper(BaseMapper):
         "GustAngle": ("weather_gustangle_angles", "GustAngle"),
     }
 
+    # ``getMeasure`` types recorded by each station/module type
+    MEASURE_TYPES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "NAMain": ("Temperature", "Humidity", "CO2", "Noise", "Pressure"),
+        "NAModule1": ("Temperature", "Humidity"),
+        "NAModule2": ("WindStrength", "WindAngle", "GustStrength", "GustAngle"),
+        "NAModule3": ("Rain",),
+        "NAModule4": ("Temperature", "Humidity", "CO2"),
+    }
+
     @staticmethod
     def to_measurements(
         timestamp: datetime,
@@ -65,6 +74,42 @@ class NetatmoMapper(BaseMapper):
 
         return measurements
 
+    @staticmethod
+    def history_to_measurements(
+        device: Mapping[str, Any],
+        types: Sequence[str],
+        body: Mapping[str, Sequence[Any]],
+    ) -> list[Measurement]:
+        """Map a ``getMeasure`` response of one station or module.
+
+        Each row is mapped like dashboard data at its own timestamp, so
+        history fills the same series the regular collection writes.
+
+        Args:
+            device: Station or module mapping (``"_id"``, ``"type"``,
+                ``"module_name"``)
+            types: Measure types requested, in response column order
+            body: ``body`` of a non-optimized response: epoch seconds to
+                one value per type
+
+        Returns:
+            Measurements of every row, oldest first
+        """
+        measurements: list[Measurement] = []
+        for epoch, values in sorted(body.items(), key=lambda item: int(item[0])):
+            row = {
+                "_id": device.get("_id"),
+                "type": device.get("type"),
+                "module_name": device.get("module_name"),
+                "dashboard_data": dict(zip(types, values, strict=False)),
+            }
+            measurements.extend(
+                NetatmoMapper._process_device_data(
+                    row, datetime.fromtimestamp(int(epoch), UTC)
+                )
+            )
+        return measurements
+
     @staticmethod
     def _process_device_data(
         device: Mapping[str, Any], timestamp: datetime
@@ -1,11 +1,24 @@
 """SolarEdge data mapping utilities."""
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from datetime import datetime
 from typing import Any
 
 from home_monitoring.core.mappers.base import BaseMapper
-from home_monitoring.models.base import Measurement
+from home_monitoring.models.base import Point, SeriesBatch
+from home_monitoring.utils.json_stream import Event
+
+METER_TYPES = ("FeedIn", "SelfConsumption", "Purchased", "Consumption", "Production")
+METER_INDEX = {meter: index for index, meter in enumerate(METER_TYPES)}
+
+# root element -> (measurement name, expected unit)
+DETAILS_ROOTS = {
+    "powerDetails": ("electricity_power_watt", "W"),
+    "energyDetails": ("electricity_energy_watthour", "Wh"),
+}
+
+# rows per columnar batch when streaming a response
+DEFAULT_BATCH_SIZE = 1000
 
 
 class SolarEdgeMapper(BaseMapper):
@@ -16,7 +29,7 @@ class SolarEdgeMapper(BaseMapper):
         timestamp: datetime,
         data: Mapping[str, Any],
         site_id: str | None = None,
-    ) -> list[Measurement]:
+    ) -> list[Point]:
         """Map SolarEdge detailed data to InfluxDB measurements.
 
         This function supports both ``/energyDetails`` and ``/powerDetails``
@@ -43,10 +56,10 @@ class SolarEdgeMapper(BaseMapper):
                 contained in the payload when provided.
 
         Returns:
-            List of InfluxDB :class:`Measurement` instances for all recognised
+            List of unvalidated :class:`Point` instances for all recognised
             meters.
         """
-        measurements: list[Measurement] = []
+        measurements: list[Point] = []
 
         if "powerDetails" in data:
             measurements.extend(
@@ -67,129 +80,217 @@ class SolarEdgeMapper(BaseMapper):
         return measurements
 
     @staticmethod
-    def _power_details_to_measurements(
-        power_details: Mapping[str, Any],
+    def to_series(
+        data: Mapping[str, Any],
         site_id: str | None = None,
-    ) -> list[Measurement]:
-        measurements: list[Measurement] = []
-
-        if not power_details or "powerDetails" not in power_details:
-            return measurements
-
-        details = power_details["powerDetails"]
-        unit = details.get("unit")
-        if unit != "W":
-            return measurements
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> list[SeriesBatch]:
+        """Map SolarEdge detailed data to columnar batches.
 
-        resolved_site_id = str(site_id or details.get("siteId", "unknown"))
+        Same input and rules as ``to_measurements``, but the dense meter
+        series stay columnar instead of becoming one point per timestamp.
 
-        values_by_time: dict[datetime, dict[str, float]] = {}
-
-        for meter in details.get("meters", []):
-            meter_type = meter.get("type")
-            if meter_type not in {
-                "FeedIn",
-                "SelfConsumption",
-                "Purchased",
-                "Consumption",
-                "Production",
-            }:
-                continue
+        Args:
+            data: ``energyDetails`` or ``powerDetails`` API response
+            site_id: Overrides the ``siteId`` value contained in the payload
+            batch_size: Maximum number of rows per batch
 
-            for point in meter.get("values", []):
-                date_str = point.get("date")
-                value = point.get("value")
-                if date_str is None or value is None:
-                    continue
-
-                try:
-                    sample_time = datetime.fromisoformat(date_str)
-                except ValueError:
-                    continue
-
-                per_time = values_by_time.setdefault(sample_time, {})
-                per_time[meter_type] = float(value)
-
-        for sample_time, meter_values in sorted(values_by_time.items()):
-            measurements.append(
-                Measurement(
-                    measurement="electricity_power_watt",
-                    tags={"site_id": resolved_site_id},
-                    timestamp=sample_time,
-                    fields={
-                        "FeedIn": float(meter_values.get("FeedIn", 0.0)),
-                        "SelfConsumption": float(
-                            meter_values.get("SelfConsumption", 0.0)
-                        ),
-                        "Purchased": float(meter_values.get("Purchased", 0.0)),
-                        "Consumption": float(meter_values.get("Consumption", 0.0)),
-                        "Production": float(meter_values.get("Production", 0.0)),
-                    },
-                )
-            )
+        Returns:
+            Batches for every recognised root element
+        """
+        series: list[SeriesBatch] = []
+        for root in DETAILS_ROOTS:
+            if root in data:
+                merger = SolarEdgeDetailsMerger(root)
+                merger.add_details(data[root])
+                series.extend(merger.batches(site_id=site_id, batch_size=batch_size))
+        return series
 
-        return measurements
+    @staticmethod
+    def _power_details_to_measurements(
+        power_details: Mapping[str, Any],
+        site_id: str | None = None,
+    ) -> list[Point]:
+        if not power_details or "powerDetails" not in power_details:
+            return []
+        merger = SolarEdgeDetailsMerger("powerDetails")
+        merger.add_details(power_details["powerDetails"])
+        return merger.measurements(site_id=site_id)
 
     @staticmethod
     def _energy_details_to_measurements(
         energy_details: Mapping[str, Any],
         site_id: str | None = None,
-    ) -> list[Measurement]:
-        measurements: list[Measurement] = []
-
+    ) -> list[Point]:
         if not energy_details or "energyDetails" not in energy_details:
-            return measurements
+            return []
+        merger = SolarEdgeDetailsMerger("energyDetails")
+        merger.add_details(energy_details["energyDetails"])
+        return merger.measurements(site_id=site_id)
+
+
+class SolarEdgeDetailsMerger:
+    """Merge the per-meter series of a details response into per-time rows.
 
-        details = energy_details["energyDetails"]
-        unit = details.get("unit")
-        if unit != "Wh":
-            return measurements
+    SolarEdge lists each meter's complete series one after the other, so a
+    row can only be emitted once every meter has been seen. Rows are kept as
+    five floats keyed by the payload's date string, which is far smaller than
+    the decoded payload or the final measurements. Values can be added from a
+    decoded mapping (``add_details``) or from ``JsonEventParser`` events
+    (``feed``) while the response is still streaming in.
+    """
 
-        resolved_site_id = str(site_id or details.get("siteId", "unknown"))
+    def __init__(self, root: str) -> None:
+        """Initialize the merger.
 
-        values_by_time: dict[datetime, dict[str, float]] = {}
+        Args:
+            root: Response root element, ``"powerDetails"`` or
+                ``"energyDetails"``
+        """
+        self._measurement, self._expected_unit = DETAILS_ROOTS[root]
+        self._root = root
+        self._meter_prefix = f"{root}.meters.item"
+        self._type_prefix = f"{root}.meters.item.type"
+        self._rows: dict[str, list[float]] = {}
+        self._unit: str | None = None
+        self._payload_site_id: Any = None
+        self._meter_type: str | None = None
+        self._pending: list[Any] = []
+        self.found_root = False
+
+    @property
+    def value_prefix(self) -> str:
+        """Event prefix of a single ``{"date": ..., "value": ...}`` entry."""
+        return f"{self._root}.meters.item.values.item"
+
+    def add(self, meter_type: str | None, date_str: Any, value: Any) -> None:
+        """Add one value of a meter; unknown meters and gaps are skipped.
 
+        Args:
+            meter_type: Meter the value belongs to (e.g. ``"Production"``)
+            date_str: Local timestamp string from the payload
+            value: Meter reading
+        """
+        index = METER_INDEX.get(meter_type) if meter_type else None
+        if index is None or date_str is None or value is None:
+            return
+        row = self._rows.get(date_str)
+        if row is None:
+            row = self._rows[date_str] = [0.0] * len(METER_TYPES)
+        row[index] = float(value)
+
+    def add_details(self, details: Mapping[str, Any]) -> None:
+        """Add every meter of an already decoded details element.
+
+        Args:
+            details: Content of the ``powerDetails``/``energyDetails`` element
+        """
+        self.found_root = True
+        self._unit = details.get("unit")
+        self._payload_site_id = details.get("siteId")
         for meter in details.get("meters", []):
             meter_type = meter.get("type")
-            if meter_type not in {
-                "FeedIn",
-                "SelfConsumption",
-                "Purchased",
-                "Consumption",
-                "Production",
-            }:
-                continue
-
             for point in meter.get("values", []):
-                date_str = point.get("date")
-                value = point.get("value")
-                if date_str is None or value is None:
-                    continue
-
-                try:
-                    sample_time = datetime.fromisoformat(date_str)
-                except ValueError:
-                    continue
-
-                per_time = values_by_time.setdefault(sample_time, {})
-                per_time[meter_type] = float(value)
-
-        for sample_time, meter_values in sorted(values_by_time.items()):
-            measurements.append(
-                Measurement(
-                    measurement="electricity_energy_watthour",
-                    tags={"site_id": resolved_site_id},
-                    timestamp=sample_time,
-                    fields={
-                        "FeedIn": float(meter_values.get("FeedIn", 0.0)),
-                        "SelfConsumption": float(
-                            meter_values.get("SelfConsumption", 0.0)
-                        ),
-                        "Purchased": float(meter_values.get("Purchased", 0.0)),
-                        "Consumption": float(meter_values.get("Consumption", 0.0)),
-                        "Production": float(meter_values.get("Production", 0.0)),
-                    },
-                )
+                self.add(meter_type, point.get("date"), point.get("value"))
+
+    def feed(self, events: Iterable[Event]) -> None:
+        """Add values from parser events.
+
+        The parser must materialize ``value_prefix`` so each value entry
+        arrives as one decoded mapping.
+
+        Args:
+            events: Events from ``JsonEventParser``
+        """
+        for prefix, event, value in events:
+            if prefix == self.value_prefix:
+                if event == "value" and isinstance(value, Mapping):
+                    if self._meter_type is None:
+                        # "type" normally precedes "values"; keep order-agnostic
+                        self._pending.append(value)
+                    else:
+                        self.add(
+                            self._meter_type, value.get("date"), value.get("value")
+                        )
+            elif prefix == self._type_prefix and event == "string":
+                self._meter_type = value
+                for point in self._pending:
+                    self.add(value, point.get("date"), point.get("value"))
+                self._pending = []
+            elif prefix == self._meter_prefix and event in ("start_map", "end_map"):
+                self._meter_type = None
+                self._pending = []
+            elif prefix == self._root and event == "start_map":
+                self.found_root = True
+            elif prefix == f"{self._root}.unit":
+                self._unit = value
+            elif prefix == f"{self._root}.siteId":
+                self._payload_site_id = value
+
+    def batches(
+        self, site_id: str | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[SeriesBatch]:
+        """Emit the merged rows as columnar batches in chronological order.
+
+        Rows are never expanded into per-row objects; each batch holds a
+        timestamp column and one float column per meter.
+
+        Args:
+            site_id: Overrides the ``siteId`` contained in the payload
+            batch_size: Maximum number of rows per batch
+
+        Yields:
+            Batches of at most ``batch_size`` rows; nothing if the unit does
+            not match the root element
+        """
+        rows = self._sorted_rows()
+        tags = {"site_id": self._resolve_site_id(site_id)}
+        for offset in range(0, len(rows), batch_size):
+            block = rows[offset : offset + batch_size]
+            timestamps = [sample_time for sample_time, _ in block]
+            columns = zip(*(values for _, values in block), strict=True)
+            yield SeriesBatch.from_columns(
+                self._measurement,
+                tags,
+                timestamps,
+                dict(zip(METER_TYPES, columns, strict=True)),
             )
 
-        return measurements
+    def measurements(self, site_id: str | None = None) -> list[Point]:
+        """Emit the merged rows as per-row points in chronological order.
+
+        Args:
+            site_id: Overrides the ``siteId`` contained in the payload
+
+        Returns:
+            One point per row; empty if the unit does not match the root
+            element
+        """
+        rows = self._sorted_rows()
+        tags = {"site_id": self._resolve_site_id(site_id)}
+        return [
+            Point(
+                self._measurement,
+                tags,
+                dict(zip(METER_TYPES, values, strict=True)),
+                sample_time,
+            )
+            for sample_time, values in rows
+        ]
+
+    def _resolve_site_id(self, site_id: str | None) -> str:
+        return str(site_id or self._payload_site_id or "unknown")
+
+    def _sorted_rows(self) -> list[tuple[datetime, list[float]]]:
+        """Parse the row dates, sort the rows and release the row table."""
+        if self._unit != self._expected_unit:
+            return []
+        rows = []
+        for date_str, values in self._rows.items():
+            try:
+                rows.append((datetime.fromisoformat(date_str), values))
+            except (TypeError, ValueError):
+                continue
+        self._rows = {}
+        rows.sort(key=lambda row: row[0])
+        return rows
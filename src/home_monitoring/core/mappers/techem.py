@@ -14,6 +14,27 @@ class TechemMapper(BaseMapper):
     EXPECTED_RESPONSE_LENGTH = 46  # Length of hex string response
     _logger = get_logger(__name__)
 
+    @staticmethod
+    def meter_id(response: bytes) -> str | None:
+        """Meter ID of a raw response.
+
+        Args:
+            response: Raw meter response as ASCII-encoded hex byte string
+
+        Returns:
+            Decimal meter ID (bytes 4-7, little endian), or None if the
+            response is not a meter frame
+        """
+        try:
+            hex_str = response.decode("ascii")
+            if len(hex_str) != TechemMapper.EXPECTED_RESPONSE_LENGTH:
+                return None
+            return str(
+                int("".join(hex_str[pos * 2 : pos * 2 + 2] for pos in (7, 6, 5, 4)))
+            )
+        except ValueError:
+            return None
+
     @staticmethod
     def to_measurements(
         timestamp: datetime,
@@ -55,10 +76,9 @@ class TechemMapper(BaseMapper):
                     continue
 
                 # Extract meter ID (bytes 4-7)
-                meter_id_bytes = ""
-                for pos in [7, 6, 5, 4]:
-                    meter_id_bytes += hex_str[pos * 2 : (pos * 2) + 2]
-                meter_id = str(int(meter_id_bytes))
+                meter_id = TechemMapper.meter_id(response)
+                if meter_id is None:
+                    raise ValueError(f"invalid meter id in {hex_str!r}")
                 TechemMapper._logger.debug(
                     "parsed_meter_id",
                     meter_id=meter_id,
@@ -1,10 +1,42 @@
 """Base models for the application."""
 
-from datetime import datetime
-from typing import Any
+import time
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
 
+from home_monitoring.core.exceptions import ValidationError
 from pydantic import BaseModel, ConfigDict
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Convert a datetime to integer nanoseconds since the Unix epoch.
+
+    Naive datetimes are converted exactly as aioinflux did before writes
+    bypassed it (``dt.timestamp() - time.timezone``), so points keep the
+    timestamps they were always stored with. On a host not set to UTC this
+    is off by the DST offset in summer; pass aware datetimes to avoid it.
+
+    Args:
+        timestamp: Point timestamp
+
+    Returns:
+        Nanoseconds since 1970-01-01T00:00:00Z
+    """
+    if timestamp.tzinfo is None:
+        seconds = int(timestamp.timestamp() - time.timezone)
+        return seconds * 1_000_000_000 + timestamp.microsecond * 1_000
+    delta = timestamp - _EPOCH
+    return (
+        delta.days * 86_400_000_000_000
+        + delta.seconds * 1_000_000_000
+        + delta.microseconds * 1_000
+    )
+
 
 class TimestampedModel(BaseModel):
     """Base model with timestamp."""
@@ -23,3 +55,140 @@ class Measurement(TimestampedModel):
     measurement: str
     tags: dict[str, str]
     fields: dict[str, Any]
+
+
+class Point(NamedTuple):
+    """Unvalidated measurement for hot write paths.
+
+    Mappers that emit thousands of rows (e.g. SolarEdge backfills) build
+    points instead of :class:`Measurement`: a tuple with named attributes
+    skips pydantic validation and is several times cheaper to create. The
+    line protocol encoder still rejects field values it cannot store, and
+    ``to_measurement`` validates a point where a model is needed.
+    """
+
+    measurement: str
+    tags: dict[str, str]
+    fields: dict[str, Any]
+    timestamp: datetime
+
+    @classmethod
+    def from_measurement(cls, measurement: Measurement) -> "Point":
+        """Convert a validated measurement without copying its dicts."""
+        return cls(
+            measurement.measurement,
+            measurement.tags,
+            measurement.fields,
+            measurement.timestamp,
+        )
+
+    def to_measurement(self) -> Measurement:
+        """Validate the point into a :class:`Measurement`.
+
+        Raises:
+            pydantic.ValidationError: If an attribute has the wrong type
+        """
+        return Measurement(
+            measurement=self.measurement,
+            tags=self.tags,
+            fields=self.fields,
+            timestamp=self.timestamp,
+        )
+
+
+# a single row the repository can write
+MeasurementLike = Measurement | Point
+
+
+@dataclass(slots=True)
+class SeriesBatch:
+    """Columnar block of one series: a timestamp column and float columns.
+
+    Dense regular series (SolarEdge meter readings, Tibber price curves) are
+    kept as ``array`` columns instead of one object per timestamp; the
+    repository encodes them column-wise. Timestamps are UTC epoch
+    nanoseconds and every field column has one value per timestamp
+    (NaN marks a missing value).
+    """
+
+    measurement: str
+    tags: dict[str, str]
+    timestamps: array  # type: ignore[type-arg]  # array("q"), epoch ns
+    fields: dict[str, array]  # type: ignore[type-arg]  # array("d") columns
+
+    def __post_init__(self) -> None:
+        for name, column in self.fields.items():
+            if len(column) != len(self.timestamps):
+                raise ValidationError(
+                    "Series column length does not match its timestamps",
+                    details={
+                        "field": name,
+                        "values": len(column),
+                        "timestamps": len(self.timestamps),
+                    },
+                )
+
+    @classmethod
+    def from_columns(
+        cls,
+        measurement: str,
+        tags: dict[str, str],
+        timestamps: Sequence[datetime],
+        fields: Mapping[str, Sequence[float]],
+    ) -> "SeriesBatch":
+        """Build a batch from datetimes and per-field value sequences.
+
+        Args:
+            measurement: Measurement name
+            tags: Tag set shared by every row
+            timestamps: Row timestamps (naive ones are converted as by
+                ``to_epoch_ns``)
+            fields: One value sequence per field, aligned with ``timestamps``
+
+        Returns:
+            The columnar batch
+
+        Raises:
+            ValidationError: If a column is not aligned with the timestamps
+        """
+        return cls(
+            measurement,
+            tags,
+            array("q", map(to_epoch_ns, timestamps)),
+            {name: array("d", values) for name, values in fields.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice(self, start: int, stop: int) -> "SeriesBatch":
+        """Rows ``start:stop`` as a new batch (columns are copied)."""
+        return SeriesBatch(
+            self.measurement,
+            self.tags,
+            self.timestamps[start:stop],
+            {name: column[start:stop] for name, column in self.fields.items()},
+        )
+
+    def rows(self) -> Iterator[Point]:
+        """Expand into per-row points (for inspection; not on write paths).
+
+        NaN values are left out of a row's fields.
+        """
+        names = list(self.fields)
+        for index, timestamp_ns in enumerate(self.timestamps):
+            fields = {
+                name: value
+                for name in names
+                if (value := self.fields[name][index]) == value  # NaN != NaN
+            }
+            yield Point(
+                self.measurement,
+                self.tags,
+                fields,
+                _EPOCH + timedelta(microseconds=timestamp_ns // 1_000),
+            )
+
+
+# anything the repository can write
+Writable = MeasurementLike | SeriesBatch
@@ -0,0 +1,183 @@
+"""Persistent index of the newest timestamp per measurement and series.
+
+Finding the newest point of a measurement used to cost a ``SELECT ... ORDER
+BY time DESC LIMIT 1`` per measurement (healthcheck, incremental
+collectors). The repository already sees every point it writes, so it keeps
+the answer instead: ``observe`` folds the timestamps of a successful write
+into the index and ``save`` merges them into ``state_dir/freshness.json``,
+where every collector process (and the healthcheck) reads them back at the
+cost of a dictionary lookup.
+
+The file is shared by concurrent collector processes: saves take an
+``flock``, re-read the file and keep the newest timestamp of every entry, so
+no process can move an entry backwards. Readers reload it only when its
+modification time changes.
+
+The index only knows what went through a repository with the index enabled;
+callers fall back to InfluxDB for measurements it has never seen.
+"""
+
+import fcntl
+import json
+import os
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.models.base import SeriesBatch, Writable, to_epoch_ns
+from home_monitoring.utils.logging import get_logger
+
+FRESHNESS_FILENAME = "freshness.json"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# measurement -> series key -> newest epoch ns
+Entries = dict[str, dict[str, int]]
+
+
+def series_key(tags: dict[str, str]) -> str:
+    """Identify a series of a measurement by its sorted tag set (``k=v,k=v``)."""
+    return ",".join(
+        f"{key}={value}"
+        for key, value in sorted(tags.items())
+        if value not in ("", None)
+    )
+
+
+def _from_ns(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value // 1_000)
+
+
+class FreshnessIndex:
+    """Newest written timestamp per measurement and series, kept on disk."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the index (the file is read on first lookup).
+
+        Args:
+            path: JSON file shared by every process using the same state dir
+        """
+        self._path = path
+        self._logger = get_logger(__name__)
+        self._entries: Entries = {}
+        self._mtime_ns: int | None = None
+        # observed since the last save
+        self._dirty: Entries = {}
+        # newest timestamp per measurement over stored and observed entries
+        self._newest: dict[str, int] = {}
+
+    def observe(self, measurements: Sequence[Writable]) -> None:
+        """Record the timestamps of measurements that were written.
+
+        Args:
+            measurements: Measurements, points or columnar batches
+        """
+        keys: dict[tuple[str, int], str] = {}
+        for measurement in measurements:
+            if isinstance(measurement, SeriesBatch):
+                if not len(measurement):
+                    continue
+                newest = max(measurement.timestamps)
+            else:
+                newest = to_epoch_ns(measurement.timestamp)
+            # a tag dict is typically shared by many points of a series
+            cache_key = (measurement.measurement, id(measurement.tags))
+            key = keys.get(cache_key)
+            if key is None:
+                key = keys[cache_key] = series_key(measurement.tags)
+            series = self._dirty.setdefault(measurement.measurement, {})
+            if newest > series.get(key, -1):
+                series[key] = newest
+            if newest > self._newest.get(measurement.measurement, -1):
+                self._newest[measurement.measurement] = newest
+
+    def latest(
+        self, measurement: str, tags: dict[str, str] | None = None
+    ) -> datetime | None:
+        """Newest timestamp of a measurement, or of one of its series.
+
+        Args:
+            measurement: Measurement name
+            tags: Tag set of the series; None for the whole measurement
+
+        Returns:
+            Newest known timestamp, or None if the index has never seen it
+        """
+        self._reload()
+        if tags is None:
+            value = self._newest.get(measurement)
+        else:
+            key = series_key(tags)
+            value = max(
+                self._entries.get(measurement, {}).get(key, -1),
+                self._dirty.get(measurement, {}).get(key, -1),
+            )
+        return None if value is None or value < 0 else _from_ns(value)
+
+    def save(self) -> None:
+        """Merge observed timestamps into the file (newest wins).
+
+        Failures are logged, not raised: the index is an optimization and
+        InfluxDB remains the source of truth.
+        """
+        if not self._dirty:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.with_suffix(".lock").open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                entries = self._read()
+                for measurement, series in self._dirty.items():
+                    entries[measurement] = _merged(entries.get(measurement), series)
+                tmp = self._path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"measurements": entries}))
+                os.replace(tmp, self._path)
+                self._set_entries(entries, self._path.stat().st_mtime_ns)
+        except OSError as e:
+            self._logger.warning("freshness_index_save_failed", error=str(e))
+            return
+        self._dirty = {}
+
+    def _reload(self) -> None:
+        """Re-read the file if another process has saved since."""
+        try:
+            mtime_ns = self._path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns != self._mtime_ns:
+            self._set_entries(self._read(), mtime_ns)
+
+    def _set_entries(self, entries: Entries, mtime_ns: int) -> None:
+        """Adopt the stored entries and refresh the per-measurement maximum."""
+        self._entries = entries
+        self._mtime_ns = mtime_ns
+        newest = {m: max(series.values()) for m, series in entries.items() if series}
+        for measurement, series in self._dirty.items():
+            newest[measurement] = max(newest.get(measurement, -1), *series.values())
+        self._newest = newest
+
+    def _read(self) -> Entries:
+        """Entries stored on disk; a missing or corrupt file is empty."""
+        try:
+            data: Any = json.loads(self._path.read_text())
+            return {
+                str(measurement): {str(k): int(v) for k, v in series.items()}
+                for measurement, series in data["measurements"].items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._logger.warning("freshness_index_unreadable", error=str(e))
+            return {}
+
+
+def _merged(
+    stored: dict[str, int] | None, observed: dict[str, int] | None
+) -> dict[str, int]:
+    """Union of two series maps keeping the newest timestamp per series."""
+    result = dict(stored or {})
+    for key, value in (observed or {}).items():
+        if value > result.get(key, -1):
+            result[key] = value
+    return result
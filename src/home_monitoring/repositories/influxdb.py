@@ -1,20 +1,73 @@
 """InfluxDB repository implementation."""
 
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from aioinflux import InfluxDBClient as BaseInfluxDBClient
 from home_monitoring.config import Settings, get_settings
-from home_monitoring.models.base import Measurement
+from home_monitoring.models.base import MeasurementLike, Writable
+from home_monitoring.repositories.freshness import FRESHNESS_FILENAME, FreshnessIndex
+from home_monitoring.repositories.influxdb_pool import get_influxdb_client
+from home_monitoring.repositories.line_protocol import DEFAULT_CHUNK_SIZE, encode_chunks
+from home_monitoring.repositories.query_results import RowBatch, to_frame
+from home_monitoring.repositories.spool import SPOOL_DIRNAME, WriteSpool
 from home_monitoring.utils.logging import get_logger
 from structlog.stdlib import BoundLogger
 
+if TYPE_CHECKING:
+    import aioinflux
+    import pandas
+
 EPOCH_DIGITS_NS = 19
 EPOCH_DIGITS_US = 16
 EPOCH_DIGITS_MS = 13
 
+# statements per multi-statement freshness query
+FRESHNESS_BATCH_SIZE = 100
+
+# points per chunk of a streamed query (InfluxDB's default is 10k)
+QUERY_CHUNK_SIZE = 10_000
+
+# spooled payloads replayed ahead of a regular write, so a long backlog is
+# worked off over several runs instead of stalling one collector
+SPOOL_REPLAY_BATCH = 20
+
+HTTP_CLIENT_ERROR = 400
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+
+def _is_rejected(error: BaseException) -> bool:
+    """Whether InfluxDB refused a write for good (4xx, e.g. a type conflict).
+
+    Such payloads would fail again on replay, so they are not spooled.
+    """
+    status = getattr(error, "status", None)
+    return (
+        isinstance(status, int)
+        and HTTP_CLIENT_ERROR <= status < HTTP_SERVER_ERROR
+        and status != HTTP_TOO_MANY_REQUESTS
+    )
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote an InfluxQL identifier (measurement name)."""
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _latest_statement(measurement: str, field: str | None) -> str:
+    """InfluxQL statement returning the newest row of a measurement.
+
+    ``last()`` of one field reads a single column; without a known field
+    every column of the newest row is read.
+    """
+    source = _quote_identifier(measurement)
+    if field is None:
+        return f"SELECT * FROM {source} ORDER BY time DESC LIMIT 1"
+    return f"SELECT last({_quote_identifier(field)}) FROM {source}"
+
 
 class InfluxDBRepository:
     """Repository for InfluxDB operations."""
@@ -22,48 +75,66 @@ class InfluxDBRepository:
     def __init__(
         self,
         settings: Settings | None = None,
-        client: BaseInfluxDBClient | None = None,
+        client: "aioinflux.InfluxDBClient | None" = None,
+        spool: WriteSpool | None = None,
+        freshness: FreshnessIndex | None = None,
     ) -> None:
         """Initialize the repository.
 
         Args:
             settings: Application settings. If not provided, loaded from env.
-            client: InfluxDB client. If not provided, new client created.
+            client: InfluxDB client. If not provided, the process-wide pooled
+                client is used (resolved on first use, inside the event loop).
+            spool: Spool for writes failing while InfluxDB is unavailable.
+                If not provided, one under ``state_dir`` is used unless
+                ``influxdb_spool`` is disabled.
+            freshness: Index of the newest written timestamps. If not
+                provided, one under ``state_dir`` is used unless
+                ``influxdb_freshness_index`` is disabled.
         """
         self._settings = settings or get_settings()
-        self._client = client or self._create_client()
+        self._injected_client = client
         self._logger: BoundLogger = get_logger(__name__)
+        self._spool = spool
+        if spool is None and self._settings.influxdb_spool:
+            self._spool = WriteSpool(
+                self._settings.state_dir / SPOOL_DIRNAME,
+                max_bytes=self._settings.influxdb_spool_max_bytes,
+            )
+        # measurement -> field key probed by freshness lookups
+        self._field_keys: dict[str, str] | None = None
+        self._freshness = freshness
+        if freshness is None and self._settings.influxdb_freshness_index:
+            self._freshness = FreshnessIndex(
+                self._settings.state_dir / FRESHNESS_FILENAME
+            )
 
-    def _create_client(self) -> BaseInfluxDBClient:
-        """Create InfluxDB client.
-
-        Returns:
-            InfluxDB client
-        """
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return BaseInfluxDBClient(
-            host=self._settings.influxdb_host,
-            port=self._settings.influxdb_port,
-            db=self._settings.influxdb_database,
-            username=self._settings.influxdb_username,
-            password=self._settings.influxdb_password,
-            loop=loop,
-        )
+    @property
+    def _client(self) -> "aioinflux.InfluxDBClient":
+        """The injected client, or the process-wide pooled one."""
+        if self._injected_client is not None:
+            return self._injected_client
+        return get_influxdb_client(self._settings)
 
-    async def get_latest_timestamp(self, measurement: str) -> datetime | None:
+    async def get_latest_timestamp(
+        self, measurement: str, use_index: bool = True
+    ) -> datetime | None:
         """Get the latest timestamp for a measurement.
 
+        Answered from the freshness index when it knows the measurement;
+        InfluxDB is only queried otherwise.
+
         Args:
             measurement: Name of the measurement
+            use_index: Whether the freshness index may answer
 
         Returns:
             Latest timestamp or None if no data exists
         """
+        if use_index and self._freshness is not None:
+            latest = self._freshness.latest(measurement)
+            if latest is not None:
+                return latest
         query = f"SELECT * from {measurement} ORDER BY time DESC LIMIT 1"
         try:
             result = await self._client.query(query)
@@ -74,45 +145,7 @@ class InfluxDBRepository:
             if not points:
                 return None
 
-            raw_time = points[0][0]
-
-            # InfluxDB may return the timestamp either as an ISO8601 string
-            # (e.g. "2025-11-22T17:38:04Z") or as an integer epoch value.
-            # Handle both cases and always return a timezone-aware UTC
-            # datetime so callers can safely compare it with other UTC times.
-
-            # String timestamp (RFC3339/ISO8601)
-            if isinstance(raw_time, str):
-                value = raw_time
-                if value.endswith("Z"):
-                    value = value.replace("Z", "+00:00")
-                dt = datetime.fromisoformat(value)
-                return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
-
-            # Integer/float epoch timestamp (ns/us/ms/s)
-            if isinstance(raw_time, int | float):
-                epoch = int(raw_time)
-                digits = len(str(abs(epoch)))
-
-                # Heuristic based on digit count
-                if digits >= EPOCH_DIGITS_NS:  # nanoseconds
-                    seconds = epoch / 1_000_000_000
-                elif digits >= EPOCH_DIGITS_US:  # microseconds
-                    seconds = epoch / 1_000_000
-                elif digits >= EPOCH_DIGITS_MS:  # milliseconds
-                    seconds = epoch / 1_000
-                else:  # seconds
-                    seconds = float(epoch)
-
-                return datetime.fromtimestamp(seconds, tz=UTC)
-
-            self._logger.error(
-                "unexpected_timestamp_type",
-                measurement=measurement,
-                raw_time=raw_time,
-                raw_type=type(raw_time).__name__,
-            )
-            return None
+            return self._parse_timestamp(points[0][0], measurement)
         except Exception as e:
             self._logger.error(
                 "failed_to_get_latest_timestamp",
@@ -121,48 +154,190 @@ class InfluxDBRepository:
             )
             raise
 
-    async def write_measurement(self, measurement: Measurement) -> None:
+    async def get_latest_timestamps(
+        self,
+        measurements: Sequence[str],
+        batch_size: int = FRESHNESS_BATCH_SIZE,
+        use_index: bool = True,
+    ) -> dict[str, datetime | None]:
+        """Get the latest timestamp of many measurements in few round trips.
+
+        Measurements the freshness index knows are answered from it. For the
+        rest, one ``SELECT last("<field>")`` per measurement reads a single
+        field of the newest row instead of all of them; the statements are
+        sent together as one multi-statement query per ``batch_size``
+        measurements, so the number of round trips stays constant for any
+        realistic measurement count. The field is the first of the
+        measurement's field keys (see ``_freshness_fields``); a measurement
+        without known field keys falls back to ``SELECT *``.
+
+        Args:
+            measurements: Names of the measurements
+            batch_size: Maximum number of statements per query
+            use_index: Whether the freshness index may answer
+
+        Returns:
+            Mapping of measurement name to latest timestamp (None if no data)
+        """
+        latest: dict[str, datetime | None] = {}
+        names = list(dict.fromkeys(measurements))
+        if use_index and self._freshness is not None:
+            for name in names:
+                indexed = self._freshness.latest(name)
+                if indexed is not None:
+                    latest[name] = indexed
+            names = [name for name in names if name not in latest]
+        fields = await self._freshness_fields(names) if names else {}
+        for offset in range(0, len(names), batch_size):
+            batch = names[offset : offset + batch_size]
+            query = "; ".join(
+                _latest_statement(name, fields.get(name)) for name in batch
+            )
+            try:
+                result = await self._client.query(query)
+            except Exception as e:
+                self._logger.error(
+                    "failed_to_get_latest_timestamps",
+                    measurements=batch,
+                    error=str(e),
+                )
+                raise
+
+            statements = {
+                statement.get("statement_id", index): statement
+                for index, statement in enumerate((result or {}).get("results", []))
+            }
+            for index, name in enumerate(batch):
+                latest[name] = None
+                for series in statements.get(index, {}).get("series", []):
+                    values = series.get("values") or []
+                    if values:
+                        latest[name] = self._parse_timestamp(values[0][0], name)
+        return latest
+
+    async def _freshness_fields(self, measurements: Sequence[str]) -> dict[str, str]:
+        """One field key per measurement to probe its newest row with.
+
+        The field keys of every measurement are fetched with a single
+        ``SHOW FIELD KEYS`` and kept for the repository's lifetime; they are
+        fetched again only when a measurement is missing from them. A point
+        without the probed field is not seen, so measurements written
+        sparsely (change-only gas prices) rely on their periodic full points.
+
+        Args:
+            measurements: Names of the measurements to probe
+
+        Returns:
+            Mapping of measurement name to its first field key
+        """
+        if self._field_keys is None or any(
+            name not in self._field_keys for name in measurements
+        ):
+            try:
+                result = await self._client.query("SHOW FIELD KEYS")
+            except Exception as e:
+                self._logger.error("failed_to_get_field_keys", error=str(e))
+                raise
+            field_keys: dict[str, str] = {}
+            for statement in (result or {}).get("results", []):
+                for series in statement.get("series", []):
+                    values = series.get("values") or []
+                    if "name" in series and values:
+                        field_keys[series["name"]] = str(values[0][0])
+            self._field_keys = field_keys
+        return self._field_keys
+
+    def _parse_timestamp(self, raw_time: Any, measurement: str) -> datetime | None:
+        """Parse a timestamp returned by InfluxDB into an aware UTC datetime.
+
+        InfluxDB may return the timestamp either as an ISO8601 string
+        (e.g. "2025-11-22T17:38:04Z") or as an integer epoch value. Both cases
+        are handled so callers can safely compare the result with other UTC
+        times.
+
+        Args:
+            raw_time: Raw ``time`` column value
+            measurement: Measurement name (for logging)
+
+        Returns:
+            Parsed timestamp, or None for an unexpected value type
+        """
+        # String timestamp (RFC3339/ISO8601)
+        if isinstance(raw_time, str):
+            value = raw_time
+            if value.endswith("Z"):
+                value = value.replace("Z", "+00:00")
+            dt = datetime.fromisoformat(value)
+            return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+        # Integer/float epoch timestamp (ns/us/ms/s)
+        if isinstance(raw_time, int | float):
+            epoch = int(raw_time)
+            digits = len(str(abs(epoch)))
+
+            # Heuristic based on digit count
+            if digits >= EPOCH_DIGITS_NS:  # nanoseconds
+                seconds = epoch / 1_000_000_000
+            elif digits >= EPOCH_DIGITS_US:  # microseconds
+                seconds = epoch / 1_000_000
+            elif digits >= EPOCH_DIGITS_MS:  # milliseconds
+                seconds = epoch / 1_000
+            else:  # seconds
+                seconds = float(epoch)
+
+            return datetime.fromtimestamp(seconds, tz=UTC)
+
+        self._logger.error(
+            "unexpected_timestamp_type",
+            measurement=measurement,
+            raw_time=raw_time,
+            raw_type=type(raw_time).__name__,
+        )
+        return None
+
+    async def write_measurement(self, measurement: MeasurementLike) -> None:
         """Write a measurement to InfluxDB.
 
         Args:
             measurement: Measurement to write
         """
-        data = {
-            "measurement": measurement.measurement,
-            "tags": measurement.tags,
-            "fields": measurement.fields,
-            "time": measurement.timestamp.isoformat(),
-        }
-        try:
-            await self._client.write([data])
-        except Exception as e:
-            self._logger.error(
-                "failed_to_write_measurement",
-                measurement=measurement.measurement,
-                error=str(e),
-            )
-            raise
+        await self.write_measurements([measurement])
 
     async def write_measurements(
         self,
-        measurements: list[Measurement],
+        measurements: Sequence[Writable],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> None:
         """Write multiple measurements to InfluxDB.
 
+        Measurements are encoded directly to line protocol with nanosecond
+        timestamps and posted to ``/write`` in chunks of ``chunk_size`` lines.
+
+        With a spool, a chunk that fails or times out because InfluxDB is
+        unavailable is spooled instead of raising, and while older chunks are
+        spooled new ones queue behind them so replay keeps the write order.
+        The timestamps are recorded in the freshness index only if InfluxDB
+        acknowledged every chunk: a spooled chunk may still be evicted before
+        it is replayed, so it must not be reported as present.
+
         Args:
-            measurements: List of measurements to write
+            measurements: Measurements, lightweight points or columnar batches
+                to write
+            chunk_size: Maximum number of points per write request
         """
-        points = [
-            {
-                "measurement": m.measurement,
-                "tags": m.tags,
-                "fields": m.fields,
-                "time": m.timestamp.isoformat(),
-            }
-            for m in measurements
-        ]
+        spool = self._spool
+        if spool is not None and spool.pending and spool.replay_due():
+            await spool.replay(self._send_spooled, limit=SPOOL_REPLAY_BATCH)
+        spooled = 0
         try:
-            await self._client.write(points)
+            for chunk in encode_chunks(measurements, chunk_size):
+                if spool is None:
+                    await self._client.write(chunk)
+                elif spool.pending:
+                    spool.append(chunk)
+                    spooled += 1
+                elif not await self._write_or_spool(chunk, spool):
+                    spooled += 1
         except Exception as e:
             self._logger.error(
                 "failed_to_write_measurements",
@@ -170,6 +345,53 @@ class InfluxDBRepository:
                 error=str(e),
             )
             raise
+        if self._freshness is not None and not spooled:
+            self._freshness.observe(measurements)
+            self._freshness.save()
+        if spooled:
+            self._logger.warning("influxdb_writes_spooled", chunks=spooled)
+
+    async def replay_spool(self) -> int:
+        """Replay every spooled write (no-op without a spool or backlog).
+
+        Returns:
+            Number of payloads written
+        """
+        if self._spool is None or not self._spool.pending:
+            return 0
+        return await self._spool.replay(self._send_spooled)
+
+    async def _write_or_spool(self, chunk: bytes, spool: WriteSpool) -> bool:
+        """Write one chunk, spooling it if InfluxDB is unavailable.
+
+        Returns:
+            True if written, False if spooled
+
+        Raises:
+            Exception: If InfluxDB rejected the payload itself (4xx)
+        """
+        try:
+            await asyncio.wait_for(
+                self._client.write(chunk), self._settings.influxdb_write_timeout
+            )
+        except Exception as e:
+            if _is_rejected(e):
+                raise
+            spool.append(chunk)
+            self._logger.warning("influxdb_write_spooled", error=str(e) or repr(e))
+            return False
+        return True
+
+    async def _send_spooled(self, payload: bytes) -> None:
+        """Replay one spooled payload; rejected payloads are dropped."""
+        try:
+            await asyncio.wait_for(
+                self._client.write(payload), self._settings.influxdb_write_timeout
+            )
+        except Exception as e:
+            if not _is_rejected(e):
+                raise
+            self._logger.error("spooled_write_rejected", error=str(e))
 
     async def query(self, query: str) -> AsyncIterator[dict[str, Any]]:
         """Execute a query against InfluxDB.
@@ -196,3 +418,51 @@ class InfluxDBRepository:
                 error=str(e),
             )
             raise
+
+    async def query_chunks(
+        self, query: str, chunk_size: int = QUERY_CHUNK_SIZE
+    ) -> AsyncIterator[RowBatch]:
+        """Stream a query's rows in batches as InfluxDB sends them.
+
+        Uses InfluxDB's chunked responses, so only one chunk of at most
+        ``chunk_size`` points is held at a time instead of the whole result.
+        Timestamps are epoch nanoseconds.
+
+        Args:
+            query: InfluxDB query string
+            chunk_size: Maximum number of points per chunk
+
+        Yields:
+            One batch per series chunk, in response order
+        """
+        try:
+            chunks = await self._client.query(
+                query, chunked=True, chunk_size=chunk_size, epoch="ns"
+            )
+            async for chunk in chunks:
+                for result in chunk.get("results", []):
+                    for series in result.get("series", []):
+                        yield RowBatch.from_series(series)
+        except Exception as e:
+            self._logger.error(
+                "failed_to_execute_query",
+                query=query,
+                error=str(e),
+            )
+            raise
+
+    async def query_frame(
+        self, query: str, chunk_size: int = QUERY_CHUNK_SIZE
+    ) -> "pandas.DataFrame":
+        """Run a streamed query into a DataFrame indexed by UTC time.
+
+        Needs pandas (the ``analysis`` extra).
+
+        Args:
+            query: InfluxDB query string
+            chunk_size: Maximum number of points per chunk
+
+        Returns:
+            One column per field (and per tag of grouped series)
+        """
+        return to_frame([batch async for batch in self.query_chunks(query, chunk_size)])
@@ -0,0 +1,121 @@
+"""Process-wide, bounded aioinflux client.
+
+Every ``InfluxDBRepository`` used to build its own aioinflux client, each with
+its own aiohttp session and an unbounded connection pool, no timeouts and no
+keep-alive tuning; collectors that build several repositories per run opened
+several sessions to the same server. ``get_influxdb_client`` hands out one
+shared client per event loop instead:
+
+- a ``TCPConnector`` limited to ``influxdb_max_connections`` connections,
+  kept alive for ``influxdb_keepalive_seconds`` between writes;
+- a connect timeout and a per-read timeout (no total timeout, so a long
+  chunked query is not cut off while data keeps arriving);
+- created lazily inside the running loop (aiohttp sessions are loop-bound),
+  so no event loop is ever created on the caller's behalf.
+
+Call ``close_influxdb_client`` once at shutdown, next to
+``close_http_clients``.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from home_monitoring.config import Settings, get_settings
+from home_monitoring.utils.lazy import lazy_import
+from home_monitoring.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import aiohttp
+    import aioinflux
+else:
+    aiohttp = lazy_import("aiohttp")
+    aioinflux = lazy_import("aioinflux")
+
+
+def create_influxdb_client(settings: Settings) -> "aioinflux.InfluxDBClient":
+    """Create a pooled aioinflux client for the running event loop.
+
+    Args:
+        settings: Connection, pool and timeout settings
+
+    Returns:
+        Client whose session is opened on first request
+
+    Raises:
+        RuntimeError: If no event loop is running
+    """
+    loop = asyncio.get_running_loop()
+    client = aioinflux.InfluxDBClient(
+        host=settings.influxdb_host,
+        port=settings.influxdb_port,
+        db=settings.influxdb_database,
+        username=settings.influxdb_username,
+        password=settings.influxdb_password,
+        timeout=aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.influxdb_connect_timeout,
+            sock_read=settings.influxdb_read_timeout,
+        ),
+        loop=loop,
+    )
+    # aioinflux forwards its options to the aiohttp session it opens lazily
+    client.opts["connector"] = aiohttp.TCPConnector(
+        limit=settings.influxdb_max_connections,
+        keepalive_timeout=settings.influxdb_keepalive_seconds,
+    )
+    return client
+
+
+class InfluxDBClientManager:
+    """Singleton manager for the process-wide aioinflux client."""
+
+    _client: "aioinflux.InfluxDBClient | None" = None
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def get_client(cls, settings: Settings | None = None) -> "aioinflux.InfluxDBClient":
+        """Get the shared client, creating it on first use in this loop.
+
+        A client created in an event loop that is no longer running (an
+        earlier ``asyncio.run``) cannot be reused and is replaced.
+
+        Args:
+            settings: Settings used to configure the client on creation.
+                Defaults to the application settings.
+
+        Raises:
+            RuntimeError: If no event loop is running
+        """
+        loop = asyncio.get_running_loop()
+        if cls._client is None or cls._loop is not loop:
+            cls._client = create_influxdb_client(settings or get_settings())
+            cls._loop = loop
+            get_logger(__name__).debug("influxdb_client_created")
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close and drop the shared client."""
+        client, loop = cls._client, cls._loop
+        cls._client = cls._loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.close()
+            # closed with the session, unless no request ever opened one
+            await client.opts["connector"].close()
+
+
+def get_influxdb_client(settings: Settings | None = None) -> "aioinflux.InfluxDBClient":
+    """Get the process-wide aioinflux client (must be called in a coroutine).
+
+    Args:
+        settings: Settings used to configure the client on first use.
+
+    Returns:
+        The shared client; do not close it, the manager owns it
+    """
+    return InfluxDBClientManager.get_client(settings)
+
+
+async def close_influxdb_client() -> None:
+    """Close the process-wide aioinflux client (call once at shutdown)."""
+    await InfluxDBClientManager.close()
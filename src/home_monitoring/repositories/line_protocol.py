@@ -0,0 +1,193 @@
+"""InfluxDB 1.x line protocol encoding.
+
+Measurements are encoded straight into line protocol instead of going through
+intermediate dicts with ISO-8601 time strings that aioinflux would re-parse.
+Timestamps are written as integer nanoseconds, and measurement names, tag sets
+and field keys are escaped once per distinct value rather than once per point.
+"""
+
+import math
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import Any
+
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.models.base import SeriesBatch, Writable, to_epoch_ns
+
+# lines per POST to /write; InfluxDB recommends batches of 5k-10k points
+DEFAULT_CHUNK_SIZE = 5000
+
+_MEASUREMENT_ESCAPES = str.maketrans({",": r"\,", " ": r"\ ", "\n": r"\n"})
+_KEY_ESCAPES = str.maketrans({",": r"\,", "=": r"\=", " ": r"\ ", "\n": r"\n"})
+_STRING_FIELD_ESCAPES = str.maketrans({'"': r"\"", "\\": "\\\\", "\n": r"\n"})
+
+
+@lru_cache(maxsize=1024)
+def escape_measurement(name: str) -> str:
+    """Escape a measurement name for line protocol."""
+    return name.translate(_MEASUREMENT_ESCAPES)
+
+
+@lru_cache(maxsize=4096)
+def escape_key(key: str) -> str:
+    """Escape a tag key, tag value or field key for line protocol."""
+    return key.translate(_KEY_ESCAPES)
+
+
+def encode_tags(tags: dict[str, str]) -> str:
+    """Encode a tag set as ``,k=v,k=v`` (sorted by key, empty values dropped).
+
+    Args:
+        tags: Tag mapping
+
+    Returns:
+        Encoded tag set including the leading comma, or ``""`` without tags
+    """
+    return "".join(
+        f",{escape_key(key)}={escape_key(str(value))}"
+        for key, value in sorted(tags.items())
+        if value is not None and value != ""
+    )
+
+
+def encode_field_value(value: Any) -> str | None:
+    """Encode a single field value.
+
+    Args:
+        value: Field value (bool, int, float or str)
+
+    Returns:
+        Encoded value, or None if the value cannot be stored (None, NaN, inf)
+
+    Raises:
+        ValidationError: If the value has an unsupported type
+    """
+    if value is None:
+        return None
+    # bool before int: bool is a subclass of int
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}i"
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return repr(value)
+    if isinstance(value, str):
+        return f'"{value.translate(_STRING_FIELD_ESCAPES)}"'
+    raise ValidationError(
+        "Unsupported field value type",
+        details={"type": type(value).__name__},
+    )
+
+
+def encode_fields(fields: dict[str, Any]) -> str:
+    """Encode a field set as ``k=v,k=v``, skipping unstorable values.
+
+    Args:
+        fields: Field mapping
+
+    Returns:
+        Encoded field set, or ``""`` if no field can be stored
+    """
+    parts = []
+    for key, value in fields.items():
+        encoded = encode_field_value(value)
+        if encoded is not None:
+            parts.append(f"{escape_key(key)}={encoded}")
+    return ",".join(parts)
+
+
+def encode_series(batch: SeriesBatch) -> Iterator[str]:
+    """Encode a columnar batch column by column.
+
+    The series key and escaped field keys are built once per batch, each
+    column is formatted with one ``map`` call, and rows are assembled by
+    zipping the formatted columns. Rows with NaN/inf values drop those
+    fields (and the row if nothing is left), as for single measurements.
+
+    Args:
+        batch: Columnar batch to encode
+
+    Yields:
+        One line per row with at least one storable field
+    """
+    if not batch.fields:
+        return
+    head = escape_measurement(batch.measurement) + encode_tags(batch.tags) + " "
+    columns = list(batch.fields.values())
+    formatted = [
+        map(f"{escape_key(name)}=".__add__, map(repr, column))
+        for name, column in batch.fields.items()
+    ]
+    if all(all(map(math.isfinite, column)) for column in columns):
+        for fields, timestamp_ns in zip(
+            map(",".join, zip(*formatted, strict=True)), batch.timestamps, strict=True
+        ):
+            yield f"{head}{fields} {timestamp_ns}"
+        return
+    for parts, values, timestamp_ns in zip(
+        zip(*formatted, strict=True),
+        zip(*columns, strict=True),
+        batch.timestamps,
+        strict=True,
+    ):
+        fields = ",".join(
+            part
+            for part, value in zip(parts, values, strict=True)
+            if math.isfinite(value)
+        )
+        if fields:
+            yield f"{head}{fields} {timestamp_ns}"
+
+
+def encode_lines(measurements: Iterable[Writable]) -> Iterator[str]:
+    """Encode measurements to line protocol lines.
+
+    Series keys (measurement name plus tag set) are encoded once and reused for
+    every point of the same series. Validated measurements and lightweight
+    points are encoded alike; columnar batches go through ``encode_series``.
+
+    Args:
+        measurements: Measurements, points or columnar batches to encode
+
+    Yields:
+        One line per measurement (or batch row) with at least one storable field
+    """
+    series_keys: dict[tuple[str, tuple[tuple[str, str], ...]], str] = {}
+    for m in measurements:
+        if isinstance(m, SeriesBatch):
+            yield from encode_series(m)
+            continue
+        fields = encode_fields(m.fields)
+        if not fields:
+            continue
+        cache_key = (m.measurement, tuple(sorted(m.tags.items())))
+        series = series_keys.get(cache_key)
+        if series is None:
+            series = escape_measurement(m.measurement) + encode_tags(m.tags)
+            series_keys[cache_key] = series
+        yield f"{series} {fields} {to_epoch_ns(m.timestamp)}"
+
+
+def encode_chunks(
+    measurements: Iterable[Writable],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Encode measurements into newline-joined line protocol chunks.
+
+    Args:
+        measurements: Measurements, points or columnar batches to encode
+        chunk_size: Maximum number of lines per chunk
+
+    Yields:
+        UTF-8 encoded chunks ready to POST to ``/write``
+    """
+    chunk: list[str] = []
+    for line in encode_lines(measurements):
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "\n".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk).encode()
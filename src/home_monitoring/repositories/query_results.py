@@ -0,0 +1,106 @@
+"""Compact containers for streamed InfluxDB query results.
+
+A chunked query (``InfluxDBRepository.query_chunks``) yields one
+:class:`RowBatch` per series chunk: the column header is shared by the batch
+and each row is a plain tuple, instead of one dict per row. ``to_frame``
+turns batches into a pandas DataFrame for the notebooks in ``analysis/``
+(pandas is only needed there, via the ``analysis`` extra).
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pandas
+
+TIME_COLUMN = "time"
+
+
+@dataclass(frozen=True, slots=True)
+class RowBatch:
+    """Rows of one series chunk sharing a column header.
+
+    Attributes:
+        name: Measurement the rows belong to
+        columns: Column names, ``time`` first (epoch ns)
+        rows: One tuple per row, aligned with ``columns``
+        tags: Tag values of the series when the query groups by tags
+    """
+
+    name: str
+    columns: tuple[str, ...]
+    rows: list[tuple[Any, ...]]
+    tags: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_series(cls, series: dict[str, Any]) -> "RowBatch":
+        """Build a batch from one ``series`` entry of a query response."""
+        return cls(
+            name=series.get("name", ""),
+            columns=tuple(series["columns"]),
+            rows=list(map(tuple, series.get("values") or [])),
+            tags=series.get("tags") or {},
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str) -> list[Any]:
+        """Values of one column.
+
+        Raises:
+            KeyError: If the batch has no such column
+        """
+        try:
+            index = self.columns.index(name)
+        except ValueError as e:
+            raise KeyError(name) from e
+        return [row[index] for row in self.rows]
+
+    def to_columns(self) -> dict[str, list[Any]]:
+        """The batch as column name to values (a column batch)."""
+        if not self.rows:
+            return {name: [] for name in self.columns}
+        return {
+            name: list(values)
+            for name, values in zip(
+                self.columns, zip(*self.rows, strict=True), strict=True
+            )
+        }
+
+
+def to_frame(batches: Iterable[RowBatch]) -> "pandas.DataFrame":
+    """Concatenate batches into one DataFrame indexed by UTC time.
+
+    Tags of grouped series become columns; rows keep the query order.
+
+    Args:
+        batches: Batches of one query, e.g. collected from ``query_chunks``
+
+    Returns:
+        DataFrame with one column per field and tag
+
+    Raises:
+        ModuleNotFoundError: If pandas is not installed
+    """
+    try:
+        import pandas  # optional, only needed for analysis
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "Frame output needs pandas; install the 'analysis' extra", name="pandas"
+        ) from e
+
+    frames = []
+    for batch in batches:
+        frame = pandas.DataFrame.from_records(batch.rows, columns=list(batch.columns))
+        for key, value in batch.tags.items():
+            frame[key] = value
+        frames.append(frame)
+    if not frames:
+        return pandas.DataFrame()
+    frame = pandas.concat(frames, ignore_index=True)
+    if TIME_COLUMN in frame:
+        frame[TIME_COLUMN] = pandas.to_datetime(frame[TIME_COLUMN], unit="ns", utc=True)
+        frame = frame.set_index(TIME_COLUMN)
+    return frame
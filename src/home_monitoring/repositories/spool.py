@@ -0,0 +1,317 @@
+"""Durable write-ahead spool for InfluxDB writes.
+
+When InfluxDB is down or restarting, line protocol payloads that could not be
+written are appended to segment files under ``state_dir/spool`` instead of
+being lost with the collection run, and replayed in order once the database
+answers again.
+
+Segments are append-only files of length- and CRC-framed records, named by
+creation time so they sort oldest first. Appends are flushed to the OS right
+away and fsync'ed at most once per ``sync_interval`` (and before every
+replay), so a burst of failed writes costs one disk sync rather than one per
+chunk. A torn record at the end of a segment (crash mid-append) is detected by
+its CRC and skipped. When the spool exceeds ``max_bytes``, whole segments are
+evicted oldest first.
+
+Several collector processes may spool at once (cron starts them on the same
+minute): every process appends to its own segment and holds an ``flock`` on
+it while it does, and replay is serialized by a lock file and stops at a
+segment another process is still writing. Records are therefore replayed in
+order and never deleted while they can still grow.
+
+Replay progress is kept in a small cursor file. InfluxDB overwrites a point
+with the same series and timestamp, so re-sending a record after a crash is
+harmless.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import struct
+import time
+import zlib
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from home_monitoring.utils.logging import get_logger
+
+SPOOL_DIRNAME = "spool"
+CURSOR_FILENAME = "cursor.json"
+LOCK_FILENAME = "replay.lock"
+SEGMENT_SUFFIX = ".seg"
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+DEFAULT_SEGMENT_BYTES = 4 * 2**20
+DEFAULT_SYNC_INTERVAL = 1.0
+# replay backoff after a failed attempt: 5s, 10s, 20s, ... capped at 5 minutes
+DEFAULT_BASE_DELAY = 5.0
+DEFAULT_MAX_DELAY = 300.0
+
+# record header: payload length and CRC32 of the payload
+_HEADER = struct.Struct(">II")
+
+Send = Callable[[bytes], Awaitable[None]]
+
+
+class WriteSpool:
+    """Append-only, size-capped spool of line protocol payloads."""
+
+    def __init__(  # noqa: PLR0913 - independent tuning knobs
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        """Initialize the spool (nothing is created on disk until needed).
+
+        Args:
+            directory: Directory holding the segments and the cursor
+            max_bytes: Size cap of all segments together
+            segment_bytes: Size at which a new segment is started (capped at
+                half of ``max_bytes`` so eviction never empties the spool)
+            sync_interval: Minimum seconds between two fsyncs on append
+            base_delay: Replay backoff after the first failed attempt
+            max_delay: Upper bound of the replay backoff
+        """
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._segment_bytes = max(1, min(segment_bytes, max_bytes // 2))
+        self._sync_interval = sync_interval
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._logger = get_logger(__name__)
+
+        # segment this process appends to: (file name, open file)
+        self._writer: tuple[str, BinaryIO] | None = None
+        self._writer_size = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._failures = 0
+        self._next_attempt = 0.0
+        self._replay_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> bool:
+        """Whether any spooled record has not been replayed yet."""
+        segment, offset = self._load_cursor()
+        return any(
+            name > segment or (name == segment and size > offset)
+            for name, size in self._segments()
+        )
+
+    @property
+    def size(self) -> int:
+        """Bytes currently held in segment files."""
+        return sum(size for _, size in self._segments())
+
+    def replay_due(self) -> bool:
+        """Whether the backoff after the last failed replay has passed."""
+        return time.monotonic() >= self._next_attempt
+
+    def append(self, payload: bytes) -> None:
+        """Append one payload, evicting the oldest segments over the cap.
+
+        Args:
+            payload: Line protocol payload (one write request)
+        """
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        writer = self._open_writer(len(record))
+        writer.write(record)
+        writer.flush()
+        self._writer_size += len(record)
+        self._unsynced = True
+        if time.monotonic() - self._last_sync >= self._sync_interval:
+            self.sync()
+        self._evict()
+
+    def sync(self) -> None:
+        """Force appended records to disk."""
+        if self._writer is not None and self._unsynced:
+            os.fsync(self._writer[1].fileno())
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close this process's segment (releasing its lock)."""
+        if self._writer is not None:
+            self.sync()
+            self._writer[1].close()
+            self._writer = None
+            self._writer_size = 0
+
+    async def replay(self, send: Send, limit: int | None = None) -> int:
+        """Send spooled payloads in order until done, failing or ``limit``.
+
+        A failed send stops the replay and backs off; the failed record is
+        retried first next time. A replay already running in this or another
+        process makes the call return immediately.
+
+        Args:
+            send: Coroutine writing one payload; raising marks it failed
+            limit: Maximum number of payloads to send (None for all)
+
+        Returns:
+            Number of payloads sent
+        """
+        if self._replay_lock.locked() or not self._dir.is_dir():
+            return 0
+        async with self._replay_lock:
+            with (self._dir / LOCK_FILENAME).open("a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return 0
+                return await self._replay_locked(send, limit)
+
+    async def _replay_locked(self, send: Send, limit: int | None) -> int:
+        """Replay while holding the replay lock."""
+        self.sync()
+        cursor = self._load_cursor()
+        sent = 0
+        try:
+            for name, _ in self._segments():
+                if name < cursor[0]:
+                    self._delete(name)  # replayed before a crash
+                    continue
+                records = self._records(name, cursor[1] if name == cursor[0] else 0)
+                if records is None:
+                    break  # another process is still appending here
+                for end, payload in records:
+                    if limit is not None and sent >= limit:
+                        break
+                    await send(payload)
+                    sent += 1
+                    cursor = (name, end)
+                else:
+                    self._delete(name)
+                    continue
+                break
+        except Exception as e:
+            self._failures += 1
+            delay = min(self._base_delay * 2 ** (self._failures - 1), self._max_delay)
+            self._next_attempt = time.monotonic() + delay
+            self._logger.warning(
+                "spool_replay_failed", error=str(e), sent=sent, retry_in_seconds=delay
+            )
+            return sent
+        finally:
+            self._save_cursor(cursor)
+        self._failures = 0
+        self._next_attempt = 0.0
+        if sent:
+            self._logger.info("spool_replayed", sent=sent)
+        return sent
+
+    def _open_writer(self, record_size: int) -> BinaryIO:
+        """Return this process's segment, rotating it when it would overflow."""
+        if (
+            self._writer is not None
+            and self._writer_size + record_size > self._segment_bytes
+        ):
+            self.close()
+        if self._writer is None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            # time-ordered and unique per process: never shared, never
+            # appended to after a torn record
+            name = f"{time.time_ns():020d}-{os.getpid()}{SEGMENT_SUFFIX}"
+            file = (self._dir / name).open("ab")
+            fcntl.flock(file, fcntl.LOCK_EX)
+            self._writer = (name, file)
+            self._writer_size = 0
+        return self._writer[1]
+
+    def _segments(self) -> list[tuple[str, int]]:
+        """``(name, size)`` of every segment, oldest first."""
+        if not self._dir.is_dir():
+            return []
+        segments = []
+        for path in self._dir.glob(f"*{SEGMENT_SUFFIX}"):
+            try:
+                segments.append((path.name, path.stat().st_size))
+            except FileNotFoundError:
+                continue  # replayed or evicted meanwhile
+        return sorted(segments)
+
+    def _records(self, name: str, start: int) -> list[tuple[int, bytes]] | None:
+        """Intact ``(end_offset, payload)`` records of a segment from ``start``.
+
+        Returns:
+            The records, or None while another process still writes the
+            segment
+        """
+        path = self._dir / name
+        if self._writer is not None and self._writer[0] == name:
+            # our own segment: stop appending to it so it can be deleted
+            self.close()
+            return list(_decode(path, start))
+        try:
+            file = path.open("rb")
+        except FileNotFoundError:
+            return []
+        with file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            return list(_decode(path, start))
+
+    def _delete(self, name: str) -> None:
+        (self._dir / name).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop the oldest segments while the spool is over its size cap."""
+        segments = self._segments()
+        total = sum(size for _, size in segments)
+        for name, size in segments:
+            if total <= self._max_bytes:
+                break
+            if self._writer is not None and self._writer[0] == name:
+                continue
+            self._delete(name)
+            total -= size
+            self._logger.warning("spool_segment_evicted", segment=name, bytes=size)
+
+    def _load_cursor(self) -> tuple[str, int]:
+        """Read the replay cursor; a missing or corrupt one starts over."""
+        path = self._dir / CURSOR_FILENAME
+        try:
+            data = json.loads(path.read_text())
+            return str(data["segment"]), int(data["offset"])
+        except FileNotFoundError:
+            return "", 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self._logger.warning("spool_cursor_unreadable", error=str(e))
+            return "", 0
+
+    def _save_cursor(self, cursor: tuple[str, int]) -> None:
+        """Persist the replay cursor atomically; failures are only logged."""
+        path = self._dir / CURSOR_FILENAME
+        tmp = path.with_suffix(".tmp")
+        segment, offset = cursor
+        try:
+            tmp.write_text(json.dumps({"segment": segment, "offset": offset}))
+            os.replace(tmp, path)
+        except OSError as e:
+            self._logger.warning("spool_cursor_save_failed", error=str(e))
+
+
+def _decode(path: Path, start: int) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(end_offset, payload)`` of the intact records from ``start``."""
+    data = path.read_bytes()
+    pos = start
+    while pos + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, pos)
+        end = pos + _HEADER.size + length
+        payload = data[pos + _HEADER.size : end]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            get_logger(__name__).warning(
+                "spool_torn_record", segment=path.name, offset=pos
+            )
+            return
+        yield end, payload
+        pos = end
@@ -0,0 +1,224 @@
+"""Write-behind buffer for event-driven InfluxDB writers.
+
+Long-running collectors that write on every device event (the Gardena
+WebSocket daemon) would otherwise send one tiny HTTP request per callback on
+the event-loop path. ``WriteBehindBuffer.write`` only records the points and
+returns; a background task flushes them in one request once ``max_points``
+distinct series are pending or the oldest pending point is ``max_age``
+seconds old, whichever comes first.
+
+Within a flush window, repeated updates of the same series (measurement and
+tag set) collapse into one point: the newest timestamp wins, and fields are
+merged with newer values replacing older ones. Only the latest state of a
+device is written, which is what the periodic refresh persists anyway.
+
+If InfluxDB is slower than the event rate, pending series pile up; once
+``max_pending`` are buffered, writers wait for a flush (backpressure) instead
+of growing the buffer without bound. Waits, collapsed updates and flush
+outcomes are counted in ``stats`` and can be written as an
+``influxdb_write_buffer`` point.
+
+Call ``close`` on shutdown: it stops the background task and flushes what is
+left.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+from home_monitoring.models.base import MeasurementLike, Point
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.line_protocol import DEFAULT_CHUNK_SIZE
+from home_monitoring.utils.logging import get_logger
+
+METRICS_MEASUREMENT = "influxdb_write_buffer"
+DEFAULT_MAX_AGE = 5.0
+
+SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class WriteBufferStats:
+    """Counters of one buffer since it was created."""
+
+    # points handed to ``write``
+    received: int = 0
+    # points merged into a pending point of the same series
+    collapsed: int = 0
+    # points written to InfluxDB (after collapsing)
+    flushed: int = 0
+    flushes: int = 0
+    # points dropped because their flush raised
+    failed: int = 0
+    # writes that had to wait for a flush because the buffer was full
+    backpressure_waits: int = 0
+    backpressure_seconds: float = 0.0
+    last_flush_seconds: float = 0.0
+
+
+class WriteBehindBuffer:
+    """Batch, collapse and asynchronously flush writes to InfluxDB."""
+
+    def __init__(
+        self,
+        repository: InfluxDBRepository,
+        max_points: int = DEFAULT_CHUNK_SIZE,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_pending: int | None = None,
+    ) -> None:
+        """Initialize the buffer (the flush task starts on the first write).
+
+        Args:
+            repository: Repository the flushes write to
+            max_points: Pending series that trigger a flush
+            max_age: Seconds the oldest pending point may wait for a flush
+            max_pending: Pending series at which writers wait for a flush.
+                Defaults to four times ``max_points``.
+        """
+        self._db = repository
+        self._max_points = max_points
+        self._max_age = max_age
+        self._max_pending = max_pending or 4 * max_points
+        self._logger = get_logger(__name__)
+
+        self._pending: dict[SeriesKey, Point] = {}
+        # monotonic time the oldest pending point was added
+        self._oldest: float | None = None
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self.stats = WriteBufferStats()
+
+    @property
+    def pending(self) -> int:
+        """Number of series waiting for the next flush."""
+        return len(self._pending)
+
+    async def write(self, measurements: Iterable[MeasurementLike]) -> None:
+        """Queue measurements for the next flush.
+
+        Returns right away unless the buffer is full, in which case it waits
+        for a flush. After ``close``, measurements are written immediately.
+
+        Args:
+            measurements: Measurements or points to write
+        """
+        if len(self._pending) >= self._max_pending:
+            start = time.monotonic()
+            await self.flush()
+            self.stats.backpressure_waits += 1
+            self.stats.backpressure_seconds += time.monotonic() - start
+            self._logger.warning(
+                "write_buffer_backpressure",
+                waited_seconds=round(time.monotonic() - start, 3),
+            )
+        was_empty = not self._pending
+        for measurement in measurements:
+            self._add(measurement)
+        if self._closed:
+            await self.flush()
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        if was_empty and self._pending:
+            # opens a flush window
+            self._oldest = time.monotonic()
+            self._wakeup.set()
+        elif len(self._pending) >= self._max_points:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every pending point now.
+
+        A failed flush is logged and its points are dropped: transient
+        outages are already spooled by the repository, and a payload
+        InfluxDB rejected would fail again.
+
+        Returns:
+            Number of points written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch = list(self._pending.values())
+            self._pending = {}
+            self._oldest = None
+            start = time.monotonic()
+            try:
+                await self._db.write_measurements(batch)
+            except Exception as e:
+                self.stats.failed += len(batch)
+                self._logger.error(
+                    "write_buffer_flush_failed", points=len(batch), error=str(e)
+                )
+                return 0
+            self.stats.flushes += 1
+            self.stats.flushed += len(batch)
+            self.stats.last_flush_seconds = time.monotonic() - start
+            return len(batch)
+
+    async def close(self) -> None:
+        """Stop the flush task and write what is still pending."""
+        self._closed = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats_point(self, source: str) -> Point:
+        """Current counters as an ``influxdb_write_buffer`` point.
+
+        Args:
+            source: Writer owning the buffer (e.g. ``gardena``)
+
+        Returns:
+            Point with one field per counter plus ``pending``
+        """
+        return Point(
+            measurement=METRICS_MEASUREMENT,
+            tags={"source": source},
+            fields={**asdict(self.stats), "pending": len(self._pending)},
+            timestamp=datetime.now(UTC),
+        )
+
+    def _add(self, measurement: MeasurementLike) -> None:
+        """Add one point, collapsing it into a pending point of its series."""
+        point = (
+            measurement
+            if isinstance(measurement, Point)
+            else Point.from_measurement(measurement)
+        )
+        key = (point.measurement, tuple(sorted(point.tags.items())))
+        self.stats.received += 1
+        previous = self._pending.get(key)
+        if previous is not None:
+            self.stats.collapsed += 1
+            newer, older = (
+                (point, previous)
+                if point.timestamp >= previous.timestamp
+                else (previous, point)
+            )
+            point = newer._replace(fields={**older.fields, **newer.fields})
+        self._pending[key] = point
+
+    async def _run(self) -> None:
+        """Flush whenever enough series are pending or the oldest is due."""
+        while not self._closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if (
+                not self._closed
+                and self._oldest is not None
+                and len(self._pending) < self._max_points
+            ):
+                delay = self._oldest + self._max_age - time.monotonic()
+                # woken early only when the size threshold is reached
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), max(delay, 0.0))
+                self._wakeup.clear()
+            await self.flush()
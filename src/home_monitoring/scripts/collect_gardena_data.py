@@ -6,6 +6,7 @@ import signal
 import sys
 from signal import Signals
 
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.gardena import GardenaService
 from home_monitoring.utils.logging import configure_logging, get_logger
 
@@ -61,6 +62,7 @@ async def shutdown(service: GardenaService, signal: Signals) -> None:
     """
     print(f"Received exit signal {signal.name}...")
     await service.stop()
+    await close_influxdb_client()
     tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
     [task.cancel() for task in tasks]
     await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,7 +4,9 @@
 import asyncio
 import sys
 
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.sam_digital import SamDigitalService
+from home_monitoring.utils.http import close_http_clients
 from home_monitoring.utils.logging import configure_logging, get_logger
 
 logger = get_logger(__name__)
@@ -24,6 +26,9 @@ async def main() -> int:
     except Exception as exc:  # pragma: no cover - script entry
         logger.error("sam_digital_collection_failed", error=str(exc))
         return 1
+    finally:
+        await close_http_clients()
+        await close_influxdb_client()
     return 0
 
 
@@ -3,15 +3,28 @@
 
 import asyncio
 import sys
-from datetime import UTC, datetime, timedelta
 
 from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.solaredge import SolarEdgeService
+from home_monitoring.utils.http import close_http_clients
 from home_monitoring.utils.logging import configure_logging, get_logger
 
 logger = get_logger(__name__)
 
 
+METERS = ["PRODUCTION", "CONSUMPTION", "SELFCONSUMPTION", "FEEDIN", "PURCHASED"]
+
+
+async def collect_recent(service: SolarEdgeService) -> None:
+    """Collect energy and power details of all meters since the last run.
+
+    Args:
+        service: SolarEdge service used to fetch and store the details
+    """
+    await service.collect_recent(meters=list(METERS))
+
+
 async def main() -> int:
     """Run the data collection.
 
@@ -19,53 +32,17 @@ async def main() -> int:
         Exit code
     """
     configure_logging()
-    service = SolarEdgeService()
     repository = InfluxDBRepository()
-    now = datetime.now(UTC)
+    service = SolarEdgeService(repository=repository)
 
     try:
-        # Collect detailed energy data starting from latest stored timestamp
-        latest_energy = await repository.get_latest_timestamp(
-            "electricity_energy_watthour"
-        )
-        energy_window_start = now - timedelta(days=30)
-        # If no data yet, start at window start; otherwise clamp latest to the window
-        energy_start = max(latest_energy or energy_window_start, energy_window_start)
-        energy_meters = [
-            "PRODUCTION",
-            "CONSUMPTION",
-            "SELFCONSUMPTION",
-            "FEEDIN",
-            "PURCHASED",
-        ]
-
-        await service.collect_and_store_energy_details(
-            start_time=energy_start,
-            end_time=now,
-            time_unit="QUARTER_OF_AN_HOUR",
-            meters=energy_meters,
-        )
-
-        # Collect detailed power data starting from latest stored timestamp
-        latest_power = await repository.get_latest_timestamp("electricity_power_watt")
-        power_window_start = now - timedelta(days=30)
-        power_start = max(latest_power or power_window_start, power_window_start)
-        power_meters = [
-            "PRODUCTION",
-            "CONSUMPTION",
-            "SELFCONSUMPTION",
-            "FEEDIN",
-            "PURCHASED",
-        ]
-
-        await service.collect_and_store_power_details(
-            start_time=power_start,
-            end_time=now,
-            meters=power_meters,
-        )
+        await collect_recent(service)
     except Exception as e:
         logger.error("solaredge_collection_failed", error=str(e))
         return 1
+    finally:
+        await close_http_clients()
+        await close_influxdb_client()
     return 0
 
 
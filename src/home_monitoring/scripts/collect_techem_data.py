@@ -5,6 +5,7 @@ import argparse
 import asyncio
 import sys
 
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.techem import TechemService
 from home_monitoring.services.techem.config import SerialConfig
 from home_monitoring.utils.logging import configure_logging, get_logger
@@ -33,10 +34,15 @@ async def main(args: argparse.Namespace) -> int:
     service = TechemService(serial_config=serial_config)
 
     try:
-        await service.collect_and_store(num_packets=args.serial_num_packets)
+        await service.collect_and_store(
+            num_packets=args.serial_num_packets,
+            expected_meters=args.expected_meter,
+        )
     except Exception as e:
         logger.error("techem_collection_failed", error=str(e))
         return 1
+    finally:
+        await close_influxdb_client()
     return 0
 
 
@@ -64,13 +70,20 @@ def parse_args() -> argparse.Namespace:
         "--serial-num-packets",
         type=int,
         default=5,
-        help="Number of packets to collect",
+        help="Most packets to collect",
+    )
+    parser.add_argument(
+        "--expected-meter",
+        action="append",
+        default=[],
+        metavar="METER_ID",
+        help="Meter ID to wait for (repeatable); stops once all have reported",
     )
     parser.add_argument(
         "--serial-timeout",
         type=int,
         default=300,
-        help="Serial port timeout in seconds",
+        help="Longest wait for meter data in seconds",
     )
     return parser.parse_args()
 
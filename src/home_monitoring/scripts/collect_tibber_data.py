@@ -10,6 +10,7 @@ import argparse
 import asyncio
 import sys
 
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.tibber import TibberService
 from home_monitoring.utils.logging import configure_logging, get_logger
 
@@ -44,6 +45,8 @@ async def main(args: argparse.Namespace) -> int:
             error=str(e),
         )
         return 1
+    finally:
+        await close_influxdb_client()
 
 
 def parse_args() -> argparse.Namespace:
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Run every collector from one long-lived asyncio scheduler.
+
+Replaces the per-collector cron entries: jobs and their crontab-style
+schedules come from conf/collector_daemon.json, and all of them share one
+``Settings``, one InfluxDB client and one HTTP client pool for the lifetime
+of the process. Runs under systemd (home-monitoring-collectors.service).
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import signal
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.config import Settings, get_settings
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
+from home_monitoring.utils.cron import CronSpec
+from home_monitoring.utils.http import (
+    HttpClientRegistry,
+    close_http_clients,
+    get_http_clients,
+)
+from home_monitoring.utils.logging import configure_logging, get_logger
+from home_monitoring.utils.scheduler import Job, JobCallable, Scheduler
+
+logger = get_logger(__name__)
+
+DEFAULT_CONFIG = Path(__file__).resolve().parents[3] / "conf" / "collector_daemon.json"
+
+
+@dataclass
+class JobContext:
+    """Clients shared by every job of the daemon."""
+
+    settings: Settings
+    repository: InfluxDBRepository
+    http_clients: HttpClientRegistry
+
+
+# Services are imported inside their factory so a disabled collector never
+# loads its vendor SDK.
+
+
+def _netatmo(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.services.netatmo import NetatmoService
+
+    service = NetatmoService(
+        settings=ctx.settings,
+        repository=ctx.repository,
+        http_clients=ctx.http_clients,
+    )
+    return service.collect_and_store
+
+
+def _solaredge(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.scripts.collect_solaredge_data import (
+        collect_recent,
+    )
+    from home_monitoring.services.solaredge import SolarEdgeService
+
+    service = SolarEdgeService(
+        settings=ctx.settings,
+        repository=ctx.repository,
+        http_clients=ctx.http_clients,
+    )
+    return lambda: collect_recent(service)
+
+
+def _tankerkoenig(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.services.tankerkoenig import (
+        TankerkoenigService,
+    )
+
+    service = TankerkoenigService(
+        settings=ctx.settings,
+        repository=ctx.repository,
+        cache_dir=options.get("cache_dir"),
+        http_clients=ctx.http_clients,
+    )
+    return service.collect_and_store
+
+
+def _tibber(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.services.tibber import TibberService
+
+    kwargs = {"user_agent": options["user_agent"]} if "user_agent" in options else {}
+    service = TibberService(settings=ctx.settings, repository=ctx.repository, **kwargs)
+    return service.collect_and_store
+
+
+def _sam_digital(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.services.sam_digital import (
+        SamDigitalService,
+    )
+
+    service = SamDigitalService(
+        settings=ctx.settings,
+        repository=ctx.repository,
+        http_clients=ctx.http_clients,
+    )
+    return service.collect_and_store
+
+
+def _techem(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.services.techem import TechemService
+    from home_monitoring.services.techem.config import (
+        SerialConfig,
+    )
+
+    service = TechemService(
+        settings=ctx.settings,
+        repository=ctx.repository,
+        serial_config=SerialConfig(
+            **{
+                key: options[key]
+                for key in ("port", "baudrate", "timeout")
+                if key in options
+            }
+        ),
+    )
+    num_packets = int(options.get("num_packets", 5))
+    expected_meters = [str(m) for m in options.get("expected_meters", [])]
+    return lambda: service.collect_and_store(
+        num_packets=num_packets, expected_meters=expected_meters
+    )
+
+
+def _healthcheck(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    from home_monitoring.scripts.healthcheck import (
+        DEFAULT_CONFIG as HEALTHCHECK_CONFIG,
+    )
+    from home_monitoring.scripts.healthcheck import (
+        DEFAULT_STATE as HEALTHCHECK_STATE,
+    )
+    from home_monitoring.services.healthcheck import (
+        AlertStore,
+        FreshnessConfig,
+        HealthcheckService,
+    )
+
+    config_path = Path(options.get("config", HEALTHCHECK_CONFIG))
+    store = AlertStore(Path(options.get("state_file", HEALTHCHECK_STATE)))
+
+    async def run() -> None:
+        # re-read per run so SLA edits apply without a restart
+        service = HealthcheckService(
+            config=FreshnessConfig.load(config_path),
+            store=store,
+            settings=ctx.settings,
+            repository=ctx.repository,
+        )
+        sent = await service.run()
+        logger.info("healthcheck_done", notifications_sent=sent)
+
+    return run
+
+
+def _influxdb_spool(ctx: JobContext, options: dict[str, Any]) -> JobCallable:
+    # writes replay a little of the backlog themselves; this drains the rest
+    return ctx.repository.replay_spool
+
+
+JOB_FACTORIES: dict[str, Callable[[JobContext, dict[str, Any]], JobCallable]] = {
+    "netatmo": _netatmo,
+    "solaredge": _solaredge,
+    "tankerkoenig": _tankerkoenig,
+    "tibber": _tibber,
+    "sam_digital": _sam_digital,
+    "techem": _techem,
+    "healthcheck": _healthcheck,
+    "influxdb_spool": _influxdb_spool,
+}
+
+
+def _deferred(build: Callable[[], JobCallable]) -> JobCallable:
+    """Build a job on its first run and keep it for later runs.
+
+    A service may fail to construct (e.g. missing credentials or config);
+    building it inside the run turns that into a failed run that is retried
+    on the next tick instead of a daemon that cannot start.
+    """
+    built: list[JobCallable] = []
+
+    async def run() -> object:
+        if not built:
+            built.append(build())
+        return await built[0]()
+
+    return run
+
+
+def load_jobs(path: Path, ctx: JobContext) -> list[Job]:
+    """Build the configured jobs.
+
+    The file maps job names to ``{"schedule": "<crontab>", ...options}``;
+    jobs missing from the file (or with ``"enabled": false``) do not run.
+
+    Args:
+        path: Path to the JSON job configuration
+        ctx: Clients shared by the jobs
+
+    Returns:
+        Jobs ready to be scheduled
+
+    Raises:
+        ValidationError: If a job name or schedule is invalid
+    """
+    data = json.loads(path.read_text())
+    jobs = []
+    for name, entry in data.get("jobs", {}).items():
+        options = dict(entry)
+        if not options.pop("enabled", True):
+            continue
+        factory = JOB_FACTORIES.get(name)
+        if factory is None:
+            raise ValidationError("Unknown collector job", details={"job": name})
+        if "schedule" not in options:
+            raise ValidationError(
+                "Collector job has no schedule", details={"job": name}
+            )
+        schedule = CronSpec.parse(options.pop("schedule"))
+        run = _deferred(functools.partial(factory, ctx, options))
+        jobs.append(Job(name=name, schedule=schedule, run=run))
+    return jobs
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Run the scheduler until SIGTERM/SIGINT.
+
+    Args:
+        args: Command line arguments
+
+    Returns:
+        Exit code
+    """
+    configure_logging()
+    settings = get_settings()
+    repository = InfluxDBRepository(settings=settings)
+    ctx = JobContext(
+        settings=settings,
+        repository=repository,
+        http_clients=get_http_clients(settings),
+    )
+
+    try:
+        jobs = load_jobs(Path(args.config), ctx)
+        scheduler = Scheduler(jobs, repository=repository)
+        if args.run_once:
+            await asyncio.gather(*(scheduler.run_once(job) for job in jobs))
+            failed = any(stats.failures for stats in scheduler.stats.values())
+            return 1 if failed else 0
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, scheduler.stop)
+        await scheduler.run_forever()
+    except Exception as e:
+        logger.error("collector_daemon_failed", error=str(e))
+        return 1
+    finally:
+        await close_http_clients()
+        await close_influxdb_client()
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run all collectors on their schedules in one process",
+    )
+    parser.add_argument(
+        "--config",
+        default=str(DEFAULT_CONFIG),
+        help=f"Path to the job configuration JSON (default: {DEFAULT_CONFIG})",
+    )
+    parser.add_argument(
+        "--run-once",
+        action="store_true",
+        help="Run every enabled job once and exit (smoke test)",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -11,6 +11,7 @@ import asyncio
 import sys
 from pathlib import Path
 
+from home_monitoring.repositories.influxdb_pool import close_influxdb_client
 from home_monitoring.services.healthcheck import (
     AlertStore,
     FreshnessConfig,
@@ -46,6 +47,8 @@ async def main(args: argparse.Namespace) -> int:
     except Exception as e:
         logger.error("healthcheck_script_failed", error=str(e))
         return 1
+    finally:
+        await close_influxdb_client()
 
 
 def parse_args() -> argparse.Namespace:
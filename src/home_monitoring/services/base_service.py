@@ -1,27 +1,42 @@
 """Base service implementation.
 
-Provides shared initialization for settings, repository, and logger.
+Provides shared initialization for settings, repository, HTTP clients, and
+logger, and the watermark helpers of incremental collectors.
 """
 
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
 from importlib import import_module
+from typing import TYPE_CHECKING
 
 from home_monitoring.config import Settings, get_settings
 from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.services.watermarks import (
+    WATERMARK_FILENAME,
+    FetchWindow,
+    WatermarkStore,
+    plan_window,
+)
 from home_monitoring.utils.logging import get_logger
 from structlog.stdlib import BoundLogger
 
+if TYPE_CHECKING:
+    from home_monitoring.utils.http import HttpClientRegistry
+
 
 class BaseService:
     """Common base class for services.
 
     This class centralizes initialization of application settings,
-    InfluxDB repository, and the structured logger.
+    InfluxDB repository, the shared HTTP client pool, and the structured
+    logger.
     """
 
     def __init__(
         self,
         settings: Settings | None = None,
         repository: InfluxDBRepository | None = None,
+        http_clients: "HttpClientRegistry | None" = None,
     ) -> None:
         """Initialize core service dependencies.
 
@@ -29,6 +44,8 @@ class BaseService:
             settings: Application settings. If not provided, loaded from env.
             repository: InfluxDB repository. If not provided, created with
                 the effective settings.
+            http_clients: Pooled HTTP clients. If not provided, the
+                process-wide registry is used.
         """
         self._settings: Settings = settings or get_settings()
 
@@ -41,5 +58,120 @@ class BaseService:
             repo_cls = getattr(module, "InfluxDBRepository", InfluxDBRepository)
             self._db = repo_cls(settings=self._settings)
 
+        # resolved on first use: services without HTTP calls (SDK-based ones)
+        # never import httpx
+        self._http_clients = http_clients
+        self._watermark_store: WatermarkStore | None = None
+
         # Use the concrete service module name for log scoping
         self._logger: BoundLogger = get_logger(self.__class__.__module__)
+
+    @property
+    def _http(self) -> "HttpClientRegistry":
+        """Pooled HTTP clients (the process-wide registry unless injected)."""
+        if self._http_clients is None:
+            from home_monitoring.utils.http import get_http_clients
+
+            self._http_clients = get_http_clients(self._settings)
+        return self._http_clients
+
+    @property
+    def _watermarks(self) -> WatermarkStore:
+        """High-water marks of this service's streams (opened on first use)."""
+        if self._watermark_store is None:
+            self._watermark_store = WatermarkStore(
+                self._settings.state_dir / WATERMARK_FILENAME
+            )
+        return self._watermark_store
+
+    @property
+    def _watermark_namespace(self) -> str:
+        """Key of this service's marks: ``home_monitoring.services.<name>``."""
+        return self.__class__.__module__.rsplit(".", 2)[-2]
+
+    async def _resume_window(  # noqa: PLR0913 - stream, window bounds and clock
+        self,
+        stream: str,
+        *,
+        max_window: timedelta,
+        interval: timedelta,
+        measurement: str | None = None,
+        now: datetime | None = None,
+    ) -> FetchWindow:
+        """Window a stream resumes from, logging gaps since the last run.
+
+        Args:
+            stream: Stream name, unique within the service
+            max_window: Furthest the window reaches back
+            interval: Regular distance between the mark and now
+            measurement: Measurement whose newest stored point seeds the mark
+                when the stream has none yet (e.g. after an upgrade)
+            now: End of the window, defaults to the current time
+
+        Returns:
+            The window to fetch
+        """
+        now = now or datetime.now(UTC)
+        mark = self._watermarks.get(self._watermark_namespace, stream)
+        if mark is None and measurement is not None:
+            mark = await self._db.get_latest_timestamp(measurement)
+        window = plan_window(mark, now, max_window, interval)
+        if window.gap:
+            log = self._logger.warning if window.truncated else self._logger.info
+            log(
+                "collection_gap_detected",
+                stream=stream,
+                watermark=window.watermark,
+                gap_seconds=window.gap.total_seconds(),
+                resume_from=window.start,
+                truncated=window.truncated,
+            )
+        return window
+
+    def _advance_watermark(self, mark: datetime, *streams: str) -> None:
+        """Record that ``streams`` are stored up to ``mark`` and persist it."""
+        for stream in streams:
+            self._watermarks.advance(self._watermark_namespace, stream, mark)
+        self._watermarks.save()
+
+    async def _fetch_since(  # noqa: PLR0913 - stream, fetch and window bounds
+        self,
+        stream: str,
+        fetch: Callable[[datetime, datetime], Awaitable[datetime | None]],
+        *,
+        max_window: timedelta,
+        interval: timedelta,
+        measurement: str | None = None,
+        now: datetime | None = None,
+    ) -> FetchWindow:
+        """Fetch and store a stream from where the last run stopped.
+
+        ``fetch`` stores the window and returns the new mark, i.e. the point
+        the next run should resume from (or None to keep the current one).
+        The mark only advances once ``fetch`` returned, so a failed run is
+        retried from the same point.
+
+        Args:
+            stream: Stream name, unique within the service
+            fetch: Stores ``[start, end)`` and returns the new mark
+            max_window: Furthest the window reaches back
+            interval: Regular distance between the mark and now
+            measurement: Measurement seeding a missing mark (see
+                ``_resume_window``)
+            now: End of the window, defaults to the current time
+
+        Returns:
+            The window that was fetched
+        """
+        window = await self._resume_window(
+            stream,
+            max_window=max_window,
+            interval=interval,
+            measurement=measurement,
+            now=now,
+        )
+        if window.start < window.end:
+            mark = await fetch(window.start, window.end)
+            if mark is not None:
+                self._advance_watermark(mark, stream)
+        return window
@@ -1,5 +1,15 @@
-"""Gardena service package."""
+"""Gardena service package.
 
-from .service import GardenaService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import GardenaService
 
 __all__ = ["GardenaService"]
+
+__getattr__ = lazy_exports(__name__, {"GardenaService": "service"})
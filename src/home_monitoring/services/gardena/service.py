@@ -3,14 +3,19 @@
 import asyncio
 from collections.abc import Callable
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from home_monitoring.config import Settings
 from home_monitoring.core.mappers.gardena import GardenaMapper
 from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.write_buffer import WriteBehindBuffer
 from home_monitoring.services.base_service import BaseService
+from home_monitoring.utils.lazy import lazy_import
 
-from gardena.smart_system import SmartSystem
+if TYPE_CHECKING:
+    from gardena import smart_system
+else:
+    smart_system = lazy_import("gardena.smart_system")
 
 
 class GardenaService(BaseService):
@@ -44,12 +49,19 @@ class GardenaService(BaseService):
                 "GARDENA_EMAIL, and GARDENA_PASSWORD environment variables."
             )
 
-        self._smart_system = SmartSystem(
+        self._smart_system = smart_system.SmartSystem(
             client_id=self._settings.gardena_application_id,
             client_secret=self._settings.gardena_application_secret,
         )
         self._callbacks: list[tuple[str, Callable[..., Any]]] = []
         self._ws_task: asyncio.Task[None] | None = None
+        # WebSocket bursts and the periodic refresh queue here instead of
+        # sending one write per device callback
+        self._buffer = WriteBehindBuffer(
+            self._db,
+            max_points=self._settings.influxdb_write_buffer_max_points,
+            max_age=self._settings.influxdb_write_buffer_max_age,
+        )
 
     async def start(self) -> None:
         """Start the Gardena service and connect to devices."""
@@ -99,17 +111,34 @@ class GardenaService(BaseService):
         The WebSocket keeps device objects up to date with no extra API calls;
         re-writing them on a fixed cadence gives InfluxDB a regular heartbeat
         (for the dashboard and freshness monitoring) even when nothing changed.
+        The write buffer's counters are persisted alongside.
         """
         for device in self._supported_devices():
             await self._handle_device_update(device)
+        await self._buffer.write([self._buffer.stats_point("gardena")])
+
+    async def flush(self) -> int:
+        """Write buffered device updates now.
+
+        Returns:
+            Number of points written
+        """
+        return await self._buffer.flush()
 
     async def stop(self) -> None:
-        """Stop the Gardena service and disconnect from devices."""
+        """Stop the Gardena service and disconnect from devices.
+
+        Device updates still buffered are written before returning, even if
+        disconnecting fails.
+        """
         self._logger.info("stopping_gardena_service")
-        await self._smart_system.quit()
+        try:
+            await self._smart_system.quit()
+        finally:
+            await self._buffer.close()
 
     async def _handle_device_update(self, device: Any) -> None:
-        """Handle device updates and store data in InfluxDB.
+        """Handle device updates and queue their data for InfluxDB.
 
         Args:
             device: Gardena device that was updated
@@ -129,7 +158,7 @@ class GardenaService(BaseService):
                 "writing_device_data",
                 measurements=measurements,
             )
-            await self._db.write_measurements(measurements)
+            await self._buffer.write(measurements)
         except Exception as e:
             self._logger.error(
                 "failed_to_handle_device_update",
@@ -1,11 +1,19 @@
-"""Freshness healthcheck service."""
+"""Freshness healthcheck service.
 
-from home_monitoring.services.healthcheck.notifier import TelegramNotifier
-from home_monitoring.services.healthcheck.service import (
-    AlertStore,
-    FreshnessConfig,
-    HealthcheckService,
-)
+Members are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from home_monitoring.services.healthcheck.notifier import TelegramNotifier
+    from home_monitoring.services.healthcheck.service import (
+        AlertStore,
+        FreshnessConfig,
+        HealthcheckService,
+    )
 
 __all__ = [
     "AlertStore",
@@ -13,3 +21,13 @@ __all__ = [
     "HealthcheckService",
     "TelegramNotifier",
 ]
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "AlertStore": "service",
+        "FreshnessConfig": "service",
+        "HealthcheckService": "service",
+        "TelegramNotifier": "notifier",
+    },
+)
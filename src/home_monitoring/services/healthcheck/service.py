@@ -199,10 +199,28 @@ class HealthcheckService(BaseService):
         return names
 
     async def _check_measurements(self, measurements: list[str], now: datetime) -> int:
-        """Check each measurement and send alerts/recoveries as needed."""
+        """Check each measurement and send alerts/recoveries as needed.
+
+        The newest timestamps come from the repository's freshness index, so
+        a pass where everything is fresh costs no freshness query. The
+        repository already asks InfluxDB about measurements the index does not
+        know; anything reported stale is confirmed with one more batched scan,
+        since other writers (ioBroker) bypass the index.
+        """
         sent = 0
+        latest_by_measurement = await self._db.get_latest_timestamps(measurements)
+        suspects = [
+            name
+            for name in measurements
+            if (latest := latest_by_measurement.get(name)) is not None
+            and now - latest > self._config.sla_for(name)
+        ]
+        if suspects:
+            latest_by_measurement.update(
+                await self._db.get_latest_timestamps(suspects, use_index=False)
+            )
         for measurement in measurements:
-            latest = await self._db.get_latest_timestamp(measurement)
+            latest = latest_by_measurement.get(measurement)
             sla = self._config.sla_for(measurement)
             stale = latest is None or now - latest > sla
 
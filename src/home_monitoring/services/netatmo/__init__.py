@@ -1,5 +1,15 @@
-"""Netatmo service package."""
+"""Netatmo service package.
 
-from .service import NetatmoService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import NetatmoService
 
 __all__ = ["NetatmoService"]
+
+__getattr__ = lazy_exports(__name__, {"NetatmoService": "service"})
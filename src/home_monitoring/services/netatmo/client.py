@@ -0,0 +1,314 @@
+"""Async Netatmo weather station API client.
+
+Talks to the Netatmo REST API through the shared httpx clients instead of
+the synchronous ``lnetatmo`` library, so requests never block the event loop
+and Netatmo can run alongside other collectors in one process.
+
+OAuth tokens are cached in ``state_dir/netatmo_token.json`` and reused until
+shortly before they expire, so a run does not re-authenticate. Netatmo
+rotates the refresh token on every refresh; the new one is persisted right
+away, and refreshes take an ``flock`` so two collector processes never
+redeem the same refresh token.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from home_monitoring.core.exceptions import APIError
+from home_monitoring.utils.http import (
+    HttpClientRegistry,
+    get_http_clients,
+    request_with_retries,
+)
+from home_monitoring.utils.logging import get_logger
+from structlog.stdlib import BoundLogger
+
+TOKEN_URL = "https://api.netatmo.com/oauth2/token"
+API_BASE_URL = "https://api.netatmo.com/api"
+STATIONS_URL = f"{API_BASE_URL}/getstationsdata"
+MEASURE_URL = f"{API_BASE_URL}/getmeasure"
+
+TOKEN_FILENAME = "netatmo_token.json"
+# refresh this many seconds before the access token expires
+TOKEN_EXPIRY_MARGIN = 60.0
+# Netatmo answers requests with an expired or revoked access token with these
+UNAUTHORIZED_STATUS = frozenset({401, 403})
+
+
+@dataclass(frozen=True)
+class NetatmoToken:
+    """OAuth token pair with the access token's expiry (epoch seconds)."""
+
+    access_token: str
+    refresh_token: str
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        """Whether the access token is expired or about to expire."""
+        return time.time() >= self.expires_at - TOKEN_EXPIRY_MARGIN
+
+
+class TokenCache:
+    """OAuth tokens persisted between runs, readable by the owner only."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: JSON file holding the token pair
+        """
+        self.path = path
+        self._logger = get_logger(__name__)
+
+    def load(self) -> NetatmoToken | None:
+        """Cached token pair; None if missing or unreadable."""
+        try:
+            data: Any = json.loads(self.path.read_text())
+            return NetatmoToken(
+                access_token=str(data["access_token"]),
+                refresh_token=str(data["refresh_token"]),
+                expires_at=float(data["expires_at"]),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self._logger.warning("netatmo_token_cache_unreadable", error=str(e))
+            return None
+
+    def store(self, token: NetatmoToken) -> None:
+        """Persist a token pair atomically.
+
+        Failures are logged, not raised: the pair is still used by this
+        process, and the next process refreshes again.
+        """
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "access_token": token.access_token,
+                        "refresh_token": token.refresh_token,
+                        "expires_at": token.expires_at,
+                    },
+                    f,
+                )
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self._logger.warning("netatmo_token_cache_not_saved", error=str(e))
+
+
+class NetatmoClient:
+    """Client for the Netatmo weather station API."""
+
+    def __init__(  # noqa: PLR0913 - credentials, token cache and HTTP pool
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str | None,
+        token_path: Path,
+        http_clients: HttpClientRegistry | None = None,
+    ) -> None:
+        """Initialize the client (no request is made until first use).
+
+        Args:
+            client_id: Netatmo app client id
+            client_secret: Netatmo app client secret
+            refresh_token: Configured refresh token, used until a rotated
+                one is cached
+            token_path: File caching the token pair between runs
+            http_clients: Pooled HTTP clients. If None, the process-wide ones.
+        """
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._refresh_token = refresh_token
+        self._cache = TokenCache(token_path)
+        self._http = http_clients or get_http_clients()
+        self._logger: BoundLogger = get_logger(__name__)
+        self._token: NetatmoToken | None = None
+        self._refresh_lock = asyncio.Lock()
+
+    async def get_stations_data(self) -> list[dict[str, Any]]:
+        """Get every station with its modules and latest dashboard data.
+
+        Returns:
+            Station mappings (``_id``, ``type``, ``module_name``,
+            ``dashboard_data``, ``modules``)
+
+        Raises:
+            APIError: If the request fails or the response is invalid
+        """
+        body = await self._get(STATIONS_URL, {})
+        devices = body.get("devices") if isinstance(body, dict) else None
+        if not isinstance(devices, list):
+            raise APIError("Invalid Netatmo stations response")
+        return devices
+
+    async def get_measure(  # noqa: PLR0913 - mirrors the getmeasure parameters
+        self,
+        device_id: str,
+        module_id: str | None,
+        types: Sequence[str],
+        date_begin: int,
+        date_end: int,
+        scale: str = "max",
+    ) -> dict[str, list[Any]]:
+        """Get recorded readings of a station or module.
+
+        Args:
+            device_id: Station id
+            module_id: Module id, None for the station itself
+            types: Measure types, e.g. ``("Temperature", "Humidity")``
+            date_begin: First epoch second to return
+            date_end: Last epoch second to return
+            scale: Resolution (``max`` is every recorded reading)
+
+        Returns:
+            Epoch seconds (as strings) to one value per type
+
+        Raises:
+            APIError: If the request fails or the response is invalid
+        """
+        params = {
+            "device_id": device_id,
+            "scale": scale,
+            "type": ",".join(types),
+            "date_begin": str(date_begin),
+            "date_end": str(date_end),
+            "optimize": "false",
+            "real_time": "false",
+        }
+        if module_id is not None:
+            params["module_id"] = module_id
+        body = await self._get(MEASURE_URL, params)
+        if body in ([], None):
+            # no readings in the window
+            return {}
+        if not isinstance(body, dict):
+            raise APIError("Invalid Netatmo measure response")
+        return body
+
+    async def _get(self, url: str, params: dict[str, str]) -> Any:
+        """GET an API endpoint and return the response ``body``.
+
+        A request rejected for its access token is retried once with a
+        refreshed token.
+        """
+        stale: str | None = None
+        for _ in range(2):
+            access_token = await self._access_token(stale)
+            try:
+                client = await self._http.client_for(url)
+                response = await request_with_retries(
+                    client,
+                    "GET",
+                    url,
+                    params=params,
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
+                if response.status_code in UNAUTHORIZED_STATUS and stale is None:
+                    stale = access_token
+                    continue
+                response.raise_for_status()
+                return response.json()["body"]
+            except Exception as e:
+                self._logger.error(
+                    "netatmo_api_request_failed",
+                    endpoint=url.rsplit("/", 1)[-1],
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+                raise APIError("Netatmo API request failed") from e
+        raise APIError("Netatmo API rejected the refreshed access token")
+
+    async def _access_token(self, stale: str | None = None) -> str:
+        """A valid access token, refreshed if needed.
+
+        Args:
+            stale: Access token the API just rejected; it is refreshed even
+                if it has not expired yet
+        """
+        token = self._token
+        if token is not None and not token.expired and token.access_token != stale:
+            return token.access_token
+        async with self._refresh_lock:
+            self._cache.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._cache.path.with_suffix(".lock").open("a") as lock:
+                # another process may hold the lock for a whole refresh
+                await asyncio.to_thread(fcntl.flock, lock, fcntl.LOCK_EX)
+                token = self._cache.load() or self._token
+                if token is None or token.expired or token.access_token == stale:
+                    token = await self._refresh(token)
+                    self._cache.store(token)
+        self._token = token
+        return token.access_token
+
+    async def _refresh(self, current: NetatmoToken | None) -> NetatmoToken:
+        """Redeem a refresh token for a new token pair.
+
+        The cached (rotated) refresh token is tried first; if Netatmo rejects
+        it, the configured one is tried, e.g. after it was regenerated.
+
+        The request is never retried: Netatmo rotates the refresh token on
+        every redeem, so if it handled a request whose response was lost, a
+        retry would redeem a revoked token. A transport error therefore fails
+        the refresh and the next run tries again.
+
+        Raises:
+            APIError: If no refresh token is available or all are rejected
+        """
+        candidates = [current.refresh_token] if current else []
+        if self._refresh_token and self._refresh_token not in candidates:
+            candidates.append(self._refresh_token)
+        if not candidates:
+            raise APIError(
+                "Missing Netatmo refresh token. Please set NETATMO_REFRESH_TOKEN."
+            )
+
+        client = await self._http.client_for(TOKEN_URL)
+        error: Exception | None = None
+        for refresh_token in candidates:
+            try:
+                response = await request_with_retries(
+                    client,
+                    "POST",
+                    TOKEN_URL,
+                    retries=0,
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": refresh_token,
+                        "client_id": self._client_id,
+                        "client_secret": self._client_secret,
+                    },
+                )
+                response.raise_for_status()
+                data = response.json()
+                token = NetatmoToken(
+                    access_token=str(data["access_token"]),
+                    refresh_token=str(data.get("refresh_token") or refresh_token),
+                    expires_at=time.time() + float(data["expires_in"]),
+                )
+            except Exception as e:
+                self._logger.warning(
+                    "netatmo_token_refresh_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+                error = e
+                if isinstance(e, httpx.TransportError):
+                    # the token may have been redeemed; don't redeem another
+                    break
+                continue
+            self._logger.info("netatmo_token_refreshed")
+            return token
+        raise APIError("Netatmo authentication failed") from error
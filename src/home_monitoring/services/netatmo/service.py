@@ -1,14 +1,22 @@
 """Netatmo weather station service implementation."""
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-import lnetatmo
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
 from home_monitoring.core.mappers.netatmo import NetatmoMapper
+from home_monitoring.models.base import Measurement
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
+from home_monitoring.services.netatmo.client import TOKEN_FILENAME, NetatmoClient
+from home_monitoring.utils.http import HttpClientRegistry
+
+# a run later than this after the previous one left a gap that is filled in
+# from ``getmeasure`` (modules report every 5-10 minutes)
+HISTORY_INTERVAL = timedelta(minutes=15)
+# ``getmeasure`` returns at most 1024 rows, about 3.5 days at full resolution
+HISTORY_MAX_WINDOW = timedelta(days=3)
 
 
 class NetatmoService(BaseService):
@@ -18,64 +26,63 @@ class NetatmoService(BaseService):
         self,
         settings: Settings | None = None,
         repository: InfluxDBRepository | None = None,
+        http_clients: HttpClientRegistry | None = None,
+        client: NetatmoClient | None = None,
     ) -> None:
         """Initialize the service.
 
+        No request is made here; the first collection authenticates (or
+        reuses the cached token).
+
         Args:
             settings: Application settings. If not provided, loaded from env.
             repository: InfluxDB repository. If not provided, created.
+            http_clients: Pooled HTTP clients. If not provided, shared ones.
+            client: Netatmo API client. If not provided, created.
+
+        Raises:
+            ValueError: If required credentials are missing.
         """
-        super().__init__(settings=settings, repository=repository)
-
-        # Validate required credentials for new lnetatmo library
-        if not all(
-            [
-                self._settings.netatmo_client_id,
-                self._settings.netatmo_client_secret,
-            ]
-        ):
+        super().__init__(
+            settings=settings, repository=repository, http_clients=http_clients
+        )
+
+        client_id = self._settings.netatmo_client_id
+        client_secret = self._settings.netatmo_client_secret
+        if not client_id or not client_secret:
             raise ValueError(
                 "Missing Netatmo credentials. Please set NETATMO_CLIENT_ID, "
                 "NETATMO_CLIENT_SECRET, and NETATMO_REFRESH_TOKEN "
                 "environment variables."
             )
-
-        # Initialize authentication with lnetatmo using environment variables
-        # The lnetatmo library will automatically use NETATMO_REFRESH_TOKEN
-        # from environment if not passed directly
-        try:
-            self._auth = lnetatmo.ClientAuth(
-                clientId=self._settings.netatmo_client_id,
-                clientSecret=self._settings.netatmo_client_secret,
-                refreshToken=self._settings.netatmo_refresh_token,
-            )
-            self._api = lnetatmo.WeatherStationData(self._auth)
-        except lnetatmo.AuthFailure as e:
-            raise ValueError(
-                f"Netatmo authentication failed: {e}. "
-                "You may need to generate a refresh token. "
-                "See https://github.com/philippelt/netatmo-api-python"
-            ) from e
-        except Exception as e:
-            raise ValueError(f"Failed to initialize Netatmo API: {e}") from e
+        self._client = client or NetatmoClient(
+            client_id=client_id,
+            client_secret=client_secret,
+            refresh_token=self._settings.netatmo_refresh_token,
+            token_path=self._settings.state_dir / TOKEN_FILENAME,
+            http_clients=self._http,
+        )
 
     async def collect_and_store(self) -> None:
         """Collect weather station data and store in InfluxDB."""
         self._logger.info("collecting_weather_data")
 
-        if not await self._get_data():
+        devices_data = await self._client.get_stations_data()
+        if not devices_data:
             raise APIError("Netatmo API request failed")
 
         timestamp = datetime.now(UTC)
-        # Get device data from lnetatmo API
-        devices_data = self._get_devices_data()
         measurements = NetatmoMapper.to_measurements(timestamp, devices_data)
+        history, streams = await self._collect_history(devices_data, timestamp)
+        measurements.extend(history)
 
         try:
             await self._db.write_measurements(measurements)
+            self._advance_watermark(timestamp, *streams)
             self._logger.info(
                 "netatmo_data_stored",
                 point_count=len(measurements),
+                history_point_count=len(history),
             )
         except Exception as e:
             self._logger.error(
@@ -86,65 +93,57 @@ class NetatmoService(BaseService):
             )
             raise
 
-    async def _get_data(self) -> bool:
-        """Get data from Netatmo API using lnetatmo library.
+    async def _collect_history(
+        self, devices_data: list[dict[str, Any]], now: datetime
+    ) -> tuple[list[Measurement], list[str]]:
+        """Fill gaps since the previous run from ``getmeasure``.
 
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            self._logger.debug("calling_lnetatmo_api")
-            # Log authentication details (without sensitive info)
-            self._logger.debug(
-                "lnetatmo_auth_info",
-                has_client_id=bool(getattr(self._auth, "clientId", None)),
-                has_client_secret=bool(getattr(self._auth, "clientSecret", None)),
-                has_access_token=bool(getattr(self._auth, "accessToken", None)),
-            )
+        Every station and module has its own watermark: the time of the last
+        run whose data was stored. Only a run that comes later than
+        ``HISTORY_INTERVAL`` asks for the readings in between, so regular
+        runs cost no extra API calls. A module whose history request fails
+        keeps its watermark and is retried on the next run.
 
-            # The lnetatmo library handles authentication automatically
-            # Access data, which will trigger auth if needed
-            stations = self._api.stations
-            self._logger.debug(
-                "lnetatmo_api_result",
-                station_count=len(stations) if stations else 0,
-                has_access_token_after=bool(getattr(self._auth, "accessToken", None)),
-            )
-            return len(stations) > 0 if stations else False
-        except lnetatmo.AuthFailure as e:
-            self._logger.error(
-                "failed_to_get_weather_data",
-                error=f"Authentication failed: {e!s}",
-                error_type="AuthFailure",
-                suggestion="Netatmo authentication failed. You may need to "
-                "generate a refresh token or check your client credentials. "
-                "See https://github.com/philippelt/netatmo-api-python",
-            )
-            return False
-        except Exception as e:
-            self._logger.error(
-                "failed_to_get_weather_data",
-                error=str(e),
-                error_type=type(e).__name__,
-                suggestion="Check network connectivity and Netatmo API status.",
-            )
-            return False
+        Args:
+            devices_data: Stations with their modules
+            now: Time of the current run
 
-    def _get_devices_data(self) -> list[dict[str, Any]]:
-        """Get device data in format compatible with NetatmoMapper.
         Returns:
-            List of device data compatible with the existing mapper
+            Measurements of the missed readings, and the streams whose
+            watermark may advance to ``now`` once they are stored
         """
-        try:
-            # Convert lnetatmo station data to format expected by mapper
-            devices_data = []
-            for station_id in self._api.stations:
-                station_data = self._api.stationById(station_id)
-                if station_data:
-                    devices_data.append(station_data)
-            return devices_data
-        except Exception as e:
-            self._logger.error(
-                "failed_to_get_devices_data", error=str(e), error_type=type(e).__name__
-            )
-            return []
+        measurements: list[Measurement] = []
+        streams: list[str] = []
+        for station in devices_data:
+            for device in [station, *station.get("modules", [])]:
+                types = NetatmoMapper.MEASURE_TYPES.get(device.get("type", ""))
+                if not types or "_id" not in device:
+                    continue
+                stream = f"measure:{device['_id']}"
+                window = await self._resume_window(
+                    stream,
+                    max_window=HISTORY_MAX_WINDOW,
+                    interval=HISTORY_INTERVAL,
+                    now=now,
+                )
+                if window.gap:
+                    try:
+                        body = await self._client.get_measure(
+                            device_id=station["_id"],
+                            module_id=None if device is station else device["_id"],
+                            types=types,
+                            date_begin=int(window.start.timestamp()) + 1,
+                            date_end=int(now.timestamp()),
+                        )
+                    except APIError as e:
+                        self._logger.warning(
+                            "netatmo_history_request_failed",
+                            device_id=device["_id"],
+                            error=str(e),
+                        )
+                        continue
+                    measurements.extend(
+                        NetatmoMapper.history_to_measurements(device, types, body)
+                    )
+                streams.append(stream)
+        return measurements, streams
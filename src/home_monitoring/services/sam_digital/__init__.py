@@ -1,5 +1,15 @@
-"""Sam Digital service package."""
+"""Sam Digital service package.
 
-from .service import SamDigitalService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import SamDigitalService
 
 __all__ = ["SamDigitalService"]
+
+__getattr__ = lazy_exports(__name__, {"SamDigitalService": "service"})
@@ -9,7 +9,7 @@ from home_monitoring.core.exceptions import APIError
 from home_monitoring.core.mappers.sam_digital import SamDigitalMapper
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
-from home_monitoring.utils.http import make_async_client, request_with_retries
+from home_monitoring.utils.http import HttpClientRegistry, request_with_retries
 
 
 class SamDigitalService(BaseService):
@@ -19,6 +19,7 @@ class SamDigitalService(BaseService):
         self,
         settings: Settings | None = None,
         repository: InfluxDBRepository | None = None,
+        http_clients: HttpClientRegistry | None = None,
         base_url: str = "https://komdat.sam-digital.net/api/public/v1",
     ) -> None:
         """Initialize the service.
@@ -26,12 +27,15 @@ class SamDigitalService(BaseService):
         Args:
             settings: Application settings. If not provided, loaded from env.
             repository: InfluxDB repository. If not provided, created.
+            http_clients: Pooled HTTP clients. If not provided, shared ones.
             base_url: Base URL of the Sam Digital API.
 
         Raises:
             ValueError: If the required API key is missing.
         """
-        super().__init__(settings=settings, repository=repository)
+        super().__init__(
+            settings=settings, repository=repository, http_clients=http_clients
+        )
         self._base_url = base_url.rstrip("/")
 
         api_key = self._settings.sam_digital_api_key
@@ -58,12 +62,10 @@ class SamDigitalService(BaseService):
         }
 
         try:
-            async with make_async_client() as client:
-                response = await request_with_retries(
-                    client, "GET", url, headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = await self._http.client_for(url)
+            response = await request_with_retries(client, "GET", url, headers=headers)
+            response.raise_for_status()
+            data = response.json()
         except Exception as exc:  # pragma: no cover - network issues
             self._logger.error(
                 "sam_digital_api_request_failed",
@@ -1,5 +1,15 @@
-"""SolarEdge service package."""
+"""SolarEdge service package.
 
-from .service import SolarEdgeService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import SolarEdgeService
 
 __all__ = ["SolarEdgeService"]
+
+__getattr__ = lazy_exports(__name__, {"SolarEdgeService": "service"})
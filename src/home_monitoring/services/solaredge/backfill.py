@@ -0,0 +1,152 @@
+"""Chunk planning and resumable progress for SolarEdge backfills.
+
+SolarEdge limits how long a window may be per request (one month at
+QUARTER_OF_AN_HOUR/HOUR resolution, one year at DAY) and how many requests a
+site may make per day. A long gap is therefore split into short chunks that
+are fetched and written one by one; a JSON checkpoint under the state
+directory records how far the backfill got and how much of today's quota is
+used, so a crash or an exhausted quota resumes where it stopped.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+CHECKPOINT_FILENAME = "solaredge_backfill.json"
+
+# longest window SolarEdge accepts per time unit ("one month" is kept at 28
+# days so February windows stay legal too)
+MAX_WINDOW = {
+    "QUARTER_OF_AN_HOUR": timedelta(days=28),
+    "HOUR": timedelta(days=28),
+    "DAY": timedelta(days=365),
+}
+
+
+@dataclass(frozen=True)
+class BackfillResult:
+    """Outcome of one backfill run.
+
+    ``frontier`` is the end of the contiguous range written by this run
+    (None if no chunk was written).
+    """
+
+    points: int
+    chunks: int
+    skipped_chunks: int
+    frontier: datetime | None = None
+
+
+def chunk_length(time_unit: str, chunk_days: int) -> timedelta:
+    """Window per request: the configured length, capped at the API limit.
+
+    Args:
+        time_unit: SolarEdge time unit of the request
+        chunk_days: Configured chunk length in days
+
+    Returns:
+        Length of each chunk
+    """
+    limit = MAX_WINDOW.get(time_unit, MAX_WINDOW["QUARTER_OF_AN_HOUR"])
+    return min(timedelta(days=max(1, chunk_days)), limit)
+
+
+def plan_chunks(
+    start: datetime, end: datetime, length: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Split ``[start, end)`` into consecutive windows of at most ``length``.
+
+    Args:
+        start: Start of the gap
+        end: End of the gap
+        length: Maximum window length
+
+    Returns:
+        Chunk windows in chronological order (empty if ``start >= end``)
+    """
+    chunks = []
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + length, end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+    return chunks
+
+
+class BackfillCheckpoint:
+    """File-backed backfill frontier per stream and daily request count."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the checkpoint.
+
+        Args:
+            path: JSON file holding the checkpoint between runs
+        """
+        self._path = path
+        self._state: dict[str, Any] = {}
+        if path.exists():
+            try:
+                state = json.loads(path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                # a corrupt checkpoint only costs a re-fetch; start fresh
+                logger.warning(
+                    "solaredge_checkpoint_unreadable", path=str(path), error=str(e)
+                )
+            else:
+                self._state = state if isinstance(state, dict) else {}
+
+    def frontier(self, stream: str) -> datetime | None:
+        """End of the contiguous range already written for ``stream``."""
+        raw = self._state.get("frontier", {}).get(stream)
+        try:
+            return datetime.fromisoformat(raw) if raw else None
+        except (TypeError, ValueError):
+            return None
+
+    def set_frontier(self, stream: str, frontier: datetime) -> None:
+        """Record that everything before ``frontier`` has been written.
+
+        The frontier only moves forward: re-collecting an older window (e.g.
+        an explicit ``collect_and_store_*_details`` call) must not make the
+        next regular run re-fetch everything since that window.
+        """
+        current = self.frontier(stream)
+        if current is not None and current >= frontier:
+            return
+        self._state.setdefault("frontier", {})[stream] = frontier.isoformat()
+
+    def requests_on(self, day: date) -> int:
+        """Number of API requests recorded on ``day``."""
+        quota = self._state.get("quota", {})
+        used: int = quota.get("used", 0) if quota.get("day") == day.isoformat() else 0
+        return used
+
+    def record_request(self, day: date) -> None:
+        """Count one API request against ``day``'s quota."""
+        self._state["quota"] = {
+            "day": day.isoformat(),
+            "used": self.requests_on(day) + 1,
+        }
+
+    def save(self) -> None:
+        """Persist the checkpoint atomically.
+
+        A failed write is logged, not raised: losing the checkpoint only
+        means the next run re-fetches data that is already stored.
+        """
+        tmp = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self._state, indent=2))
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning(
+                "solaredge_checkpoint_not_saved", path=str(self._path), error=str(e)
+            )
@@ -1,14 +1,39 @@
 """SolarEdge service implementation."""
 
-from datetime import UTC, datetime
-from typing import Any
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
 
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
-from home_monitoring.core.mappers.solaredge import SolarEdgeMapper
+from home_monitoring.core.mappers.solaredge import SolarEdgeDetailsMerger
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
-from home_monitoring.utils.http import make_async_client, request_with_retries
+from home_monitoring.services.solaredge.backfill import (
+    CHECKPOINT_FILENAME,
+    BackfillCheckpoint,
+    BackfillResult,
+    chunk_length,
+    plan_chunks,
+)
+from home_monitoring.services.watermarks import align
+from home_monitoring.utils.http import HttpClientRegistry, stream_with_retries
+from home_monitoring.utils.json_stream import JsonEventParser
+
+# endpoint names used in request failure logs
+ENDPOINT_LOG_NAMES = {
+    "energyDetails": "energy_details",
+    "powerDetails": "power_details",
+}
+
+# never resume further back than this on a regular run
+RECENT_WINDOW = timedelta(days=30)
+QUARTER_HOUR = timedelta(minutes=15)
+
+
+def _resume_point(result: BackfillResult) -> datetime | None:
+    """Start of the quarter hour containing the written frontier."""
+    return align(result.frontier, QUARTER_HOUR) if result.frontier else None
 
 
 class SolarEdgeService(BaseService):
@@ -18,17 +43,21 @@ class SolarEdgeService(BaseService):
         self,
         settings: Settings | None = None,
         repository: InfluxDBRepository | None = None,
+        http_clients: HttpClientRegistry | None = None,
     ) -> None:
         """Initialize the service.
 
         Args:
             settings: Application settings. If not provided, loaded from env.
             repository: InfluxDB repository. If not provided, created.
+            http_clients: Pooled HTTP clients. If not provided, shared ones.
 
         Raises:
             ValueError: If required credentials are missing.
         """
-        super().__init__(settings=settings, repository=repository)
+        super().__init__(
+            settings=settings, repository=repository, http_clients=http_clients
+        )
 
         # Validate required credentials (narrowed copies for typed use)
         api_key = self._settings.solaredge_api_key
@@ -40,15 +69,65 @@ class SolarEdgeService(BaseService):
             )
         self._api_key: str = api_key
         self._site_id: str = site_id
+        self._checkpoint = BackfillCheckpoint(
+            self._settings.state_dir / CHECKPOINT_FILENAME
+        )
+
+    async def _store_details(self, root: str, params: dict[str, str]) -> int:
+        """Stream one details response into InfluxDB.
+
+        The body is parsed incrementally and merged into per-time rows while
+        it downloads (see ``SolarEdgeDetailsMerger``), then written as
+        columnar batches, so neither the decoded payload nor per-row
+        measurement objects are ever held in memory.
+
+        Args:
+            root: Endpoint and response root element (``energyDetails`` or
+                ``powerDetails``).
+            params: Query parameters without the API key.
+
+        Returns:
+            Number of points written.
+
+        Raises:
+            APIError: If the API request fails or response format is invalid.
+        """
+        url = f"https://monitoringapi.solaredge.com/site/{self._site_id}/{root}"
+        merger = SolarEdgeDetailsMerger(root)
+        parser = JsonEventParser(materialize=[merger.value_prefix])
+        try:
+            client = await self._http.client_for(url)
+            async with stream_with_retries(
+                client, "GET", url, params={"api_key": self._api_key, **params}
+            ) as response:
+                response.raise_for_status()
+                async for text in response.aiter_text():
+                    merger.feed(parser.feed(text))
+            merger.feed(parser.close())
+            if not merger.found_root:
+                raise APIError("Invalid response format")
+        except Exception as e:
+            self._logger.error(
+                "solaredge_api_request_failed",
+                endpoint=ENDPOINT_LOG_NAMES[root],
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            raise APIError("SolarEdge API request failed") from e
 
-    async def _get_energy_details(
+        batches = list(merger.batches(site_id=self._site_id))
+        if batches:
+            await self._db.write_measurements(batches)
+        return sum(len(batch) for batch in batches)
+
+    async def _store_energy_details(
         self,
         start_time: datetime,
         end_time: datetime,
         time_unit: str,
         meters: list[str] | None = None,
-    ) -> dict[str, Any]:
-        """Get detailed energy data from SolarEdge energyDetails API.
+    ) -> int:
+        """Store detailed energy data from the SolarEdge energyDetails API.
 
         Args:
             start_time: Start of the interval to query.
@@ -57,39 +136,19 @@ class SolarEdgeService(BaseService):
             meters: Optional list of meter types to request.
 
         Returns:
-            Energy details response data.
+            Number of points written.
 
         Raises:
             APIError: If the API request fails or response format is invalid.
         """
-        url = (
-            "https://monitoringapi.solaredge.com/site/" f"{self._site_id}/energyDetails"
-        )
         params: dict[str, str] = {
-            "api_key": self._api_key,
             "timeUnit": time_unit,
             "startTime": start_time.strftime("%Y-%m-%d %H:%M:%S"),
             "endTime": end_time.strftime("%Y-%m-%d %H:%M:%S"),
         }
         if meters:
             params["meters"] = ",".join(meters)
-
-        try:
-            async with make_async_client() as client:
-                response = await request_with_retries(client, "GET", url, params=params)
-                response.raise_for_status()
-                data: dict[str, Any] = response.json()
-                if "energyDetails" not in data:
-                    raise APIError("Invalid response format")
-                return data
-        except Exception as e:
-            self._logger.error(
-                "solaredge_api_request_failed",
-                endpoint="energy_details",
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            raise APIError("SolarEdge API request failed") from e
+        return await self._store_details("energyDetails", params)
 
     async def collect_and_store_energy_details(
         self,
@@ -97,13 +156,17 @@ class SolarEdgeService(BaseService):
         end_time: datetime,
         time_unit: str,
         meters: list[str] | None = None,
-    ) -> None:
+    ) -> BackfillResult:
         """Collect energy details from SolarEdge and store in InfluxDB.
 
         This uses the /energyDetails endpoint to retrieve detailed energy
         data for the requested meters and writes them as
         electricity_energy_watthour measurements with fields FeedIn,
-        SelfConsumption, Purchased, Consumption, and Production.
+        SelfConsumption, Purchased, Consumption, and Production. Long
+        windows are backfilled in chunks (see ``_backfill``).
+
+        Returns:
+            Points stored and how far the window was written
         """
         self._logger.info(
             "collecting_solaredge_energy_details",
@@ -114,35 +177,29 @@ class SolarEdgeService(BaseService):
             meters=meters,
         )
 
-        try:
-            energy_details = await self._get_energy_details(
-                start_time,
-                end_time,
-                time_unit,
-                meters,
-            )
-            measurements = SolarEdgeMapper.to_measurements(
-                datetime.now(UTC),
-                energy_details,
-                site_id=str(self._settings.solaredge_site_id),
+        async def store(chunk_start: datetime, chunk_end: datetime) -> int:
+            return await self._store_energy_details(
+                chunk_start, chunk_end, time_unit, meters
             )
 
-            self._logger.info(
-                "energy_details_measurements_created",
-                measurement_count=len(measurements),
+        try:
+            result = await self._backfill(
+                f"energy_details:{time_unit}", store, start_time, end_time, time_unit
             )
 
-            if not measurements:
+            if not result.points and result.chunks:
                 raise APIError(
                     "No SolarEdge energy details measurements created",
                 )
 
-            await self._db.write_measurements(measurements)
             self._logger.info(
                 "solaredge_energy_details_stored",
-                point_count=len(measurements),
+                point_count=result.points,
+                chunks=result.chunks,
+                skipped_chunks=result.skipped_chunks,
                 site_id=self._settings.solaredge_site_id,
             )
+            return result
         except Exception as e:
             self._logger.error(
                 "solaredge_energy_details_collection_failed",
@@ -152,13 +209,13 @@ class SolarEdgeService(BaseService):
             )
             raise
 
-    async def _get_power_details(
+    async def _store_power_details(
         self,
         start_time: datetime,
         end_time: datetime,
         meters: list[str] | None = None,
-    ) -> dict[str, Any]:
-        """Get detailed power data from SolarEdge powerDetails API.
+    ) -> int:
+        """Store detailed power data from the SolarEdge powerDetails API.
 
         Args:
             start_time: Start of the interval to query.
@@ -166,52 +223,36 @@ class SolarEdgeService(BaseService):
             meters: Optional list of meter types to request.
 
         Returns:
-            Power details response data.
+            Number of points written.
 
         Raises:
             APIError: If the API request fails or response format is invalid.
         """
-        url = (
-            "https://monitoringapi.solaredge.com/site/" f"{self._site_id}/powerDetails"
-        )
         params: dict[str, str] = {
-            "api_key": self._api_key,
             "startTime": start_time.strftime("%Y-%m-%d %H:%M:%S"),
             "endTime": end_time.strftime("%Y-%m-%d %H:%M:%S"),
             "timeUnit": "QUARTER_OF_AN_HOUR",
         }
         if meters:
             params["meters"] = ",".join(meters)
-
-        try:
-            async with make_async_client() as client:
-                response = await request_with_retries(client, "GET", url, params=params)
-                response.raise_for_status()
-                data: dict[str, Any] = response.json()
-                if "powerDetails" not in data:
-                    raise APIError("Invalid response format")
-                return data
-        except Exception as e:
-            self._logger.error(
-                "solaredge_api_request_failed",
-                endpoint="power_details",
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            raise APIError("SolarEdge API request failed") from e
+        return await self._store_details("powerDetails", params)
 
     async def collect_and_store_power_details(
         self,
         start_time: datetime,
         end_time: datetime,
         meters: list[str] | None = None,
-    ) -> None:
+    ) -> BackfillResult:
         """Collect power details from SolarEdge and store in InfluxDB.
 
         This uses the /powerDetails endpoint to retrieve quarter-hour
         resolution power data for the requested meters and writes them as
         electricity_power_watt measurements with fields FeedIn,
-        SelfConsumption, Purchased, Consumption, and Production.
+        SelfConsumption, Purchased, Consumption, and Production. Long
+        windows are backfilled in chunks (see ``_backfill``).
+
+        Returns:
+            Points stored and how far the window was written
         """
         self._logger.info(
             "collecting_solaredge_power_details",
@@ -221,30 +262,27 @@ class SolarEdgeService(BaseService):
             meters=meters,
         )
 
-        try:
-            power_details = await self._get_power_details(start_time, end_time, meters)
-            measurements = SolarEdgeMapper.to_measurements(
-                datetime.now(UTC),
-                power_details,
-                site_id=str(self._settings.solaredge_site_id),
-            )
+        async def store(chunk_start: datetime, chunk_end: datetime) -> int:
+            return await self._store_power_details(chunk_start, chunk_end, meters)
 
-            self._logger.info(
-                "power_details_measurements_created",
-                measurement_count=len(measurements),
+        try:
+            result = await self._backfill(
+                "power_details", store, start_time, end_time, "QUARTER_OF_AN_HOUR"
             )
 
-            if not measurements:
+            if not result.points and result.chunks:
                 raise APIError(
                     "No SolarEdge power details measurements created",
                 )
 
-            await self._db.write_measurements(measurements)
             self._logger.info(
                 "solaredge_power_details_stored",
-                point_count=len(measurements),
+                point_count=result.points,
+                chunks=result.chunks,
+                skipped_chunks=result.skipped_chunks,
                 site_id=self._settings.solaredge_site_id,
             )
+            return result
         except Exception as e:
             self._logger.error(
                 "solaredge_power_details_collection_failed",
@@ -253,3 +291,145 @@ class SolarEdgeService(BaseService):
                 site_id=self._settings.solaredge_site_id,
             )
             raise
+
+    async def collect_recent(
+        self, meters: list[str] | None = None, now: datetime | None = None
+    ) -> None:
+        """Collect energy and power details since the last stored quarter hour.
+
+        Each stream resumes from its watermark (seeded from the newest stored
+        point on the first run), at most ``RECENT_WINDOW`` back. The mark
+        advances to the start of the newest, possibly incomplete, quarter
+        hour, which the next run fetches again.
+
+        Args:
+            meters: Meter types to request
+            now: End of the collection window, defaults to the current time
+        """
+        time_unit = "QUARTER_OF_AN_HOUR"
+
+        async def energy(start_time: datetime, end_time: datetime) -> datetime | None:
+            result = await self.collect_and_store_energy_details(
+                start_time=start_time,
+                end_time=end_time,
+                time_unit=time_unit,
+                meters=meters,
+            )
+            return _resume_point(result)
+
+        async def power(start_time: datetime, end_time: datetime) -> datetime | None:
+            result = await self.collect_and_store_power_details(
+                start_time=start_time, end_time=end_time, meters=meters
+            )
+            return _resume_point(result)
+
+        await self._fetch_since(
+            f"energy_details:{time_unit}",
+            energy,
+            max_window=RECENT_WINDOW,
+            interval=QUARTER_HOUR,
+            measurement="electricity_energy_watthour",
+            now=now,
+        )
+        await self._fetch_since(
+            "power_details",
+            power,
+            max_window=RECENT_WINDOW,
+            interval=QUARTER_HOUR,
+            measurement="electricity_power_watt",
+            now=now,
+        )
+
+    async def _backfill(  # noqa: PLR0913 - stream, store callback and window
+        self,
+        stream: str,
+        store: Callable[[datetime, datetime], Awaitable[int]],
+        start_time: datetime,
+        end_time: datetime,
+        time_unit: str,
+    ) -> BackfillResult:
+        """Fetch a window in API-legal chunks and store each chunk.
+
+        Chunks run with bounded concurrency and each one is streamed into
+        the repository as it arrives, so at most a few chunks are held in
+        memory. The checkpoint frontier advances over the contiguous prefix
+        of written chunks; a later run restarts from there if it lies before
+        the requested start. Chunks beyond today's request quota are left
+        for the next run.
+
+        Args:
+            stream: Checkpoint key of the data stream
+            store: Fetches and stores one chunk window, returning its points
+            start_time: Start of the window to collect
+            end_time: End of the window to collect
+            time_unit: SolarEdge time unit (bounds the chunk length)
+
+        Returns:
+            Number of points stored, chunks fetched, and chunks skipped
+
+        Raises:
+            Exception: The first chunk failure, after all other chunks ran
+        """
+        frontier = self._checkpoint.frontier(stream)
+        if frontier is not None and frontier < start_time:
+            self._logger.info(
+                "solaredge_backfill_resumed",
+                stream=stream,
+                frontier=frontier,
+                requested_start=start_time,
+            )
+            start_time = frontier
+
+        chunks = plan_chunks(
+            start_time,
+            end_time,
+            chunk_length(time_unit, self._settings.solaredge_backfill_chunk_days),
+        )
+        # SolarEdge counts requests per site and day; UTC days approximate it
+        today = datetime.now(UTC).date()
+        budget = self._settings.solaredge_daily_quota
+        budget = max(0, budget - self._checkpoint.requests_on(today))
+        skipped = max(0, len(chunks) - budget)
+        if skipped:
+            self._logger.warning(
+                "solaredge_daily_quota_exhausted",
+                stream=stream,
+                skipped_chunks=skipped,
+                resume_from=chunks[budget][0],
+            )
+            chunks = chunks[:budget]
+
+        semaphore = asyncio.Semaphore(
+            max(1, self._settings.solaredge_max_concurrent_requests)
+        )
+        written = [False] * len(chunks)
+
+        async def run(index: int) -> int:
+            chunk_start, chunk_end = chunks[index]
+            async with semaphore:
+                self._checkpoint.record_request(today)
+                points = await store(chunk_start, chunk_end)
+            written[index] = True
+            done = written.index(False) if False in written else len(written)
+            if done:
+                self._checkpoint.set_frontier(stream, chunks[done - 1][1])
+            self._checkpoint.save()
+            return points
+
+        outcomes = await asyncio.gather(
+            *(run(i) for i in range(len(chunks))), return_exceptions=True
+        )
+        # persist the request count even if every chunk failed
+        self._checkpoint.save()
+
+        points = 0
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            points += outcome
+        return BackfillResult(
+            points=points,
+            chunks=len(chunks),
+            skipped_chunks=skipped,
+            frontier=chunks[-1][1] if chunks else None,
+        )
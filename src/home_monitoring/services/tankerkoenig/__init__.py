@@ -1,5 +1,15 @@
-"""Tankerkoenig service package."""
+"""Tankerkoenig service package.
 
-from .service import TankerkoenigService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import TankerkoenigService
 
 __all__ = ["TankerkoenigService"]
+
+__getattr__ = lazy_exports(__name__, {"TankerkoenigService": "service"})
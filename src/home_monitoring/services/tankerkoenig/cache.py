@@ -0,0 +1,281 @@
+"""Station details cache with a time-to-live.
+
+Station details (name, brand, address) rarely change, but they do change, so
+each entry carries the time it was fetched: entries younger than the TTL are
+used as they are, older ones are still used but refreshed.
+
+Details live in one SQLite file, ``stations.sqlite3`` in the cache
+directory, read in a single query on first use and updated in one
+transaction per run, instead of one small JSON file per station (the former
+layout, imported and removed on first use). Without a directory the cache
+lives in memory only.
+
+The same file holds the watchlists resolved from radius searches: the IDs
+of the stations within a set of search areas and when they were resolved.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.utils.logging import get_logger
+
+DEFAULT_TTL = timedelta(days=7)
+# stations open and close rarely; a radius search every few hours suffices
+DEFAULT_WATCHLIST_TTL = timedelta(hours=6)
+CACHE_FILENAME = "stations.sqlite3"
+# seconds to wait for another process's write transaction
+LOCK_TIMEOUT = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    id TEXT PRIMARY KEY,
+    details TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+_WATCHLIST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlists (
+    areas TEXT PRIMARY KEY,
+    station_ids TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+_UPSERT = (
+    "INSERT INTO stations (id, details, fetched_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    "details = excluded.details, fetched_at = excluded.fetched_at"
+)
+
+
+@dataclass(frozen=True)
+class CachedStation:
+    """Cached details of a station.
+
+    Attributes:
+        details: Station details as returned by ``detail.php``
+        fetched_at: When the details were fetched (epoch seconds)
+    """
+
+    details: dict[str, Any]
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class CachedWatchlist:
+    """Cached result of a radius search.
+
+    Attributes:
+        station_ids: IDs of the stations found
+        fetched_at: When the search ran (epoch seconds)
+    """
+
+    station_ids: tuple[str, ...]
+    fetched_at: float
+
+
+class StationCache:
+    """Station details by station ID, loaded once per process."""
+
+    def __init__(self, directory: Path | None, ttl: timedelta = DEFAULT_TTL):
+        """Initialize the cache (the file is read on first lookup).
+
+        Args:
+            directory: Directory holding the cache file. If None, the cache
+                is kept in memory only.
+            ttl: Age after which an entry is refreshed
+        """
+        self._directory = directory
+        self._ttl = ttl.total_seconds()
+        self._logger = get_logger(__name__)
+        self._entries: dict[str, CachedStation] | None = None
+        self._watchlists: dict[str, CachedWatchlist] = {}
+
+    def get(self, station_id: str) -> CachedStation | None:
+        """Cached details of a station, or None if never cached."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries.get(station_id)
+
+    def is_fresh(self, entry: CachedStation) -> bool:
+        """Whether an entry is younger than the TTL."""
+        return time.time() - entry.fetched_at < self._ttl
+
+    def put_many(self, details: Mapping[str, dict[str, Any]]) -> None:
+        """Store freshly fetched details of stations in one transaction.
+
+        Failures to persist are logged, not raised: the entries are still
+        used by this process, and the next process fetches them again.
+
+        Args:
+            details: Station details by station ID
+        """
+        if not details:
+            return
+        if self._entries is None:
+            self._entries = self._load()
+        now = time.time()
+        entries = {sid: CachedStation(d, now) for sid, d in details.items()}
+        self._entries.update(entries)
+        if self._directory is None:
+            return
+        try:
+            with _connect(self._directory) as db, db:
+                db.executemany(
+                    _UPSERT,
+                    [
+                        (sid, _dumps(entry.details), entry.fetched_at)
+                        for sid, entry in entries.items()
+                    ],
+                )
+        except (OSError, sqlite3.Error) as e:
+            self._logger.error(
+                "failed_to_save_cache",
+                station_ids=sorted(details),
+                error=str(e),
+            )
+
+    def get_watchlist(self, areas: str) -> CachedWatchlist | None:
+        """Cached watchlist of a set of search areas, or None if never cached.
+
+        Args:
+            areas: Key identifying the search areas
+        """
+        watchlist = self._watchlists.get(areas)
+        if watchlist is not None or self._directory is None:
+            return watchlist
+        if not self._directory.is_dir():
+            return None
+        try:
+            with _connect(self._directory) as db:
+                row = db.execute(
+                    "SELECT station_ids, fetched_at FROM watchlists WHERE areas = ?",
+                    (areas,),
+                ).fetchone()
+            if row is None:
+                return None
+            watchlist = CachedWatchlist(
+                tuple(str(sid) for sid in json.loads(row[0])), float(row[1])
+            )
+        except (OSError, sqlite3.Error, ValueError, TypeError) as e:
+            self._logger.error("failed_to_load_watchlist", error=str(e))
+            return None
+        self._watchlists[areas] = watchlist
+        return watchlist
+
+    def put_watchlist(self, areas: str, station_ids: Sequence[str]) -> None:
+        """Store the result of a radius search.
+
+        Failures to persist are logged, not raised, as for station details.
+
+        Args:
+            areas: Key identifying the search areas
+            station_ids: IDs of the stations found
+        """
+        watchlist = CachedWatchlist(tuple(station_ids), time.time())
+        self._watchlists[areas] = watchlist
+        if self._directory is None:
+            return
+        try:
+            with _connect(self._directory) as db, db:
+                db.execute(
+                    "INSERT INTO watchlists (areas, station_ids, fetched_at) "
+                    "VALUES (?, ?, ?) ON CONFLICT (areas) DO UPDATE SET "
+                    "station_ids = excluded.station_ids, "
+                    "fetched_at = excluded.fetched_at",
+                    (areas, json.dumps(watchlist.station_ids), watchlist.fetched_at),
+                )
+        except (OSError, sqlite3.Error) as e:
+            self._logger.error("failed_to_save_watchlist", error=str(e))
+
+    def _load(self) -> dict[str, CachedStation]:
+        """Entries stored in the cache file, after importing legacy files."""
+        directory = self._directory
+        if directory is None or not directory.is_dir():
+            return {}
+        entries: dict[str, CachedStation] = {}
+        try:
+            with _connect(directory) as db:
+                self._migrate(db, directory)
+                rows = db.execute("SELECT id, details, fetched_at FROM stations")
+                for station_id, raw, fetched_at in rows:
+                    try:
+                        entries[station_id] = CachedStation(
+                            json.loads(raw), float(fetched_at)
+                        )
+                    except ValueError as e:
+                        self._logger.error(
+                            "failed_to_load_cache",
+                            station_id=station_id,
+                            error=str(e),
+                        )
+        except (OSError, sqlite3.Error) as e:
+            self._logger.error("failed_to_load_cache", error=str(e))
+        return entries
+
+    def _migrate(self, db: sqlite3.Connection, directory: Path) -> None:
+        """Import per-station JSON files of the former layout, then remove them.
+
+        Only files named after a station UUID and holding that station's
+        details are imported, so other JSON files in the directory (e.g. the
+        collectors' state files) are never touched. The file's modification
+        time becomes the fetch time; an entry already stored with a newer one
+        is kept. Unreadable files are left in place.
+        """
+        legacy = sorted(p for p in directory.glob("*.json") if _is_uuid(p.stem))
+        if not legacy:
+            return
+        rows: list[tuple[str, str, float]] = []
+        for path in legacy:
+            try:
+                details: Any = json.loads(path.read_text())
+                if not isinstance(details, dict) or details.get("id") != path.stem:
+                    # a JSON file that merely has a UUID name
+                    continue
+                rows.append((path.stem, _dumps(details), path.stat().st_mtime))
+            except (OSError, ValueError) as e:
+                self._logger.error(
+                    "failed_to_migrate_cache",
+                    station_id=path.stem,
+                    error=str(e),
+                )
+        if not rows:
+            return
+        with db:
+            db.executemany(
+                _UPSERT + " WHERE excluded.fetched_at > stations.fetched_at", rows
+            )
+        for station_id, _, _ in rows:
+            (directory / f"{station_id}.json").unlink(missing_ok=True)
+        self._logger.info("station_cache_migrated", station_count=len(rows))
+
+
+@contextmanager
+def _connect(directory: Path) -> Iterator[sqlite3.Connection]:
+    """Open the cache file, creating it and its table if needed."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / CACHE_FILENAME
+    with closing(sqlite3.connect(path, timeout=LOCK_TIMEOUT)) as db:
+        db.execute(_SCHEMA)
+        db.execute(_WATCHLIST_SCHEMA)
+        yield db
+
+
+def _is_uuid(name: str) -> bool:
+    """Whether a name is a UUID (the form of Tankerkoenig station IDs)."""
+    try:
+        uuid.UUID(name)
+    except ValueError:
+        return False
+    return True
+
+
+def _dumps(details: dict[str, Any]) -> str:
+    return json.dumps(details, separators=(",", ":"))
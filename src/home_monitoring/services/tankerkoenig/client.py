@@ -1,33 +1,88 @@
-"""Tankerkoenig API client implementation."""
+"""Tankerkoenig API client implementation.
 
-import json
-import os
+Price batches and station details are requested concurrently, bounded by
+``MAX_CONCURRENT_REQUESTS``, so a run over many stations takes about as long
+as its slowest request instead of the sum of all of them.
+
+Stations within search areas are resolved with ``list.php`` at most once per
+watchlist TTL; their prices are then polled with ``prices.php`` like any
+fixed list of stations, ten per request instead of one search per area.
+"""
+
+import asyncio
+import time
 from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
+import httpx
 from home_monitoring.core.exceptions import APIError
-from home_monitoring.utils.http import make_async_client, request_with_retries
+from home_monitoring.services.tankerkoenig.cache import (
+    DEFAULT_TTL,
+    DEFAULT_WATCHLIST_TTL,
+    StationCache,
+)
+from home_monitoring.utils.http import (
+    DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    HttpClientRegistry,
+    get_http_clients,
+    request_with_retries,
+)
 from home_monitoring.utils.logging import get_logger
 from structlog.stdlib import BoundLogger
 
+API_BASE_URL = "https://creativecommons.tankerkoenig.de/json"
+PRICES_URL = f"{API_BASE_URL}/prices.php"
+DETAIL_URL = f"{API_BASE_URL}/detail.php"
+LIST_URL = f"{API_BASE_URL}/list.php"
+
 # prices.php accepts at most 10 station ids per request
 PRICES_BATCH_SIZE = 10
+# requests in flight at once; more would only queue for a pooled connection
+MAX_CONCURRENT_REQUESTS = DEFAULT_MAX_CONNECTIONS_PER_HOST
+# list.php searches at most this far around a point
+MAX_SEARCH_RADIUS_KM = 25.0
+FUELS = ("e5", "e10", "diesel")
+
+
+@dataclass(frozen=True)
+class SearchArea:
+    """Circle searched for stations with ``list.php``."""
+
+    lat: float
+    lng: float
+    radius_km: float
 
 
 class TankerkoenigClient:
     """Client for interacting with Tankerkoenig API."""
 
-    def __init__(self, api_key: str, cache_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        cache_dir: str | None = None,
+        http_clients: HttpClientRegistry | None = None,
+        details_ttl: timedelta = DEFAULT_TTL,
+        watchlist_ttl: timedelta = DEFAULT_WATCHLIST_TTL,
+    ) -> None:
         """Initialize the client.
 
         Args:
             api_key: Tankerkoenig API key
-            cache_dir: Directory to cache station details. If None, disabled.
+            cache_dir: Directory to cache station details. If None, details
+                are only cached for the lifetime of the client.
+            http_clients: Pooled HTTP clients. If None, the process-wide ones.
+            details_ttl: Age after which cached station details are refreshed
+            watchlist_ttl: Age after which search areas are searched again
         """
         self._api_key = api_key
-        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._cache = StationCache(Path(cache_dir) if cache_dir else None, details_ttl)
+        self._http = http_clients or get_http_clients()
         self._logger: BoundLogger = get_logger(__name__)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._watchlist_ttl = watchlist_ttl.total_seconds()
 
     async def get_prices(self, station_ids: Sequence[str]) -> dict[str, Any]:
         """Get current prices for gas stations.
@@ -53,36 +108,17 @@ class TankerkoenigClient:
             station_ids[i : i + PRICES_BATCH_SIZE]
             for i in range(0, len(station_ids), PRICES_BATCH_SIZE)
         ]
+        client = await self._http.client_for(PRICES_URL)
+        results = await asyncio.gather(
+            *(self._get_prices_batch(client, batch) for batch in batches)
+        )
         prices: dict[str, Any] = {}
         failed_batches = 0
-
-        async with make_async_client() as client:
-            for batch in batches:
-                url = (
-                    "https://creativecommons.tankerkoenig.de/json/prices.php"
-                    f"?ids={','.join(batch)}&apikey={self._api_key}"
-                )
-                try:
-                    response = await request_with_retries(client, "GET", url)
-                    response.raise_for_status()
-                    data = response.json()
-                    if not data.get("ok", False):
-                        self._logger.warning(
-                            "gas_prices_batch_not_ok",
-                            station_ids=batch,
-                            message=data.get("message"),
-                        )
-                        failed_batches += 1
-                        continue
-                    prices.update(data.get("prices", {}))
-                except Exception as e:
-                    self._logger.warning(
-                        "failed_to_get_gas_prices_batch",
-                        station_ids=batch,
-                        error=str(e),
-                    )
-                    failed_batches += 1
-                    continue
+        for result in results:
+            if result is None:
+                failed_batches += 1
+            else:
+                prices.update(result)
 
         if failed_batches == len(batches):
             self._logger.error(
@@ -101,6 +137,159 @@ class TankerkoenigClient:
 
         return {"ok": True, "prices": prices}
 
+    async def _get_prices_batch(
+        self, client: httpx.AsyncClient, batch: Sequence[str]
+    ) -> dict[str, Any] | None:
+        """Get the prices of one batch of stations.
+
+        Returns:
+            Prices by station ID, or None if the batch failed (logged)
+        """
+        url = f"{PRICES_URL}?ids={','.join(batch)}&apikey={self._api_key}"
+        try:
+            async with self._semaphore:
+                response = await request_with_retries(client, "GET", url)
+            response.raise_for_status()
+            data = response.json()
+            if not data.get("ok", False):
+                self._logger.warning(
+                    "gas_prices_batch_not_ok",
+                    station_ids=batch,
+                    message=data.get("message"),
+                )
+                return None
+            prices: dict[str, Any] = data.get("prices", {})
+            return prices
+        except Exception as e:
+            self._logger.warning(
+                "failed_to_get_gas_prices_batch",
+                station_ids=batch,
+                error=str(e),
+            )
+            return None
+
+    async def get_watchlist(
+        self, areas: Sequence[SearchArea], force_update: bool = False
+    ) -> list[str]:
+        """Get the IDs of the stations within the search areas.
+
+        The areas are searched only if their cached watchlist is older than
+        the watchlist TTL. The details of the stations found are cached as
+        well, so they need no detail requests. A search that fails in some
+        area is used but not cached; one that fails entirely falls back to
+        the cached watchlist, however old.
+
+        Args:
+            areas: Circles to search
+            force_update: Whether to search even if the watchlist is fresh
+
+        Returns:
+            Station IDs
+
+        Raises:
+            APIError: If the search fails and no watchlist is cached
+        """
+        key = ";".join(f"{a.lat},{a.lng},{a.radius_km}" for a in areas)
+        cached = self._cache.get_watchlist(key)
+        if (
+            cached is not None
+            and not force_update
+            and time.time() - cached.fetched_at < self._watchlist_ttl
+        ):
+            return list(cached.station_ids)
+        try:
+            response = await self.search_stations(areas)
+        except APIError as e:
+            if cached is None:
+                raise
+            self._logger.warning("using_stale_gas_station_watchlist", error=str(e))
+            return list(cached.station_ids)
+
+        stations: dict[str, Any] = response["stations"]
+        self._cache.put_many(stations)
+        if response["complete"]:
+            self._cache.put_watchlist(key, list(stations))
+        self._logger.info("gas_station_watchlist_resolved", station_count=len(stations))
+        return list(stations)
+
+    async def search_stations(self, areas: Sequence[SearchArea]) -> dict[str, Any]:
+        """Get details of every station within the search areas.
+
+        One ``list.php`` request per area. Areas are searched concurrently;
+        a station found in several areas is reported once. Failed areas are
+        logged and skipped.
+
+        Args:
+            areas: Circles to search
+
+        Returns:
+            API response with ``stations`` keyed by station ID, shaped like
+            the ``get_stations_details`` result, and ``complete``, whether
+            every area was searched
+
+        Raises:
+            APIError: If every area fails
+        """
+        self._logger.debug("searching_gas_stations", area_count=len(areas))
+        client = await self._http.client_for(LIST_URL)
+        results = await asyncio.gather(
+            *(self._search_area(client, area) for area in areas)
+        )
+        if areas and all(result is None for result in results):
+            raise APIError("Failed to search stations in all areas")
+
+        stations: dict[str, Any] = {}
+        for result in results:
+            for station in result or []:
+                station_id = station.get("id")
+                if not station_id:
+                    continue
+                # prices are polled with prices.php, not kept with the details
+                stations[station_id] = {
+                    k: v
+                    for k, v in station.items()
+                    if k not in FUELS and k not in ("isOpen", "dist")
+                }
+        return {
+            "ok": True,
+            "stations": stations,
+            "complete": all(result is not None for result in results),
+        }
+
+    async def _search_area(
+        self, client: httpx.AsyncClient, area: SearchArea
+    ) -> list[dict[str, Any]] | None:
+        """Search one area.
+
+        Returns:
+            Stations found, or None if the search failed (logged)
+        """
+        url = (
+            f"{LIST_URL}?lat={area.lat}&lng={area.lng}&rad={area.radius_km}"
+            f"&sort=dist&type=all&apikey={self._api_key}"
+        )
+        try:
+            async with self._semaphore:
+                response = await request_with_retries(client, "GET", url)
+            response.raise_for_status()
+            data = response.json()
+            if not data.get("ok", False):
+                self._logger.warning(
+                    "gas_station_search_not_ok",
+                    area=area,
+                    message=data.get("message"),
+                )
+                return None
+            stations: list[dict[str, Any]] = data.get("stations", [])
+            return stations
+        except Exception as e:
+            self._logger.warning(
+                "failed_to_search_gas_stations",
+                area=area,
+                error=str(e),
+            )
+            return None
+
     async def get_stations_details(
         self,
         station_ids: Sequence[str],
@@ -108,61 +297,78 @@ class TankerkoenigClient:
     ) -> dict[str, Any]:
         """Get details for gas stations.
 
+        Cached details younger than the TTL are used as they are. Stations
+        without cached details, and stale entries, are requested
+        concurrently and cached in one update; a failed refresh keeps the
+        stale entry.
+
         Args:
             station_ids: List of station IDs to get details for
             force_update: Whether to force update from API even if cached
 
         Returns:
             API response with station details
+
+        Raises:
+            APIError: If details of an uncached station cannot be fetched
         """
         self._logger.debug("getting_station_details", station_ids=station_ids)
-        stations = {}
+        stations: dict[str, Any] = {}
+        missing: list[str] = []
+        stale: list[str] = []
 
         for station_id in station_ids:
-            details = await self._get_station_detail(station_id, force_update)
-            if details and details.get("ok", False):
-                stations[station_id] = details.get("station", {})
+            entry = None if force_update else self._cache.get(station_id)
+            if entry is None:
+                missing.append(station_id)
+                continue
+            stations[station_id] = entry.details
+            if not self._cache.is_fresh(entry):
+                stale.append(station_id)
+
+        if stale:
+            self._logger.debug("refreshing_station_details", station_ids=stale)
+        requested = [*missing, *stale]
+        results = await asyncio.gather(
+            *(self._get_station_detail(station_id) for station_id in requested),
+            return_exceptions=True,
+        )
+        errors: list[BaseException] = []
+        fetched: dict[str, dict[str, Any]] = {}
+        for station_id, result in zip(requested, results, strict=True):
+            if isinstance(result, BaseException):
+                if station_id not in stations:
+                    errors.append(result)
+            elif result and result.get("ok", False):
+                fetched[station_id] = result.get("station", {})
+        stations.update(fetched)
+        self._cache.put_many(fetched)
+        if errors:
+            raise errors[0]
 
         return {"ok": True, "stations": stations}
 
-    async def _get_station_detail(
-        self,
-        station_id: str,
-        force_update: bool = False,
-    ) -> dict[str, Any] | None:
-        """Get details for a single gas station.
+    async def _get_station_detail(self, station_id: str) -> dict[str, Any] | None:
+        """Get details for a single gas station from the API.
 
         Args:
             station_id: Station ID to get details for
-            force_update: Whether to force update from API even if cached
 
         Returns:
             API response with station details or None if not found
+
+        Raises:
+            APIError: If the request fails
         """
-        # Try to load from cache first
-        if not force_update and self._cache_dir:
-            cached = self._load_from_cache(station_id)
-            if cached:
-                # Wrap cached station data in same format as API response
-                return {"ok": True, "station": cached}
-
-        # Get from API
-        url = (
-            "https://creativecommons.tankerkoenig.de/json/detail.php"
-            f"?id={station_id}&apikey={self._api_key}"
-        )
+        url = f"{DETAIL_URL}?id={station_id}&apikey={self._api_key}"
 
         try:
-            async with make_async_client() as client:
+            client = await self._http.client_for(url)
+            async with self._semaphore:
                 response = await request_with_retries(client, "GET", url)
-                response.raise_for_status()
-                data: dict[str, Any] = response.json()
-
-                # Cache the response
-                if self._cache_dir and data.get("ok", False):
-                    self._save_to_cache(station_id, data["station"])
-
-                return data
+            response.raise_for_status()
+            data: dict[str, Any] = response.json()
+            return data
 
         except Exception as e:
             self._logger.error(
@@ -171,53 +377,3 @@ class TankerkoenigClient:
                 error=str(e),
             )
             raise APIError("Failed to get station details") from e
-
-    def _load_from_cache(self, station_id: str) -> dict[str, Any] | None:
-        """Load station details from cache.
-
-        Args:
-            station_id: Station ID to load details for
-
-        Returns:
-            Cached station details or None if not found
-        """
-        if not self._cache_dir:
-            return None
-
-        cache_file = self._cache_dir / f"{station_id}.json"
-        if not cache_file.exists():
-            return None
-
-        try:
-            with cache_file.open("r") as f:
-                cached: dict[str, Any] = json.load(f)
-                return cached
-        except Exception as e:
-            self._logger.error(
-                "failed_to_load_cache",
-                station_id=station_id,
-                error=str(e),
-            )
-            return None
-
-    def _save_to_cache(self, station_id: str, data: dict[str, Any]) -> None:
-        """Save station details to cache.
-
-        Args:
-            station_id: Station ID the details belong to
-            data: Station details to cache
-        """
-        if not self._cache_dir:
-            return
-
-        try:
-            os.makedirs(self._cache_dir, exist_ok=True)
-            cache_file = self._cache_dir / f"{station_id}.json"
-            with cache_file.open("w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            self._logger.error(
-                "failed_to_save_cache",
-                station_id=station_id,
-                error=str(e),
-            )
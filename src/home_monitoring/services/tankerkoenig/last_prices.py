@@ -0,0 +1,140 @@
+"""Last written gas price per station and fuel.
+
+Prices change a few times a day, while the collector polls every five
+minutes, so most polls repeat the previous point. ``LastPriceStore`` reduces
+a run's points to the fuels whose price changed since it was last written;
+unchanged fuels are skipped. Every ``keyframe_interval`` a station's full
+point is written regardless, so a time-bounded query always finds a recent
+price, and the stored history is still exact: a price holds until the next
+point.
+
+The last written prices live in ``state_dir/tankerkoenig_prices.json`` so
+cron runs share them; a missing or corrupt file makes the next run write
+every point.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.models.base import Measurement
+from home_monitoring.utils.logging import get_logger
+
+LAST_PRICES_FILENAME = "tankerkoenig_prices.json"
+DEFAULT_KEYFRAME_INTERVAL = timedelta(minutes=30)
+
+# station id -> {"prices": {fuel: price}, "keyframe": epoch seconds}
+Entries = dict[str, dict[str, Any]]
+
+
+class LastPriceStore:
+    """Last written price per station and fuel, kept on disk."""
+
+    def __init__(
+        self, path: Path, keyframe_interval: timedelta = DEFAULT_KEYFRAME_INTERVAL
+    ) -> None:
+        """Initialize the store (the file is read on first use).
+
+        Args:
+            path: JSON file holding the last written prices
+            keyframe_interval: Longest time between two full points of a
+                station
+        """
+        self._path = path
+        self._keyframe_interval = keyframe_interval.total_seconds()
+        self._logger = get_logger(__name__)
+        self._entries: Entries | None = None
+        # entries of points returned by ``changes`` and not yet saved
+        self._pending: Entries = {}
+
+    def changes(
+        self, measurements: Sequence[Measurement], now: datetime
+    ) -> list[Measurement]:
+        """Reduce price points to what changed since they were last written.
+
+        Call ``save`` once the returned points are stored.
+
+        Args:
+            measurements: One ``gas_prices_euro`` point per station
+            now: Time of the run
+
+        Returns:
+            Full points of stations due for a keyframe, points holding only
+            the changed fuels of the other stations; stations without a
+            change are left out
+        """
+        if self._entries is None:
+            self._entries = self._read()
+        result: list[Measurement] = []
+        epoch = now.timestamp()
+        for measurement in measurements:
+            station_id = measurement.tags.get("station_id", "")
+            entry = self._entries.get(station_id)
+            last: dict[str, Any] = entry["prices"] if entry else {}
+            if entry is None or epoch - entry["keyframe"] >= self._keyframe_interval:
+                fields = dict(measurement.fields)
+                keyframe = epoch
+            else:
+                fields = {
+                    fuel: price
+                    for fuel, price in measurement.fields.items()
+                    if last.get(fuel) != price
+                }
+                keyframe = entry["keyframe"]
+            if not fields:
+                continue
+            self._pending[station_id] = {
+                "prices": {**last, **fields},
+                "keyframe": keyframe,
+            }
+            result.append(
+                Measurement(
+                    measurement=measurement.measurement,
+                    tags=measurement.tags,
+                    timestamp=measurement.timestamp,
+                    fields=fields,
+                )
+            )
+        return result
+
+    def save(self) -> None:
+        """Record the points returned by ``changes`` as written.
+
+        Failures are logged, not raised: the next run then writes the same
+        prices again.
+        """
+        if not self._pending or self._entries is None:
+            return
+        self._entries.update(self._pending)
+        self._pending = {}
+        tmp = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self._entries))
+            os.replace(tmp, self._path)
+        except OSError as e:
+            self._logger.warning("tankerkoenig_prices_not_saved", error=str(e))
+
+    def discard(self) -> None:
+        """Forget the points returned by ``changes`` (they were not stored)."""
+        self._pending = {}
+
+    def _read(self) -> Entries:
+        """Entries stored on disk; a missing or corrupt file is empty."""
+        try:
+            data: Any = json.loads(self._path.read_text())
+            return {
+                str(station_id): {
+                    "prices": dict(entry["prices"]),
+                    "keyframe": float(entry["keyframe"]),
+                }
+                for station_id, entry in data.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._logger.warning("tankerkoenig_prices_unreadable", error=str(e))
+            return {}
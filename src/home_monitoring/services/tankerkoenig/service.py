@@ -1,15 +1,30 @@
 """Tankerkoenig service implementation."""
 
+import asyncio
 from collections.abc import Sequence
-from datetime import UTC, datetime
-from typing import ClassVar
+from datetime import UTC, datetime, timedelta
+from typing import Any, ClassVar
 
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
 from home_monitoring.core.mappers.tankerkoenig import TankerkoenigMapper
+from home_monitoring.models.base import Measurement
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
-from home_monitoring.services.tankerkoenig.client import TankerkoenigClient
+from home_monitoring.services.tankerkoenig.client import (
+    MAX_SEARCH_RADIUS_KM,
+    SearchArea,
+    TankerkoenigClient,
+)
+from home_monitoring.services.tankerkoenig.last_prices import (
+    LAST_PRICES_FILENAME,
+    LastPriceStore,
+)
+from home_monitoring.services.tankerkoenig.stats import (
+    STATS_FILENAME,
+    PriceStatsStore,
+)
+from home_monitoring.utils.http import HttpClientRegistry
 
 
 class TankerkoenigService(BaseService):
@@ -40,6 +55,7 @@ class TankerkoenigService(BaseService):
         settings: Settings | None = None,
         repository: InfluxDBRepository | None = None,
         cache_dir: str | None = None,
+        http_clients: HttpClientRegistry | None = None,
     ) -> None:
         """Initialize the service.
 
@@ -47,16 +63,47 @@ class TankerkoenigService(BaseService):
             settings: Application settings. If not provided, loaded from env.
             repository: InfluxDB repository. If not provided, created.
             cache_dir: Directory to cache station details. If None, disabled.
+            http_clients: Pooled HTTP clients. If not provided, shared ones.
         """
-        super().__init__(settings=settings, repository=repository)
+        super().__init__(
+            settings=settings, repository=repository, http_clients=http_clients
+        )
         api_key = self._settings.tankerkoenig_api_key
         if not api_key:
             raise ValueError(
-                "Missing Tankerkoenig credentials. " "Please set TANKERKOENIG_API_KEY."
+                "Missing Tankerkoenig credentials. Please set TANKERKOENIG_API_KEY."
+            )
+        self._search_areas = [
+            SearchArea(lat, lng, radius_km)
+            for lat, lng, radius_km in self._settings.tankerkoenig_search_areas
+        ]
+        if any(
+            not 0 < area.radius_km <= MAX_SEARCH_RADIUS_KM
+            for area in self._search_areas
+        ):
+            raise ValueError(
+                "Invalid TANKERKOENIG_SEARCH_AREAS: the radius must be between "
+                f"0 and {MAX_SEARCH_RADIUS_KM:g} km."
             )
         self._client = TankerkoenigClient(
             api_key=api_key,
             cache_dir=cache_dir,
+            http_clients=self._http,
+        )
+        self._last_prices = (
+            LastPriceStore(
+                self._settings.state_dir / LAST_PRICES_FILENAME,
+                keyframe_interval=timedelta(
+                    minutes=self._settings.tankerkoenig_keyframe_minutes
+                ),
+            )
+            if self._settings.tankerkoenig_write_changes_only
+            else None
+        )
+        self._stats = (
+            PriceStatsStore(self._settings.state_dir / STATS_FILENAME)
+            if self._settings.tankerkoenig_stats
+            else None
         )
 
     async def collect_and_store(
@@ -66,40 +113,33 @@ class TankerkoenigService(BaseService):
     ) -> None:
         """Collect gas station prices and store in InfluxDB.
 
+        Stations are the given ones, else every station within the
+        configured search areas (resolved every few hours), else
+        ``DEFAULT_STATION_IDS``. Unless
+        disabled, only prices that changed since they were last written are
+        stored, plus a periodic full point per station.
+
         Args:
-            station_ids: Station IDs to monitor. If None, uses default list.
+            station_ids: Station IDs to monitor. If None, search areas or the
+                default list are used.
             force_update: Whether to force update details.
         """
-        station_ids = station_ids or self.DEFAULT_STATION_IDS
-        self._logger.info(
-            "collecting_gas_prices",
-            station_count=len(station_ids),
-        )
-
         try:
-            # Get current prices
-            prices_response = await self._client.get_prices(station_ids)
-            if not prices_response.get("ok", False):
-                error_msg = prices_response.get("message", "Unknown error")
-                raise APIError(error_msg)
-
-            # Get station details
-            stations_response = await self._client.get_stations_details(
-                station_ids, force_update
+            if station_ids is None and self._search_areas:
+                station_ids = await self._client.get_watchlist(
+                    self._search_areas, force_update
+                )
+            prices_data, stations_data = await self._get_prices_and_details(
+                self.DEFAULT_STATION_IDS if station_ids is None else station_ids,
+                force_update,
             )
-            if not stations_response.get("ok", False):
-                msg = stations_response.get("message", "Unknown error")
-                raise APIError(msg)
-
-            # Map to InfluxDB measurements
-            timestamp = datetime.now(UTC)
-            prices_data = prices_response.get("prices", {})
-            stations_data = stations_response.get("stations", {})
 
             # Validate we have price data
             if not prices_data:
                 raise APIError("No price data received from Tankerkoenig API")
 
+            # Map to InfluxDB measurements
+            timestamp = datetime.now(UTC)
             combined_data = {
                 "prices": prices_data,
                 "stations": stations_data,
@@ -113,12 +153,7 @@ class TankerkoenigService(BaseService):
                     "All stations may be closed or have invalid prices."
                 )
 
-            # Store in InfluxDB
-            await self._db.write_measurements(measurements)
-            self._logger.info(
-                "gas_prices_stored",
-                point_count=len(measurements),
-            )
+            await self._store(measurements, timestamp)
         except Exception as e:
             self._logger.error(
                 "failed_to_store_gas_prices",
@@ -127,3 +162,94 @@ class TankerkoenigService(BaseService):
                 measurements=(measurements if "measurements" in locals() else None),
             )
             raise
+
+    async def _get_prices_and_details(
+        self, station_ids: Sequence[str], force_update: bool
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Get prices and details of a list of stations.
+
+        Returns:
+            Prices and station details, both keyed by station ID
+        """
+        self._logger.info(
+            "collecting_gas_prices",
+            station_count=len(station_ids),
+        )
+        # Get current prices and station details concurrently
+        prices_response, stations_response = await asyncio.gather(
+            self._client.get_prices(station_ids),
+            self._client.get_stations_details(station_ids, force_update),
+        )
+        if not prices_response.get("ok", False):
+            error_msg = prices_response.get("message", "Unknown error")
+            raise APIError(error_msg)
+
+        if not stations_response.get("ok", False):
+            msg = stations_response.get("message", "Unknown error")
+            raise APIError(msg)
+
+        return prices_response.get("prices", {}), stations_response.get("stations", {})
+
+    async def _store(self, measurements: list[Measurement], now: datetime) -> None:
+        """Write the points, reduced to changed prices unless disabled.
+
+        The price statistics of the stations with a written point (a changed
+        price or a keyframe) are written alongside.
+        """
+        if self._last_prices is None:
+            points = measurements
+        else:
+            points = self._last_prices.changes(measurements, now)
+        stats = await self._update_stats(measurements, points, now)
+        if points or stats:
+            try:
+                await self._db.write_measurements([*points, *stats])
+            except Exception:
+                if self._last_prices is not None:
+                    self._last_prices.discard()
+                raise
+        if self._last_prices is not None:
+            self._last_prices.save()
+        if self._stats is not None:
+            self._stats.save()
+        self._logger.info(
+            "gas_prices_stored",
+            point_count=len(points),
+            unchanged_count=len(measurements) - len(points),
+            stats_point_count=len(stats),
+        )
+
+    async def _update_stats(
+        self,
+        measurements: list[Measurement],
+        points: list[Measurement],
+        now: datetime,
+    ) -> list[Measurement]:
+        """Fold a run's prices into the rolling statistics.
+
+        The first run seeds the statistics from the stored prices; if that
+        fails, it is retried on the next run. Every observed price is folded
+        in, but only stations with a written point are reported, so unchanged
+        stations get fresh statistics with their next keyframe.
+
+        Args:
+            measurements: Every price point of the run
+            points: The price points being written
+            now: Time of the run
+
+        Returns:
+            One ``gas_prices_stats`` point per station in ``points``
+        """
+        if self._stats is None:
+            return []
+        if not self._stats.seeded:
+            try:
+                await self._stats.seed(self._db.query_chunks(self._stats.seed_query))
+            except Exception as e:
+                self._logger.warning(
+                    "gas_prices_stats_seed_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+        self._stats.observe(measurements)
+        return self._stats.to_measurements(now, (m.tags["station_id"] for m in points))
@@ -0,0 +1,299 @@
+"""Rolling gas price statistics per station and fuel.
+
+The dashboard shows min, max and the 20/50/80th percentiles of each fuel's
+price over the last 14 days. Computing them in InfluxDB scans the whole
+window of ``gas_prices_euro`` on every refresh; here they are maintained
+incrementally from the prices each run observes and written as one
+``gas_prices_stats`` point per station.
+
+Each station and fuel keeps a sliding-window histogram: the time the price
+spent at each level within the window, built from the price's segments
+(constant price between two observations). A run extends the current
+segment, or starts a new one on a change, and evicts what fell out of the
+window, so the cost per run is independent of the window length. Statistics
+are time-weighted, which matches percentiles over regularly polled points
+regardless of how sparsely prices are written. A quantile ``q`` is the
+lowest price held for at least ``q`` of the window's time (the ceil rank
+over time, not InfluxQL's rounded ``PERCENTILE`` rank over points), so it
+can differ from the values the dashboard computed from the stored points.
+
+Segments live in ``state_dir/tankerkoenig_stats.json``. On first use the
+window is seeded from ``gas_prices_euro``, so statistics are complete from
+the first run instead of after 14 days.
+"""
+
+import json
+import os
+from collections import deque
+from collections.abc import AsyncIterable, Iterable, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.models.base import Measurement
+from home_monitoring.repositories.query_results import TIME_COLUMN, RowBatch
+from home_monitoring.utils.logging import get_logger
+
+STATS_FILENAME = "tankerkoenig_stats.json"
+STATS_MEASUREMENT = "gas_prices_stats"
+PRICES_MEASUREMENT = "gas_prices_euro"
+FUELS = ("e5", "e10", "diesel")
+STATS_WINDOW = timedelta(days=14)
+# observations further apart than this leave a gap instead of extending the
+# price (covers change-only writes with their keyframes when seeding)
+MAX_GAP = timedelta(hours=2)
+QUANTILES = {"p20": 0.2, "p50": 0.5, "p80": 0.8}
+
+# histogram entries below this many seconds are float residue of evictions
+_EPSILON = 1e-6
+
+
+class PriceWindow:
+    """Time-weighted price histogram of one fuel over a sliding window."""
+
+    def __init__(self, segments: Iterable[Sequence[float]] = ()) -> None:
+        """Initialize the window.
+
+        Args:
+            segments: ``(start, end, price)`` in epoch seconds, oldest first
+        """
+        self._segments: deque[list[float]] = deque()
+        # price -> seconds spent at it within the window
+        self._histogram: dict[float, float] = {}
+        for start, end, price in segments:
+            self._segments.append([start, end, price])
+            self._add(price, end - start)
+
+    @property
+    def segments(self) -> list[list[float]]:
+        """``[start, end, price]`` per segment, oldest first."""
+        return list(self._segments)
+
+    def observe(self, moment: float, price: float) -> None:
+        """Record the price seen at ``moment`` (epoch seconds).
+
+        The previous price is taken to hold until ``moment`` unless the
+        observations are more than ``MAX_GAP`` apart. Observations not newer
+        than the last one are ignored.
+        """
+        last = self._segments[-1] if self._segments else None
+        if last is not None and moment <= last[1]:
+            return
+        if last is not None and moment - last[1] <= MAX_GAP.total_seconds():
+            self._add(last[2], moment - last[1])
+            last[1] = moment
+            if price == last[2]:
+                return
+        self._segments.append([moment, moment, price])
+
+    def evict(self, oldest: float) -> None:
+        """Drop the part of the window before ``oldest`` (epoch seconds)."""
+        while self._segments and self._segments[0][1] < oldest:
+            start, end, price = self._segments.popleft()
+            self._add(price, start - end)
+        if self._segments and self._segments[0][0] < oldest:
+            first = self._segments[0]
+            self._add(first[2], first[0] - oldest)
+            first[0] = oldest
+
+    def stats(self) -> dict[str, float]:
+        """Min, max and quantiles of the window; empty if it has no price.
+
+        A quantile is the lowest price whose cumulative time reaches its
+        share of the window's total time.
+        """
+        if not self._segments:
+            return {}
+        prices = [segment[2] for segment in self._segments]
+        weights = sorted(self._histogram.items())
+        if not weights:
+            # only single observations so far: weigh them equally
+            weights = [(price, 1.0) for price in sorted(prices)]
+        total = sum(weight for _, weight in weights)
+        result = {"min": min(prices), "max": max(prices)}
+        for name, q in QUANTILES.items():
+            target, cumulative = q * total, 0.0
+            for price, weight in weights:
+                cumulative += weight
+                if cumulative >= target - _EPSILON:
+                    result[name] = price
+                    break
+        return result
+
+    def _add(self, price: float, seconds: float) -> None:
+        weight = self._histogram.get(price, 0.0) + seconds
+        if weight > _EPSILON:
+            self._histogram[price] = weight
+        else:
+            self._histogram.pop(price, None)
+
+
+class PriceStatsStore:
+    """Price windows of every station and fuel, kept on disk."""
+
+    def __init__(self, path: Path, window: timedelta = STATS_WINDOW) -> None:
+        """Initialize the store (the file is read on first use).
+
+        Args:
+            path: JSON file holding the windows' segments
+            window: Length of the sliding window
+        """
+        self._path = path
+        self._window = window.total_seconds()
+        self._logger = get_logger(__name__)
+        self._windows: dict[tuple[str, str], PriceWindow] | None = None
+        self._seeded = False
+
+    @property
+    def seeded(self) -> bool:
+        """Whether the windows were seeded from stored prices."""
+        self._load()
+        return self._seeded
+
+    @property
+    def seed_query(self) -> str:
+        """Query for the stored prices within the window (for ``seed``)."""
+        fields = ", ".join(f'"{fuel}"' for fuel in FUELS)
+        return (
+            f'SELECT {fields} FROM "{PRICES_MEASUREMENT}" '
+            f"WHERE time > now() - {int(self._window)}s "
+            'GROUP BY "station_id"'
+        )
+
+    async def seed(self, batches: AsyncIterable[RowBatch]) -> None:
+        """Fill the windows from stored ``gas_prices_euro`` points.
+
+        Args:
+            batches: Result of ``seed_query`` from
+                ``InfluxDBRepository.query_chunks`` (epoch ns, grouped by
+                station, oldest first)
+        """
+        windows: dict[tuple[str, str], PriceWindow] = {}
+        async for batch in batches:
+            station_id = batch.tags.get("station_id")
+            if not station_id:
+                continue
+            times = [t / 1e9 for t in batch.column(TIME_COLUMN)]
+            for fuel in FUELS:
+                if fuel not in batch.columns:
+                    continue
+                for moment, value in zip(times, batch.column(fuel), strict=True):
+                    price = _price(value)
+                    if price is not None:
+                        self._window_of(windows, station_id, fuel).observe(
+                            moment, price
+                        )
+        # replay what was observed before seeding on top of the history
+        for (station_id, fuel), observed in self._load().items():
+            window = self._window_of(windows, station_id, fuel)
+            for start, end, price in observed.segments:
+                window.observe(start, price)
+                window.observe(end, price)
+        self._windows = windows
+        self._seeded = True
+
+    def observe(self, measurements: Sequence[Measurement]) -> None:
+        """Record the prices of a run's ``gas_prices_euro`` points."""
+        windows = self._load()
+        for measurement in measurements:
+            station_id = measurement.tags.get("station_id")
+            if not station_id:
+                continue
+            moment = measurement.timestamp.timestamp()
+            for fuel in FUELS:
+                price = _price(measurement.fields.get(fuel))
+                if price is not None:
+                    self._window_of(windows, station_id, fuel).observe(moment, price)
+
+    def to_measurements(
+        self, timestamp: datetime, station_ids: Iterable[str]
+    ) -> list[Measurement]:
+        """Statistics of the given stations over the window ending now.
+
+        Args:
+            timestamp: Time of the run (end of the window)
+            station_ids: Stations to report
+
+        Returns:
+            One ``gas_prices_stats`` point per station with a price in the
+            window, fields named ``<fuel>_<stat>``
+        """
+        windows = self._load()
+        oldest = timestamp.timestamp() - self._window
+        for window in windows.values():
+            window.evict(oldest)
+        measurements = []
+        for station_id in sorted(set(station_ids)):
+            fields = {
+                f"{fuel}_{name}": value
+                for fuel in FUELS
+                if (fuel_window := windows.get((station_id, fuel))) is not None
+                for name, value in fuel_window.stats().items()
+            }
+            if fields:
+                measurements.append(
+                    Measurement(
+                        measurement=STATS_MEASUREMENT,
+                        tags={"station_id": station_id},
+                        timestamp=timestamp,
+                        fields=fields,
+                    )
+                )
+        return measurements
+
+    def save(self) -> None:
+        """Persist the windows; failures are logged, not raised."""
+        if self._windows is None:
+            return
+        series = {
+            f"{station_id}|{fuel}": window.segments
+            for (station_id, fuel), window in self._windows.items()
+            if window.segments
+        }
+        tmp = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"seeded": self._seeded, "series": series}))
+            os.replace(tmp, self._path)
+        except OSError as e:
+            self._logger.warning("tankerkoenig_stats_not_saved", error=str(e))
+
+    def _load(self) -> dict[tuple[str, str], PriceWindow]:
+        if self._windows is None:
+            self._windows = self._read()
+        return self._windows
+
+    def _read(self) -> dict[tuple[str, str], PriceWindow]:
+        """Windows stored on disk; a missing or corrupt file is empty."""
+        try:
+            data: Any = json.loads(self._path.read_text())
+            windows = {}
+            for key, segments in data["series"].items():
+                station_id, fuel = str(key).rsplit("|", 1)
+                windows[(station_id, fuel)] = PriceWindow(
+                    (float(s), float(e), float(p)) for s, e, p in segments
+                )
+            self._seeded = bool(data["seeded"])
+            return windows
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._logger.warning("tankerkoenig_stats_unreadable", error=str(e))
+            return {}
+
+    @staticmethod
+    def _window_of(
+        windows: dict[tuple[str, str], PriceWindow], station_id: str, fuel: str
+    ) -> PriceWindow:
+        key = (station_id, fuel)
+        window = windows.get(key)
+        if window is None:
+            window = windows[key] = PriceWindow()
+        return window
+
+
+def _price(value: Any) -> float | None:
+    """A price, or None for closed or unsold fuels (0, None or false)."""
+    if isinstance(value, bool) or not isinstance(value, int | float) or value <= 0:
+        return None
+    return float(value)
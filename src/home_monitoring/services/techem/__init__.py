@@ -1,5 +1,15 @@
-"""Techem service package."""
+"""Techem service package.
 
-from .service import TechemService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import TechemService
 
 __all__ = ["TechemService"]
+
+__getattr__ = lazy_exports(__name__, {"TechemService": "service"})
@@ -9,4 +9,5 @@ class SerialConfig:
 
     port: str = "/dev/serial/by-id/usb-SHK_NANO_CUL_868-if00-port0"
     baudrate: int = 38400
+    # longest wait for meter frames (seconds)
     timeout: int = 300
@@ -0,0 +1,115 @@
+"""Non-blocking reader for WMBUS frames from a nanoCUL stick.
+
+pyserial only offers blocking reads, so every call on the port runs in a
+worker thread and the event loop stays free while the stick waits for the
+next radio frame. Reads use a short ``READ_TIMEOUT`` instead of the overall
+wait, so a finished or cancelled collection never leaves a thread blocked
+on the port for minutes.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
+
+from home_monitoring.core.exceptions import APIError
+from home_monitoring.services.techem.config import SerialConfig
+from home_monitoring.utils.lazy import lazy_import
+from home_monitoring.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import serial
+else:
+    serial = lazy_import("serial")
+
+# longest a single read blocks its worker thread
+READ_TIMEOUT = 1.0
+# longest the stick takes to answer a command
+COMMAND_TIMEOUT = 5.0
+# the stick resets when the port is opened
+SETTLE_TIME = 2.0
+
+
+class WmbusReader:
+    """Serial connection to a nanoCUL stick receiving WMBUS frames."""
+
+    def __init__(self, config: SerialConfig, settle_time: float = SETTLE_TIME):
+        """Initialize the reader (the port is opened on entering the context).
+
+        Args:
+            config: Serial port configuration; ``timeout`` bounds how long
+                ``frames`` waits for radio frames
+            settle_time: Seconds to wait after opening the port
+        """
+        self._config = config
+        self._settle_time = settle_time
+        self._logger = get_logger(__name__)
+        self._port: serial.Serial | None = None
+
+    async def __aenter__(self) -> Self:
+        """Open the port and wait for the stick to be ready.
+
+        Raises:
+            APIError: If the port does not open
+        """
+        port = await asyncio.to_thread(
+            serial.Serial,
+            self._config.port,
+            self._config.baudrate,
+            timeout=READ_TIMEOUT,
+        )
+        await asyncio.sleep(self._settle_time)
+        if not port.is_open:
+            raise APIError("Failed to open serial port")
+        self._port = port
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the port."""
+        port, self._port = self._port, None
+        if port is not None and port.is_open:
+            await asyncio.to_thread(port.close)
+
+    async def command(self, command: bytes) -> str:
+        """Send a command and return the stick's answer.
+
+        Args:
+            command: Command line, e.g. ``b"V\\r\\n"``
+
+        Returns:
+            First line of the answer, or an empty string if none arrived
+            within ``COMMAND_TIMEOUT``
+        """
+        port = self._open_port()
+        await asyncio.to_thread(port.write, command)
+        deadline = time.monotonic() + COMMAND_TIMEOUT
+        while time.monotonic() < deadline:
+            line: bytes = await asyncio.to_thread(port.readline)
+            if line:
+                return line.rstrip().decode("utf-8")
+        return ""
+
+    async def frames(self) -> AsyncGenerator[bytes, None]:
+        """Yield raw frames as they arrive, for at most ``config.timeout``.
+
+        Lines are yielded as received (including any line terminator); the
+        caller stops iterating once it has what it needs.
+        """
+        port = self._open_port()
+        deadline = time.monotonic() + self._config.timeout
+        while time.monotonic() < deadline:
+            line = await asyncio.to_thread(port.readline)
+            if line:
+                self._logger.debug("received_packet", data=line)
+                yield line
+
+    def _open_port(self) -> "serial.Serial":
+        if self._port is None:
+            raise RuntimeError("WmbusReader used outside its context")
+        return self._port
@@ -1,15 +1,16 @@
 """Techem service implementation."""
 
-import asyncio
+from collections.abc import Collection
+from contextlib import aclosing
 from datetime import UTC, datetime
 
-import serial
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
 from home_monitoring.core.mappers.techem import TechemMapper
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
 from home_monitoring.services.techem.config import SerialConfig
+from home_monitoring.services.techem.reader import WmbusReader
 
 
 class TechemService(BaseService):
@@ -31,12 +32,18 @@ class TechemService(BaseService):
         super().__init__(settings=settings, repository=repository)
         self._serial_config = serial_config or SerialConfig()
 
-    async def collect_and_store(self, num_packets: int = 5) -> None:
+    async def collect_and_store(
+        self,
+        num_packets: int = 5,
+        expected_meters: Collection[str] = (),
+    ) -> None:
         """Collect meter data and store in InfluxDB.
 
         Args:
-            num_packets: Number of data packets to collect. Should be larger
-                than number of receivable IDs.
+            num_packets: Most frames to receive. Should be larger than the
+                number of receivable meters.
+            expected_meters: IDs of the meters to wait for; reception stops
+                as soon as each of them has reported
         """
         self._logger.info(
             "starting_data_collection",
@@ -46,7 +53,7 @@ class TechemService(BaseService):
 
         try:
             # Get meter data
-            responses = await self._get_meter_data(num_packets)
+            responses = await self._get_meter_data(num_packets, expected_meters)
 
             # Map to InfluxDB measurements
             timestamp = datetime.now(UTC)
@@ -69,62 +76,66 @@ class TechemService(BaseService):
             )
             raise
 
-    async def _get_meter_data(self, num_packets: int) -> list[bytes]:
-        """Get meter data from serial port.
+    async def _get_meter_data(
+        self, num_packets: int, expected_meters: Collection[str] = ()
+    ) -> list[bytes]:
+        """Get the latest frame of every meter heard on the serial port.
+
+        Frames are read as they arrive without blocking the event loop, and
+        only the newest frame per meter ID is kept. Reception ends after
+        ``num_packets`` frames, once every expected meter has reported, or
+        when the configured timeout expires, whichever comes first.
 
         Args:
-            num_packets: Number of packets to collect
+            num_packets: Most frames to receive
+            expected_meters: IDs of the meters to wait for
 
         Returns:
-            List of meter data responses
+            One raw frame per meter
 
         Raises:
             APIError: If the serial port fails or data is invalid
         """
+        expected = frozenset(expected_meters)
+        latest: dict[str, bytes] = {}
+        received = 0
         try:
-            # Initialize serial port
-            ser = serial.Serial(
-                self._serial_config.port,
-                self._serial_config.baudrate,
-                timeout=self._serial_config.timeout,
-            )
-            await asyncio.sleep(2)  # Wait for port to be ready
-
-            if not ser.is_open:
-                raise APIError("Failed to open serial port")
-
-            # Get version info
-            ser.write(b"V\r\n")
-            version = ser.readline().rstrip().decode("utf-8")
-            if not version:
-                raise APIError("Failed to get device version")
-            self._logger.info("device_version", version=version)
-
-            # Set WMBUS mode
-            ser.write(b"brt\r\n")
-            mode = ser.readline().rstrip().decode("utf-8")
-            if not mode:
-                raise APIError("Failed to set WMBUS mode")
-            self._logger.info("wmbus_mode", mode=mode)
-
-            # Collect responses
-            responses = []
-            for _ in range(num_packets):
-                response = ser.readline()
-                if response:
-                    self._logger.debug("received_packet", data=response)
-                    responses.append(response)
-
-            if not responses:
+            async with WmbusReader(self._serial_config) as reader:
+                # Get version info
+                version = await reader.command(b"V\r\n")
+                if not version:
+                    raise APIError("Failed to get device version")
+                self._logger.info("device_version", version=version)
+
+                # Set WMBUS mode
+                mode = await reader.command(b"brt\r\n")
+                if not mode:
+                    raise APIError("Failed to set WMBUS mode")
+                self._logger.info("wmbus_mode", mode=mode)
+
+                # Collect responses
+                async with aclosing(reader.frames()) as frames:
+                    async for frame in frames:
+                        received += 1
+                        meter_id = TechemMapper.meter_id(frame)
+                        if meter_id is not None:
+                            latest[meter_id] = frame
+                        if received >= num_packets or (
+                            expected and expected <= latest.keys()
+                        ):
+                            break
+
+            if not latest:
                 raise APIError("No meter data received")
 
             self._logger.info(
                 "responses_collected",
-                count=len(responses),
-                distinct=len(set(responses)),
+                count=received,
+                meters=sorted(latest),
+                missing=sorted(expected - latest.keys()),
             )
 
-            return responses
+            return list(latest.values())
         except Exception as e:
             self._logger.error(
                 "failed_to_get_meter_data",
@@ -134,6 +145,3 @@ class TechemService(BaseService):
             if isinstance(e, APIError):
                 raise e
             raise APIError("Failed to get meter data") from e
-        finally:
-            if "ser" in locals() and ser.is_open:
-                ser.close()
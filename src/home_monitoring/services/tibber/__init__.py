@@ -1,5 +1,15 @@
-"""Tibber service package."""
+"""Tibber service package.
 
-from .service import TibberService
+The service module and its dependencies are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from home_monitoring.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import TibberService
 
 __all__ = ["TibberService"]
+
+__getattr__ = lazy_exports(__name__, {"TibberService": "service"})
@@ -6,10 +6,69 @@ from typing import Any
 import structlog
 from home_monitoring.core.mappers.tibber import TibberMapper
 from home_monitoring.models.base import Measurement
+from home_monitoring.services.tibber.rollup import (
+    RollupCache,
+    finalized_totals,
+    open_window,
+)
 
 logger = structlog.get_logger()
 
 
+async def _completed_periods(  # noqa: PLR0913 - period window plus its context
+    home: Any,
+    rollup: RollupCache | None,
+    resolution: str,
+    start: datetime,
+    completed: int,
+    now: datetime,
+) -> tuple[list[float | None], list[float | None], list[float | None]]:
+    """Get cost, consumption and production of the completed periods.
+
+    Periods already in the rollup cache are served from it; only the open
+    ones are fetched, and those that have since become final are cached.
+
+    Args:
+        home: Tibber home object
+        rollup: Cache of finalized totals (None fetches every period)
+        resolution: ``DAILY`` or ``MONTHLY``
+        start: Start of the first completed period
+        completed: Number of completed periods
+        now: Current datetime
+
+    Returns:
+        Tuple of (costs, consumptions, productions), one entry per period
+        (empty if neither cache nor API has any)
+    """
+    cached, open_from, n_open = open_window(rollup, resolution, start, completed)
+    nodes: list[dict[str, Any]] = []
+    production_nodes: list[dict[str, Any]] = []
+    if n_open > 0:
+        nodes = await home.get_historic_data_date(
+            date_from=open_from, n_data=n_open, resolution=resolution
+        )
+        production_nodes = await home.get_historic_data_date(
+            date_from=open_from, n_data=n_open, resolution=resolution, production=True
+        )
+    if rollup is not None:
+        rollup.store(
+            resolution,
+            finalized_totals(resolution, nodes, production_nodes, now),
+        )
+    if cached:
+        logger.debug(
+            "tibber_rollup_hit", resolution=resolution, cached=len(cached), open=n_open
+        )
+
+    costs: list[float | None] = [t.cost for t in cached]
+    costs += [node.get("cost") for node in nodes or []]
+    consumptions: list[float | None] = [t.consumption for t in cached]
+    consumptions += [node.get("consumption") for node in nodes or []]
+    productions: list[float | None] = [t.production for t in cached]
+    productions += [node.get("production") for node in production_nodes or []]
+    return costs, consumptions, productions
+
+
 async def aggregate_this_day_data(
     home: Any,
     connection: Any,
@@ -117,7 +176,7 @@ async def aggregate_this_day_data(
     return measurements, day_cost, day_consumption, day_production
 
 
-async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracked for the tibber cleanup
+async def aggregate_this_month_data(  # noqa: PLR0913 - refactor tracked for the tibber cleanup
     home: Any,
     connection: Any,
     summary_timestamp: datetime,
@@ -125,10 +184,12 @@ async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracke
     day_consumption: float | None,
     day_production: float | None,
     now: datetime | None = None,
+    rollup: RollupCache | None = None,
 ) -> tuple[list[Measurement], float | None, float | None, float | None]:
     """Aggregate this month (month so far) consumption data.
 
-    Calculates: sum of completed days + this_day
+    Calculates: sum of completed days + this_day. Days already in the rollup
+    cache are not fetched again; newly finalized days are added to it.
 
     Args:
         home: Tibber home object
@@ -138,6 +199,7 @@ async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracke
         day_consumption: Consumption for this_day
         day_production: Production for this_day
         now: Current datetime (if None, uses actual current time)
+        rollup: Cache of finalized daily totals (None fetches every day)
 
     Returns:
         Tuple of (measurements, month_cost, month_consumption, month_production)
@@ -173,28 +235,17 @@ async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracke
             )
 
             if days_completed > 0:
-                monthly_data = await home.get_historic_data_date(
-                    date_from=first_of_month,
-                    n_data=days_completed,
-                    resolution="DAILY",
-                )
-                monthly_production = await home.get_historic_data_date(
-                    date_from=first_of_month,
-                    n_data=days_completed,
-                    resolution="DAILY",
-                    production=True,
+                costs, consumptions, productions = await _completed_periods(
+                    home, rollup, "DAILY", first_of_month, days_completed, now
                 )
 
-                if monthly_data:
-                    costs = [node.get("cost") for node in monthly_data]
-                    consumptions = [node.get("consumption") for node in monthly_data]
-
+                if costs:
                     if None in costs or None in consumptions:
                         logger.debug(
                             "this_month_completed_days_incomplete",
                             missing_costs=costs.count(None),
                             missing_consumptions=consumptions.count(None),
-                            total_days=len(monthly_data),
+                            total_days=len(costs),
                         )
                         month_cost = None
                         month_consumption = None
@@ -212,20 +263,16 @@ async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracke
 
                         logger.debug(
                             "this_month_completed_days",
-                            num_days=len(monthly_data),
+                            num_days=len(costs),
                             completed_days_cost=completed_days_cost,
                             completed_days_consumption=completed_days_consumption,
                             total_month_cost=month_cost,
                             total_month_consumption=month_consumption,
                         )
 
-                if monthly_production:
-                    productions = [
-                        node.get("production") for node in monthly_production
-                    ]
-                    month_production += float(
-                        sum(p if p is not None else 0.0 for p in productions)
-                    )
+                month_production += float(
+                    sum(p if p is not None else 0.0 for p in productions)
+                )
 
             if month_cost is not None and month_consumption is not None:
                 month_grid_consumption = max(0.0, month_consumption - month_production)
@@ -269,7 +316,7 @@ async def aggregate_this_month_data(  # noqa: PLR0913, PLR0912 - refactor tracke
     return measurements, month_cost, month_consumption, month_production
 
 
-async def aggregate_this_year_data(  # noqa: PLR0913, PLR0912 - refactor tracked for the tibber cleanup
+async def aggregate_this_year_data(  # noqa: PLR0913 - refactor tracked for the tibber cleanup
     home: Any,
     connection: Any,
     summary_timestamp: datetime,
@@ -277,10 +324,12 @@ async def aggregate_this_year_data(  # noqa: PLR0913, PLR0912 - refactor tracked
     month_consumption: float | None,
     month_production: float | None,
     now: datetime | None = None,
+    rollup: RollupCache | None = None,
 ) -> list[Measurement]:
     """Aggregate this year (year so far) consumption data.
 
-    Calculates: sum of completed months + this_month
+    Calculates: sum of completed months + this_month. Months already in the
+    rollup cache are not fetched again; newly finalized months are added.
 
     Args:
         home: Tibber home object
@@ -290,6 +339,7 @@ async def aggregate_this_year_data(  # noqa: PLR0913, PLR0912 - refactor tracked
         month_consumption: Consumption for this_month
         month_production: Production for this_month
         now: Current datetime (if None, uses actual current time)
+        rollup: Cache of finalized monthly totals (None fetches every month)
 
     Returns:
         List of measurements for this_year
@@ -321,28 +371,17 @@ async def aggregate_this_year_data(  # noqa: PLR0913, PLR0912 - refactor tracked
             )
 
             if months_completed > 0:
-                yearly_data = await home.get_historic_data_date(
-                    date_from=first_of_year,
-                    n_data=months_completed,
-                    resolution="MONTHLY",
-                )
-                yearly_production = await home.get_historic_data_date(
-                    date_from=first_of_year,
-                    n_data=months_completed,
-                    resolution="MONTHLY",
-                    production=True,
+                costs, consumptions, productions = await _completed_periods(
+                    home, rollup, "MONTHLY", first_of_year, months_completed, now
                 )
 
-                if yearly_data:
-                    costs = [node.get("cost") for node in yearly_data]
-                    consumptions = [node.get("consumption") for node in yearly_data]
-
+                if costs:
                     if None in costs or None in consumptions:
                         logger.debug(
                             "this_year_completed_months_incomplete",
                             missing_costs=costs.count(None),
                             missing_consumptions=consumptions.count(None),
-                            total_months=len(yearly_data),
+                            total_months=len(costs),
                         )
                         year_cost = None
                         year_consumption = None
@@ -360,18 +399,16 @@ async def aggregate_this_year_data(  # noqa: PLR0913, PLR0912 - refactor tracked
 
                         logger.debug(
                             "this_year_completed_months",
-                            num_months=len(yearly_data),
+                            num_months=len(costs),
                             completed_months_cost=completed_months_cost,
                             completed_months_consumption=completed_months_consumption,
                             total_year_cost=year_cost,
                             total_year_consumption=year_consumption,
                         )
 
-                if yearly_production:
-                    productions = [node.get("production") for node in yearly_production]
-                    year_production += float(
-                        sum(p if p is not None else 0.0 for p in productions)
-                    )
+                year_production += float(
+                    sum(p if p is not None else 0.0 for p in productions)
+                )
 
             if year_cost is not None and year_consumption is not None:
                 year_grid_consumption = max(0.0, year_consumption - year_production)
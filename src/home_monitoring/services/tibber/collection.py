@@ -9,7 +9,7 @@ from typing import Any
 
 import structlog
 from home_monitoring.core.mappers.tibber import TibberMapper
-from home_monitoring.models.base import Measurement
+from home_monitoring.models.base import Measurement, SeriesBatch
 
 logger = structlog.get_logger()
 
@@ -23,45 +23,48 @@ RANK_EXPENSIVE_THRESHOLD = 0.85
 PRICE_FORECAST_MEASUREMENT = "electricity_price_forecast_euro"
 
 
-async def collect_price_forecast_data(home: Any) -> list[Measurement]:
+async def collect_price_forecast_data(home: Any) -> list[SeriesBatch]:
     """Collect the hourly day-ahead price curve (today + tomorrow when published).
 
     Each forecast hour is stored at its own (possibly future) timestamp in a
     dedicated measurement, so "latest price" queries on
     ``electricity_prices_euro`` keep returning the current price. Rows for the
-    same hour are overwritten on every run.
+    same hour are overwritten on every run. The curve is a dense series and is
+    returned as one columnar batch.
 
     Args:
         home: Tibber home object
 
     Returns:
-        List of forecast measurements (empty on failure)
+        The forecast batch in a list (empty on failure or without prices)
     """
-    measurements: list[Measurement] = []
-
     try:
         await home.update_info_and_price_info()
         price_total = home.price_total or {}
-        for ts_str, total in price_total.items():
-            if total is None:
-                continue
-            measurements.append(
-                Measurement(
-                    timestamp=datetime.fromisoformat(ts_str),
-                    measurement=PRICE_FORECAST_MEASUREMENT,
-                    tags={},
-                    fields={"total": float(total)},
-                )
-            )
-        logger.debug("price_forecast_collected", hours=len(measurements))
+        hours = [
+            (datetime.fromisoformat(ts_str), float(total))
+            for ts_str, total in price_total.items()
+            if total is not None
+        ]
+        logger.debug("price_forecast_collected", hours=len(hours))
     except Exception as e:
         logger.error(
             "failed_to_get_price_forecast",
             error=str(e),
             error_type=type(e).__name__,
         )
-
-    return measurements
+        return []
+
+    if not hours:
+        return []
+    return [
+        SeriesBatch.from_columns(
+            PRICE_FORECAST_MEASUREMENT,
+            {},
+            [timestamp for timestamp, _ in hours],
+            {"total": [total for _, total in hours]},
+        )
+    ]
 
 
 async def collect_price_data(
@@ -214,6 +217,82 @@ async def collect_last_hour_data(
     return measurements
 
 
+def _node_end(node: dict[str, Any]) -> datetime | None:
+    """End of the period a historic-data node covers, if it carries one."""
+    try:
+        return datetime.fromisoformat(node["to"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def collect_missed_hours(
+    home: Any, watermark: datetime | None, missed_hours: int
+) -> tuple[list[Measurement], datetime | None]:
+    """Collect completed hours that earlier runs missed.
+
+    ``last_hour`` only ever stores the latest completed hour, so hours that
+    completed while the collector was down never reached InfluxDB. They are
+    stored as ``last_hour`` points at the end of their hour. The latest
+    completed hour is left to ``collect_last_hour_data``.
+
+    Args:
+        home: Tibber home object
+        watermark: End of the newest hour already stored
+        missed_hours: Completed hours before the latest one to fill in
+
+    Returns:
+        Measurements of the missed hours, and the end of the latest
+        completed hour (the new watermark; None if unknown)
+    """
+    measurements: list[Measurement] = []
+
+    try:
+        hourly_data = await home.get_historic_data(
+            n_data=missed_hours + 1, resolution="HOURLY"
+        )
+        hourly_production = await home.get_historic_data(
+            n_data=missed_hours + 1, resolution="HOURLY", production=True
+        )
+    except Exception as e:
+        logger.warning("failed_to_get_missed_hours", error=str(e))
+        return measurements, None
+
+    if not hourly_data:
+        return measurements, None
+
+    production_by_hour = {
+        node.get("to"): node.get("production") for node in hourly_production or []
+    }
+    for node in hourly_data[:-1]:
+        end = _node_end(node)
+        cost = node.get("totalCost")
+        consumption = node.get("consumption")
+        if end is None or cost is None or consumption is None:
+            continue
+        if watermark is not None and end <= watermark:
+            continue
+        production = production_by_hour.get(node.get("to")) or 0.0
+        data: list[dict[str, Any]] = [
+            {"cost": cost, "period": "last_hour"},
+            {"consumption": consumption, "period": "last_hour"},
+            {
+                "consumption": max(0.0, consumption - production),
+                "period": "last_hour",
+                "source": "grid",
+            },
+        ]
+        if production > 0:
+            data.append(
+                {"consumption": production, "period": "last_hour", "source": "solar"}
+            )
+        for entry in data:
+            measurements.extend(TibberMapper.to_measurements(end, entry))
+
+    if measurements:
+        logger.info("missed_hours_collected", point_count=len(measurements))
+    return measurements, _node_end(hourly_data[-1])
+
+
 async def collect_last_day_data(
     home: Any, summary_timestamp: datetime
 ) -> list[Measurement]:
@@ -0,0 +1,152 @@
+"""Per-run memoizing layer for Tibber historic-data requests.
+
+Several periods ask the rate-limited Tibber GraphQL API for the same or
+overlapping windows (``last_hour`` and ``this_hour`` both request the latest
+hour, which is also the tail of ``this_day``'s hourly window). Requests are
+keyed on (resolution, n_data, date_from, production); a narrower window is
+served as a slice of a wider one already fetched in the same run, so each
+distinct window reaches the API only once.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+HistoricData = list[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class HistoricRequest:
+    """One ``get_historic_data`` / ``get_historic_data_date`` call."""
+
+    resolution: str
+    n_data: int
+    date_from: datetime | None = None
+    production: bool = False
+
+    @property
+    def window(self) -> tuple[str, datetime | None, bool]:
+        """Requests sharing a window differ only in how many nodes they ask for."""
+        return (self.resolution, self.date_from, self.production)
+
+    def slice(self, data: HistoricData) -> HistoricData:
+        """Cut this request's nodes out of a wider window's result.
+
+        Without ``date_from`` Tibber returns the *last* ``n_data`` nodes, so a
+        narrower request is the tail; with ``date_from`` it returns the first
+        ``n_data`` nodes from that date, so it is the head.
+        """
+        if self.n_data <= 0:
+            return []
+        if self.date_from is None:
+            return data[-self.n_data :]
+        return data[: self.n_data]
+
+
+async def fetch(home: Any, request: HistoricRequest) -> HistoricData:
+    """Issue a single historic-data request against the Tibber home.
+
+    Args:
+        home: Tibber home object
+        request: Request to issue
+
+    Returns:
+        Historic data nodes
+    """
+    if request.date_from is None:
+        data: HistoricData = await home.get_historic_data(
+            n_data=request.n_data,
+            resolution=request.resolution,
+            production=request.production,
+        )
+    else:
+        data = await home.get_historic_data_date(
+            date_from=request.date_from,
+            n_data=request.n_data,
+            resolution=request.resolution,
+            production=request.production,
+        )
+    return data
+
+
+class MemoizedHome:
+    """Tibber home wrapper memoizing historic-data requests for one run.
+
+    Concurrent identical requests share one in-flight API call, failures are
+    memoized as well (the error is re-raised to every caller), and at most
+    ``max_concurrency`` API calls run at once. Every other attribute is
+    delegated to the wrapped home.
+    """
+
+    def __init__(self, home: Any, max_concurrency: int = 1) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            home: Tibber home object
+            max_concurrency: Maximum number of API calls in flight
+        """
+        self._home = home
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._calls: dict[HistoricRequest, asyncio.Task[HistoricData]] = {}
+        self.api_calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._home, name)
+
+    async def get_historic_data(
+        self, n_data: int, resolution: str = "HOURLY", production: bool = False
+    ) -> HistoricData:
+        """Memoized ``home.get_historic_data``."""
+        return await self.load(HistoricRequest(resolution, n_data, None, production))
+
+    async def get_historic_data_date(
+        self,
+        date_from: datetime,
+        n_data: int,
+        resolution: str = "HOURLY",
+        production: bool = False,
+    ) -> HistoricData:
+        """Memoized ``home.get_historic_data_date``."""
+        return await self.load(
+            HistoricRequest(resolution, n_data, date_from, production)
+        )
+
+    async def load(self, request: HistoricRequest) -> HistoricData:
+        """Return the nodes for ``request``, calling the API at most once.
+
+        Args:
+            request: Requested window
+
+        Returns:
+            Historic data nodes (a slice of a wider cached window if possible)
+        """
+        if request.n_data <= 0:
+            return []
+        source = self._covering(request)
+        if source is None:
+            source = request
+            self._calls[request] = asyncio.create_task(self._call_api(request))
+        elif source != request:
+            logger.debug("tibber_request_sliced", request=request, source=source)
+        # shield: a cancelled caller must not cancel the call other callers share
+        data = await asyncio.shield(self._calls[source])
+        return request.slice(data)
+
+    def _covering(self, request: HistoricRequest) -> HistoricRequest | None:
+        """Find the widest known request whose window contains ``request``."""
+        best = None
+        for known in self._calls:
+            if known.window == request.window and known.n_data >= request.n_data:
+                if best is None or known.n_data > best.n_data:
+                    best = known
+        return best
+
+    async def _call_api(self, request: HistoricRequest) -> HistoricData:
+        async with self._semaphore:
+            self.api_calls += 1
+            return await fetch(self._home, request)
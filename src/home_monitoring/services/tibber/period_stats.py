@@ -0,0 +1,356 @@
+"""Rolling statistics of Tibber periods and prices for the dashboard.
+
+The dashboard shows, per period, the maximum of the running totals
+(``this_*``) and min, max and the 20/50/80th percentiles of the completed
+totals (``last_*``) of grid consumption and cost, plus the same statistics
+of the price over the last week. Computing them in InfluxDB takes fifteen
+queries per refresh, several of them scanning a year of points. Here they
+are maintained incrementally from what each run collects and written as one
+``electricity_stats`` point, read by the dashboard with a single ``last()``.
+
+Each statistic is backed by a ``RollingSeries``: one value per time bucket
+within a sliding window, the newest value of the bucket for completed
+periods and prices (as InfluxQL's ``LAST`` per ``GROUP BY time``) and the
+largest for running totals. Buckets are aligned to the epoch like InfluxQL's
+``GROUP BY time`` and evicted once they end before the window, so a run only
+touches the buckets it observes. Quantiles pick the value InfluxQL's
+``PERCENTILE`` picks, the one at index ``floor(n * p / 100 + 0.5) - 1`` of
+the ``n`` sorted values. Where that index is negative (``PERCENTILE``
+returns null) the smallest value is reported, so the point keeps every
+field and the dashboard's ``last()`` never falls back to an older value.
+
+Buckets live in ``state_dir/tibber_stats.json``. On first use they are
+seeded from the stored points with one grouped query per series, so
+statistics are complete from the first run instead of after a year.
+"""
+
+import json
+import math
+import os
+from collections.abc import AsyncIterable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.models.base import Measurement, Writable
+from home_monitoring.repositories.query_results import TIME_COLUMN, RowBatch
+from home_monitoring.utils.logging import get_logger
+
+STATS_FILENAME = "tibber_stats.json"
+STATS_MEASUREMENT = "electricity_stats"
+QUANTILES = {"p20": 0.2, "p50": 0.5, "p80": 0.8}
+ALL_STATS = ("min", "max", *QUANTILES)
+
+# column holding the bucket value in seed query results
+_VALUE_COLUMN = "value"
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    """Source and window of one rolling series.
+
+    Attributes:
+        name: Prefix of the series' fields, e.g. ``cost_last_day``
+        measurement: Measurement the values are read from
+        field: Field holding the value
+        period: Required ``period`` tag, None for untagged points
+        source: Required ``source`` tag, None for untagged points
+        bucket: Bucket length; one value is kept per bucket
+        window: Length of the sliding window
+        reducer: ``last`` keeps the newest value of a bucket, ``max`` the
+            largest
+        stats: Statistics to report
+    """
+
+    name: str
+    measurement: str
+    field: str
+    period: str | None
+    source: str | None
+    bucket: timedelta
+    window: timedelta
+    reducer: str
+    stats: tuple[str, ...]
+
+
+def percentile_index(count: int, q: float) -> int:
+    """Index of InfluxQL's ``PERCENTILE`` in ``count`` sorted values.
+
+    Args:
+        count: Number of values, at least one
+        q: Quantile between 0 and 1
+
+    Returns:
+        The index, 0 where ``PERCENTILE`` returns null
+    """
+    return min(count - 1, max(0, math.floor(count * q + 0.5) - 1))
+
+
+def _period_specs() -> tuple[SeriesSpec, ...]:
+    """Series of the statistics shown by ``tibber_states.js``."""
+    day = timedelta(days=1)
+    # period -> (bucket, window, reducer, stats); completed periods are
+    # bucketed like the former GROUP BY time() subqueries
+    periods = {
+        "this_hour": (timedelta(hours=1), day, "max", ("max",)),
+        "this_day": (day, timedelta(days=30), "max", ("max",)),
+        "this_month": (day, timedelta(days=365), "max", ("max",)),
+        "this_year": (day, timedelta(days=365), "max", ("max",)),
+        "last_hour": (timedelta(hours=1), day, "last", ALL_STATS),
+        "last_day": (day, timedelta(days=30), "last", ALL_STATS),
+        "last_month": (timedelta(days=30), timedelta(days=365), "last", ALL_STATS),
+    }
+    specs = [
+        SeriesSpec(
+            name=f"{prefix}_{period}",
+            measurement=measurement,
+            field=field,
+            period=period,
+            source=source,
+            bucket=bucket,
+            window=window,
+            reducer=reducer,
+            stats=stats,
+        )
+        for prefix, measurement, field, source in (
+            ("consumption_grid", "electricity_consumption_kwh", "consumption", "grid"),
+            ("cost", "electricity_costs_euro", "cost", None),
+        )
+        for period, (bucket, window, reducer, stats) in periods.items()
+    ]
+    # Tibber prices change every quarter hour
+    specs.append(
+        SeriesSpec(
+            name="energy_price_euro",
+            measurement="electricity_prices_euro",
+            field="total",
+            period=None,
+            source=None,
+            bucket=timedelta(minutes=15),
+            window=timedelta(days=7),
+            reducer="last",
+            stats=ALL_STATS,
+        )
+    )
+    return tuple(specs)
+
+
+SERIES = _period_specs()
+
+
+class RollingSeries:
+    """One value per time bucket over a sliding window."""
+
+    def __init__(self, spec: SeriesSpec, rows: Iterable[Iterable[float]] = ()):
+        """Initialize the series.
+
+        Args:
+            spec: Bucketing and window of the series
+            rows: ``(bucket start, observed at, value)`` in epoch seconds
+        """
+        self.spec = spec
+        self._bucket = spec.bucket.total_seconds()
+        # bucket start -> [observed at, value]
+        self._buckets: dict[float, list[float]] = {}
+        for start, moment, value in rows:
+            self._buckets[start] = [moment, value]
+
+    @property
+    def rows(self) -> list[list[float]]:
+        """``[bucket start, observed at, value]`` per bucket, oldest first."""
+        return [[start, *entry] for start, entry in sorted(self._buckets.items())]
+
+    def observe(self, moment: float, value: float) -> None:
+        """Record a value observed at ``moment`` (epoch seconds)."""
+        start = moment - moment % self._bucket
+        entry = self._buckets.get(start)
+        if entry is None:
+            self._buckets[start] = [moment, value]
+        elif self.spec.reducer == "max":
+            entry[:] = [max(entry[0], moment), max(entry[1], value)]
+        elif moment >= entry[0]:
+            entry[:] = [moment, value]
+
+    def evict(self, now: float) -> None:
+        """Drop the buckets that ended before the window ending ``now``."""
+        oldest = now - self.spec.window.total_seconds()
+        for start in [s for s in self._buckets if s + self._bucket <= oldest]:
+            del self._buckets[start]
+
+    def stats(self) -> dict[str, float]:
+        """The spec's statistics of the window; empty if it has no value."""
+        values = sorted(value for _, value in self._buckets.values())
+        if not values:
+            return {}
+        result = {"min": values[0], "max": values[-1]}
+        for name, q in QUANTILES.items():
+            result[name] = values[percentile_index(len(values), q)]
+        return {name: result[name] for name in self.spec.stats}
+
+
+class PeriodStatsStore:
+    """Rolling series of every dashboard statistic, kept on disk."""
+
+    def __init__(self, path: Path, specs: Iterable[SeriesSpec] = SERIES) -> None:
+        """Initialize the store (the file is read on first use).
+
+        Args:
+            path: JSON file holding the series' buckets
+            specs: Series to maintain
+        """
+        self._path = path
+        self._specs = {spec.name: spec for spec in specs}
+        self._logger = get_logger(__name__)
+        self._series: dict[str, RollingSeries] | None = None
+        self._seeded = False
+
+    @property
+    def seeded(self) -> bool:
+        """Whether the series were seeded from stored points."""
+        self._load()
+        return self._seeded
+
+    @property
+    def seed_queries(self) -> dict[str, str]:
+        """Query per series for its stored buckets (for ``seed``)."""
+        queries = {}
+        for spec in self._specs.values():
+            filters = "".join(
+                f"\"{tag}\" = '{value}' AND "
+                for tag, value in (("period", spec.period), ("source", spec.source))
+                if value is not None
+            )
+            queries[spec.name] = (
+                f'SELECT {spec.reducer}("{spec.field}") AS {_VALUE_COLUMN} '
+                f'FROM "{spec.measurement}" WHERE {filters}'
+                f"time > now() - {int(spec.window.total_seconds())}s "
+                f"GROUP BY time({int(spec.bucket.total_seconds())}s) fill(none)"
+            )
+        return queries
+
+    async def seed(self, results: Mapping[str, AsyncIterable[RowBatch]]) -> None:
+        """Fill the series from stored points.
+
+        Args:
+            results: Result of each of ``seed_queries`` from
+                ``InfluxDBRepository.query_chunks`` (epoch ns), by series name
+        """
+        series = {name: RollingSeries(spec) for name, spec in self._specs.items()}
+        for name, batches in results.items():
+            rolling = series.get(name)
+            async for batch in batches:
+                if rolling is None or _VALUE_COLUMN not in batch.columns:
+                    continue
+                times = batch.column(TIME_COLUMN)
+                for t, raw in zip(times, batch.column(_VALUE_COLUMN), strict=True):
+                    value = _value(raw)
+                    if value is not None:
+                        rolling.observe(t / 1e9, value)
+        # replay what was observed before seeding on top of the history
+        for name, observed in self._load().items():
+            for _, moment, value in observed.rows:
+                series[name].observe(moment, value)
+        self._series = series
+        self._seeded = True
+
+    def observe(self, measurements: Iterable[Writable]) -> None:
+        """Record the values of a run's price, cost and consumption points."""
+        series = self._load()
+        by_source = {
+            (s.spec.measurement, s.spec.period, s.spec.source): s
+            for s in series.values()
+        }
+        for measurement in measurements:
+            if not isinstance(measurement, Measurement):
+                continue
+            rolling = by_source.get(
+                (
+                    measurement.measurement,
+                    measurement.tags.get("period"),
+                    measurement.tags.get("source"),
+                )
+            )
+            if rolling is None:
+                continue
+            value = _value(measurement.fields.get(rolling.spec.field))
+            if value is not None:
+                rolling.observe(measurement.timestamp.timestamp(), value)
+
+    def to_measurements(self, timestamp: datetime) -> list[Measurement]:
+        """Statistics over the windows ending now.
+
+        Args:
+            timestamp: Time of the run (end of the windows)
+
+        Returns:
+            One ``electricity_stats`` point with fields named
+            ``<series>_<stat>``, or none if no series has a value
+        """
+        now = timestamp.timestamp()
+        fields: dict[str, float] = {}
+        for name, rolling in self._load().items():
+            rolling.evict(now)
+            fields.update(
+                (f"{name}_{stat}", value) for stat, value in rolling.stats().items()
+            )
+        if not fields:
+            return []
+        return [
+            Measurement(
+                measurement=STATS_MEASUREMENT,
+                tags={},
+                timestamp=timestamp,
+                fields=fields,
+            )
+        ]
+
+    def save(self) -> None:
+        """Persist the series; failures are logged, not raised."""
+        if self._series is None:
+            return
+        series = {
+            name: rolling.rows for name, rolling in self._series.items() if rolling.rows
+        }
+        tmp = self._path.with_suffix(".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"seeded": self._seeded, "series": series}))
+            os.replace(tmp, self._path)
+        except OSError as e:
+            self._logger.warning("tibber_stats_not_saved", error=str(e))
+
+    def _load(self) -> dict[str, RollingSeries]:
+        if self._series is None:
+            self._series = self._read()
+        return self._series
+
+    def _read(self) -> dict[str, RollingSeries]:
+        """Series stored on disk; a missing or corrupt file is empty.
+
+        Series no longer in the specs are dropped.
+        """
+        empty = {name: RollingSeries(spec) for name, spec in self._specs.items()}
+        try:
+            data: Any = json.loads(self._path.read_text())
+            series = dict(empty)
+            for name, rows in data["series"].items():
+                if name in self._specs:
+                    series[name] = RollingSeries(
+                        self._specs[name],
+                        ((float(s), float(t), float(v)) for s, t, v in rows),
+                    )
+            self._seeded = bool(data["seeded"])
+            return series
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._logger.warning("tibber_stats_unreadable", error=str(e))
+            return empty
+
+
+def _value(raw: Any) -> float | None:
+    """A finite number, or None for missing or invalid values."""
+    if isinstance(raw, bool) or not isinstance(raw, int | float):
+        return None
+    return float(raw) if math.isfinite(raw) else None
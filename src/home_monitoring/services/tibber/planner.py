@@ -0,0 +1,117 @@
+"""Concurrent prefetch of the Tibber historic-data requests of one run.
+
+``collect_and_store`` issues about 16 ``get_historic_data*`` calls. None of
+them depends on another's result — only on the current time — so the planner
+derives the full request list up front, reduces it to the widest window per
+series (see ``memo``), runs those under a bounded concurrency limit, and hands
+the collection/aggregation functions the memoized home to read from.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+
+import structlog
+from home_monitoring.services.tibber.memo import HistoricRequest, MemoizedHome
+from home_monitoring.services.tibber.rollup import RollupCache, open_window
+
+logger = structlog.get_logger()
+
+
+def _pair(
+    resolution: str, n_data: int, date_from: datetime | None = None
+) -> list[HistoricRequest]:
+    """Consumption and production requests for the same window."""
+    return [
+        HistoricRequest(resolution, n_data, date_from),
+        HistoricRequest(resolution, n_data, date_from, production=True),
+    ]
+
+
+def plan_requests(
+    now: datetime, rollup: RollupCache | None = None, missed_hours: int = 0
+) -> list[HistoricRequest]:
+    """List the historic-data requests of one collection run.
+
+    Args:
+        now: Current time in the home's timezone
+        rollup: Cache of finalized totals; cached days/months are not planned
+        missed_hours: Completed hours missed since the last run
+
+    Returns:
+        Requests, one entry per call site (duplicates included)
+    """
+    first_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_of_year = first_of_month.replace(month=1)
+
+    requests = [
+        *_pair("HOURLY", 1),  # last_hour
+        *_pair("HOURLY", 1 + missed_hours),  # missed hours
+        *_pair("DAILY", 1),  # last_day
+        *_pair("HOURLY", now.hour),  # this_day
+    ]
+    _, open_day, days_open = open_window(rollup, "DAILY", first_of_month, now.day - 1)
+    if days_open > 0:
+        requests += _pair("DAILY", days_open, open_day)  # this_month
+    _, open_month, months_open = open_window(
+        rollup, "MONTHLY", first_of_year, now.month - 1
+    )
+    if months_open > 0:
+        requests += _pair("MONTHLY", months_open, open_month)  # this_year
+    requests += [
+        *_pair("HOURLY", 1),  # this_hour
+        *_pair("MONTHLY", 1),  # last_month
+        *_pair("ANNUAL", 2),  # last_year
+    ]
+    return requests
+
+
+def widest_requests(requests: list[HistoricRequest]) -> list[HistoricRequest]:
+    """Reduce requests to the widest one per window, in first-seen order.
+
+    Args:
+        requests: Planned requests
+
+    Returns:
+        One request per window; all others are slices of these
+    """
+    widest: dict[tuple[str, datetime | None, bool], HistoricRequest] = {}
+    for request in requests:
+        known = widest.get(request.window)
+        if known is None or request.n_data > known.n_data:
+            widest[request.window] = request
+    return [request for request in widest.values() if request.n_data > 0]
+
+
+async def prefetch_historic_data(
+    home: Any,
+    requests: list[HistoricRequest],
+    max_concurrency: int,
+) -> MemoizedHome:
+    """Fetch the planned windows concurrently into a per-run memo.
+
+    Failures are memoized per window and surface only where the result is
+    used.
+
+    Args:
+        home: Tibber home object
+        requests: Planned requests (see ``plan_requests``)
+        max_concurrency: Maximum number of requests in flight
+
+    Returns:
+        Memoized home serving the prefetched windows
+    """
+    memo = MemoizedHome(home, max_concurrency)
+    windows = widest_requests(requests)
+    outcomes = await asyncio.gather(
+        *(memo.load(request) for request in windows), return_exceptions=True
+    )
+
+    logger.debug(
+        "tibber_prefetch_done",
+        call_sites=len(requests),
+        api_calls=memo.api_calls,
+        failed=sum(isinstance(o, BaseException) for o in outcomes),
+        max_concurrency=max_concurrency,
+    )
+    return memo
@@ -0,0 +1,236 @@
+"""Local rollup cache of finalized Tibber daily and monthly totals.
+
+``this_month`` and ``this_year`` sum every completed day of the month and
+every completed month of the year. Completed periods never change once Tibber
+has settled them, so their totals are kept in a small SQLite file under the
+state directory and each run only asks the API for the periods still open.
+"""
+
+import sqlite3
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+ROLLUP_FILENAME = "tibber_rollup.sqlite3"
+
+# Tibber may still correct a period shortly after it ends; only periods that
+# ended at least this long ago are cached
+SETTLE_TIME = timedelta(days=1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS totals (
+    resolution TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    cost REAL NOT NULL,
+    consumption REAL NOT NULL,
+    production REAL NOT NULL,
+    PRIMARY KEY (resolution, period_start)
+)
+"""
+
+
+@dataclass(frozen=True)
+class PeriodTotals:
+    """Totals of one finalized day or month."""
+
+    period_start: date
+    cost: float
+    consumption: float
+    production: float
+
+
+def shift(start: datetime, resolution: str, periods: int) -> datetime:
+    """Start of the period ``periods`` days (DAILY) or months (MONTHLY) later.
+
+    Args:
+        start: Start of the first period (midnight, first of month for MONTHLY)
+        resolution: ``DAILY`` or ``MONTHLY``
+        periods: Number of periods to move forward
+
+    Returns:
+        Start of the shifted period
+    """
+    if resolution == "MONTHLY":
+        month = start.month - 1 + periods
+        return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+    return start + timedelta(days=periods)
+
+
+def is_final(resolution: str, period_start: datetime, now: datetime) -> bool:
+    """Whether a period ended at least ``SETTLE_TIME`` before ``now``."""
+    period_end = shift(period_start, resolution, 1)
+    return period_end.replace(tzinfo=None) <= now.replace(tzinfo=None) - SETTLE_TIME
+
+
+class RollupCache:
+    """SQLite-backed store of finalized period totals.
+
+    Database errors are logged and treated as cache misses, so a broken cache
+    file only costs API calls, never a collection run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (and create if needed) the rollup database.
+
+        Args:
+            path: SQLite file holding the totals between runs
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def completed(
+        self, resolution: str, start: datetime, count: int
+    ) -> list[PeriodTotals]:
+        """Return cached totals for consecutive periods from ``start``.
+
+        Stops at the first period that is not cached, so the result always
+        covers ``start`` up to (excluding) the first open period.
+
+        Args:
+            resolution: ``DAILY`` or ``MONTHLY``
+            start: Start of the first period
+            count: Number of completed periods wanted
+
+        Returns:
+            Totals of the leading cached periods (at most ``count``)
+        """
+        keys = [shift(start, resolution, i).date().isoformat() for i in range(count)]
+        if not keys:
+            return []
+        try:
+            rows = self._conn.execute(
+                "SELECT period_start, cost, consumption, production FROM totals "
+                f"WHERE resolution = ? AND period_start IN ({','.join('?' * count)})",
+                [resolution, *keys],
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("tibber_rollup_read_failed", error=str(e))
+            return []
+
+        by_start = {row[0]: row for row in rows}
+        totals = []
+        for key in keys:
+            row = by_start.get(key)
+            if row is None:
+                break
+            totals.append(
+                PeriodTotals(date.fromisoformat(row[0]), row[1], row[2], row[3])
+            )
+        return totals
+
+    def store(self, resolution: str, totals: Sequence[PeriodTotals]) -> None:
+        """Insert or replace finalized totals.
+
+        Args:
+            resolution: ``DAILY`` or ``MONTHLY``
+            totals: Finalized period totals
+        """
+        if not totals:
+            return
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO totals VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        resolution,
+                        t.period_start.isoformat(),
+                        t.cost,
+                        t.consumption,
+                        t.production,
+                    )
+                    for t in totals
+                ],
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("tibber_rollup_write_failed", error=str(e))
+
+
+def open_window(
+    rollup: RollupCache | None, resolution: str, start: datetime, completed: int
+) -> tuple[list[PeriodTotals], datetime, int]:
+    """Split completed periods into cached totals and the window to fetch.
+
+    Args:
+        rollup: Rollup cache, or None to fetch everything
+        resolution: ``DAILY`` or ``MONTHLY``
+        start: Start of the first completed period
+        completed: Number of completed periods
+
+    Returns:
+        Tuple of (cached totals, start of the first open period, open count)
+    """
+    cached = rollup.completed(resolution, start, completed) if rollup else []
+    return cached, shift(start, resolution, len(cached)), completed - len(cached)
+
+
+def finalized_totals(
+    resolution: str,
+    nodes: Sequence[dict[str, Any]],
+    production_nodes: Sequence[dict[str, Any]],
+    now: datetime,
+) -> list[PeriodTotals]:
+    """Build cacheable totals from freshly fetched period nodes.
+
+    Each period is keyed by its node's ``from`` timestamp and production is
+    joined on the same timestamp, so a short or gapped response never files
+    totals under the wrong date. Periods that are not final yet, lack a
+    timestamp, cost or consumption, or lack a production node while the home
+    reports production are skipped.
+
+    Args:
+        resolution: ``DAILY`` or ``MONTHLY``
+        nodes: Consumption nodes of the fetched periods
+        production_nodes: Production nodes (empty for homes without solar)
+        now: Current time in the home's timezone
+
+    Returns:
+        Totals safe to cache
+    """
+    production_by_start: dict[datetime, Any] = {}
+    for node in production_nodes:
+        period_start = _period_start(node)
+        if period_start is not None:
+            production_by_start[period_start] = node.get("production")
+
+    totals = []
+    for node in nodes:
+        period_start = _period_start(node)
+        cost = node.get("cost")
+        consumption = node.get("consumption")
+        if period_start is None or cost is None or consumption is None:
+            continue
+        if not is_final(resolution, period_start, now):
+            continue
+        if production_nodes and period_start not in production_by_start:
+            continue
+        production = production_by_start.get(period_start)
+        totals.append(
+            PeriodTotals(
+                period_start.date(),
+                float(cost),
+                float(consumption),
+                float(production or 0.0),
+            )
+        )
+    return totals
+
+
+def _period_start(node: dict[str, Any]) -> datetime | None:
+    """Start of the period a node covers, from its ``from`` timestamp."""
+    try:
+        return datetime.fromisoformat(node["from"])
+    except (KeyError, TypeError, ValueError):
+        return None
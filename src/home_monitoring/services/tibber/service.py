@@ -1,15 +1,44 @@
 """Tibber service implementation - orchestrates data collection."""
 
-from datetime import UTC, datetime
-from typing import TypedDict
+import asyncio
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypedDict
 
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
+from home_monitoring.models.base import Measurement, Writable
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.base_service import BaseService
-from home_monitoring.services.tibber import aggregation, collection
+from home_monitoring.services.tibber import aggregation, collection, planner
+from home_monitoring.services.tibber.period_stats import (
+    STATS_FILENAME,
+    PeriodStatsStore,
+)
+from home_monitoring.services.tibber.rollup import ROLLUP_FILENAME, RollupCache
+from home_monitoring.services.watermarks import FetchWindow, align
+from home_monitoring.utils.lazy import lazy_import
 
-import tibber
+if TYPE_CHECKING:
+    import tibber
+else:
+    tibber = lazy_import("tibber")
+
+# watermark of the hourly consumption stored as ``last_hour``: the end of the
+# newest stored hour, which trails "now" by up to an hour plus Tibber's lag
+HOURLY_STREAM = "hourly_consumption"
+HOURLY_INTERVAL = timedelta(hours=2)
+# missed hours are filled in at most this far back
+HOURLY_MAX_WINDOW = timedelta(days=7)
+HOUR = timedelta(hours=1)
+
+
+def missed_hours(window: FetchWindow) -> int:
+    """Completed hours between the watermark and the latest completed hour."""
+    if window.watermark is None:
+        return 0
+    hours = (align(window.end, HOUR) - align(window.start, HOUR)) // HOUR
+    return max(0, hours - 1)
 
 
 class ConsumptionData(TypedDict):
@@ -41,10 +70,13 @@ class TibberService(BaseService):
         """
         super().__init__(settings=settings, repository=repository)
         self._user_agent = user_agent
+        self._stats = (
+            PeriodStatsStore(self._settings.state_dir / STATS_FILENAME)
+            if self._settings.tibber_stats
+            else None
+        )
 
-    async def collect_and_store(  # noqa: PLR0915 - refactor tracked for the tibber cleanup
-        self,
-    ) -> None:
+    async def collect_and_store(self) -> None:
         """Collect Tibber price and summary data and store in InfluxDB."""
         self._logger.info("collecting_electricity_data")
 
@@ -72,86 +104,33 @@ class TibberService(BaseService):
             await home.update_info()
             self._logger.debug("got_home_data", address=home.address1)
 
-            summary_timestamp = datetime.now(UTC)
-            measurements = []
-
-            # Get current time from price data (for aggregation calculations)
-            try:
-                _, price_timestamp, _ = home.current_price_data()
-                current_time = price_timestamp
-            except Exception:
-                current_time = None
-
-            # Collect price data
-            price_measurements = await collection.collect_price_data(
-                home, summary_timestamp
+            window = await self._resume_window(
+                HOURLY_STREAM, max_window=HOURLY_MAX_WINDOW, interval=HOURLY_INTERVAL
             )
-            measurements.extend(price_measurements)
-
-            # Day-ahead price curve (today + tomorrow once published ~13:00)
-            measurements.extend(await collection.collect_price_forecast_data(home))
-
-            # Collect individual period data
-            last_hour = await collection.collect_last_hour_data(home, summary_timestamp)
-            measurements.extend(last_hour)
-
-            last_day = await collection.collect_last_day_data(home, summary_timestamp)
-            measurements.extend(last_day)
-
-            # Collect aggregated period data (this_day, this_month, this_year)
-            # Note: Must be called before this_hour to maintain test mock order
-            this_day_measurements, day_cost, day_consumption, day_production = (
-                await aggregation.aggregate_this_day_data(
-                    home, connection, summary_timestamp, current_time
-                )
-            )
-            measurements.extend(this_day_measurements)
-
-            this_month_measurements, month_cost, month_consumption, month_production = (
-                await aggregation.aggregate_this_month_data(
-                    home,
-                    connection,
-                    summary_timestamp,
-                    day_cost,
-                    day_consumption,
-                    day_production,
-                    current_time,
+            rollup = self._open_rollup()
+            try:
+                measurements, hourly_mark = await self._collect_measurements(
+                    home, connection, rollup, window
                 )
-            )
-            measurements.extend(this_month_measurements)
-
-            this_year_measurements = await aggregation.aggregate_this_year_data(
-                home,
-                connection,
-                summary_timestamp,
-                month_cost,
-                month_consumption,
-                month_production,
-                current_time,
-            )
-            measurements.extend(this_year_measurements)
-
-            # Collect remaining simple periods after aggregations
-            this_hour = await collection.collect_this_hour_data(home, summary_timestamp)
-            measurements.extend(this_hour)
-
-            last_month = await collection.collect_last_month_data(
-                home, summary_timestamp
-            )
-            measurements.extend(last_month)
-
-            last_year = await collection.collect_last_year_data(home, summary_timestamp)
-            measurements.extend(last_year)
+            finally:
+                if rollup is not None:
+                    rollup.close()
 
             # Store all measurements
             if not measurements:
                 self._logger.warning("no_tibber_measurements_to_store")
                 return
 
-            await self._db.write_measurements(measurements)
+            stats = await self._update_stats(measurements, datetime.now(UTC))
+            await self._db.write_measurements([*measurements, *stats])
+            if hourly_mark is not None:
+                self._advance_watermark(hourly_mark, HOURLY_STREAM)
+            if self._stats is not None:
+                self._stats.save()
             self._logger.info(
                 "tibber_data_stored",
                 point_count=len(measurements),
+                stats_point_count=len(stats),
             )
 
         except Exception as exc:
@@ -164,3 +143,170 @@ class TibberService(BaseService):
         finally:
             if "connection" in locals():
                 await connection.close_connection()
+
+    def _open_rollup(self) -> RollupCache | None:
+        """Open the rollup cache of finalized totals, if enabled and usable."""
+        if not self._settings.tibber_rollup_cache:
+            return None
+        try:
+            return RollupCache(self._settings.state_dir / ROLLUP_FILENAME)
+        except (OSError, sqlite3.Error) as e:
+            # without the cache every completed period is fetched again
+            self._logger.warning("tibber_rollup_unavailable", error=str(e))
+            return None
+
+    async def _update_stats(
+        self, measurements: list[Writable], now: datetime
+    ) -> list[Measurement]:
+        """Fold a run's prices, costs and consumption into the statistics.
+
+        The first run seeds the statistics from the stored points; if that
+        fails, it is retried on the next run.
+
+        Returns:
+            The ``electricity_stats`` point, if any statistic has a value
+        """
+        if self._stats is None:
+            return []
+        if not self._stats.seeded:
+            try:
+                await self._stats.seed(
+                    {
+                        name: self._db.query_chunks(query)
+                        for name, query in self._stats.seed_queries.items()
+                    }
+                )
+            except Exception as e:
+                self._logger.warning(
+                    "tibber_stats_seed_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+        self._stats.observe(measurements)
+        return self._stats.to_measurements(now)
+
+    async def _collect_measurements(
+        self,
+        home: Any,
+        connection: Any,
+        rollup: RollupCache | None = None,
+        hourly_window: FetchWindow | None = None,
+    ) -> tuple[list[Writable], datetime | None]:
+        """Collect all price and period measurements for one home.
+
+        The historic-data requests of every period are independent, so they
+        are prefetched concurrently (see ``planner``) into a per-run memo
+        (see ``memo``) that the collection and aggregation functions read
+        from; overlapping windows reach the Tibber API only once. Hours
+        completed since the hourly watermark but never stored are filled in
+        from the same hourly window.
+
+        Args:
+            home: Tibber home object (info already updated)
+            connection: Tibber connection with timezone info
+            rollup: Cache of finalized daily/monthly totals, if any
+            hourly_window: Resume window of the hourly consumption stream
+
+        Returns:
+            Measurements to store, and the new hourly watermark (if known)
+        """
+        summary_timestamp = datetime.now(UTC)
+        measurements: list[Writable] = []
+
+        # Get current time from price data (for aggregation calculations)
+        try:
+            _, price_timestamp, _ = home.current_price_data()
+            now = price_timestamp
+        except Exception:
+            now = None
+        if now is None:
+            now = datetime.now(connection.time_zone)
+
+        # Collect price data
+        price_measurements = await collection.collect_price_data(
+            home, summary_timestamp
+        )
+        measurements.extend(price_measurements)
+
+        # Day-ahead price curve (today + tomorrow once published ~13:00),
+        # fetched alongside the historic data
+        missed = missed_hours(hourly_window) if hourly_window else 0
+        planned_home, forecast = await asyncio.gather(
+            planner.prefetch_historic_data(
+                home,
+                planner.plan_requests(now, rollup, missed),
+                self._settings.tibber_max_concurrent_requests,
+            ),
+            collection.collect_price_forecast_data(home),
+        )
+        measurements.extend(forecast)
+
+        # Collect individual period data
+        last_hour = await collection.collect_last_hour_data(
+            planned_home, summary_timestamp
+        )
+        measurements.extend(last_hour)
+
+        missed_measurements, hourly_mark = await collection.collect_missed_hours(
+            planned_home,
+            hourly_window.watermark if hourly_window else None,
+            missed,
+        )
+        measurements.extend(missed_measurements)
+
+        last_day = await collection.collect_last_day_data(
+            planned_home, summary_timestamp
+        )
+        measurements.extend(last_day)
+
+        # Collect aggregated period data (this_day, this_month, this_year)
+        this_day_measurements, day_cost, day_consumption, day_production = (
+            await aggregation.aggregate_this_day_data(
+                planned_home, connection, summary_timestamp, now
+            )
+        )
+        measurements.extend(this_day_measurements)
+
+        this_month_measurements, month_cost, month_consumption, month_production = (
+            await aggregation.aggregate_this_month_data(
+                planned_home,
+                connection,
+                summary_timestamp,
+                day_cost,
+                day_consumption,
+                day_production,
+                now,
+                rollup,
+            )
+        )
+        measurements.extend(this_month_measurements)
+
+        this_year_measurements = await aggregation.aggregate_this_year_data(
+            planned_home,
+            connection,
+            summary_timestamp,
+            month_cost,
+            month_consumption,
+            month_production,
+            now,
+            rollup,
+        )
+        measurements.extend(this_year_measurements)
+
+        # Collect remaining simple periods after aggregations
+        this_hour = await collection.collect_this_hour_data(
+            planned_home, summary_timestamp
+        )
+        measurements.extend(this_hour)
+
+        last_month = await collection.collect_last_month_data(
+            planned_home, summary_timestamp
+        )
+        measurements.extend(last_month)
+
+        last_year = await collection.collect_last_year_data(
+            planned_home, summary_timestamp
+        )
+        measurements.extend(last_year)
+
+        return measurements, hourly_mark
@@ -0,0 +1,170 @@
+"""Per-stream high-water marks of incremental collectors.
+
+A collector that can fetch history records, per (service, stream), the point
+up to which it has stored a stream completely. The next run resumes there
+instead of fetching only "now" (which leaves holes after downtime) or a fixed
+window (which re-fetches what is already stored). ``plan_window`` turns a
+mark into the window to fetch, bounded by how far back the API is worth
+asking, and reports the gap since the last run.
+
+Marks live in ``state_dir/watermarks.json``, shared by every collector
+process: saves take an ``flock``, re-read the file and keep the newest mark
+of every stream, so no process can move a mark backwards.
+"""
+
+import fcntl
+import json
+import os
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from home_monitoring.utils.logging import get_logger
+
+WATERMARK_FILENAME = "watermarks.json"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# service -> stream -> mark (ISO 8601)
+Marks = dict[str, dict[str, str]]
+
+
+@dataclass(frozen=True)
+class FetchWindow:
+    """Where a collector resumes a stream.
+
+    Attributes:
+        start: Start of the window to fetch
+        end: End of the window to fetch (the current time)
+        watermark: Stored mark, or None on the first run
+        gap: Time since the mark beyond one regular interval; zero if the
+            previous run was on time or there is no mark
+        truncated: Whether the mark lies before the window, i.e. part of the
+            gap is older than the API is asked for and stays missing
+    """
+
+    start: datetime
+    end: datetime
+    watermark: datetime | None
+    gap: timedelta
+    truncated: bool
+
+
+def align(moment: datetime, interval: timedelta) -> datetime:
+    """Round ``moment`` down to a multiple of ``interval`` (since the epoch)."""
+    return moment - (moment - _EPOCH) % interval
+
+
+def plan_window(
+    watermark: datetime | None,
+    now: datetime,
+    max_window: timedelta,
+    interval: timedelta,
+) -> FetchWindow:
+    """Window to fetch for a stream last stored up to ``watermark``.
+
+    Args:
+        watermark: Stored mark, None if the stream was never collected
+        now: Current time (end of the window)
+        max_window: Furthest the window reaches back
+        interval: Regular distance between mark and ``now``; anything
+            beyond is a gap
+
+    Returns:
+        The window; without a mark it spans ``max_window``
+    """
+    oldest = now - max_window
+    if watermark is None:
+        return FetchWindow(oldest, now, None, timedelta(0), truncated=False)
+    return FetchWindow(
+        start=max(watermark, oldest),
+        end=now,
+        watermark=watermark,
+        gap=max(timedelta(0), now - watermark - interval),
+        truncated=watermark < oldest,
+    )
+
+
+class WatermarkStore:
+    """High-water mark per service and stream, kept on disk."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the store (the file is read on first lookup).
+
+        Args:
+            path: JSON file shared by every process using the same state dir
+        """
+        self._path = path
+        self._logger = get_logger(__name__)
+        self._marks: Marks | None = None
+        # advanced since the last save
+        self._dirty: Marks = {}
+
+    def get(self, service: str, stream: str) -> datetime | None:
+        """Mark of a stream, or None if it was never advanced."""
+        if self._marks is None:
+            self._marks = self._read()
+        raw = self._dirty.get(service, {}).get(stream)
+        raw = raw or self._marks.get(service, {}).get(stream)
+        return _parse(raw)
+
+    def advance(self, service: str, stream: str, mark: datetime) -> None:
+        """Move a stream's mark forward (an older mark is ignored)."""
+        current = self.get(service, stream)
+        if current is None or mark > current:
+            self._dirty.setdefault(service, {})[stream] = mark.isoformat()
+
+    def save(self) -> None:
+        """Merge advanced marks into the file (newest wins).
+
+        Failures are logged, not raised: a lost mark only means the next run
+        fetches a wider window.
+        """
+        if not self._dirty:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.with_suffix(".lock").open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                marks = self._read()
+                for service, streams in self._dirty.items():
+                    stored = marks.setdefault(service, {})
+                    for stream, raw in streams.items():
+                        if _newer(raw, stored.get(stream)):
+                            stored[stream] = raw
+                tmp = self._path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(marks, indent=2))
+                os.replace(tmp, self._path)
+        except OSError as e:
+            self._logger.warning("watermarks_save_failed", error=str(e))
+            return
+        self._marks = marks
+        self._dirty = {}
+
+    def _read(self) -> Marks:
+        """Marks stored on disk; a missing or corrupt file is empty."""
+        try:
+            data: Any = json.loads(self._path.read_text())
+            return {
+                str(service): {str(k): str(v) for k, v in streams.items()}
+                for service, streams in data.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self._logger.warning("watermarks_unreadable", error=str(e))
+            return {}
+
+
+def _parse(raw: str | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _newer(raw: str, stored: str | None) -> bool:
+    """Whether mark ``raw`` is newer than ``stored`` (or ``stored`` is unusable)."""
+    mark, current = _parse(raw), _parse(stored)
+    return mark is not None and (current is None or mark > current)
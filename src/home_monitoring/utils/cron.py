@@ -0,0 +1,146 @@
+"""Cron-style schedule specifications.
+
+Supports the five classic crontab fields (minute, hour, day of month, month,
+day of week) with ``*``, single values, ranges (``1-5``), lists (``0,30``)
+and steps (``*/5``, ``10-50/20``). Day of week counts from Sunday = 0 (7 is
+accepted as Sunday too). As in cron, if both day fields are restricted a day
+matches when either of them does.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from home_monitoring.core.exceptions import ValidationError
+
+# (name, lowest, highest) of each field, in crontab order
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+# crontab accepts both 0 and 7 for Sunday
+_SUNDAY_ALIAS = 7
+
+# give up on specs that never match (e.g. "0 0 31 2 *") after this long
+_SEARCH_LIMIT = timedelta(days=4 * 366)
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> frozenset[int]:
+    """Parse one crontab field into the set of values it matches."""
+    values: set[int] = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        try:
+            step = int(step_text) if step_text else 1
+            if spec == "*":
+                first, last = low, high
+            elif "-" in spec:
+                first_text, last_text = spec.split("-", 1)
+                first, last = int(first_text), int(last_text)
+            else:
+                first = int(spec)
+                last = high if step_text else first
+        except ValueError as e:
+            raise ValidationError(
+                "Invalid cron field", details={"field": name, "value": text}
+            ) from e
+        if step < 1 or not low <= first <= last <= high:
+            raise ValidationError(
+                "Cron field out of range", details={"field": name, "value": text}
+            )
+        values.update(range(first, last + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSpec:
+    """A parsed five-field crontab schedule."""
+
+    expression: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    # whether the day fields were restricted (not ``*``)
+    day_restricted: bool
+    weekday_restricted: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSpec":
+        """Parse a crontab expression such as ``*/5 * * * *``.
+
+        Args:
+            expression: Five whitespace-separated crontab fields
+
+        Returns:
+            Parsed schedule
+
+        Raises:
+            ValidationError: If the expression is malformed or out of range
+        """
+        parts = expression.split()
+        if len(parts) != len(_FIELDS):
+            raise ValidationError(
+                "Cron expression needs five fields",
+                details={"expression": expression},
+            )
+        minutes, hours, days, months, weekdays = (
+            _parse_field(part, *field)
+            for part, field in zip(parts, _FIELDS, strict=True)
+        )
+        if _SUNDAY_ALIAS in weekdays:
+            weekdays = (weekdays - {_SUNDAY_ALIAS}) | {0}
+        return cls(
+            expression=expression,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=weekdays,
+            day_restricted=not parts[2].startswith("*"),
+            weekday_restricted=not parts[4].startswith("*"),
+        )
+
+    def matches_day(self, moment: datetime) -> bool:
+        """Whether the date of ``moment`` is a scheduled day."""
+        if moment.month not in self.months:
+            return False
+        day = moment.day in self.days
+        # Python counts Monday = 0, cron counts Sunday = 0
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first scheduled minute strictly after ``moment``.
+
+        The result keeps the timezone (or naivety) of ``moment``.
+
+        Args:
+            moment: Reference time
+
+        Returns:
+            Start of the next matching minute
+
+        Raises:
+            ValidationError: If the schedule never matches
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + _SEARCH_LIMIT
+        while candidate <= limit:
+            if not self.matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValidationError(
+            "Cron expression never matches", details={"expression": self.expression}
+        )
@@ -4,12 +4,23 @@ Every collector talks to a vendor cloud API. Without a timeout a slow/hung
 endpoint blocks the cron slot indefinitely; without retries a single transient
 blip fails the whole run. These helpers give every service the same bounded,
 retrying client.
+
+Clients are long-lived: ``HttpClientRegistry`` keeps one pooled client per
+host for the whole process, so repeated calls to the same vendor API reuse
+keep-alive connections instead of paying a TLS handshake and DNS lookup each
+time.
 """
 
 import asyncio
+import importlib.util
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
+from home_monitoring.config import Settings, get_settings
+from home_monitoring.utils.logging import get_logger
 
 # total request budget and a tighter connect budget — a hung endpoint must not
 # outlast the cron cadence
@@ -18,20 +29,191 @@ DEFAULT_RETRIES = 2
 DEFAULT_BASE_DELAY = 1.0
 RETRYABLE_STATUS = frozenset({500, 502, 503, 504})
 
+# vendor APIs are small and rate-limited; a handful of connections per host is
+# plenty and keeps the Pi's socket count bounded
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+# pooled clients are recycled after this long so DNS changes are picked up
+DEFAULT_CLIENT_LIFETIME = 3600.0
+
+ClientFactory = Callable[..., httpx.AsyncClient]
+
 
 def make_async_client(
     timeout: httpx.Timeout | float = DEFAULT_TIMEOUT,
+    limits: httpx.Limits | None = None,
+    http2: bool = False,
 ) -> httpx.AsyncClient:
     """Create an httpx async client with a sane default timeout.
 
     Args:
         timeout: Request timeout (httpx.Timeout or seconds). Defaults to
             DEFAULT_TIMEOUT.
+        limits: Connection pool limits. Defaults to httpx's defaults.
+        http2: Whether to negotiate HTTP/2 (requires the ``h2`` package).
 
     Returns:
         A configured ``httpx.AsyncClient`` (use as an async context manager).
     """
-    return httpx.AsyncClient(timeout=timeout)
+    if limits is None:
+        return httpx.AsyncClient(timeout=timeout, http2=http2)
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+
+def _http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientRegistry:
+    """Process-wide pool of long-lived httpx clients, one per host.
+
+    Each host gets its own client so the connection limit applies per host.
+    Clients are recycled after ``lifetime`` seconds; a recycled client is kept
+    open for one more timeout budget so in-flight requests can finish.
+    """
+
+    def __init__(  # noqa: PLR0913 - pool knobs are independent settings
+        self,
+        *,
+        timeout: httpx.Timeout | float = DEFAULT_TIMEOUT,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        lifetime: float = DEFAULT_CLIENT_LIFETIME,
+        client_factory: ClientFactory = make_async_client,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            timeout: Request timeout for every client
+            max_connections_per_host: Connection limit of each per-host pool
+            keepalive_expiry: Idle seconds before a pooled connection is closed
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+            lifetime: Seconds after which a host's client is recycled
+            client_factory: Factory used to build clients (injectable in tests)
+        """
+        self._logger = get_logger(__name__)
+        self._timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and _http2_available()
+        if http2 and not self._http2:
+            self._logger.warning("http2_unavailable", reason="h2 not installed")
+        self._lifetime = lifetime
+        self._client_factory = client_factory
+        self._clients: dict[str, tuple[float, httpx.AsyncClient]] = {}
+        self._retired: list[tuple[float, httpx.AsyncClient]] = []
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "HttpClientRegistry":
+        """Create a registry configured from application settings."""
+        return cls(
+            max_connections_per_host=settings.http_max_connections_per_host,
+            keepalive_expiry=settings.http_keepalive_seconds,
+            http2=settings.http2,
+            lifetime=settings.http_client_lifetime_seconds,
+        )
+
+    async def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host of ``url``.
+
+        Do not close the returned client; the registry owns its lifetime.
+
+        Args:
+            url: Request URL (or bare host) the client will be used for
+
+        Returns:
+            A shared, connection-pooling ``httpx.AsyncClient``
+        """
+        host = httpx.URL(url).host or url
+        now = time.monotonic()
+        entry = self._clients.get(host)
+        if entry is not None and now - entry[0] >= self._lifetime:
+            self._retired.append((now, entry[1]))
+            entry = None
+        if entry is None:
+            client = self._client_factory(
+                timeout=self._timeout, limits=self._limits, http2=self._http2
+            )
+            entry = (now, client)
+            self._clients[host] = entry
+            self._logger.debug("http_client_created", host=host, http2=self._http2)
+        await self._close_retired(now)
+        return entry[1]
+
+    async def _close_retired(self, now: float) -> None:
+        """Close recycled clients whose grace period has passed."""
+        grace = _timeout_budget(self._timeout)
+        keep = []
+        for retired_at, client in self._retired:
+            if now - retired_at >= grace:
+                await client.aclose()
+            else:
+                keep.append((retired_at, client))
+        self._retired = keep
+
+    async def aclose(self) -> None:
+        """Close every pooled and recycled client."""
+        clients = [client for _, client in self._clients.values()]
+        clients.extend(client for _, client in self._retired)
+        self._clients.clear()
+        self._retired.clear()
+        for client in clients:
+            await client.aclose()
+
+
+def _timeout_budget(timeout: httpx.Timeout | float) -> float:
+    """Longest time a single request may take under ``timeout``."""
+    if isinstance(timeout, httpx.Timeout):
+        parts = [timeout.connect, timeout.read, timeout.write, timeout.pool]
+        return sum(part for part in parts if part is not None)
+    return float(timeout)
+
+
+class HttpClientManager:
+    """Singleton manager for the process-wide HTTP client registry."""
+
+    _instance: HttpClientRegistry | None = None
+
+    @classmethod
+    def get_registry(cls, settings: Settings | None = None) -> HttpClientRegistry:
+        """Get the process-wide registry, creating it on first use.
+
+        Args:
+            settings: Settings used to configure the registry on creation.
+                Defaults to the application settings.
+        """
+        if cls._instance is None:
+            cls._instance = HttpClientRegistry.from_settings(settings or get_settings())
+        return cls._instance
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close and drop the process-wide registry."""
+        if cls._instance is not None:
+            registry, cls._instance = cls._instance, None
+            await registry.aclose()
+
+
+def get_http_clients(settings: Settings | None = None) -> HttpClientRegistry:
+    """Get the process-wide HTTP client registry.
+
+    Args:
+        settings: Settings used to configure the registry on first use.
+
+    Returns:
+        The shared registry
+    """
+    return HttpClientManager.get_registry(settings)
+
+
+async def close_http_clients() -> None:
+    """Close all process-wide HTTP clients (call once at shutdown)."""
+    await HttpClientManager.close()
 
 
 async def request_with_retries(
@@ -75,3 +257,53 @@ async def request_with_retries(
                 return response
         await asyncio.sleep(base_delay * (2**attempt))
         attempt += 1
+
+
+@asynccontextmanager
+async def stream_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    retries: int = DEFAULT_RETRIES,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    **kwargs: Any,
+) -> AsyncIterator[httpx.Response]:
+    """Like ``request_with_retries``, but leave the body unread for streaming.
+
+    Retries happen only until response headers arrive; once the response is
+    handed to the caller its body is consumed incrementally (e.g. via
+    ``aiter_text``) and the connection is released when the block exits.
+
+    Args:
+        client: The async client to use.
+        method: HTTP method.
+        url: Request URL.
+        retries: Maximum number of retries after the first attempt.
+        base_delay: Base backoff delay in seconds (doubled each attempt).
+        **kwargs: Forwarded to ``client.build_request``.
+
+    Yields:
+        The HTTP response with an unread body.
+
+    Raises:
+        httpx.TransportError: If transport failures persist past all retries.
+    """
+    request = client.build_request(method, url, **kwargs)
+    attempt = 0
+    while True:
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError:
+            if attempt >= retries:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS or attempt >= retries:
+                break
+            await response.aclose()
+        await asyncio.sleep(base_delay * (2**attempt))
+        attempt += 1
+    try:
+        yield response
+    finally:
+        await response.aclose()
@@ -0,0 +1,264 @@
+"""Incremental JSON parsing for large API responses.
+
+``json.loads`` needs the whole body in memory and then materializes every
+object at once. ``JsonEventParser`` instead accepts the body in arbitrary text
+chunks (e.g. from ``httpx.Response.aiter_text``) and emits ijson-style
+``(prefix, event, value)`` events as soon as the tokens are complete, so the
+caller can fold the document into its own compact representation while it
+streams in.
+
+Prefixes are dot-joined object keys, with ``item`` for array elements:
+``{"a": [{"b": 1}]}`` reports ``1`` under the prefix ``a.item.b``. Small
+repeated values (such as the rows of a time series) can be decoded in one
+``json`` call each by naming their prefix in ``materialize``; they are then
+reported as a single ``value`` event.
+"""
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from home_monitoring.core.exceptions import ValidationError
+
+Event = tuple[str, str, Any]
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<punct>[{}\[\]:,])
+        |(?P<string>"(?:[^"\\]|\\.)*")
+        |(?P<number>-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)
+        |(?P<literal>true|false|null)
+    )""",
+    re.VERBOSE,
+)
+_WHITESPACE = re.compile(r"\s*")
+# comma after an array item, consumed directly after a materialized value
+_ITEM_SEPARATOR = re.compile(r"\s*,")
+# characters that could still extend a number split across chunks
+_NUMBER_TAIL = re.compile(r"[\d.eE+-]*\Z")
+_LITERALS: dict[str, tuple[str, Any]] = {
+    "true": ("boolean", True),
+    "false": ("boolean", False),
+    "null": ("null", None),
+}
+
+# what a container expects next
+_FIRST = 0  # first key (map) / first value (array), or the closing bracket
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_NEXT = 4  # a comma or the closing bracket
+
+
+@dataclass
+class _Frame:
+    """An open object or array."""
+
+    is_map: bool
+    prefix: str
+    state: int = _FIRST
+    # prefix of the value currently being parsed in this container
+    child: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.is_map:
+            self.child = self._join("item")
+
+    def set_key(self, key: str) -> None:
+        """Enter the value of ``key`` (objects only)."""
+        self.child = self._join(key)
+
+    def _join(self, segment: str) -> str:
+        return f"{self.prefix}.{segment}" if self.prefix else segment
+
+
+class JsonEventParser:
+    """Push parser turning JSON text chunks into ``(prefix, event, value)``.
+
+    Events are ``start_map``, ``map_key``, ``end_map``, ``start_array``,
+    ``end_array``, ``string``, ``number``, ``boolean``, ``null`` and, for
+    prefixes listed in ``materialize``, ``value``. Only the unconsumed tail of
+    the input is buffered.
+    """
+
+    def __init__(self, materialize: Iterable[str] = ()) -> None:
+        """Initialize the parser.
+
+        Args:
+            materialize: Prefixes whose values are decoded whole and reported
+                as one ``value`` event instead of a stream of events
+        """
+        self._materialize = frozenset(materialize)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._stack: list[_Frame] = []
+        self._complete = False
+
+    def feed(self, text: str) -> list[Event]:
+        """Parse the next chunk of the document.
+
+        Args:
+            text: Next chunk of JSON text (may split tokens anywhere)
+
+        Returns:
+            Events for every token completed by this chunk
+
+        Raises:
+            ValidationError: If the document is malformed
+        """
+        self._buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> list[Event]:
+        """Finish parsing after the last chunk.
+
+        Returns:
+            Events for the tokens still buffered
+
+        Raises:
+            ValidationError: If the document is malformed or truncated
+        """
+        events = self._drain(final=True)
+        if self._stack or not self._complete:
+            raise ValidationError("Truncated JSON document")
+        return events
+
+    def _drain(self, final: bool) -> list[Event]:
+        """Emit events for all complete tokens in the buffer."""
+        events: list[Event] = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            whitespace = _WHITESPACE.match(buffer, pos)
+            pos = whitespace.end() if whitespace else pos
+            if pos == len(buffer):
+                break
+            if self._expects_value() and self._value_prefix() in self._materialize:
+                try:
+                    value, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if not final:
+                        break  # wait for the rest of the value
+                    raise ValidationError(
+                        "Malformed JSON document", details={"error": str(e)}
+                    ) from e
+                if (
+                    not final
+                    and isinstance(value, int | float)
+                    and _NUMBER_TAIL.match(buffer, end)
+                ):
+                    break  # the number may continue in the next chunk
+                events.append((self._value_prefix(), "value", value))
+                self._value_done()
+                pos = end
+                # skip the tokenizer for the comma between materialized items
+                separator = _ITEM_SEPARATOR.match(buffer, pos)
+                if separator and self._stack and not self._stack[-1].is_map:
+                    self._stack[-1].state = _VALUE
+                    pos = separator.end()
+                continue
+            match = _TOKEN.match(buffer, pos)
+            # a number at the end of the buffer may continue in the next chunk
+            if match is None or (
+                not final
+                and match.lastgroup == "number"
+                and _NUMBER_TAIL.match(buffer, match.end())
+            ):
+                if not final:
+                    break
+                raise ValidationError(
+                    "Malformed JSON document", details={"near": buffer[pos : pos + 20]}
+                )
+            self._token(match, events)
+            pos = match.end()
+        self._buffer = buffer[pos:]
+        return events
+
+    def _expects_value(self) -> bool:
+        if not self._stack:
+            return not self._complete
+        frame = self._stack[-1]
+        return frame.state == _VALUE or (frame.state == _FIRST and not frame.is_map)
+
+    def _value_prefix(self) -> str:
+        return self._stack[-1].child if self._stack else ""
+
+    def _value_done(self) -> None:
+        if self._stack:
+            self._stack[-1].state = _NEXT
+        else:
+            self._complete = True
+
+    def _token(self, match: re.Match[str], events: list[Event]) -> None:
+        """Apply one token to the parser state, appending its events."""
+        kind = match.lastgroup
+        text = match.group(kind) if kind else ""
+        frame = self._stack[-1] if self._stack else None
+
+        if self._expects_value():
+            if text == "]" and frame is not None and frame.state == _FIRST:
+                self._close(events)
+                handled = True
+            else:
+                handled = self._value(kind, text, events)
+        else:
+            handled = frame is not None and self._punctuation(frame, kind, text, events)
+        if not handled:
+            raise ValidationError("Unexpected JSON token", details={"token": text})
+
+    def _punctuation(
+        self, frame: _Frame, kind: str | None, text: str, events: list[Event]
+    ) -> bool:
+        """Handle a key, colon, comma or closing bracket; False if misplaced."""
+        if frame.is_map and frame.state in (_FIRST, _KEY) and kind == "string":
+            key = _decode_string(text)
+            frame.set_key(key)
+            frame.state = _COLON
+            events.append((frame.prefix, "map_key", key))
+        elif frame.state == _COLON and text == ":":
+            frame.state = _VALUE
+        elif frame.state == _NEXT and text == ",":
+            frame.state = _KEY if frame.is_map else _VALUE
+        elif (frame.is_map and text == "}" and frame.state in (_FIRST, _NEXT)) or (
+            not frame.is_map and text == "]" and frame.state == _NEXT
+        ):
+            self._close(events)
+        else:
+            return False
+        return True
+
+    def _value(self, kind: str | None, text: str, events: list[Event]) -> bool:
+        """Handle a token in value position; False if it cannot start a value."""
+        prefix = self._value_prefix()
+        if text in ("{", "["):
+            is_map = text == "{"
+            events.append((prefix, "start_map" if is_map else "start_array", None))
+            self._stack.append(_Frame(is_map=is_map, prefix=prefix))
+            return True
+        if kind == "string":
+            events.append((prefix, "string", _decode_string(text)))
+        elif kind == "number":
+            number = float(text) if any(c in text for c in ".eE") else int(text)
+            events.append((prefix, "number", number))
+        elif kind == "literal":
+            event, value = _LITERALS[text]
+            events.append((prefix, event, value))
+        else:
+            return False
+        self._value_done()
+        return True
+
+    def _close(self, events: list[Event]) -> None:
+        frame = self._stack.pop()
+        events.append((frame.prefix, "end_map" if frame.is_map else "end_array", None))
+        self._value_done()
+
+
+def _decode_string(token: str) -> str:
+    """Decode a JSON string token (with its quotes)."""
+    if "\\" not in token:
+        return token[1:-1]
+    decoded: str = json.loads(token)
+    return decoded
@@ -0,0 +1,74 @@
+"""Deferred imports for vendor SDKs and heavy dependencies.
+
+Collectors start from cron (or once per boot under the collector daemon) on a
+Raspberry Pi, where importing every vendor SDK up front costs noticeable
+start-up time even when a run only needs one of them. ``lazy_import`` binds a
+module object whose code runs on first attribute access, and
+``lazy_exports`` lets a package ``__init__`` re-export names that are only
+imported when they are used.
+
+Typical use keeps static typing intact::
+
+    if TYPE_CHECKING:
+        import tibber
+    else:
+        tibber = lazy_import("tibber")
+"""
+
+import importlib
+import importlib.util
+import sys
+from collections.abc import Callable, Mapping
+from types import ModuleType
+from typing import Any
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return ``name`` as a module that is executed on first attribute access.
+
+    A module that was already imported is returned as is. A missing module
+    still fails here, like a regular import, rather than on first use.
+
+    Args:
+        name: Absolute module name (parents are imported eagerly)
+
+    Returns:
+        The (possibly not yet executed) module, registered in ``sys.modules``
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> Callable[[str], Any]:
+    """Build a module ``__getattr__`` importing re-exported names on use.
+
+    Args:
+        package: ``__name__`` of the package doing the re-export
+        exports: Exported name to the relative submodule defining it
+
+    Returns:
+        Function to assign to the package's ``__getattr__``
+    """
+
+    def __getattr__(name: str) -> Any:  # noqa: N807 - module __getattr__ hook
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{submodule}", package), name)
+        # cache on the package so later lookups skip this hook
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
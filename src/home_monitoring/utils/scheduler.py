@@ -0,0 +1,188 @@
+"""In-process asyncio scheduler for collector jobs.
+
+Replaces one cron process per collector tick: every job runs on its own
+``CronSpec`` inside one long-lived event loop, so interpreter start-up,
+imports, settings parsing and client construction happen once per boot.
+
+A job whose previous run is still in progress skips the tick (the former
+``flock -n`` behaviour of ``run_home_monitoring.sh``). Every run, failure and
+skip is timed, logged and, when a repository is given, written as a
+``collector_job_runs`` point so cadence and duration show up in Grafana.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from home_monitoring.models.base import Point
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.utils.cron import CronSpec
+from home_monitoring.utils.logging import get_logger
+
+METRICS_MEASUREMENT = "collector_job_runs"
+# seconds in-flight runs get to finish on shutdown before they are cancelled
+DEFAULT_SHUTDOWN_GRACE = 30.0
+
+JobCallable = Callable[[], Awaitable[object]]
+
+
+@dataclass(frozen=True)
+class Job:
+    """A named coroutine run on a cron schedule.
+
+    Attributes:
+        name: Job name used in logs and metrics
+        schedule: When the job is due
+        run: Coroutine factory performing one run; raising marks it failed
+    """
+
+    name: str
+    schedule: CronSpec
+    run: JobCallable
+
+
+@dataclass
+class JobStats:
+    """Timing counters of one job since the scheduler started."""
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_duration: float | None = None
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+
+
+class Scheduler:
+    """Run jobs on their schedules with overlap protection and timing."""
+
+    def __init__(
+        self,
+        jobs: Iterable[Job],
+        repository: InfluxDBRepository | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+        shutdown_grace: float = DEFAULT_SHUTDOWN_GRACE,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            jobs: Jobs to run; names must be unique
+            repository: Repository receiving per-run metrics. None disables
+                metric points (runs are still logged).
+            clock: Wall clock the schedules are evaluated in (local time,
+                like cron)
+            shutdown_grace: Seconds in-flight runs may take after ``stop``
+        """
+        self._jobs = list(jobs)
+        self._db = repository
+        self._clock = clock
+        self._shutdown_grace = shutdown_grace
+        self._logger = get_logger(__name__)
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._stopping = asyncio.Event()
+        self.stats = {job.name: JobStats() for job in self._jobs}
+
+    def stop(self) -> None:
+        """Ask ``run_forever`` to return once in-flight runs have finished."""
+        self._stopping.set()
+
+    async def run_forever(self) -> None:
+        """Schedule every job until ``stop`` is called."""
+        self._logger.info("scheduler_started", jobs=[job.name for job in self._jobs])
+        loops = [asyncio.create_task(self._loop(job)) for job in self._jobs]
+        try:
+            await self._stopping.wait()
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+            await self._drain()
+        self._logger.info("scheduler_stopped")
+
+    async def trigger(self, job: Job) -> bool:
+        """Start a run of ``job`` now unless one is still in progress.
+
+        Args:
+            job: Job to run
+
+        Returns:
+            True if a run was started, False if the tick was skipped
+        """
+        running = self._running.get(job.name)
+        if running is not None and not running.done():
+            stats = self.stats[job.name]
+            stats.skipped += 1
+            self._logger.warning("job_skipped_overlap", job=job.name)
+            await self._record(job.name, "skipped", 0.0)
+            return False
+        self._running[job.name] = asyncio.create_task(self.run_once(job))
+        return True
+
+    async def run_once(self, job: Job) -> None:
+        """Run ``job`` once, timing it and recording the outcome.
+
+        Failures are logged and counted, never raised, so one broken
+        collector cannot take the daemon down.
+
+        Args:
+            job: Job to run
+        """
+        stats = self.stats[job.name]
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = "failed"
+            stats.failures += 1
+            self._logger.error("job_failed", job=job.name, error=str(e))
+        duration = time.perf_counter() - start
+        stats.runs += 1
+        stats.last_duration = duration
+        stats.max_duration = max(stats.max_duration, duration)
+        stats.total_duration += duration
+        self._logger.info(
+            "job_finished",
+            job=job.name,
+            status=status,
+            duration_ms=round(duration * 1000, 1),
+        )
+        await self._record(job.name, status, duration)
+
+    async def _loop(self, job: Job) -> None:
+        """Sleep until each due time of ``job`` and trigger it."""
+        due = self._clock()
+        while True:
+            # never fire the same minute twice if the sleep woke up early
+            due = job.schedule.next_after(max(self._clock(), due))
+            await asyncio.sleep(max((due - self._clock()).total_seconds(), 0.0))
+            await self.trigger(job)
+
+    async def _drain(self) -> None:
+        """Wait for in-flight runs, cancelling those past the grace period."""
+        pending = [task for task in self._running.values() if not task.done()]
+        if not pending:
+            return
+        _, late = await asyncio.wait(pending, timeout=self._shutdown_grace)
+        for task in late:
+            task.cancel()
+        await asyncio.gather(*late, return_exceptions=True)
+
+    async def _record(self, name: str, status: str, duration: float) -> None:
+        """Write one run metric; a failed write is logged, not raised."""
+        if self._db is None:
+            return
+        point = Point(
+            measurement=METRICS_MEASUREMENT,
+            tags={"job": name, "status": status},
+            fields={"duration_seconds": duration},
+            timestamp=datetime.now(UTC),
+        )
+        try:
+            await self._db.write_measurements([point])
+        except Exception as e:
+            self._logger.warning("job_metrics_write_failed", job=name, error=str(e))
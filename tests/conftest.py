@@ -1,14 +1,17 @@
 """Test configuration and fixtures."""
 
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 from home_monitoring.config import Settings
+from home_monitoring.utils.http import HttpClientManager
 from pytest_mock import MockerFixture
 
 
 @pytest.fixture
-def mock_settings() -> Settings:
+def mock_settings(tmp_path: Path) -> Settings:
     """Mock settings."""
     return Settings(
         # InfluxDB settings
@@ -34,6 +37,8 @@ def mock_settings() -> Settings:
         tibber_access_token="test",
         # Tankerkoenig settings
         tankerkoenig_api_key="test",
+        # Local state stays inside the test's temporary directory
+        state_dir=tmp_path / "state",
         # Logging settings
         log_level="INFO",
         json_logs=False,
@@ -61,3 +66,10 @@ def mock_influxdb(mocker: MockerFixture, mock_settings: Settings) -> AsyncMock:
     mock.write_measurements = mocker.AsyncMock()
     mock.query = mocker.AsyncMock()
     return mock
+
+
+@pytest.fixture(autouse=True)
+def reset_http_clients() -> Iterator[None]:
+    """Drop the process-wide HTTP client registry between tests."""
+    yield
+    HttpClientManager._instance = None
@@ -1,21 +1,26 @@
 """Integration tests for SolarEdge service."""
 
 import asyncio
+import tempfile
 from datetime import UTC, datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
+from home_monitoring.models.base import SeriesBatch
 from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.solaredge.service import SolarEdgeService
+from home_monitoring.utils.http import HttpClientRegistry
 
 EXPECTED_PRODUCTION = 2953.0
 EXPECTED_CONSUMPTION = 29885.0
 
 
 @pytest.mark.asyncio
-async def test_solaredge_data_collection_and_storage() -> None:
+async def test_solaredge_data_collection_and_storage(tmp_path: Path) -> None:
     """Integration test to verify SolarEdge detailed data collection and storage."""
     # Mock API responses for detailed energy and power data
     mock_energy_details_response = {
@@ -75,6 +80,7 @@ async def test_solaredge_data_collection_and_storage() -> None:
         influxdb_host="localhost",
         influxdb_port=8086,
         influxdb_database="test_db",
+        state_dir=tmp_path,
     )
 
     # Mock InfluxDB repository to capture what gets stored
@@ -82,6 +88,12 @@ async def test_solaredge_data_collection_and_storage() -> None:
     stored_measurements = []
 
     async def capture_measurements(measurements):
+        # details are written as columnar batches; expand them for inspection
+        measurements = [
+            row
+            for item in measurements
+            for row in (item.rows() if isinstance(item, SeriesBatch) else [item])
+        ]
         stored_measurements.extend(measurements)
         print(f"\n=== CAPTURED {len(measurements)} MEASUREMENTS ===")
         for i, measurement in enumerate(measurements):
@@ -94,87 +106,86 @@ async def test_solaredge_data_collection_and_storage() -> None:
 
     mock_influxdb.write_measurements.side_effect = capture_measurements
 
-    # Create service and mock its internal methods directly
-    service = SolarEdgeService(settings=settings)
-    service._db = mock_influxdb
+    # Serve the API responses through a mock transport; the service streams
+    # and parses them like real responses
+    def serve(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/energyDetails"):
+            return httpx.Response(200, json=mock_energy_details_response)
+        return httpx.Response(200, json=mock_power_details_response)
 
-    # Mock the internal API methods directly
-    with (
-        patch.object(
-            service, "_get_energy_details", return_value=mock_energy_details_response
-        ),
-        patch.object(
-            service, "_get_power_details", return_value=mock_power_details_response
-        ),
-    ):
-
-        print("=== STARTING SOLAREDGE DETAILED DATA COLLECTION ===")
-        start_time = datetime(2015, 11, 16, 0, 0, 0, tzinfo=UTC)
-        end_time = datetime(2015, 11, 23, 0, 0, 0, tzinfo=UTC)
-
-        # Collect energy and power details
-        await service.collect_and_store_energy_details(
-            start_time,
-            end_time,
-            time_unit="WEEK",
-            meters=["PRODUCTION", "CONSUMPTION"],
+    http_clients = HttpClientRegistry(
+        client_factory=lambda **kwargs: httpx.AsyncClient(
+            transport=httpx.MockTransport(serve)
         )
+    )
+    service = SolarEdgeService(settings=settings, http_clients=http_clients)
+    service._db = mock_influxdb
 
-        power_start = datetime(2015, 11, 21, 11, 0, 0, tzinfo=UTC)
-        power_end = datetime(2015, 11, 21, 11, 30, 0, tzinfo=UTC)
-        await service.collect_and_store_power_details(
-            power_start,
-            power_end,
-            meters=["PRODUCTION", "CONSUMPTION"],
-        )
+    print("=== STARTING SOLAREDGE DETAILED DATA COLLECTION ===")
+    start_time = datetime(2015, 11, 16, 0, 0, 0, tzinfo=UTC)
+    end_time = datetime(2015, 11, 23, 0, 0, 0, tzinfo=UTC)
 
-        # Verify measurements were stored
-        assert len(stored_measurements) > 0, "No measurements were stored!"
+    # Collect energy and power details
+    await service.collect_and_store_energy_details(
+        start_time,
+        end_time,
+        time_unit="WEEK",
+        meters=["PRODUCTION", "CONSUMPTION"],
+    )
 
-        print("=== VERIFICATION RESULTS ===")
-        print(f"Total measurements stored: {len(stored_measurements)}")
+    power_start = datetime(2015, 11, 21, 11, 0, 0, tzinfo=UTC)
+    power_end = datetime(2015, 11, 21, 11, 30, 0, tzinfo=UTC)
+    await service.collect_and_store_power_details(
+        power_start,
+        power_end,
+        meters=["PRODUCTION", "CONSUMPTION"],
+    )
 
-        # Check for expected measurement types
-        measurement_names = [m.measurement for m in stored_measurements]
+    # Verify measurements were stored
+    assert len(stored_measurements) > 0, "No measurements were stored!"
 
-        print(f"Measurement names: {measurement_names}")
+    print("=== VERIFICATION RESULTS ===")
+    print(f"Total measurements stored: {len(stored_measurements)}")
 
-        assert (
-            "electricity_energy_watthour" in measurement_names
-        ), "Expected 'electricity_energy_watthour' measurement"
-        assert (
-            "electricity_power_watt" in measurement_names
-        ), "Expected 'electricity_power_watt' measurement"
+    # Check for expected measurement types
+    measurement_names = [m.measurement for m in stored_measurements]
 
-        # Check energy measurement fields
-        energy_measurement = next(
-            m
-            for m in stored_measurements
-            if m.measurement == "electricity_energy_watthour"
-        )
-        print("=== ENERGY MEASUREMENT FIELDS ===")
-        for field, value in energy_measurement.fields.items():
-            print(f"  {field}: {value}")
+    print(f"Measurement names: {measurement_names}")
 
-        assert energy_measurement.fields["Production"] == EXPECTED_PRODUCTION
-        assert energy_measurement.fields["Consumption"] == EXPECTED_CONSUMPTION
+    assert (
+        "electricity_energy_watthour" in measurement_names
+    ), "Expected 'electricity_energy_watthour' measurement"
+    assert (
+        "electricity_power_watt" in measurement_names
+    ), "Expected 'electricity_power_watt' measurement"
 
-        # Check power measurements
-        power_measurements = [
-            m for m in stored_measurements if m.measurement == "electricity_power_watt"
-        ]
-        print("=== POWER MEASUREMENTS ===")
-        print(f"Count: {len(power_measurements)}")
+    # Check energy measurement fields
+    energy_measurement = next(
+        m for m in stored_measurements if m.measurement == "electricity_energy_watthour"
+    )
+    print("=== ENERGY MEASUREMENT FIELDS ===")
+    for field, value in energy_measurement.fields.items():
+        print(f"  {field}: {value}")
+
+    assert energy_measurement.fields["Production"] == EXPECTED_PRODUCTION
+    assert energy_measurement.fields["Consumption"] == EXPECTED_CONSUMPTION
+
+    # Check power measurements
+    power_measurements = [
+        m for m in stored_measurements if m.measurement == "electricity_power_watt"
+    ]
+    print("=== POWER MEASUREMENTS ===")
+    print(f"Count: {len(power_measurements)}")
 
-        first_power = power_measurements[0]
-        print("=== FIRST POWER MEASUREMENT FIELDS ===")
-        for field, value in first_power.fields.items():
-            print(f"  {field}: {value}")
+    first_power = power_measurements[0]
+    print("=== FIRST POWER MEASUREMENT FIELDS ===")
+    for field, value in first_power.fields.items():
+        print(f"  {field}: {value}")
 
-        assert "Consumption" in first_power.fields
-        assert "Purchased" in first_power.fields
+    assert "Consumption" in first_power.fields
+    assert "Purchased" in first_power.fields
 
-        print("=== ALL VERIFICATIONS PASSED ===")
+    print("=== ALL VERIFICATIONS PASSED ===")
 
 
 @pytest.mark.asyncio
@@ -187,9 +198,13 @@ async def test_solaredge_missing_credentials() -> None:
 
 
 @pytest.mark.asyncio
-async def test_solaredge_api_error_handling() -> None:
+async def test_solaredge_api_error_handling(tmp_path: Path) -> None:
     """Test that API errors are handled and logged properly for energy details."""
-    settings = Settings(solaredge_api_key="test_api_key", solaredge_site_id="123456")
+    settings = Settings(
+        solaredge_api_key="test_api_key",
+        solaredge_site_id="123456",
+        state_dir=tmp_path,
+    )
 
     mock_influxdb = AsyncMock(spec=InfluxDBRepository)
 
@@ -216,4 +231,4 @@ async def test_solaredge_api_error_handling() -> None:
 
 if __name__ == "__main__":
     # Run the integration test directly
-    asyncio.run(test_solaredge_data_collection_and_storage())
+    asyncio.run(test_solaredge_data_collection_and_storage(Path(tempfile.mkdtemp())))
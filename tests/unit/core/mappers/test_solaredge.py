@@ -1,8 +1,14 @@
 """Unit tests for SolarEdge mapper."""
 
+import json
 from datetime import UTC, datetime
 
-from home_monitoring.core.mappers.solaredge import SolarEdgeMapper
+from home_monitoring.core.mappers.solaredge import (
+    SolarEdgeDetailsMerger,
+    SolarEdgeMapper,
+)
+from home_monitoring.repositories.line_protocol import encode_lines
+from home_monitoring.utils.json_stream import JsonEventParser
 
 EXPECTED_POWER_DETAIL_POINTS = 2
 
@@ -194,3 +200,98 @@ def test_power_details_to_measurements_invalid_unit() -> None:
     )
 
     assert points == []
+
+
+def stream_into(merger: SolarEdgeDetailsMerger, payload: dict, size: int) -> None:
+    """Feed ``payload`` to ``merger`` as JSON text in ``size``-byte chunks."""
+    text = json.dumps(payload)
+    parser = JsonEventParser(materialize=[merger.value_prefix])
+    for offset in range(0, len(text), size):
+        merger.feed(parser.feed(text[offset : offset + size]))
+    merger.feed(parser.close())
+
+
+def test_streamed_details_match_decoded_mapping() -> None:
+    """Streamed columnar batches encode exactly like the decoded mapping."""
+    values = [
+        {"date": f"2015-11-21 {hour:02d}:{minute:02d}:00", "value": hour + minute}
+        for hour in range(24)
+        for minute in (0, 15, 30, 45)
+    ]
+    payload = {
+        "powerDetails": {
+            "timeUnit": "QUARTER_OF_AN_HOUR",
+            "unit": "W",
+            "meters": [
+                {"type": "Production", "values": values},
+                {"type": "Consumption", "values": values[::2]},
+            ],
+        }
+    }
+    merger = SolarEdgeDetailsMerger("powerDetails")
+
+    stream_into(merger, payload, size=37)
+    batches = list(merger.batches(site_id="1", batch_size=40))
+
+    assert [len(batch) for batch in batches] == [40, 40, 16]
+    assert list(encode_lines(batches)) == list(
+        encode_lines(
+            SolarEdgeMapper.to_measurements(datetime.now(UTC), payload, site_id="1")
+        )
+    )
+
+
+def test_streamed_values_before_meter_type_are_kept() -> None:
+    """A meter whose "type" follows its "values" is still merged (unhappy path)."""
+    payload = {
+        "energyDetails": {
+            "meters": [
+                {"values": [{"date": "2015-11-16 00:00:00", "value": 2953}]},
+                {"type": "Production"},
+                {"values": [{"date": "2015-11-16 00:00:00", "value": 1}]},
+            ],
+            "unit": "Wh",
+        }
+    }
+    merger = SolarEdgeDetailsMerger("energyDetails")
+
+    stream_into(merger, payload, size=5)
+    points = merger.measurements(site_id="1")
+
+    assert merger.found_root
+    assert points == []
+
+    payload["energyDetails"]["meters"] = [
+        {
+            "values": [{"date": "2015-11-16 00:00:00", "value": 2953}],
+            "type": "Production",
+        }
+    ]
+    merger = SolarEdgeDetailsMerger("energyDetails")
+    stream_into(merger, payload, size=5)
+
+    assert merger.measurements(site_id="1")[0].fields["Production"] == 2953.0
+
+
+def test_streamed_details_with_wrong_root_or_unit_yield_nothing() -> None:
+    """Other roots are ignored and a unit mismatch drops all rows."""
+    payload = {
+        "powerDetails": {
+            "unit": "kW",
+            "meters": [
+                {
+                    "type": "Production",
+                    "values": [{"date": "2015-11-21 11:00:00", "value": 1}],
+                }
+            ],
+        }
+    }
+    power = SolarEdgeDetailsMerger("powerDetails")
+    energy = SolarEdgeDetailsMerger("energyDetails")
+
+    stream_into(power, payload, size=64)
+    stream_into(energy, payload, size=64)
+
+    assert power.measurements() == []
+    assert not energy.found_root
+    assert energy.measurements() == []
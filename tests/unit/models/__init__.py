@@ -0,0 +1 @@
+"""Model test package."""
@@ -0,0 +1,44 @@
+"""Tests for the measurement models."""
+
+from datetime import UTC, datetime
+
+import pydantic
+import pytest
+from home_monitoring.models.base import Measurement, Point
+from home_monitoring.repositories.line_protocol import encode_lines
+
+TIMESTAMP = datetime(2024, 2, 16, 20, 0, tzinfo=UTC)
+
+
+def test_point_round_trips_and_encodes_like_measurement() -> None:
+    """Points convert to and from measurements and encode identically."""
+    measurement = Measurement(
+        measurement="electricity_power_watt",
+        tags={"site_id": "42"},
+        timestamp=TIMESTAMP,
+        fields={"Production": 1.5},
+    )
+
+    point = Point.from_measurement(measurement)
+
+    assert point == Point(
+        "electricity_power_watt", {"site_id": "42"}, {"Production": 1.5}, TIMESTAMP
+    )
+    assert point.to_measurement() == measurement
+    assert list(encode_lines([point])) == list(encode_lines([measurement]))
+
+
+def test_invalid_point_fails_validation_at_the_edge() -> None:
+    """Points skip validation until converted (unhappy path)."""
+    point = Point("m", {"tag": 1}, {"v": 1.0}, "not a timestamp")  # type: ignore[arg-type]
+
+    with pytest.raises(pydantic.ValidationError):
+        point.to_measurement()
+
+
+def test_point_is_immutable() -> None:
+    """Like the frozen model, a point cannot be reassigned (unhappy path)."""
+    point = Point("m", {}, {"v": 1.0}, TIMESTAMP)
+
+    with pytest.raises(AttributeError):
+        point.measurement = "other"  # type: ignore[misc]
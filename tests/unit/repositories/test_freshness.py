@@ -0,0 +1,120 @@
+"""Tests for the write-time freshness index."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from home_monitoring.config import Settings
+from home_monitoring.models.base import Point, SeriesBatch
+from home_monitoring.repositories.freshness import FRESHNESS_FILENAME, FreshnessIndex
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+
+T0 = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def price(station: str, offset_minutes: int) -> Point:
+    """One gas price point ``offset_minutes`` after T0."""
+    return Point(
+        "gas_prices_euro",
+        {"station_id": station},
+        {"e5": 1.799},
+        T0 + timedelta(minutes=offset_minutes),
+    )
+
+
+@pytest.mark.asyncio
+async def test_written_timestamps_answer_freshness_without_a_query(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """The newest point per measurement and series comes from the index."""
+    writer = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    await writer.write_measurements([price("aral", 5), price("shell", 10)])
+    await writer.write_measurements(
+        [SeriesBatch.from_columns("electricity_power_watt", {}, [T0], {"w": [1.0]})]
+    )
+
+    # another process sharing the state dir
+    reader = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    latest = await reader.get_latest_timestamps(
+        ["gas_prices_euro", "electricity_power_watt"]
+    )
+
+    assert latest == {
+        "gas_prices_euro": T0 + timedelta(minutes=10),
+        "electricity_power_watt": T0,
+    }
+    assert (
+        await reader.get_latest_timestamp("gas_prices_euro")
+        == latest["gas_prices_euro"]
+    )
+    index = FreshnessIndex(mock_settings.state_dir / FRESHNESS_FILENAME)
+    assert index.latest("gas_prices_euro", {"station_id": "aral"}) == T0 + timedelta(
+        minutes=5
+    )
+    mock_influxdb_client.query.assert_not_awaited()
+
+
+def test_concurrent_saves_never_move_an_entry_backwards(tmp_path: Path) -> None:
+    """Saves merge with the file; the newest timestamp of each series wins."""
+    path = tmp_path / FRESHNESS_FILENAME
+    early, late = FreshnessIndex(path), FreshnessIndex(path)
+    late.observe([price("aral", 30)])
+    late.save()
+    early.observe([price("aral", 20), price("shell", 25)])
+    early.save()
+
+    index = FreshnessIndex(path)
+    assert index.latest("gas_prices_euro", {"station_id": "aral"}) == T0 + timedelta(
+        minutes=30
+    )
+    assert index.latest("gas_prices_euro") == T0 + timedelta(minutes=30)
+    assert index.latest("gas_prices_euro", {"station_id": "esso"}) is None
+
+
+@pytest.mark.asyncio
+async def test_corrupt_index_falls_back_to_influxdb(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """An unreadable index is treated as empty, not as an error."""
+    path = mock_settings.state_dir / FRESHNESS_FILENAME
+    path.parent.mkdir(parents=True)
+    path.write_text("{not json")
+    mock_influxdb_client.query.return_value = {
+        "results": [{"series": [{"values": [["2024-05-01T00:00:00Z", 1.0]]}]}]
+    }
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+
+    assert await repository.get_latest_timestamp("gas_prices_euro") == T0
+    mock_influxdb_client.query.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_not_indexed(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """Points that never reached InfluxDB (nor the spool) stay unknown."""
+    settings = mock_settings.model_copy(update={"influxdb_spool": False})
+    mock_influxdb_client.write.side_effect = ConnectionError("down")
+    repository = InfluxDBRepository(settings=settings, client=mock_influxdb_client)
+
+    with pytest.raises(ConnectionError):
+        await repository.write_measurements([price("aral", 5)])
+
+    index = FreshnessIndex(settings.state_dir / FRESHNESS_FILENAME)
+    assert index.latest("gas_prices_euro") is None
+
+
+@pytest.mark.asyncio
+async def test_spooled_write_is_not_indexed(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """Spooled points may be evicted before replay, so they stay unknown."""
+    mock_influxdb_client.write.side_effect = [None, ConnectionError("down")]
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+
+    await repository.write_measurements([price("aral", 5)])
+    await repository.write_measurements([price("aral", 10)])
+
+    index = FreshnessIndex(mock_settings.state_dir / FRESHNESS_FILENAME)
+    assert index.latest("gas_prices_euro") == T0 + timedelta(minutes=5)
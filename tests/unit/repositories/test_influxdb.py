@@ -1,6 +1,9 @@
 """Unit tests for InfluxDB repository."""
 
+import sys
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
@@ -33,11 +36,10 @@ async def test_write_measurement_success(
 
     # Assert
     mock_influxdb_client.write.assert_called_once()
-    points = mock_influxdb_client.write.call_args[0][0]
-    assert len(points) == 1
-    assert points[0]["measurement"] == "test"
-    assert points[0]["tags"] == {"tag1": "value1"}
-    assert points[0]["fields"] == {"field1": 1.0}
+    payload = mock_influxdb_client.write.call_args[0][0]
+    lines = payload.decode().split("\n")
+    assert len(lines) == 1
+    assert lines[0].startswith("test,tag1=value1 field1=1.0 ")
 
 
 @pytest.mark.asyncio(scope="function")
@@ -46,9 +48,10 @@ async def test_write_measurement_error(
     mock_influxdb_client: AsyncMock,
     mock_settings: Settings,
 ) -> None:
-    """Test error handling in write_measurement."""
+    """Without a spool, write errors propagate."""
     # Arrange
-    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    settings = mock_settings.model_copy(update={"influxdb_spool": False})
+    repository = InfluxDBRepository(settings=settings, client=mock_influxdb_client)
     measurement = Measurement(
         measurement="test",
         tags={"tag1": "value1"},
@@ -91,14 +94,52 @@ async def test_write_measurements_success(
 
     # Assert
     mock_influxdb_client.write.assert_called_once()
-    points = mock_influxdb_client.write.call_args[0][0]
-    assert len(points) == EXPECTED_ITEM_COUNT
-    assert points[0]["measurement"] == "test1"
-    assert points[0]["tags"] == {"tag1": "value1"}
-    assert points[0]["fields"] == {"field1": 1.0}
-    assert points[1]["measurement"] == "test2"
-    assert points[1]["tags"] == {"tag2": "value2"}
-    assert points[1]["fields"] == {"field2": 2.0}
+    payload = mock_influxdb_client.write.call_args[0][0]
+    lines = payload.decode().split("\n")
+    assert len(lines) == EXPECTED_ITEM_COUNT
+    assert lines[0].startswith("test1,tag1=value1 field1=1.0 ")
+    assert lines[1].startswith("test2,tag2=value2 field2=2.0 ")
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_write_measurements_chunks_large_batches(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Large batches are split into one write request per chunk."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    measurements = [
+        Measurement(
+            measurement="test",
+            tags={},
+            timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+            fields={"value": float(i)},
+        )
+        for i in range(5)
+    ]
+
+    await repository.write_measurements(measurements, chunk_size=2)
+
+    assert mock_influxdb_client.write.await_count == 3
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_write_measurements_empty_skips_write(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Nothing is posted when no measurement has a storable field."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    measurement = Measurement(
+        measurement="test",
+        tags={},
+        timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+        fields={"value": None},
+    )
+
+    await repository.write_measurements([measurement])
+
+    mock_influxdb_client.write.assert_not_called()
 
 
 @pytest.mark.asyncio(scope="function")
@@ -107,9 +148,10 @@ async def test_write_measurements_error(
     mock_influxdb_client: AsyncMock,
     mock_settings: Settings,
 ) -> None:
-    """Test error handling in write_measurements."""
+    """Without a spool, write errors propagate."""
     # Arrange
-    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    settings = mock_settings.model_copy(update={"influxdb_spool": False})
+    repository = InfluxDBRepository(settings=settings, client=mock_influxdb_client)
     measurements = [
         Measurement(
             measurement="test1",
@@ -189,3 +231,160 @@ async def test_get_latest_timestamp_epoch_seconds(
     assert latest is not None
     expected = datetime.fromtimestamp(epoch_seconds, tz=UTC)
     assert latest == expected
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_get_latest_timestamps_single_multi_statement_query(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Freshness of several measurements is fetched in one round trip.
+
+    Each statement reads one field of the newest row; the field keys are
+    looked up once and reused.
+    """
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    field_keys = {
+        "results": [
+            {
+                "statement_id": 0,
+                "series": [
+                    {"name": "a", "values": [["power", "float"], ["state", "string"]]},
+                    {"name": 'we"ird', "values": [['va"lue', "float"]]},
+                ],
+            }
+        ]
+    }
+    latest_rows = {
+        "results": [
+            {
+                "statement_id": 0,
+                "series": [{"values": [["2025-11-22T17:38:04Z", 1.0]]}],
+            },
+            {"statement_id": 1},
+        ]
+    }
+    mock_influxdb_client.query.side_effect = [field_keys, latest_rows, latest_rows]
+
+    latest = await repository.get_latest_timestamps(["a", 'we"ird'])
+    await repository.get_latest_timestamps(["a", 'we"ird'])
+
+    queries = [c.args[0] for c in mock_influxdb_client.query.call_args_list]
+    expected = 'SELECT last("power") FROM "a"; SELECT last("va\\"lue") FROM "we\\"ird"'
+    assert queries == ["SHOW FIELD KEYS", expected, expected]
+    assert latest == {
+        "a": datetime(2025, 11, 22, 17, 38, 4, tzinfo=UTC),
+        'we"ird': None,
+    }
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_get_latest_timestamps_without_field_keys_reads_whole_row(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """A measurement missing from SHOW FIELD KEYS falls back to SELECT *."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.query.side_effect = [{"results": [{}]}, {"results": [{}]}]
+
+    latest = await repository.get_latest_timestamps(["a"])
+
+    query = mock_influxdb_client.query.call_args[0][0]
+    assert query == 'SELECT * FROM "a" ORDER BY time DESC LIMIT 1'
+    assert latest == {"a": None}
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_get_latest_timestamps_query_error_propagates(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """A failing batch query raises instead of reporting stale data."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.query.side_effect = Exception("DB Error")
+
+    with pytest.raises(Exception, match="DB Error"):
+        await repository.get_latest_timestamps(["a"])
+
+
+async def _chunks(*chunks: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+    """Chunked query response as aioinflux yields it."""
+    for chunk in chunks:
+        yield chunk
+
+
+def _series(values: list[list[Any]]) -> dict[str, Any]:
+    """One-series chunk of gas prices."""
+    return {
+        "results": [
+            {
+                "statement_id": 0,
+                "series": [
+                    {
+                        "name": "gas_prices_euro",
+                        "columns": ["time", "e5"],
+                        "values": values,
+                    }
+                ],
+            }
+        ]
+    }
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_query_chunks_streams_tuple_rows(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Each chunk becomes a batch of tuples sharing one column header."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.query.return_value = _chunks(
+        _series([[1, 1.799], [2, 1.809]]), _series([[3, 1.789]])
+    )
+
+    batches = [b async for b in repository.query_chunks("SELECT e5 FROM x", 2)]
+
+    mock_influxdb_client.query.assert_awaited_once_with(
+        "SELECT e5 FROM x", chunked=True, chunk_size=2, epoch="ns"
+    )
+    assert [b.rows for b in batches] == [[(1, 1.799), (2, 1.809)], [(3, 1.789)]]
+    assert batches[0].columns == ("time", "e5")
+    assert batches[0].to_columns() == {"time": [1, 2], "e5": [1.799, 1.809]}
+    with pytest.raises(KeyError):
+        batches[0].column("e10")
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_query_chunks_error_mid_stream_propagates(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """A chunk reporting an error aborts the stream after the good batches."""
+
+    async def failing() -> AsyncIterator[dict[str, Any]]:
+        yield _series([[1, 1.799]])
+        raise Exception("chunk error")
+
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.query.return_value = failing()
+
+    seen = []
+    with pytest.raises(Exception, match="chunk error"):
+        async for batch in repository.query_chunks("SELECT e5 FROM x"):
+            seen.append(batch)
+    assert len(seen) == 1
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_query_frame_without_pandas_explains_extra(
+    mock_influxdb_client: AsyncMock,
+    mock_settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Frame output names the optional dependency it needs."""
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.query.return_value = _chunks(_series([[1, 1.799]]))
+
+    with pytest.raises(ModuleNotFoundError, match="analysis"):
+        await repository.query_frame("SELECT e5 FROM x")
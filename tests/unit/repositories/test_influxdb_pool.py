@@ -0,0 +1,70 @@
+"""Tests for the process-wide InfluxDB client."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from home_monitoring.config import Settings
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.influxdb_pool import (
+    close_influxdb_client,
+    get_influxdb_client,
+)
+
+
+@pytest.fixture
+async def pooled(mock_settings: Settings) -> AsyncIterator[Settings]:
+    """Settings for the shared client; closes it after the test."""
+    settings = mock_settings.model_copy(
+        update={
+            "influxdb_max_connections": 2,
+            "influxdb_keepalive_seconds": 15.0,
+            "influxdb_read_timeout": 20.0,
+        }
+    )
+    yield settings
+    await close_influxdb_client()
+
+
+@pytest.mark.asyncio
+async def test_repositories_share_one_bounded_client(pooled: Settings) -> None:
+    """Every repository without an injected client uses the same pool."""
+    first = InfluxDBRepository(settings=pooled)
+    second = InfluxDBRepository(settings=pooled)
+
+    client = first._client
+
+    assert second._client is client
+    assert client is get_influxdb_client()
+    connector = client.opts["connector"]
+    assert connector.limit == 2
+    assert client.opts["timeout"].sock_read == 20.0
+    assert client.opts["timeout"].total is None
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_replaced(pooled: Settings) -> None:
+    """After close, the next use opens a fresh client."""
+    client = get_influxdb_client(pooled)
+
+    await close_influxdb_client()
+
+    assert client.opts["connector"].closed
+    assert get_influxdb_client(pooled) is not client
+
+
+def test_client_from_a_finished_loop_is_not_reused(pooled: Settings) -> None:
+    """A client bound to an earlier asyncio.run is replaced, not reused."""
+
+    async def current() -> object:
+        return get_influxdb_client(pooled)
+
+    assert asyncio.run(current()) is not asyncio.run(current())
+
+
+def test_repository_outside_a_loop_creates_no_client(pooled: Settings) -> None:
+    """Construction stays cheap; the client needs a running loop."""
+    repository = InfluxDBRepository(settings=pooled)
+
+    with pytest.raises(RuntimeError):
+        repository._client  # noqa: B018 - property access under test
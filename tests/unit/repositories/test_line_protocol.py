@@ -0,0 +1,163 @@
+"""Unit tests for the line protocol encoder."""
+
+import time
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.models.base import Measurement, SeriesBatch
+from home_monitoring.repositories.line_protocol import (
+    encode_chunks,
+    encode_lines,
+    encode_series,
+    to_epoch_ns,
+)
+
+TIMESTAMP = datetime(2024, 2, 16, 20, 0, 0, 123456, tzinfo=UTC)
+TIMESTAMP_NS = 1_708_113_600_123_456_000
+
+
+def make_measurement(
+    fields: dict[str, object],
+    tags: dict[str, str] | None = None,
+    name: str = "electricity_power_watt",
+) -> Measurement:
+    return Measurement(
+        measurement=name,
+        tags=tags if tags is not None else {"site_id": "42"},
+        timestamp=TIMESTAMP,
+        fields=fields,
+    )
+
+
+def encode_line(measurement: Measurement) -> str | None:
+    """The line of a single measurement, or None if it has no storable field."""
+    return next(encode_lines([measurement]), None)
+
+
+def test_encode_typed_fields() -> None:
+    """Floats, ints, bools and strings are encoded per type (happy path)."""
+    line = encode_line(
+        make_measurement({"power": 1.5, "count": 3, "on": True, "state": "ok"})
+    )
+
+    assert line == (
+        "electricity_power_watt,site_id=42 "
+        f'power=1.5,count=3i,on=true,state="ok" {TIMESTAMP_NS}'
+    )
+
+
+def test_to_epoch_ns_matches_influx_precision() -> None:
+    """Timestamps keep microsecond precision as integer nanoseconds."""
+    assert to_epoch_ns(TIMESTAMP) == TIMESTAMP_NS
+    berlin = TIMESTAMP.astimezone(timezone(timedelta(hours=1)))
+    assert to_epoch_ns(berlin) == TIMESTAMP_NS
+
+
+@pytest.mark.parametrize("tz", ["UTC", "Europe/Berlin"])
+def test_naive_timestamp_is_encoded_like_aioinflux(
+    tz: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Naive datetimes keep the timestamps aioinflux wrote (unhappy path)."""
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        summer = datetime(2024, 7, 1, 12, 0, 0, 123456)
+        aioinflux_ns = (
+            int(summer.timestamp() - time.timezone) * 10**9 + summer.microsecond * 1000
+        )
+
+        assert to_epoch_ns(summer) == aioinflux_ns
+        assert to_epoch_ns(TIMESTAMP.replace(tzinfo=None)) == TIMESTAMP_NS
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_special_characters_are_escaped() -> None:
+    """Spaces, commas, equals signs and quotes are escaped (unhappy path)."""
+    line = encode_line(
+        make_measurement(
+            {"note": 'say "hi"'},
+            tags={"street": "Haupt Str, 1", "a=b": "x"},
+            name="gas prices,euro",
+        )
+    )
+
+    assert line == (
+        r"gas\ prices\,euro,a\=b=x,street=Haupt\ Str\,\ 1 "
+        rf'note="say \"hi\"" {TIMESTAMP_NS}'
+    )
+
+
+def test_unstorable_fields_are_dropped() -> None:
+    """None and NaN fields are skipped; a point without fields is dropped."""
+    partial = make_measurement({"a": None, "b": float("nan"), "c": 1.0})
+    empty = make_measurement({"a": None})
+
+    assert encode_line(partial) == (
+        f"electricity_power_watt,site_id=42 c=1.0 {TIMESTAMP_NS}"
+    )
+    assert encode_line(empty) is None
+    assert list(encode_lines([empty])) == []
+
+
+def test_empty_tag_values_are_dropped() -> None:
+    """Line protocol cannot carry empty tag values (unhappy path)."""
+    line = encode_line(make_measurement({"v": 1.0}, tags={"a": "", "b": "1"}))
+
+    assert line == f"electricity_power_watt,b=1 v=1.0 {TIMESTAMP_NS}"
+
+
+def test_unsupported_field_type_raises() -> None:
+    """Values that have no line protocol type raise ValidationError."""
+    with pytest.raises(ValidationError, match="Unsupported field value type"):
+        encode_line(make_measurement({"v": [1, 2]}))
+
+
+def test_encode_chunks_splits_by_line_count() -> None:
+    """Chunks hold at most ``chunk_size`` newline-separated lines."""
+    measurements = [make_measurement({"v": float(i)}) for i in range(5)]
+
+    chunks = list(encode_chunks(measurements, chunk_size=2))
+
+    assert [chunk.count(b"\n") + 1 for chunk in chunks] == [2, 2, 1]
+    assert chunks[0].startswith(b"electricity_power_watt,site_id=42 v=0.0 ")
+
+
+def make_batch(**columns: list[float]) -> SeriesBatch:
+    return SeriesBatch.from_columns(
+        "electricity_power_watt",
+        {"site_id": "42"},
+        [TIMESTAMP + timedelta(minutes=15 * i) for i in range(3)],
+        columns,
+    )
+
+
+def test_encode_series_matches_row_encoding() -> None:
+    """A columnar batch encodes exactly like its rows (happy path)."""
+    batch = make_batch(FeedIn=[0.0, 1.5, 2.25], Production=[10.0, 11.0, 12.0])
+
+    lines = list(encode_series(batch))
+
+    assert lines == list(encode_lines(batch.rows()))
+    assert lines[0] == (
+        f"electricity_power_watt,site_id=42 FeedIn=0.0,Production=10.0 {TIMESTAMP_NS}"
+    )
+    assert list(encode_lines([batch])) == lines
+
+
+def test_encode_series_drops_nan_values() -> None:
+    """NaN cells are skipped and all-NaN rows dropped (unhappy path)."""
+    nan = float("nan")
+    batch = make_batch(a=[1.0, nan, nan], b=[nan, 2.0, nan])
+
+    lines = list(encode_series(batch))
+
+    assert [line.split(" ")[1] for line in lines] == ["a=1.0", "b=2.0"]
+
+
+def test_series_batch_rejects_misaligned_columns() -> None:
+    """Every column needs one value per timestamp (unhappy path)."""
+    with pytest.raises(ValidationError, match="column length"):
+        make_batch(a=[1.0, 2.0])
@@ -0,0 +1,130 @@
+"""Tests for the InfluxDB write-ahead spool."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from home_monitoring.config import Settings
+from home_monitoring.models.base import Point
+from home_monitoring.repositories.influxdb import InfluxDBRepository
+from home_monitoring.repositories.spool import SPOOL_DIRNAME, WriteSpool
+
+
+class WriteError(Exception):
+    """Stand-in for aioinflux's InfluxDBWriteError (carries the status)."""
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f"Error writing data ({status})")
+        self.status = status
+
+
+def point(value: float) -> Point:
+    """One point whose field value identifies it in the payload."""
+    return Point(
+        measurement="weather_temperature_celsius",
+        tags={"module_name": "Indoor"},
+        fields={"Temperature": value},
+        timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+    )
+
+
+def written_values(client: AsyncMock) -> list[str]:
+    """Field values of the successful writes, in order."""
+    return [
+        call.args[0].decode().split("Temperature=")[1].split(" ")[0]
+        for call in client.write.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_outage_is_spooled_and_replayed_in_order(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """Writes during an outage are kept and land in order once InfluxDB is back."""
+    spool = WriteSpool(mock_settings.state_dir / SPOOL_DIRNAME, base_delay=0.0)
+    repository = InfluxDBRepository(
+        settings=mock_settings, client=mock_influxdb_client, spool=spool
+    )
+    mock_influxdb_client.write.side_effect = ConnectionRefusedError()
+
+    await repository.write_measurements([point(1.0)])
+    await repository.write_measurements([point(2.0)])
+
+    assert spool.pending
+    mock_influxdb_client.write.reset_mock(side_effect=True)
+
+    await repository.write_measurements([point(3.0)])
+
+    assert written_values(mock_influxdb_client) == ["1.0", "2.0", "3.0"]
+    assert not spool.pending
+
+
+@pytest.mark.asyncio
+async def test_rejected_write_is_raised_not_spooled(
+    mock_settings: Settings, mock_influxdb_client: AsyncMock
+) -> None:
+    """A 400 (e.g. field type conflict) would fail forever on replay."""
+    repository = InfluxDBRepository(settings=mock_settings, client=mock_influxdb_client)
+    mock_influxdb_client.write.side_effect = WriteError(400)
+
+    with pytest.raises(WriteError):
+        await repository.write_measurements([point(1.0)])
+
+    assert not WriteSpool(mock_settings.state_dir / SPOOL_DIRNAME).pending
+
+
+@pytest.mark.asyncio
+async def test_failed_replay_backs_off_and_keeps_records(tmp_path: Path) -> None:
+    """A replay failing midway keeps the rest for later and waits before retrying."""
+    spool = WriteSpool(tmp_path, base_delay=60.0)
+    for payload in (b"a", b"b", b"c"):
+        spool.append(payload)
+    send = AsyncMock(side_effect=[None, OSError("still down")])
+
+    assert await spool.replay(send) == 1
+    assert not spool.replay_due()
+
+    sent: list[bytes] = []
+
+    async def collect(payload: bytes) -> None:
+        sent.append(payload)
+
+    assert await WriteSpool(tmp_path).replay(collect) == 2
+    assert sent == [b"b", b"c"]
+
+
+def test_size_cap_evicts_oldest_segments(tmp_path: Path) -> None:
+    """Over the cap, whole segments are dropped oldest first."""
+    spool = WriteSpool(tmp_path, max_bytes=100, segment_bytes=40)
+    for index in range(10):
+        spool.append(bytes([index]) * 20)
+
+    assert spool.size <= 100
+    segments = sorted(tmp_path.glob("*.seg"))
+    # the newest record survives, the oldest does not
+    assert segments[-1].read_bytes().endswith(bytes([9]) * 20)
+    assert bytes([0]) * 20 not in b"".join(p.read_bytes() for p in segments)
+
+
+@pytest.mark.asyncio
+async def test_torn_record_and_foreign_writer_stop_replay(tmp_path: Path) -> None:
+    """A torn tail is skipped; a segment another writer holds is left alone."""
+    first = WriteSpool(tmp_path)
+    first.append(b"complete")
+    first.close()
+    [segment] = tmp_path.glob("*.seg")
+    with segment.open("ab") as file:
+        file.write(b"\x00\x00\x00\xffpartial")  # crash mid-append
+
+    other = WriteSpool(tmp_path)
+    other.append(b"still being written")
+
+    sent: list[bytes] = []
+
+    async def collect(payload: bytes) -> None:
+        sent.append(payload)
+
+    assert await WriteSpool(tmp_path).replay(collect) == 1
+    assert sent == [b"complete"]
+    assert WriteSpool(tmp_path).pending
@@ -0,0 +1,145 @@
+"""Tests for the write-behind buffer."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from home_monitoring.models.base import Measurement, Point
+from home_monitoring.repositories.write_buffer import WriteBehindBuffer
+
+T0 = datetime(2024, 6, 1, 12, tzinfo=UTC)
+
+
+def reading(name: str, value: float, offset: int = 0) -> Point:
+    """One garden sensor reading ``offset`` seconds after T0."""
+    return Point(
+        "garden_temperature_celsius",
+        {"name": name},
+        {"temperature": value},
+        T0 + timedelta(seconds=offset),
+    )
+
+
+@pytest.mark.asyncio
+async def test_burst_is_collapsed_into_one_flush_after_max_age() -> None:
+    """Repeated updates of a series within the window are written once."""
+    repository = AsyncMock()
+    buffer = WriteBehindBuffer(repository, max_age=0.05)
+
+    await buffer.write([reading("bed", 20.0, 0), reading("lawn", 18.0, 0)])
+    await buffer.write([reading("bed", 21.0, 1)])
+    await buffer.write(
+        [
+            Measurement(
+                measurement="garden_temperature_celsius",
+                tags={"name": "bed"},
+                fields={"temperature": 22.0},
+                timestamp=T0 + timedelta(seconds=2),
+            )
+        ]
+    )
+    assert repository.write_measurements.await_count == 0
+
+    await asyncio.sleep(0.1)
+
+    repository.write_measurements.assert_awaited_once()
+    [points] = repository.write_measurements.await_args.args
+    assert {p.tags["name"]: p.fields["temperature"] for p in points} == {
+        "bed": 22.0,
+        "lawn": 18.0,
+    }
+    assert buffer.stats.collapsed == 2
+    assert buffer.stats.flushed == 2
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_update_does_not_overwrite_newer_one() -> None:
+    """A late event keeps the newest timestamp and only fills missing fields."""
+    repository = AsyncMock()
+    buffer = WriteBehindBuffer(repository, max_age=60)
+
+    await buffer.write([reading("bed", 22.0, 5)])
+    await buffer.write(
+        [
+            Point(
+                "garden_temperature_celsius",
+                {"name": "bed"},
+                {"temperature": 20.0, "battery": 90.0},
+                T0,
+            )
+        ]
+    )
+    await buffer.close()
+
+    [points] = repository.write_measurements.await_args.args
+    assert points == [
+        Point(
+            "garden_temperature_celsius",
+            {"name": "bed"},
+            {"temperature": 22.0, "battery": 90.0},
+            T0 + timedelta(seconds=5),
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_size_threshold_flushes_before_max_age() -> None:
+    """Reaching max_points distinct series flushes without waiting."""
+    repository = AsyncMock()
+    buffer = WriteBehindBuffer(repository, max_points=3, max_age=60)
+
+    await buffer.write([reading(f"sensor-{i}", 20.0) for i in range(3)])
+    await asyncio.sleep(0.01)
+
+    repository.write_measurements.assert_awaited_once()
+    assert buffer.pending == 0
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_applies_backpressure() -> None:
+    """While a flush is stuck, writers wait once max_pending series are queued."""
+    release = asyncio.Event()
+
+    async def stuck_write(_: object) -> None:
+        await release.wait()
+
+    repository = AsyncMock()
+    repository.write_measurements.side_effect = stuck_write
+    buffer = WriteBehindBuffer(repository, max_points=2, max_age=60, max_pending=2)
+
+    await buffer.write([reading("a", 1.0), reading("b", 1.0)])
+    await asyncio.sleep(0.01)  # first flush is now in flight
+    await buffer.write([reading("c", 1.0), reading("d", 1.0)])
+
+    blocked = asyncio.create_task(buffer.write([reading("e", 1.0)]))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await blocked
+    await buffer.close()
+
+    assert buffer.stats.backpressure_waits == 1
+    assert buffer.stats.flushed == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_counted_and_does_not_stop_the_buffer() -> None:
+    """A raising write drops its batch; later writes still go through."""
+    repository = AsyncMock()
+    repository.write_measurements.side_effect = [ValueError("400 bad field"), None]
+    buffer = WriteBehindBuffer(repository, max_age=60)
+
+    await buffer.write([reading("bed", 20.0)])
+    assert await buffer.flush() == 0
+    await buffer.write([reading("bed", 21.0)])
+    await buffer.close()
+
+    assert buffer.stats.failed == 1
+    assert buffer.stats.flushed == 1
+    point = buffer.stats_point("gardena")
+    assert point.measurement == "influxdb_write_buffer"
+    assert point.fields["failed"] == 1
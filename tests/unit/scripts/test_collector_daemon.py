@@ -0,0 +1,81 @@
+"""Unit tests for the collector daemon job configuration."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.scripts.collector_daemon import (
+    DEFAULT_CONFIG,
+    JOB_FACTORIES,
+    JobContext,
+    load_jobs,
+)
+
+
+def make_context() -> JobContext:
+    """Context with mocked shared clients."""
+    return JobContext(
+        settings=MagicMock(), repository=MagicMock(), http_clients=MagicMock()
+    )
+
+
+def test_shipped_config_names_known_jobs() -> None:
+    """Every job in conf/collector_daemon.json has a factory and a valid schedule."""
+    data = json.loads(DEFAULT_CONFIG.read_text())
+
+    assert set(data["jobs"]) <= set(JOB_FACTORIES)
+
+
+def test_unknown_job_is_rejected(tmp_path: Path) -> None:
+    """A typo in a job name fails at start-up rather than silently not running."""
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": {"netatmoo": {"schedule": "* * * * *"}}}))
+
+    with pytest.raises(ValidationError, match="Unknown collector job"):
+        load_jobs(path, make_context())
+
+
+def test_disabled_and_unscheduled_jobs(tmp_path: Path) -> None:
+    """Disabled jobs are skipped; an enabled job without a schedule is an error."""
+    path = tmp_path / "jobs.json"
+    path.write_text(
+        json.dumps({"jobs": {"techem": {"schedule": "0 1 * * *", "enabled": False}}})
+    )
+    assert load_jobs(path, make_context()) == []
+
+    path.write_text(json.dumps({"jobs": {"tibber": {}}}))
+    with pytest.raises(ValidationError, match="no schedule"):
+        load_jobs(path, make_context())
+
+
+@pytest.mark.asyncio
+async def test_job_is_built_on_first_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A service failing to construct fails that run only; the next run retries."""
+    attempts = 0
+    collect = AsyncMock()
+
+    def factory(ctx: JobContext, options: dict[str, Any]) -> Any:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ValueError("Failed to initialize Netatmo API")
+        return collect
+
+    monkeypatch.setitem(JOB_FACTORIES, "netatmo", factory)
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": {"netatmo": {"schedule": "*/5 * * * *"}}}))
+    [job] = load_jobs(path, make_context())
+    assert attempts == 0
+
+    with pytest.raises(ValueError, match="Netatmo"):
+        await job.run()
+    await job.run()
+    await job.run()
+
+    assert attempts == 2
+    assert collect.await_count == 2
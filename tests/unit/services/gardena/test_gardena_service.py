@@ -62,10 +62,10 @@ def service(
         lambda: mock_db,
     )
     monkeypatch.setattr(
-        "home_monitoring.services.gardena.service.SmartSystem",
+        "home_monitoring.services.gardena.service.smart_system.SmartSystem",
         lambda *args, **kwargs: mock_smart_system,
     )
-    return GardenaService(settings=settings)
+    return GardenaService(settings=settings, repository=mock_db)
 
 
 def test_init_with_valid_credentials(
@@ -97,7 +97,8 @@ def test_init_smart_system_parameters(
             mock_calls.append(("__init__", kwargs))
 
     monkeypatch.setattr(
-        "home_monitoring.services.gardena.service.SmartSystem", MockSmartSystem
+        "home_monitoring.services.gardena.service.smart_system.SmartSystem",
+        MockSmartSystem,
     )
     monkeypatch.setattr(
         "home_monitoring.repositories.influxdb.InfluxDBRepository",
@@ -199,7 +200,7 @@ def _real_sensor() -> MagicMock:
 
 @pytest.mark.asyncio
 async def test_start_writes_initial_state(
-    service: GardenaService, mock_smart_system: MagicMock
+    service: GardenaService, mock_smart_system: MagicMock, mock_db: AsyncMock
 ) -> None:
     """start() persists the initial device state, not just on later changes."""
     sensor = _real_sensor()
@@ -208,18 +209,19 @@ async def test_start_writes_initial_state(
         side_effect=lambda t: [sensor] if t == "SENSOR" else []
     )
     mock_smart_system.location = loc
-    service._db = AsyncMock()
 
     await service.start()
+    await service.flush()
 
     # registered for future change events AND wrote the baseline now
     sensor.add_callback.assert_called_once()
-    assert service._db.write_measurements.await_count >= 1
+    assert mock_db.write_measurements.await_count >= 1
+    await service.stop()
 
 
 @pytest.mark.asyncio
 async def test_refresh_all_rewrites_current_state(
-    service: GardenaService, mock_smart_system: MagicMock
+    service: GardenaService, mock_smart_system: MagicMock, mock_db: AsyncMock
 ) -> None:
     """refresh_all() re-persists current device state (the cadence heartbeat)."""
     sensor = _real_sensor()
@@ -228,8 +230,45 @@ async def test_refresh_all_rewrites_current_state(
         side_effect=lambda t: [sensor] if t == "SENSOR" else []
     )
     mock_smart_system.location = loc
-    service._db = AsyncMock()
 
     await service.refresh_all()
+    await service.flush()
+
+    assert mock_db.write_measurements.await_count >= 1
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_device_updates_are_batched_and_collapsed(
+    service: GardenaService, mock_smart_system: MagicMock, mock_db: AsyncMock
+) -> None:
+    """A burst of callbacks becomes one write with the latest state per series."""
+    sensor = _real_sensor()
+
+    for temperature in (20.0, 21.0, 22.0):
+        sensor.ambient_temperature = temperature
+        await service._handle_device_update(sensor)
+    assert mock_db.write_measurements.await_count == 0
+
+    await service.stop()
+
+    mock_db.write_measurements.assert_awaited_once()
+    [points] = mock_db.write_measurements.await_args.args
+    temperatures = [
+        p.fields for p in points if p.measurement == "garden_temperature_celsius"
+    ]
+    assert temperatures == [{"temperature": 22.0}]
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_buffer_when_disconnect_fails(
+    service: GardenaService, mock_smart_system: MagicMock, mock_db: AsyncMock
+) -> None:
+    """Buffered updates are written even if quitting the session raises."""
+    await service._handle_device_update(_real_sensor())
+    mock_smart_system.quit.side_effect = RuntimeError("websocket gone")
+
+    with pytest.raises(RuntimeError):
+        await service.stop()
 
-    assert service._db.write_measurements.await_count >= 1
+    mock_db.write_measurements.assert_awaited_once()
@@ -2,10 +2,14 @@
 
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
+from home_monitoring.models.base import Point
+from home_monitoring.repositories.freshness import FRESHNESS_FILENAME, FreshnessIndex
+from home_monitoring.repositories.influxdb import InfluxDBRepository
 from home_monitoring.services.healthcheck import (
     AlertStore,
     FreshnessConfig,
@@ -30,8 +34,10 @@ class FakeRepository:
         for name in self._timestamps:
             yield {"name": name}
 
-    async def get_latest_timestamp(self, measurement: str) -> datetime | None:
-        return self._timestamps[measurement]
+    async def get_latest_timestamps(
+        self, measurements: list[str], use_index: bool = True
+    ) -> dict[str, datetime | None]:
+        return {name: self._timestamps[name] for name in measurements}
 
 
 class FakeNotifier:
@@ -352,3 +358,126 @@ async def test_backup_glob_picks_newest(tmp_path, mock_settings) -> None:
     sent = await service.run()
 
     assert sent == 0  # newest file is fresh -> no alert despite the stale one
+
+
+class CountingInfluxClient:
+    """Stub aioinflux client that answers freshness queries and counts trips."""
+
+    def __init__(self, names: list[str], newest: datetime) -> None:
+        self.round_trips = 0
+        self._names = names
+        self._newest_ns = int(newest.timestamp()) * 1_000_000_000
+
+    async def query(self, query: str) -> dict[str, Any]:
+        self.round_trips += 1
+        if query == "SHOW MEASUREMENTS":
+            values = [[name] for name in self._names]
+            return {"results": [{"series": [{"columns": ["name"], "values": values}]}]}
+        if query == "SHOW FIELD KEYS":
+            series = [
+                {"name": name, "values": [["v", "float"]]} for name in self._names
+            ]
+            return {"results": [{"series": series}]}
+        statements = query.split("; ")
+        return {
+            "results": [
+                {
+                    "statement_id": i,
+                    "series": [
+                        {
+                            "columns": ["time", "last"],
+                            "values": [[self._newest_ns, 1.0]],
+                        }
+                    ],
+                }
+                for i in range(len(statements))
+            ]
+        }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [20, 200])
+async def test_round_trips_independent_of_measurement_count(
+    tmp_path, mock_settings, count: int
+) -> None:
+    """The pass costs the same few round trips for 20 or 200 measurements."""
+    names = [f"measurement_{i}" for i in range(count)]
+    client = CountingInfluxClient(names, datetime.now(UTC))
+    service = HealthcheckService(
+        config=FreshnessConfig(default_sla_minutes=60),
+        store=AlertStore(tmp_path / "state.json"),
+        notifier=FakeNotifier(),
+        settings=mock_settings,
+        repository=InfluxDBRepository(settings=mock_settings, client=client),
+    )
+
+    sent = await service.run()
+
+    assert sent == 0
+    # SHOW MEASUREMENTS, SHOW FIELD KEYS and batched freshness queries of 100
+    # statements each
+    assert client.round_trips == 2 + -(-count // 100)
+
+
+@pytest.mark.asyncio
+async def test_batched_scan_missing_series_counts_as_no_data(mock_settings) -> None:
+    """A statement without series maps to None, not an error (unhappy path)."""
+    client = CountingInfluxClient([], datetime.now(UTC))
+
+    async def query(query: str) -> dict[str, Any]:
+        return {"results": [{"statement_id": 0}, {"statement_id": 1, "series": []}]}
+
+    client.query = query  # type: ignore[method-assign]
+    repository = InfluxDBRepository(settings=mock_settings, client=client)
+
+    latest = await repository.get_latest_timestamps(["a", "b"])
+
+    assert latest == {"a": None, "b": None}
+
+
+@pytest.mark.asyncio
+async def test_fresh_index_skips_freshness_queries(tmp_path, mock_settings) -> None:
+    """With every measurement fresh in the index, only the listing hits InfluxDB."""
+    names = [f"measurement_{i}" for i in range(20)]
+    index = FreshnessIndex(mock_settings.state_dir / FRESHNESS_FILENAME)
+    index.observe(
+        [Point(name, {}, {"v": 1.0}, datetime.now(UTC)) for name in names[:-1]]
+    )
+    index.save()
+    client = CountingInfluxClient(names, datetime.now(UTC))
+    service = HealthcheckService(
+        config=FreshnessConfig(default_sla_minutes=60),
+        store=AlertStore(tmp_path / "state.json"),
+        notifier=FakeNotifier(),
+        settings=mock_settings,
+        repository=InfluxDBRepository(settings=mock_settings, client=client),
+    )
+
+    sent = await service.run()
+
+    assert sent == 0
+    # SHOW MEASUREMENTS, SHOW FIELD KEYS and one lookup of the measurement
+    # missing from the index
+    assert client.round_trips == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_index_entry_is_confirmed_with_influxdb(
+    tmp_path, mock_settings
+) -> None:
+    """Data written around the index (ioBroker) must not raise a false alert."""
+    index = FreshnessIndex(mock_settings.state_dir / FRESHNESS_FILENAME)
+    index.observe([Point("iobroker_states", {}, {"v": 1.0}, datetime(2024, 1, 1))])
+    index.save()
+    client = CountingInfluxClient(["iobroker_states"], datetime.now(UTC))
+    service = HealthcheckService(
+        config=FreshnessConfig(default_sla_minutes=60),
+        store=AlertStore(tmp_path / "state.json"),
+        notifier=FakeNotifier(),
+        settings=mock_settings,
+        repository=InfluxDBRepository(settings=mock_settings, client=client),
+    )
+
+    assert await service.run() == 0
+    # SHOW MEASUREMENTS, SHOW FIELD KEYS and the confirming lookup
+    assert client.round_trips == 3
@@ -0,0 +1,137 @@
+"""Tests for the async Netatmo API client."""
+
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from home_monitoring.core.exceptions import APIError
+from home_monitoring.services.netatmo.client import NetatmoClient
+from home_monitoring.utils.http import HttpClientRegistry
+
+STATION = {"_id": "70:ee", "type": "NAMain", "module_name": "Indoor"}
+
+
+class FakeNetatmo:
+    """Token and API endpoints; every refresh rotates the refresh token."""
+
+    def __init__(self, lose_token_response: bool = False) -> None:
+        self.refreshes = 0
+        self.valid_tokens: set[str] = set()
+        self.redeemed: list[str] = []
+        self._lose_token_response = lose_token_response
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth2/token":
+            form = dict(httpx.QueryParams(request.content.decode()))
+            self.redeemed.append(form["refresh_token"])
+            if self._lose_token_response:
+                # handled (and rotated) by Netatmo, but the response is lost
+                raise httpx.ReadTimeout("timed out", request=request)
+            if form["refresh_token"] == "revoked":
+                return httpx.Response(400, json={"error": "invalid_grant"})
+            self.refreshes += 1
+            access = f"access-{self.refreshes}"
+            self.valid_tokens.add(access)
+            return httpx.Response(
+                200,
+                json={
+                    "access_token": access,
+                    "refresh_token": f"refresh-{self.refreshes}",
+                    "expires_in": 10800,
+                },
+            )
+        bearer = request.headers["Authorization"].removeprefix("Bearer ")
+        if bearer not in self.valid_tokens:
+            return httpx.Response(403, json={"error": {"code": 3}})
+        return httpx.Response(200, json={"body": {"devices": [STATION]}})
+
+
+def make_client(
+    api: FakeNetatmo, token_path: Path, refresh_token: str = "configured"
+) -> NetatmoClient:
+    registry = HttpClientRegistry(
+        client_factory=lambda **kwargs: httpx.AsyncClient(
+            transport=httpx.MockTransport(api)
+        )
+    )
+    return NetatmoClient("id", "secret", refresh_token, token_path, registry)
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached_on_disk_and_reused(tmp_path: Path) -> None:
+    """A second process reuses the cached token instead of re-authenticating."""
+    api = FakeNetatmo()
+    token_path = tmp_path / "netatmo_token.json"
+
+    assert await make_client(api, token_path).get_stations_data() == [STATION]
+    assert await make_client(api, token_path).get_stations_data() == [STATION]
+
+    assert api.refreshes == 1
+    assert json.loads(token_path.read_text())["refresh_token"] == "refresh-1"
+    assert token_path.stat().st_mode & 0o777 == 0o600
+
+
+@pytest.mark.asyncio
+async def test_expired_or_rejected_token_is_refreshed_with_rotated_token(
+    tmp_path: Path,
+) -> None:
+    """Expiry and a 403 both refresh, redeeming the cached rotated token."""
+    api = FakeNetatmo()
+    token_path = tmp_path / "netatmo_token.json"
+    token_path.write_text(
+        json.dumps(
+            {
+                "access_token": "old",
+                "refresh_token": "rotated",
+                "expires_at": time.time() + 3600,
+            }
+        )
+    )
+
+    # "old" has not expired, but the API rejects it
+    assert await make_client(api, token_path).get_stations_data() == [STATION]
+
+    assert api.redeemed == ["rotated"]
+    assert json.loads(token_path.read_text())["access_token"] == "access-1"
+
+
+@pytest.mark.asyncio
+async def test_revoked_cached_token_falls_back_to_configured_one(
+    tmp_path: Path,
+) -> None:
+    """A regenerated NETATMO_REFRESH_TOKEN replaces a revoked cached one."""
+    api = FakeNetatmo()
+    token_path = tmp_path / "netatmo_token.json"
+    token_path.write_text(
+        json.dumps({"access_token": "old", "refresh_token": "revoked", "expires_at": 0})
+    )
+
+    await make_client(api, token_path).get_stations_data()
+
+    assert api.redeemed == ["revoked", "configured"]
+
+
+@pytest.mark.asyncio
+async def test_lost_refresh_response_is_not_retried(tmp_path: Path) -> None:
+    """A timed-out refresh fails the run instead of redeeming another token."""
+    api = FakeNetatmo(lose_token_response=True)
+    token_path = tmp_path / "netatmo_token.json"
+    token_path.write_text(
+        json.dumps({"access_token": "old", "refresh_token": "rotated", "expires_at": 0})
+    )
+
+    with pytest.raises(APIError, match="authentication failed"):
+        await make_client(api, token_path).get_stations_data()
+
+    assert api.redeemed == ["rotated"]
+
+
+@pytest.mark.asyncio
+async def test_missing_refresh_token_raises(tmp_path: Path) -> None:
+    """Without any refresh token the request fails with an APIError."""
+    client = NetatmoClient("id", "secret", None, tmp_path / "token.json")
+
+    with pytest.raises(APIError, match="NETATMO_REFRESH_TOKEN"):
+        await client.get_stations_data()
@@ -1,19 +1,24 @@
 """Tests for Netatmo service."""
 
-from unittest.mock import AsyncMock, MagicMock
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
 from home_monitoring.services.netatmo.service import NetatmoService
+from home_monitoring.services.watermarks import WATERMARK_FILENAME, WatermarkStore
 
 
 @pytest.fixture
-def settings() -> Settings:
+def settings(tmp_path: Path) -> Settings:
     """Create test settings."""
     return Settings(
         netatmo_client_id="test_id",
         netatmo_client_secret="test_secret",
+        state_dir=tmp_path,
     )
 
 
@@ -26,22 +31,9 @@ def mock_db() -> AsyncMock:
 
 
 @pytest.fixture
-def mock_auth() -> MagicMock:
-    """Create mock lnetatmo ClientAuth."""
-    auth = MagicMock()
-    auth.clientId = "test_id"
-    auth.clientSecret = "test_secret"
-    auth.accessToken = "test_access_token"
-    return auth
-
-
-@pytest.fixture
-def mock_api() -> MagicMock:
-    """Create mock lnetatmo WeatherStationData."""
-    api = MagicMock()
-    api.stations = ["test_station"]
-    # Mock station data
-    station_data = {
+def station_data() -> dict[str, Any]:
+    """Station with one module as returned by getstationsdata."""
+    return {
         "_id": "test_station",
         "type": "NAMain",
         "module_name": "Test Station",
@@ -67,55 +59,44 @@ def mock_api() -> MagicMock:
         ],
     }
 
-    api.stationById = MagicMock(return_value=station_data)
+
+@pytest.fixture
+def mock_api(station_data: dict[str, Any]) -> AsyncMock:
+    """Create mock Netatmo API client."""
+    api = AsyncMock()
+    api.get_stations_data = AsyncMock(return_value=[station_data])
+    api.get_measure = AsyncMock(return_value={})
     return api
 
 
 @pytest.fixture
 def service(
-    settings: Settings,
-    mock_db: AsyncMock,
-    mock_auth: MagicMock,
-    mock_api: MagicMock,
-    monkeypatch: pytest.MonkeyPatch,
+    settings: Settings, mock_db: AsyncMock, mock_api: AsyncMock
 ) -> NetatmoService:
     """Create test service."""
-    monkeypatch.setattr(
-        "home_monitoring.services.netatmo.service.InfluxDBRepository",
-        lambda *args, **kwargs: mock_db,
-    )
-    monkeypatch.setattr(
-        "home_monitoring.services.netatmo.service.lnetatmo.ClientAuth",
-        lambda *args, **kwargs: mock_auth,
-    )
-    monkeypatch.setattr(
-        "home_monitoring.services.netatmo.service.lnetatmo.WeatherStationData",
-        lambda *args, **kwargs: mock_api,
-    )
-    return NetatmoService(settings=settings)
+    return NetatmoService(settings=settings, repository=mock_db, client=mock_api)
 
 
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_success(
-    service: NetatmoService, mock_api: MagicMock, mock_db: AsyncMock
+    service: NetatmoService, mock_api: AsyncMock, mock_db: AsyncMock
 ) -> None:
     """Test successful data collection and storage."""
-    # Mock successful station access
-    mock_api.stations = ["test_station"]
-
     await service.collect_and_store()
 
-    assert mock_api.stationById.called
-    assert mock_db.write_measurements.called
+    mock_api.get_stations_data.assert_awaited_once()
+    [points] = mock_db.write_measurements.await_args.args
+    assert len(points) == 7
+    mock_api.get_measure.assert_not_awaited()
 
 
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_api_error(
-    service: NetatmoService, mock_api: MagicMock, mock_db: AsyncMock
+    service: NetatmoService, mock_api: AsyncMock, mock_db: AsyncMock
 ) -> None:
     """Test handling of API errors."""
     # Mock no stations available
-    mock_api.stations = []
+    mock_api.get_stations_data.return_value = []
 
     with pytest.raises(APIError, match="Netatmo API request failed"):
         await service.collect_and_store()
@@ -125,20 +106,54 @@ async def test_collect_and_store_api_error(
 
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_database_error(
-    service: NetatmoService, mock_api: MagicMock, mock_db: AsyncMock
+    service: NetatmoService, mock_api: AsyncMock, mock_db: AsyncMock
 ) -> None:
     """Test handling of database errors."""
-    # Mock successful station access
-    mock_api.stations = ["test_station"]
     mock_db.write_measurements.side_effect = Exception("Database error")
 
     with pytest.raises(Exception, match="Database error"):
         await service.collect_and_store()
 
-    assert mock_api.stationById.called
+    mock_api.get_stations_data.assert_awaited_once()
     assert mock_db.write_measurements.called
 
 
+@pytest.mark.asyncio(scope="function")
+async def test_gap_since_last_run_is_filled_from_get_measure(
+    service: NetatmoService,
+    settings: Settings,
+    mock_api: AsyncMock,
+    mock_db: AsyncMock,
+) -> None:
+    """A late run fetches the missed readings; an on-time run does not."""
+    last_run = datetime.now(UTC) - timedelta(hours=1)
+    store = WatermarkStore(settings.state_dir / WATERMARK_FILENAME)
+    store.advance("netatmo", "measure:test_module", last_run)
+    store.save()
+    missed = int(last_run.timestamp()) + 600
+    mock_api.get_measure.return_value = {str(missed): [17.0, 60]}
+
+    await service.collect_and_store()
+
+    # only the module has a watermark; the station is seen for the first time
+    mock_api.get_measure.assert_awaited_once()
+    assert mock_api.get_measure.await_args.kwargs["module_id"] == "test_module"
+    assert mock_api.get_measure.await_args.kwargs["types"] == (
+        "Temperature",
+        "Humidity",
+    )
+    [points] = mock_db.write_measurements.await_args.args
+    history = [p for p in points if p.timestamp == datetime.fromtimestamp(missed, UTC)]
+    assert {p.measurement: p.fields for p in history} == {
+        "weather_temperature_celsius": {"Temperature": 17.0},
+        "weather_humidity_percentage": {"Humidity": 60.0},
+    }
+
+    await service.collect_and_store()
+
+    mock_api.get_measure.assert_awaited_once()
+
+
 def test_init_with_missing_credentials() -> None:
     """Test service initialization with missing credentials."""
     settings = Settings()
@@ -6,6 +6,7 @@ import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
 from home_monitoring.services.sam_digital.service import SamDigitalService
+from home_monitoring.utils.http import HttpClientRegistry
 
 EXPECTED_SAM_SERVICE_MEASUREMENT_COUNT = 1
 
@@ -53,11 +54,8 @@ def service(
         "home_monitoring.services.sam_digital.service.InfluxDBRepository",
         lambda *args, **kwargs: mock_db,
     )
-    monkeypatch.setattr(
-        "home_monitoring.services.sam_digital.service.make_async_client",
-        lambda *args, **kwargs: mock_client,
-    )
-    return SamDigitalService(settings=settings)
+    http_clients = HttpClientRegistry(client_factory=lambda **kwargs: mock_client)
+    return SamDigitalService(settings=settings, http_clients=http_clients)
 
 
 def test_init_with_missing_credentials() -> None:
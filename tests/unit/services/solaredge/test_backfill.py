@@ -0,0 +1,222 @@
+"""Tests for chunked, resumable SolarEdge backfills."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from home_monitoring.config import Settings
+from home_monitoring.core.exceptions import APIError
+from home_monitoring.services.solaredge.backfill import (
+    CHECKPOINT_FILENAME,
+    BackfillCheckpoint,
+    chunk_length,
+    plan_chunks,
+)
+from home_monitoring.services.solaredge.service import SolarEdgeService
+from home_monitoring.utils.http import HttpClientRegistry
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+class FakePowerApi:
+    """Serves one power point per chunk and tracks request concurrency."""
+
+    def __init__(self, fail_on: datetime | None = None) -> None:
+        self.windows: list[tuple[datetime, datetime]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail_on = fail_on
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        start, end = (
+            datetime.fromisoformat(request.url.params[key]).replace(tzinfo=UTC)
+            for key in ("startTime", "endTime")
+        )
+        self.windows.append((start, end))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if start == self._fail_on:
+            return httpx.Response(403)
+        value = {"date": request.url.params["startTime"], "value": 1.0}
+        return httpx.Response(
+            200,
+            json={
+                "powerDetails": {
+                    "timeUnit": "QUARTER_OF_AN_HOUR",
+                    "unit": "W",
+                    "meters": [{"type": "Production", "values": [value]}],
+                }
+            },
+        )
+
+
+def make_service(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    api: FakePowerApi,
+    **overrides: Any,
+) -> tuple[SolarEdgeService, AsyncMock]:
+    """Build a service whose power endpoint is served by ``api``."""
+    db = AsyncMock()
+    monkeypatch.setattr(
+        "home_monitoring.services.solaredge.service.InfluxDBRepository",
+        lambda *args, **kwargs: db,
+    )
+    settings = Settings(
+        solaredge_api_key="test_key",
+        solaredge_site_id="test_site",
+        state_dir=tmp_path,
+        **overrides,
+    )
+    http_clients = HttpClientRegistry(
+        client_factory=lambda **kwargs: httpx.AsyncClient(
+            transport=httpx.MockTransport(api)
+        )
+    )
+    return SolarEdgeService(settings=settings, http_clients=http_clients), db
+
+
+def test_plan_chunks_caps_window_at_api_limit() -> None:
+    """A 60-day gap splits into legal windows covering it exactly."""
+    length = chunk_length("QUARTER_OF_AN_HOUR", chunk_days=90)
+    chunks = plan_chunks(START, START + timedelta(days=60), length)
+
+    assert length == timedelta(days=28)
+    assert [end - start for start, end in chunks] == [
+        timedelta(days=28),
+        timedelta(days=28),
+        timedelta(days=4),
+    ]
+    assert chunks[0][0] == START
+    assert chunks[-1][1] == START + timedelta(days=60)
+    assert plan_chunks(START, START, length) == []
+
+
+@pytest.mark.asyncio
+async def test_long_gap_is_fetched_in_bounded_parallel_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A 30-day gap becomes 5 requests, at most 2 in flight (happy path)."""
+    api = FakePowerApi()
+    service, db = make_service(
+        tmp_path,
+        monkeypatch,
+        api,
+        solaredge_backfill_chunk_days=7,
+        solaredge_max_concurrent_requests=2,
+    )
+
+    await service.collect_and_store_power_details(START, START + timedelta(days=30))
+
+    assert len(api.windows) == 5
+    assert api.max_in_flight == 2
+    assert db.write_measurements.await_count == 5
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    assert checkpoint.frontier("power_details") == START + timedelta(days=30)
+    assert checkpoint.requests_on(datetime.now(UTC).date()) == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_resumed_on_next_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The frontier stops before a failed chunk and the next run restarts there."""
+    failing = START + timedelta(days=7)
+    api = FakePowerApi(fail_on=failing)
+    service, _ = make_service(tmp_path, monkeypatch, api)
+
+    with pytest.raises(APIError, match="SolarEdge API request failed"):
+        await service.collect_and_store_power_details(START, START + timedelta(days=21))
+
+    # the other chunks still ran and were written
+    assert len(api.windows) == 3
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    assert checkpoint.frontier("power_details") == failing
+
+    retry = FakePowerApi()
+    service, _ = make_service(tmp_path, monkeypatch, retry)
+    # the regular run only asks for the tail, the checkpoint extends it
+    await service.collect_and_store_power_details(
+        START + timedelta(days=20), START + timedelta(days=21)
+    )
+
+    assert retry.windows[0][0] == failing
+
+
+@pytest.mark.asyncio
+async def test_older_window_does_not_move_the_frontier_back(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Re-collecting an old window leaves the next regular run on the tail."""
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    checkpoint.set_frontier("power_details", START + timedelta(days=60))
+    checkpoint.save()
+    service, _ = make_service(tmp_path, monkeypatch, FakePowerApi())
+
+    await service.collect_and_store_power_details(START, START + timedelta(days=1))
+
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    assert checkpoint.frontier("power_details") == START + timedelta(days=60)
+    api = FakePowerApi()
+    service, _ = make_service(tmp_path, monkeypatch, api)
+    await service.collect_and_store_power_details(
+        START + timedelta(days=60), START + timedelta(days=61)
+    )
+    assert api.windows == [(START + timedelta(days=60), START + timedelta(days=61))]
+
+
+@pytest.mark.asyncio
+async def test_chunks_beyond_daily_quota_are_skipped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Once today's quota is used up, remaining chunks wait for the next run."""
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    for _ in range(8):
+        checkpoint.record_request(datetime.now(UTC).date())
+    checkpoint.save()
+    api = FakePowerApi()
+    service, db = make_service(tmp_path, monkeypatch, api, solaredge_daily_quota=10)
+
+    await service.collect_and_store_power_details(START, START + timedelta(days=28))
+
+    assert api.windows == [
+        (START, START + timedelta(days=7)),
+        (START + timedelta(days=7), START + timedelta(days=14)),
+    ]
+    assert db.write_measurements.await_count == 2
+    checkpoint = BackfillCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    assert checkpoint.frontier("power_details") == START + timedelta(days=14)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_makes_no_request(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With no quota left nothing is fetched and no error is raised."""
+    api = FakePowerApi()
+    service, db = make_service(tmp_path, monkeypatch, api, solaredge_daily_quota=0)
+
+    await service.collect_and_store_power_details(START, START + timedelta(hours=1))
+
+    assert api.windows == []
+    assert not db.write_measurements.called
+
+
+def test_corrupt_checkpoint_starts_fresh(tmp_path: Path) -> None:
+    """An unreadable checkpoint is ignored rather than failing the run."""
+    path = tmp_path / CHECKPOINT_FILENAME
+    path.write_text("{not json")
+
+    checkpoint = BackfillCheckpoint(path)
+
+    assert checkpoint.frontier("power_details") is None
+    assert checkpoint.requests_on(START.date()) == 0
+    checkpoint.set_frontier("power_details", START)
+    checkpoint.save()
+    assert BackfillCheckpoint(path).frontier("power_details") == START
@@ -1,20 +1,26 @@
 """Tests for SolarEdge service."""
 
-from datetime import UTC, datetime
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
+from home_monitoring.services.solaredge.backfill import BackfillResult
 from home_monitoring.services.solaredge.service import SolarEdgeService
+from home_monitoring.utils.http import HttpClientRegistry
 
 
 @pytest.fixture
-def settings() -> Settings:
+def settings(tmp_path: Path) -> Settings:
     """Create test settings."""
     return Settings(
         solaredge_api_key="test_key",
         solaredge_site_id="test_site",
+        state_dir=tmp_path,
     )
 
 
@@ -31,14 +37,23 @@ def mock_client() -> MagicMock:
     """Create mock HTTP client."""
     client = MagicMock()
 
-    # Create mock response
+    # Create mock response; the streamed body is the configured json payload
     mock_response = MagicMock()
     mock_response.raise_for_status = MagicMock()
     mock_response.json = MagicMock()
+    mock_response.aclose = AsyncMock()
+
+    async def aiter_text() -> AsyncIterator[str]:
+        body = json.dumps(mock_response.json.return_value)
+        for offset in range(0, len(body), 64):
+            yield body[offset : offset + 64]
+
+    mock_response.aiter_text = aiter_text
 
     # Set up the client methods
     client.get = AsyncMock(return_value=mock_response)
     client.request = client.get  # request_with_retries calls client.request
+    client.send = client.get  # stream_with_retries calls client.send
     client.__aenter__ = AsyncMock(return_value=client)
     client.__aexit__ = AsyncMock(return_value=None)
 
@@ -57,11 +72,8 @@ def service(
         "home_monitoring.services.solaredge.service.InfluxDBRepository",
         lambda *args, **kwargs: mock_db,
     )
-    monkeypatch.setattr(
-        "home_monitoring.services.solaredge.service.make_async_client",
-        lambda *args, **kwargs: mock_client,
-    )
-    return SolarEdgeService(settings=settings)
+    http_clients = HttpClientRegistry(client_factory=lambda **kwargs: mock_client)
+    return SolarEdgeService(settings=settings, http_clients=http_clients)
 
 
 def test_init_with_missing_credentials() -> None:
@@ -288,7 +300,6 @@ async def test_collect_and_store_power_details_no_measurements(
     service: SolarEdgeService,
     mock_client: MagicMock,
     mock_db: AsyncMock,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Service should fail when mapper yields no measurements for power details."""
     start_time = datetime(2015, 11, 21, 11, 0, 0, tzinfo=UTC)
@@ -304,11 +315,6 @@ async def test_collect_and_store_power_details_no_measurements(
 
     mock_client.get.return_value.json.return_value = power_details_response
 
-    monkeypatch.setattr(
-        "home_monitoring.services.solaredge.service.SolarEdgeMapper.to_measurements",
-        lambda *args, **kwargs: [],
-    )
-
     with pytest.raises(
         APIError,
         match="No SolarEdge power details measurements created",
@@ -316,3 +322,74 @@ async def test_collect_and_store_power_details_no_measurements(
         await service.collect_and_store_power_details(start_time, end_time)
 
     assert not mock_db.write_measurements.called
+
+
+NOW = datetime(2024, 2, 16, 20, 7, tzinfo=UTC)
+
+
+def stub_collection(service: SolarEdgeService) -> tuple[AsyncMock, AsyncMock]:
+    """Replace both detail collections by stubs writing their whole window."""
+
+    async def written(**kwargs: object) -> BackfillResult:
+        return BackfillResult(points=1, chunks=1, skipped_chunks=0, frontier=NOW)
+
+    energy = AsyncMock(side_effect=written)
+    power = AsyncMock(side_effect=written)
+    service.collect_and_store_energy_details = energy  # type: ignore[method-assign]
+    service.collect_and_store_power_details = power  # type: ignore[method-assign]
+    return energy, power
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_recent_without_data_uses_30_day_window(
+    service: SolarEdgeService, mock_db: AsyncMock
+) -> None:
+    """Without a watermark or stored data, the last 30 days are collected."""
+    mock_db.get_latest_timestamp = AsyncMock(return_value=None)
+    energy, power = stub_collection(service)
+
+    await service.collect_recent(meters=["PRODUCTION"], now=NOW)
+
+    energy.assert_awaited_once_with(
+        start_time=NOW - timedelta(days=30),
+        end_time=NOW,
+        time_unit="QUARTER_OF_AN_HOUR",
+        meters=["PRODUCTION"],
+    )
+    power.assert_awaited_once_with(
+        start_time=NOW - timedelta(days=30), end_time=NOW, meters=["PRODUCTION"]
+    )
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_recent_clamps_old_data_to_30_day_window(
+    service: SolarEdgeService, mock_db: AsyncMock
+) -> None:
+    """Stored data older than 30 days seeds the mark but the window is clamped."""
+    mock_db.get_latest_timestamp = AsyncMock(return_value=NOW - timedelta(days=60))
+    energy, power = stub_collection(service)
+
+    await service.collect_recent(now=NOW)
+
+    assert energy.await_args.kwargs["start_time"] == NOW - timedelta(days=30)
+    assert power.await_args.kwargs["start_time"] == NOW - timedelta(days=30)
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_recent_resumes_from_watermark(
+    service: SolarEdgeService, mock_db: AsyncMock
+) -> None:
+    """The next run starts at the last (incomplete) quarter hour of the previous."""
+    mock_db.get_latest_timestamp = AsyncMock(return_value=None)
+    energy, power = stub_collection(service)
+    await service.collect_recent(now=NOW)
+
+    later = NOW + timedelta(hours=2)
+    await service.collect_recent(now=later)
+
+    quarter = datetime(2024, 2, 16, 20, 0, tzinfo=UTC)
+    assert energy.await_args.kwargs["start_time"] == quarter
+    assert energy.await_args.kwargs["end_time"] == later
+    assert power.await_args.kwargs["start_time"] == quarter
+    # the stored data was only consulted before the first mark existed
+    assert mock_db.get_latest_timestamp.await_count == 2
@@ -0,0 +1,58 @@
+"""Tests for the last written gas prices."""
+
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from home_monitoring.config import Settings
+from home_monitoring.models.base import Measurement
+from home_monitoring.scripts.healthcheck import DEFAULT_CONFIG
+from home_monitoring.services.tankerkoenig.last_prices import LastPriceStore
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+
+def _point(e5: float, diesel: float) -> Measurement:
+    return Measurement(
+        measurement="gas_prices_euro",
+        tags={"station_id": "s1", "brand": "Star"},
+        timestamp=NOW,
+        fields={"e5": e5, "diesel": diesel},
+    )
+
+
+def test_keyframe_is_written_after_interval(tmp_path: Path) -> None:
+    """A station without a change gets a full point once per interval."""
+    path = tmp_path / "prices.json"
+    store = LastPriceStore(path, keyframe_interval=timedelta(hours=1))
+    assert store.changes([_point(1.8, 1.6)], NOW)[0].fields == {
+        "e5": 1.8,
+        "diesel": 1.6,
+    }
+    store.save()
+
+    store = LastPriceStore(path, keyframe_interval=timedelta(hours=1))
+    assert store.changes([_point(1.8, 1.6)], NOW + timedelta(minutes=59)) == []
+    changed = store.changes([_point(1.8, 1.5)], NOW + timedelta(minutes=59))
+    assert changed[0].fields == {"diesel": 1.5}
+    store.save()
+    keyframe = store.changes([_point(1.8, 1.5)], NOW + timedelta(hours=1))
+    assert keyframe[0].fields == {"e5": 1.8, "diesel": 1.5}
+
+
+def test_default_keyframe_interval_meets_freshness_sla() -> None:
+    """During quiet periods keyframes alone keep gas prices fresh."""
+    sla = json.loads(DEFAULT_CONFIG.read_text())["slas"]["gas_prices_euro"]
+    keyframe = Settings.model_fields["tankerkoenig_keyframe_minutes"].default
+    poll = 5  # the keyframe is written on the first poll after it is due
+
+    assert keyframe + poll < sla
+
+
+def test_unsaved_changes_are_written_again(tmp_path: Path) -> None:
+    """Points whose write failed are not recorded as written."""
+    store = LastPriceStore(tmp_path / "prices.json")
+    store.changes([_point(1.8, 1.6)], NOW)
+    store.discard()
+
+    assert len(store.changes([_point(1.8, 1.6)], NOW)) == 1
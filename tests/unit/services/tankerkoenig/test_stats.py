@@ -0,0 +1,103 @@
+"""Tests for the rolling gas price statistics."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from home_monitoring.models.base import Measurement
+from home_monitoring.repositories.query_results import RowBatch
+from home_monitoring.services.tankerkoenig.stats import PriceStatsStore, PriceWindow
+
+HOUR = 3600.0
+NOW = datetime(2026, 3, 15, tzinfo=UTC)
+
+
+def test_window_is_time_weighted_and_slides() -> None:
+    """Quantiles weigh prices by how long they held; old time is evicted."""
+    window = PriceWindow()
+    for hour in range(8):
+        window.observe(hour * HOUR, 1.70)
+    for hour in range(8, 11):  # 1.70 held 8 h
+        window.observe(hour * HOUR, 1.80)
+    window.observe(11 * HOUR, 1.60)  # 1.80 held 3 h, 1.60 just started
+
+    assert window.stats() == {
+        "min": 1.60,
+        "max": 1.80,
+        "p20": 1.70,
+        "p50": 1.70,
+        "p80": 1.80,
+    }
+
+    window.evict(7 * HOUR)  # 1.70 now held 1 h of the window
+    assert window.stats()["p50"] == 1.80
+
+
+def test_quantile_is_the_lowest_price_held_for_its_share() -> None:
+    """The ceil rank over time: exactly 20 % at 1.70 makes it the p20."""
+    window = PriceWindow()
+    window.observe(0, 1.70)
+    for hour in range(1, 6):  # 1 h at 1.70, 4 h at 1.90
+        window.observe(hour * HOUR, 1.90)
+
+    stats = window.stats()
+
+    assert (stats["p20"], stats["p50"], stats["p80"]) == (1.70, 1.90, 1.90)
+
+
+def test_gap_is_not_credited_to_the_previous_price() -> None:
+    """Observations further apart than the gap limit do not bridge it."""
+    window = PriceWindow()
+    window.observe(0, 1.70)
+    window.observe(HOUR, 1.70)
+    window.observe(10 * HOUR, 1.90)
+    window.observe(12 * HOUR, 1.90)
+
+    # 1 h at 1.70, 2 h at 1.90
+    assert window.stats()["p20"] == 1.70
+    assert window.stats()["p50"] == 1.90
+
+
+@pytest.mark.asyncio
+async def test_store_is_seeded_once_and_persisted(tmp_path: Path) -> None:
+    """Stored history seeds the windows; the next process reads them back."""
+    start = NOW - timedelta(days=1)
+    history = RowBatch(
+        name="gas_prices_euro",
+        columns=("time", "e5", "e10", "diesel"),
+        rows=[
+            (int((start + timedelta(hours=h)).timestamp() * 1e9), 1.75, None, 0)
+            for h in range(0, 24)
+        ],
+        tags={"station_id": "s1"},
+    )
+
+    async def batches():
+        yield history
+
+    store = PriceStatsStore(tmp_path / "stats.json")
+    assert not store.seeded
+    await store.seed(batches())
+    store.observe(
+        [
+            Measurement(
+                measurement="gas_prices_euro",
+                tags={"station_id": "s1"},
+                timestamp=NOW,
+                fields={"e5": 1.85, "e10": 0.0, "diesel": 0.0},
+            )
+        ]
+    )
+    store.save()
+
+    store = PriceStatsStore(tmp_path / "stats.json")
+    assert store.seeded
+    (point,) = store.to_measurements(NOW, ["s1"])
+    assert point.measurement == "gas_prices_stats"
+    assert point.fields == {
+        "e5_min": 1.75,
+        "e5_max": 1.85,
+        "e5_p20": 1.75,
+        "e5_p50": 1.75,
+        "e5_p80": 1.75,
+    }
@@ -1,11 +1,144 @@
 """Unit tests for Tankerkoenig client."""
 
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
 from home_monitoring.core.exceptions import APIError
-from home_monitoring.services.tankerkoenig.client import TankerkoenigClient
+from home_monitoring.services.tankerkoenig.cache import CACHE_FILENAME
+from home_monitoring.services.tankerkoenig.client import (
+    MAX_CONCURRENT_REQUESTS,
+    SearchArea,
+    TankerkoenigClient,
+)
+from home_monitoring.utils.http import HttpClientRegistry
+
+
+class FakeDetailApi:
+    """``detail.php`` answering after a short delay; tracks concurrency."""
+
+    def __init__(self, failing: frozenset[str] = frozenset()) -> None:
+        self.failing = failing
+        self.requested: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        station_id = request.url.params["id"]
+        self.requested.append(station_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if station_id in self.failing:
+            return httpx.Response(400, json={"ok": False})
+        return httpx.Response(
+            200, json={"ok": True, "station": {"id": station_id, "name": "fresh"}}
+        )
+
+
+def make_client(
+    api: Callable[[httpx.Request], Any], cache_dir: Path | None = None
+) -> TankerkoenigClient:
+    registry = HttpClientRegistry(
+        client_factory=lambda **kwargs: httpx.AsyncClient(
+            transport=httpx.MockTransport(api)
+        )
+    )
+    return TankerkoenigClient(
+        "test-key",
+        cache_dir=str(cache_dir) if cache_dir else None,
+        http_clients=registry,
+    )
+
+
+@pytest.mark.asyncio
+async def test_station_details_are_fetched_concurrently_and_cached(
+    tmp_path: Path,
+) -> None:
+    """Uncached details are requested concurrently, bounded, then cached."""
+    api = FakeDetailApi()
+    station_ids = [f"station-{i}" for i in range(12)]
+
+    result = await make_client(api, tmp_path).get_stations_details(station_ids)
+
+    assert sorted(result["stations"]) == sorted(station_ids)
+    assert api.max_in_flight == MAX_CONCURRENT_REQUESTS
+    # a second process is served from the cache
+    result = await make_client(api, tmp_path).get_stations_details(station_ids)
+    assert len(result["stations"]) == len(station_ids)
+    assert len(api.requested) == len(station_ids)
+
+
+# station IDs are UUIDs; only files named like one are legacy cache entries
+STALE = "00000000-0000-4000-8000-000000000001"
+BROKEN = "00000000-0000-4000-8000-000000000002"
+FRESH = "00000000-0000-4000-8000-000000000003"
+
+
+@pytest.mark.asyncio
+async def test_stale_station_details_are_refreshed(tmp_path: Path) -> None:
+    """Entries older than the TTL are refreshed; a failed refresh keeps them.
+
+    The entries start out in the former one-file-per-station layout, which
+    is imported into the cache file and removed.
+    """
+    stale = time.time() - 8 * 24 * 3600
+    for station_id in (STALE, BROKEN, FRESH):
+        path = tmp_path / f"{station_id}.json"
+        path.write_text(json.dumps({"id": station_id, "name": "cached"}))
+        if station_id != FRESH:
+            os.utime(path, (stale, stale))
+    api = FakeDetailApi(failing=frozenset({BROKEN}))
+
+    result = await make_client(api, tmp_path).get_stations_details(
+        [STALE, BROKEN, FRESH]
+    )
+
+    assert sorted(api.requested) == [STALE, BROKEN]
+    names = {k: v["name"] for k, v in result["stations"].items()}
+    assert names == {STALE: "fresh", BROKEN: "cached", FRESH: "cached"}
+    assert [p.name for p in tmp_path.iterdir()] == [CACHE_FILENAME]
+    # the refreshed entry is persisted, the others keep their age
+    api.requested.clear()
+    await make_client(api, tmp_path).get_stations_details([STALE, FRESH])
+    assert api.requested == []
+
+
+@pytest.mark.asyncio
+async def test_migration_leaves_other_json_files_alone(tmp_path: Path) -> None:
+    """State files sharing the directory are neither imported nor deleted."""
+    state_files = {
+        "freshness.json": {"gas_prices_euro": 1.0},
+        "watermarks.json": {"solaredge": {}},
+        # UUID-named, but not the details of that station
+        f"{STALE}.json": {"id": FRESH, "name": "cached"},
+    }
+    for name, content in state_files.items():
+        (tmp_path / name).write_text(json.dumps(content))
+    api = FakeDetailApi()
+
+    await make_client(api, tmp_path).get_stations_details([STALE])
+
+    assert api.requested == [STALE]
+    for name, content in state_files.items():
+        assert json.loads((tmp_path / name).read_text()) == content
+
+
+@pytest.mark.asyncio
+async def test_uncached_station_details_failure_raises() -> None:
+    """A station without cached details fails the request."""
+    api = FakeDetailApi(failing=frozenset({"broken"}))
+
+    with pytest.raises(APIError, match="Failed to get station details"):
+        await make_client(api).get_stations_details(["ok", "broken"])
 
 
 @pytest.mark.asyncio
@@ -224,3 +357,97 @@ async def test_get_prices_empty_station_list() -> None:
     # Assert - should return empty but valid response
     assert result["ok"] is True
     assert result["prices"] == {}
+
+
+@pytest.mark.asyncio
+async def test_search_stations_merges_areas() -> None:
+    """Overlapping areas report a station once, without prices."""
+    station = {
+        "id": "s1",
+        "brand": "STAR",
+        "dist": 1.2,
+        "isOpen": True,
+        "e5": 1.799,
+        "e10": None,
+        "diesel": 1.599,
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("/list.php")
+        return httpx.Response(200, json={"ok": True, "stations": [station]})
+
+    registry = HttpClientRegistry(
+        client_factory=lambda **kwargs: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+    )
+    client = TankerkoenigClient("test-key", http_clients=registry)
+
+    result = await client.search_stations(
+        [SearchArea(52.5, 13.4, 5.0), SearchArea(52.51, 13.41, 5.0)]
+    )
+
+    assert result["stations"] == {"s1": {"id": "s1", "brand": "STAR"}}
+    assert result["complete"] is True
+
+
+class FakeSearchApi:
+    """``list.php`` and ``prices.php``; records the requested endpoints."""
+
+    def __init__(self) -> None:
+        self.requested: list[str] = []
+        self.failing = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        self.requested.append(endpoint)
+        if self.failing:
+            return httpx.Response(400, json={"ok": False})
+        if endpoint == "list.php":
+            stations = [{"id": "s1", "brand": "STAR", "e5": 1.799, "isOpen": True}]
+            return httpx.Response(200, json={"ok": True, "stations": stations})
+        assert endpoint == "prices.php", endpoint
+        prices = {"s1": {"status": "open", "e5": 1.789}}
+        return httpx.Response(200, json={"ok": True, "prices": prices})
+
+
+async def run_search_areas(api: FakeSearchApi, cache_dir: Path) -> dict[str, Any]:
+    """One collection run over a search area, as the service does it."""
+    client = make_client(api, cache_dir)
+    station_ids = await client.get_watchlist([SearchArea(52.5, 13.4, 5.0)])
+    prices = await client.get_prices(station_ids)
+    details = await client.get_stations_details(station_ids)
+    assert details["stations"] == {"s1": {"id": "s1", "brand": "STAR"}}
+    return prices
+
+
+@pytest.mark.asyncio
+async def test_watchlist_is_searched_once_per_ttl(tmp_path: Path) -> None:
+    """Within the TTL, runs poll prices.php only; details come with list.php."""
+    api = FakeSearchApi()
+
+    first = await run_search_areas(api, tmp_path)
+    second = await run_search_areas(api, tmp_path)
+
+    assert (
+        first["prices"] == second["prices"] == {"s1": {"status": "open", "e5": 1.789}}
+    )
+    assert api.requested == ["list.php", "prices.php", "prices.php"]
+
+
+@pytest.mark.asyncio
+async def test_stale_watchlist_is_searched_again(tmp_path: Path) -> None:
+    """An expired watchlist is resolved again; a failed search keeps it."""
+    api = FakeSearchApi()
+    areas = [SearchArea(52.5, 13.4, 5.0)]
+    await make_client(api, tmp_path).get_watchlist(areas)
+    later = time.time() + 7 * 3600
+
+    with patch("time.time", return_value=later):
+        api.failing = True
+        client = make_client(api, tmp_path)
+        assert await client.get_watchlist(areas) == ["s1"]
+        api.failing = False
+        assert await client.get_watchlist(areas) == ["s1"]
+
+    assert api.requested == ["list.php", "list.php", "list.php"]
@@ -1,5 +1,6 @@
 """Unit tests for Tankerkoenig service."""
 
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
@@ -22,6 +23,11 @@ from tests.unit.services.tankerkoenig.constants import (
 )
 
 
+def _price_points(written: list) -> list:
+    """Price points of a write (price statistics are written alongside)."""
+    return [m for m in written if m.measurement == "gas_prices_euro"]
+
+
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_success(
     mocker: MockerFixture,
@@ -85,7 +91,7 @@ async def test_collect_and_store_success(
 
     # Assert
     mock_influxdb.write_measurements.assert_called_once()
-    measurements = mock_influxdb.write_measurements.call_args[0][0]
+    measurements = _price_points(mock_influxdb.write_measurements.call_args[0][0])
     assert len(measurements) == 1
     assert measurements[0].measurement == "gas_prices_euro"
     assert measurements[0].tags["station_id"] == TEST_STATION_ID
@@ -218,6 +224,12 @@ async def test_collect_and_store_invalid_response(
         "get_prices",
         side_effect=mock_client.get_prices,
     )
+    # details are requested alongside the prices
+    mocker.patch.object(
+        TankerkoenigClient,
+        "get_stations_details",
+        return_value={"ok": True, "stations": {}},
+    )
 
     # Create service
     service = TankerkoenigService(
@@ -295,7 +307,7 @@ async def test_collect_and_store_integer_postcode(
 
     # Assert - should handle integer postCode gracefully
     mock_influxdb.write_measurements.assert_called_once()
-    measurements = mock_influxdb.write_measurements.call_args[0][0]
+    measurements = _price_points(mock_influxdb.write_measurements.call_args[0][0])
     assert len(measurements) == 1
     assert measurements[0].measurement == "gas_prices_euro"
     assert measurements[0].tags["station_id"] == TEST_STATION_ID
@@ -317,11 +329,16 @@ async def test_collect_and_store_empty_price_data(
             "prices": {},  # Empty prices
         }
     )
+    mock_client.get_stations_details = AsyncMock(
+        return_value={"ok": True, "stations": {}}
+    )
 
     original_init = TankerkoenigClient.__init__
 
-    def mock_init(self, api_key: str, cache_dir: str | None = None) -> None:
-        original_init(self, api_key, cache_dir)
+    def mock_init(
+        self, api_key: str, cache_dir: str | None = None, **kwargs: Any
+    ) -> None:
+        original_init(self, api_key, cache_dir, **kwargs)
 
     mocker.patch.object(
         TankerkoenigClient,
@@ -333,6 +350,11 @@ async def test_collect_and_store_empty_price_data(
         "get_prices",
         side_effect=mock_client.get_prices,
     )
+    mocker.patch.object(
+        TankerkoenigClient,
+        "get_stations_details",
+        side_effect=mock_client.get_stations_details,
+    )
 
     # Create service
     service = TankerkoenigService(
@@ -466,3 +488,128 @@ async def test_collect_and_store_all_zero_prices(
         await service.collect_and_store(station_ids=[TEST_STATION_ID])
 
     assert not mock_influxdb.write_measurements.called
+
+
+def _prices(diesel: float) -> dict:
+    return {
+        "ok": True,
+        "prices": {
+            TEST_STATION_ID: {
+                "diesel": diesel,
+                "e5": TEST_E5_PRICE,
+                "e10": TEST_E10_PRICE,
+                "status": "open",
+            },
+        },
+    }
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_and_store_writes_changed_prices_only(
+    mocker: MockerFixture,
+    mock_influxdb: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Unchanged prices are skipped, a changed fuel is written on its own.
+
+    A run without any change writes nothing, not even statistics.
+    """
+    mocker.patch.object(TankerkoenigClient, "__init__", return_value=None)
+    get_prices = mocker.patch.object(
+        TankerkoenigClient, "get_prices", return_value=_prices(TEST_DIESEL_PRICE)
+    )
+    mocker.patch.object(
+        TankerkoenigClient,
+        "get_stations_details",
+        return_value={"ok": True, "stations": {}},
+    )
+    service = TankerkoenigService(settings=mock_settings, repository=mock_influxdb)
+
+    await service.collect_and_store(station_ids=[TEST_STATION_ID])
+    # a second process sees the same prices
+    service = TankerkoenigService(settings=mock_settings, repository=mock_influxdb)
+    await service.collect_and_store(station_ids=[TEST_STATION_ID])
+    get_prices.return_value = _prices(TEST_DIESEL_PRICE + 0.01)
+    await service.collect_and_store(station_ids=[TEST_STATION_ID])
+
+    writes = [
+        _price_points(c.args[0])
+        for c in mock_influxdb.write_measurements.call_args_list
+    ]
+    assert [len(points) for points in writes] == [1, 1]
+    assert set(writes[0][0].fields) == {"diesel", "e5", "e10"}
+    assert writes[1][0].fields == {"diesel": TEST_DIESEL_PRICE + 0.01}
+    assert writes[1][0].tags == writes[0][0].tags
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_and_store_writes_price_stats(
+    mocker: MockerFixture,
+    mock_influxdb: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """A run writes the rolling price statistics of each changed station."""
+    mocker.patch.object(TankerkoenigClient, "__init__", return_value=None)
+    get_prices = mocker.patch.object(
+        TankerkoenigClient, "get_prices", return_value=_prices(TEST_DIESEL_PRICE)
+    )
+    mocker.patch.object(
+        TankerkoenigClient,
+        "get_stations_details",
+        return_value={"ok": True, "stations": {}},
+    )
+    service = TankerkoenigService(settings=mock_settings, repository=mock_influxdb)
+
+    await service.collect_and_store(station_ids=[TEST_STATION_ID])
+    get_prices.return_value = _prices(TEST_DIESEL_PRICE + 0.1)
+    await service.collect_and_store(station_ids=[TEST_STATION_ID])
+
+    written = mock_influxdb.write_measurements.call_args[0][0]
+    (stats,) = (m for m in written if m.measurement == "gas_prices_stats")
+    assert stats.tags == {"station_id": TEST_STATION_ID}
+    assert stats.fields["diesel_min"] == TEST_DIESEL_PRICE
+    assert stats.fields["diesel_max"] == TEST_DIESEL_PRICE + 0.1
+    assert stats.fields["e5_p50"] == TEST_E5_PRICE
+
+
+@pytest.mark.asyncio(scope="function")
+async def test_collect_and_store_searches_configured_areas(
+    mocker: MockerFixture,
+    mock_influxdb: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """With search areas and no station IDs, their watchlist is polled."""
+    mock_settings.tankerkoenig_search_areas = [(52.52, 13.4, 5.0)]
+    mocker.patch.object(TankerkoenigClient, "__init__", return_value=None)
+    watchlist = mocker.patch.object(
+        TankerkoenigClient, "get_watchlist", return_value=[TEST_STATION_ID]
+    )
+    get_prices = mocker.patch.object(
+        TankerkoenigClient, "get_prices", return_value=_prices(TEST_DIESEL_PRICE)
+    )
+    mocker.patch.object(
+        TankerkoenigClient,
+        "get_stations_details",
+        return_value={
+            "ok": True,
+            "stations": {TEST_STATION_ID: {"brand": TEST_STATION_BRAND}},
+        },
+    )
+    service = TankerkoenigService(settings=mock_settings, repository=mock_influxdb)
+
+    await service.collect_and_store()
+
+    areas, force_update = watchlist.call_args.args
+    assert [(a.lat, a.lng, a.radius_km) for a in areas] == [(52.52, 13.4, 5.0)]
+    assert force_update is False
+    get_prices.assert_called_once_with([TEST_STATION_ID])
+    measurements = _price_points(mock_influxdb.write_measurements.call_args[0][0])
+    assert measurements[0].tags["brand"] == TEST_STATION_BRAND.title()
+
+
+def test_search_radius_is_validated(mock_settings: Settings) -> None:
+    """list.php searches at most 25 km around a point."""
+    mock_settings.tankerkoenig_search_areas = [(52.52, 13.4, 30.0)]
+
+    with pytest.raises(ValueError, match="radius"):
+        TankerkoenigService(settings=mock_settings, repository=AsyncMock())
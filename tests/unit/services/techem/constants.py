@@ -9,6 +9,10 @@ TEST_METER_DATA = b"36446850532301534362000000000000fd000000000000"
 # Expected meter ID from test data
 EXPECTED_METER_ID = "53012353"
 
+# Frame of a second meter
+OTHER_METER_DATA = b"36446850542301534362000000000000fd000000000000"
+OTHER_METER_ID = "53012354"
+
 # Serial configuration used in tests
 SERIAL_BAUDRATE = 9600
 SERIAL_TIMEOUT = 60
@@ -10,6 +10,8 @@ from pytest_mock import MockerFixture
 
 from tests.unit.services.techem.constants import (
     EXPECTED_METER_ID,
+    OTHER_METER_DATA,
+    OTHER_METER_ID,
     SERIAL_BAUDRATE,
     SERIAL_TIMEOUT,
     TEST_METER_DATA,
@@ -84,12 +86,47 @@ async def test_collect_and_store_success(
         # Assert
         mock_influxdb.write_measurements.assert_called_once()
         measurements = mock_influxdb.write_measurements.call_args[0][0]
-        assert len(measurements) == TEST_NUM_PACKETS
+        # repeated frames of one meter are stored once
+        assert len(measurements) == 1
         assert measurements[0].measurement == "heat_energy_watthours"
         assert measurements[0].tags["id"] == EXPECTED_METER_ID
         assert measurements[0].fields["Total_Consumption"] > 0
 
 
+@pytest.mark.asyncio(scope="function")
+async def test_collect_and_store_stops_once_expected_meters_reported(
+    mock_influxdb: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Test that reception ends as soon as every expected meter was heard."""
+    service = TechemService(settings=mock_settings, repository=mock_influxdb)
+
+    mock_serial = MagicMock()
+    mock_serial.is_open = True
+    mock_serial.readline.side_effect = [
+        b"CUL V4.0\r\n",  # Version
+        b"OK\r\n",  # WMBUS mode
+        TEST_METER_DATA,
+        b"",  # read timeout, not a frame
+        TEST_METER_DATA,
+        OTHER_METER_DATA,
+        TEST_METER_DATA,  # never read
+    ]
+
+    with patch("serial.Serial", return_value=mock_serial):
+        await service.collect_and_store(
+            num_packets=10, expected_meters=[EXPECTED_METER_ID, OTHER_METER_ID]
+        )
+
+    assert mock_serial.readline.call_count == 6
+    measurements = mock_influxdb.write_measurements.call_args[0][0]
+    assert sorted(m.tags["id"] for m in measurements) == [
+        EXPECTED_METER_ID,
+        OTHER_METER_ID,
+    ]
+    mock_serial.close.assert_called_once()
+
+
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_port_error(
     mocker: MockerFixture,
@@ -0,0 +1,64 @@
+"""Tests for the collector watermark store."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from home_monitoring.services.watermarks import (
+    WatermarkStore,
+    align,
+    plan_window,
+)
+
+NOW = datetime(2024, 6, 1, 12, 7, tzinfo=UTC)
+QUARTER = timedelta(minutes=15)
+
+
+def test_plan_window_reports_gap_and_truncation() -> None:
+    """An on-time mark has no gap; one beyond max_window is clamped."""
+    on_time = plan_window(NOW - QUARTER, NOW, timedelta(days=1), QUARTER)
+    assert on_time.start == NOW - QUARTER
+    assert not on_time.gap
+    assert not on_time.truncated
+
+    late = plan_window(NOW - timedelta(hours=3), NOW, timedelta(days=1), QUARTER)
+    assert late.gap == timedelta(hours=2, minutes=45)
+    assert not late.truncated
+
+    lost = plan_window(NOW - timedelta(days=3), NOW, timedelta(days=1), QUARTER)
+    assert lost.start == NOW - timedelta(days=1)
+    assert lost.truncated
+
+    first = plan_window(None, NOW, timedelta(days=1), QUARTER)
+    assert first.start == NOW - timedelta(days=1)
+    assert first.watermark is None
+    assert not first.gap
+    assert align(NOW, QUARTER) == datetime(2024, 6, 1, 12, tzinfo=UTC)
+
+
+def test_marks_are_shared_between_stores_and_never_move_back(tmp_path: Path) -> None:
+    """Saves merge per stream keeping the newest mark."""
+    path = tmp_path / "watermarks.json"
+    first, second = WatermarkStore(path), WatermarkStore(path)
+
+    first.advance("tibber", "hourly_consumption", NOW)
+    first.save()
+    second.advance("tibber", "hourly_consumption", NOW - timedelta(hours=1))
+    second.advance("netatmo", "measure:a", NOW)
+    second.save()
+
+    reopened = WatermarkStore(path)
+    assert reopened.get("tibber", "hourly_consumption") == NOW
+    assert reopened.get("netatmo", "measure:a") == NOW
+    assert reopened.get("netatmo", "measure:b") is None
+
+
+def test_corrupt_file_is_treated_as_empty(tmp_path: Path) -> None:
+    """An unreadable file only costs a wider window."""
+    path = tmp_path / "watermarks.json"
+    path.write_text("{not json")
+    store = WatermarkStore(path)
+
+    assert store.get("solaredge", "power_details") is None
+    store.advance("solaredge", "power_details", NOW)
+    store.save()
+    assert WatermarkStore(path).get("solaredge", "power_details") == NOW
@@ -0,0 +1,93 @@
+"""Unit tests for the per-run Tibber request memo."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from home_monitoring.services.tibber.memo import MemoizedHome
+
+FIRST_OF_MONTH = datetime(2024, 3, 1)
+
+
+def make_home() -> MagicMock:
+    home = MagicMock()
+    home.get_historic_data = AsyncMock(
+        side_effect=lambda n_data, **kwargs: list(range(n_data))
+    )
+    home.get_historic_data_date = AsyncMock(
+        side_effect=lambda date_from, n_data, **kwargs: list(range(n_data))
+    )
+    return home
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_share_one_call() -> None:
+    """Identical requests reach the API once, even in flight (happy path)."""
+    home = make_home()
+    memo = MemoizedHome(home, max_concurrency=4)
+
+    results = await asyncio.gather(
+        *(memo.get_historic_data(n_data=3, resolution="HOURLY") for _ in range(3))
+    )
+
+    assert results == [[0, 1, 2]] * 3
+    assert home.get_historic_data.await_count == 1
+    assert memo.api_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_narrower_windows_are_sliced_from_wider_ones() -> None:
+    """Latest-N windows are tails, date_from windows are heads."""
+    home = make_home()
+    memo = MemoizedHome(home)
+
+    await memo.get_historic_data(n_data=10, resolution="HOURLY")
+    last_hour = await memo.get_historic_data(n_data=1, resolution="HOURLY")
+    await memo.get_historic_data_date(FIRST_OF_MONTH, n_data=14, resolution="DAILY")
+    first_days = await memo.get_historic_data_date(
+        FIRST_OF_MONTH, n_data=2, resolution="DAILY"
+    )
+
+    assert last_hour == [9]
+    assert first_days == [0, 1]
+    assert memo.api_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_different_series_are_not_shared() -> None:
+    """Production and other resolutions are separate windows (unhappy path)."""
+    home = make_home()
+    memo = MemoizedHome(home)
+
+    await memo.get_historic_data(n_data=10, resolution="HOURLY")
+    await memo.get_historic_data(n_data=1, resolution="HOURLY", production=True)
+    await memo.get_historic_data(n_data=1, resolution="DAILY")
+    # a wider window than the cached one needs a new call
+    await memo.get_historic_data(n_data=12, resolution="HOURLY")
+
+    assert memo.api_calls == 4
+
+
+@pytest.mark.asyncio
+async def test_failures_are_memoized() -> None:
+    """A failed request is not retried within the run (unhappy path)."""
+    home = make_home()
+    home.get_historic_data.side_effect = RuntimeError("rate limited")
+    memo = MemoizedHome(home)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="rate limited"):
+            await memo.get_historic_data(n_data=1, resolution="HOURLY")
+
+    assert home.get_historic_data.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_window_skips_the_api() -> None:
+    """n_data=0 (midnight's this_day) is answered locally (unhappy path)."""
+    home = make_home()
+    memo = MemoizedHome(home)
+
+    assert await memo.get_historic_data(n_data=0, resolution="HOURLY") == []
+    assert memo.api_calls == 0
@@ -0,0 +1,147 @@
+"""Tests for the rolling Tibber period and price statistics."""
+
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from home_monitoring.models.base import Measurement
+from home_monitoring.repositories.query_results import RowBatch
+from home_monitoring.services.tibber.period_stats import (
+    ALL_STATS,
+    SERIES,
+    PeriodStatsStore,
+    RollingSeries,
+    percentile_index,
+)
+
+HOUR = 3600.0
+NOW = datetime(2026, 3, 15, 12, tzinfo=UTC)
+SPECS = {spec.name: spec for spec in SERIES}
+
+
+def _cost(period: str, cost: float, at: datetime) -> Measurement:
+    return Measurement(
+        measurement="electricity_costs_euro",
+        tags={"period": period},
+        timestamp=at,
+        fields={"cost": cost},
+    )
+
+
+async def _batches(*batches: RowBatch) -> AsyncIterator[RowBatch]:
+    for batch in batches:
+        yield batch
+
+
+def test_completed_periods_keep_the_last_value_per_bucket() -> None:
+    """Repeated observations of an hour count once, with their newest value."""
+    series = RollingSeries(SPECS["cost_last_hour"])
+    for hour, cost in enumerate([0.10, 0.20, 0.30, 0.40, 0.50]):
+        series.observe(hour * HOUR, cost - 0.05)
+        series.observe(hour * HOUR + 1800, cost)
+
+    assert series.stats() == {
+        "min": 0.10,
+        "max": 0.50,
+        "p20": 0.10,
+        "p50": 0.30,
+        "p80": 0.40,
+    }
+
+    series.evict(26 * HOUR)  # the first two hours left the 24 h window
+    assert series.stats()["min"] == 0.30
+
+
+def test_quantiles_pick_the_values_of_influxql_percentile() -> None:
+    """PERCENTILE(value, p) over 24 hourly values picks the 5th, 12th and 19th."""
+    series = RollingSeries(SPECS["cost_last_hour"])
+    for hour in range(24):
+        series.observe(hour * HOUR, float(hour + 1))
+
+    stats = series.stats()
+
+    # SELECT PERCENTILE(v, 20), PERCENTILE(v, 50), PERCENTILE(v, 80) over 1..24
+    assert (stats["p20"], stats["p50"], stats["p80"]) == (5.0, 12.0, 19.0)
+
+
+@pytest.mark.parametrize(
+    ("count", "q", "index"),
+    [(12, 0.2, 1), (12, 0.8, 9), (24, 0.8, 18), (5, 0.5, 2), (2, 0.2, 0)],
+)
+def test_percentile_index_rounds_like_influxql(
+    count: int, q: float, index: int
+) -> None:
+    """``floor(n * p / 100 + 0.5) - 1``, not the ceil rank; null becomes 0."""
+    assert percentile_index(count, q) == index
+
+
+def test_running_totals_keep_the_largest_value_per_bucket() -> None:
+    """``this_*`` series report the maximum of the running totals."""
+    series = RollingSeries(SPECS["cost_this_hour"])
+    series.observe(0, 0.30)
+    series.observe(600, 0.10)  # a later, smaller value does not lower it
+    series.observe(HOUR, 0.20)
+
+    assert series.stats() == {"max": 0.30}
+
+
+def test_store_reports_one_point_of_matching_series(tmp_path: Path) -> None:
+    """Only the configured measurements and tags feed the statistics."""
+    store = PeriodStatsStore(tmp_path / "stats.json")
+    store.observe(
+        [
+            _cost("last_day", 4.0, NOW),
+            _cost("last_24h", 9.0, NOW),  # not a dashboard period
+            Measurement(
+                measurement="electricity_consumption_kwh",
+                tags={"period": "last_day"},  # total, not grid consumption
+                timestamp=NOW,
+                fields={"consumption": 12.0},
+            ),
+            Measurement(
+                measurement="electricity_prices_euro",
+                tags={},
+                timestamp=NOW,
+                fields={"total": 0.31, "rank": 0.5},
+            ),
+        ]
+    )
+
+    (point,) = store.to_measurements(NOW)
+
+    assert point.measurement == "electricity_stats"
+    assert set(point.fields) == {
+        *(f"cost_last_day_{stat}" for stat in ALL_STATS),
+        *(f"energy_price_euro_{stat}" for stat in ALL_STATS),
+    }
+    assert point.fields["cost_last_day_max"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_store_is_seeded_once_and_persisted(tmp_path: Path) -> None:
+    """Stored buckets seed the series; the next process reads them back."""
+    path = tmp_path / "stats.json"
+    store = PeriodStatsStore(path)
+    store.observe([_cost("last_day", 5.0, NOW)])  # observed before seeding
+    assert not store.seeded
+    assert "time > now() - 2592000s" in store.seed_queries["cost_last_day"]
+
+    days = [NOW - timedelta(days=d) for d in (3, 2, 1)]
+    history = RowBatch(
+        name="electricity_costs_euro",
+        columns=("time", "value"),
+        rows=[
+            (int(day.timestamp() * 1e9), cost)
+            for day, cost in zip(days, [1, 2, 3], strict=True)
+        ],
+    )
+    await store.seed({"cost_last_day": _batches(history)})
+    store.save()
+
+    reopened = PeriodStatsStore(path)
+    assert reopened.seeded
+    (point,) = reopened.to_measurements(NOW)
+    assert point.fields["cost_last_day_min"] == 1.0
+    assert point.fields["cost_last_day_max"] == 5.0
+    assert point.fields["cost_last_day_p50"] == 2.0
@@ -0,0 +1,118 @@
+"""Unit tests for the concurrent Tibber historic-data planner."""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from home_monitoring.services.tibber.memo import HistoricRequest
+from home_monitoring.services.tibber.planner import (
+    plan_requests,
+    prefetch_historic_data,
+    widest_requests,
+)
+
+NOW = datetime(2024, 3, 15, 10, 30)
+
+
+class SlowHome:
+    """Fake home answering every request after a delay, tracking concurrency."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self._delay = delay
+
+    async def get_historic_data(
+        self, n_data: int, resolution: str, production: bool
+    ) -> list[dict[str, Any]]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self._delay)
+        self.in_flight -= 1
+        return [{"resolution": resolution, "index": i} for i in range(n_data)]
+
+    async def get_historic_data_date(
+        self, date_from: datetime, **kwargs: Any
+    ) -> list[dict[str, Any]]:
+        return await self.get_historic_data(**kwargs)
+
+
+def test_plan_covers_every_call_site() -> None:
+    """Mid-year runs plan all periods, including month and year windows."""
+    requests = plan_requests(NOW)
+
+    first_of_month = datetime(2024, 3, 1)
+    assert len(requests) == 18
+    assert HistoricRequest("HOURLY", 10) in requests
+    assert HistoricRequest("DAILY", 14, first_of_month, production=True) in requests
+    assert HistoricRequest("MONTHLY", 2, datetime(2024, 1, 1)) in requests
+
+
+def test_plan_skips_empty_windows_on_new_year() -> None:
+    """On January 1st there are no completed days or months to fetch."""
+    requests = plan_requests(datetime(2024, 1, 1, 0, 5))
+
+    assert len(requests) == 14
+    assert all(r.date_from is None for r in requests)
+
+
+def test_widest_requests_collapses_overlapping_windows() -> None:
+    """last_hour/this_hour collapse into this_day's hourly window."""
+    windows = widest_requests(plan_requests(NOW))
+
+    assert len(windows) == 12
+    assert HistoricRequest("HOURLY", 10) in windows
+    assert HistoricRequest("HOURLY", 1) not in windows
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_concurrently_within_limit() -> None:
+    """Windows are fetched concurrently within the limit (happy path)."""
+    home = SlowHome()
+
+    planned = await prefetch_historic_data(home, plan_requests(NOW), 4)
+
+    assert home.calls == 12
+    assert home.max_in_flight == 4
+    last_hour = await planned.get_historic_data(n_data=1, resolution="HOURLY")
+    assert last_hour == [{"resolution": "HOURLY", "index": 9}]
+    assert home.calls == 12
+
+
+@pytest.mark.asyncio
+async def test_failure_surfaces_only_at_its_call_sites() -> None:
+    """A failed window re-raises where it is used; others still succeed."""
+    home = MagicMock()
+    home.get_historic_data = AsyncMock(
+        side_effect=[RuntimeError("rate limited"), [{"production": 1.0}]]
+    )
+    requests = [
+        HistoricRequest("HOURLY", 1),
+        HistoricRequest("HOURLY", 1, production=True),
+    ]
+
+    planned = await prefetch_historic_data(home, requests, max_concurrency=1)
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        await planned.get_historic_data(n_data=1, resolution="HOURLY")
+    production = await planned.get_historic_data(
+        n_data=1, resolution="HOURLY", production=True
+    )
+    assert production == [{"production": 1.0}]
+    assert home.get_historic_data.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unplanned_request_falls_through_to_home() -> None:
+    """Calls outside the plan still reach the wrapped home (unhappy path)."""
+    home = SlowHome(delay=0)
+
+    planned = await prefetch_historic_data(home, [], max_concurrency=4)
+    data = await planned.get_historic_data(n_data=2, resolution="DAILY")
+
+    assert home.calls == 1
+    assert len(data) == 2
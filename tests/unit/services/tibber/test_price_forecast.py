@@ -19,7 +19,7 @@ def make_home(price_total: object) -> MagicMock:
 
 @pytest.mark.asyncio
 async def test_forecast_collected_for_published_hours() -> None:
-    """Published hourly prices become future-timestamped measurements (happy)."""
+    """Published hourly prices become one future-timestamped batch (happy)."""
     home = make_home(
         {
             "2026-06-11T14:00:00+02:00": 0.31,
@@ -27,12 +27,14 @@ async def test_forecast_collected_for_published_hours() -> None:
         }
     )
 
-    measurements = await collect_price_forecast_data(home)
+    [batch] = await collect_price_forecast_data(home)
 
-    assert len(measurements) == 2
-    assert all(m.measurement == PRICE_FORECAST_MEASUREMENT for m in measurements)
-    assert measurements[0].fields["total"] == 0.31
-    assert measurements[0].timestamp == datetime(2026, 6, 11, 12, 0, tzinfo=UTC)
+    assert len(batch) == 2
+    assert batch.measurement == PRICE_FORECAST_MEASUREMENT
+    assert list(batch.fields["total"]) == [0.31, 0.28]
+    first = next(batch.rows())
+    assert first.fields == {"total": 0.31}
+    assert first.timestamp == datetime(2026, 6, 11, 12, 0, tzinfo=UTC)
 
 
 @pytest.mark.asyncio
@@ -45,9 +47,9 @@ async def test_forecast_skips_unpublished_none_prices() -> None:
         }
     )
 
-    measurements = await collect_price_forecast_data(home)
+    [batch] = await collect_price_forecast_data(home)
 
-    assert len(measurements) == 1
+    assert len(batch) == 1
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,183 @@
+"""Unit tests for the Tibber rollup cache of finalized totals."""
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from home_monitoring.config import Settings
+from home_monitoring.services.tibber.aggregation import (
+    aggregate_this_month_data,
+    aggregate_this_year_data,
+)
+from home_monitoring.services.tibber.planner import plan_requests
+from home_monitoring.services.tibber.rollup import (
+    ROLLUP_FILENAME,
+    PeriodTotals,
+    RollupCache,
+    finalized_totals,
+    shift,
+)
+from home_monitoring.services.tibber.service import TibberService
+
+NOW = datetime(2024, 3, 15, 10, 0)
+TS = datetime(2024, 3, 15, 10, 0)
+CONNECTION = MagicMock()
+
+
+def node(period_start: datetime, **values: float | None) -> dict[str, Any]:
+    """Historic-data node of the period starting at ``period_start``."""
+    return {"from": period_start.isoformat(), **values}
+
+
+def make_home(cost: float = 5.0, consumption: float = 20.0) -> MagicMock:
+    """Home answering dated requests with one identical node per period."""
+    home = MagicMock()
+
+    async def get_historic_data_date(
+        date_from: datetime,
+        n_data: int,
+        resolution: str = "HOURLY",
+        production: bool = False,
+    ) -> list[dict[str, Any]]:
+        starts = [shift(date_from, resolution, i) for i in range(n_data)]
+        if production:
+            return [node(s, production=1.0) for s in starts]
+        return [node(s, cost=cost, consumption=consumption) for s in starts]
+
+    home.get_historic_data_date = AsyncMock(side_effect=get_historic_data_date)
+    return home
+
+
+def month_totals(measurements: list) -> dict[str, float]:
+    return {
+        m.measurement: next(iter(m.fields.values()))
+        for m in measurements
+        if "source" not in m.tags
+    }
+
+
+@pytest.mark.asyncio
+async def test_second_run_fetches_only_open_days(tmp_path: Path) -> None:
+    """Finalized days come from the cache on the next run (happy path)."""
+    rollup = RollupCache(tmp_path / "rollup.sqlite3")
+    first_home, second_home = make_home(), make_home()
+
+    first = await aggregate_this_month_data(
+        first_home, CONNECTION, TS, 1.0, 2.0, 0.0, NOW, rollup
+    )
+    second = await aggregate_this_month_data(
+        second_home, CONNECTION, TS, 1.0, 2.0, 0.0, NOW, rollup
+    )
+
+    assert first[1:] == second[1:] == (71.0, 282.0, 14.0)
+    assert first_home.get_historic_data_date.await_args.kwargs["n_data"] == 14
+    # March 1-13 are final; yesterday (the 14th) is fetched again
+    kwargs = second_home.get_historic_data_date.await_args.kwargs
+    assert kwargs["date_from"] == datetime(2024, 3, 14)
+    assert kwargs["n_data"] == 1
+    assert month_totals(first[0]) == month_totals(second[0])
+
+
+@pytest.mark.asyncio
+async def test_cached_months_skip_the_api(tmp_path: Path) -> None:
+    """Completed months of the year are not fetched once cached."""
+    rollup = RollupCache(tmp_path / "rollup.sqlite3")
+    home = make_home(cost=100.0, consumption=400.0)
+
+    await aggregate_this_year_data(home, CONNECTION, TS, 1.0, 2.0, 0.0, NOW, rollup)
+    home.get_historic_data_date.reset_mock()
+    measurements = await aggregate_this_year_data(
+        home, CONNECTION, TS, 1.0, 2.0, 0.0, NOW, rollup
+    )
+
+    home.get_historic_data_date.assert_not_awaited()
+    assert month_totals(measurements)["electricity_costs_euro"] == 201.0
+
+
+def test_unsettled_or_incomplete_periods_are_not_cached() -> None:
+    """Yesterday, missing values and missing production nodes are skipped."""
+    nodes = [
+        node(datetime(2024, 3, 11), cost=1.0, consumption=2.0),  # final
+        node(datetime(2024, 3, 12), cost=1.0, consumption=2.0),  # final
+        node(datetime(2024, 3, 13), cost=None, consumption=2.0),  # incomplete
+        node(datetime(2024, 3, 14), cost=1.0, consumption=2.0),  # not settled yet
+    ]
+
+    totals = finalized_totals("DAILY", nodes[1:], [], NOW)
+    lagging_production = finalized_totals(
+        "DAILY", nodes[1:], [node(datetime(2024, 3, 12), production=None)], NOW
+    )
+    missing_production = finalized_totals(
+        "DAILY", nodes, [node(datetime(2024, 3, 11), production=3.0)], NOW
+    )
+
+    assert totals == [PeriodTotals(date(2024, 3, 12), 1.0, 2.0, 0.0)]
+    assert lagging_production == [PeriodTotals(date(2024, 3, 12), 1.0, 2.0, 0.0)]
+    assert missing_production == [PeriodTotals(date(2024, 3, 11), 1.0, 2.0, 3.0)]
+
+
+def test_gapped_response_is_keyed_by_node_timestamps() -> None:
+    """Totals follow each node's ``from``, not its position (unhappy path)."""
+    berlin = timezone(timedelta(hours=1))
+    day = {d: datetime(2024, 3, d, tzinfo=berlin) for d in range(1, 5)}
+    # Tibber skipped the 2nd in both lists and the 3rd's production node
+    nodes = [node(day[d], cost=d, consumption=d) for d in (1, 3, 4)]
+    production_nodes = [node(day[d], production=10 * d) for d in (1, 4)]
+
+    totals = finalized_totals("DAILY", nodes, production_nodes, NOW)
+
+    assert totals == [
+        PeriodTotals(date(2024, 3, 1), 1.0, 1.0, 10.0),
+        PeriodTotals(date(2024, 3, 4), 4.0, 4.0, 40.0),
+    ]
+
+
+def test_gap_in_cache_stops_the_cached_prefix(tmp_path: Path) -> None:
+    """Only the leading run of cached periods is used (unhappy path)."""
+    rollup = RollupCache(tmp_path / "rollup.sqlite3")
+    rollup.store(
+        "DAILY",
+        [
+            PeriodTotals(date(2024, 3, 1), 1.0, 1.0, 0.0),
+            PeriodTotals(date(2024, 3, 3), 1.0, 1.0, 0.0),
+        ],
+    )
+
+    cached = rollup.completed("DAILY", datetime(2024, 3, 1), 5)
+
+    assert [t.period_start for t in cached] == [date(2024, 3, 1)]
+
+
+def test_planner_narrows_windows_to_open_periods(tmp_path: Path) -> None:
+    """The prefetch plan asks only for periods missing from the cache."""
+    rollup = RollupCache(tmp_path / "rollup.sqlite3")
+    rollup.store(
+        "DAILY",
+        [PeriodTotals(date(2024, 3, d), 1.0, 1.0, 0.0) for d in range(1, 14)],
+    )
+    rollup.store(
+        "MONTHLY",
+        [PeriodTotals(date(2024, m, 1), 1.0, 1.0, 0.0) for m in (1, 2)],
+    )
+
+    dated = [r for r in plan_requests(NOW, rollup) if r.date_from is not None]
+
+    assert {(r.resolution, r.n_data, r.date_from) for r in dated} == {
+        ("DAILY", 1, datetime(2024, 3, 14))
+    }
+
+
+def test_shift_months_across_year_end() -> None:
+    """Monthly periods roll over into the next year."""
+    assert shift(datetime(2024, 11, 1), "MONTHLY", 2) == datetime(2025, 1, 1)
+    assert shift(datetime(2024, 2, 28), "DAILY", 2) == datetime(2024, 3, 1)
+
+
+def test_unusable_cache_file_disables_the_rollup(mock_settings: Settings) -> None:
+    """A cache path that cannot be opened falls back to fetching everything."""
+    (mock_settings.state_dir / ROLLUP_FILENAME).mkdir(parents=True)
+    service = TibberService(settings=mock_settings, repository=AsyncMock())
+
+    assert service._open_rollup() is None
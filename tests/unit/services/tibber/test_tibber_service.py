@@ -1,15 +1,64 @@
 """Unit tests for Tibber service."""
 
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 from zoneinfo import ZoneInfo
 
 import pytest
 from home_monitoring.config import Settings
 from home_monitoring.core.exceptions import APIError
+from home_monitoring.services.tibber.period_stats import STATS_MEASUREMENT
 from home_monitoring.services.tibber.service import TibberService
+from home_monitoring.services.watermarks import (
+    WATERMARK_FILENAME,
+    WatermarkStore,
+    align,
+)
 from pytest_mock import MockerFixture
 
+Windows = dict[tuple[str, bool], list[dict[str, Any]] | Exception]
+
+
+def _collected_points(written: list) -> list:
+    """Collected points of a write (statistics are written alongside)."""
+    return [m for m in written if m.measurement != STATS_MEASUREMENT]
+
+
+def serve_windows(windows: Windows) -> AsyncMock:
+    """Fake ``home.get_historic_data`` keyed on (resolution, production).
+
+    Like the API it returns the latest ``n_data`` nodes of a series (missing
+    series are empty); an exception value is raised instead.
+    """
+
+    async def get_historic_data(
+        n_data: int, resolution: str = "HOURLY", production: bool = False
+    ) -> list[dict[str, Any]]:
+        nodes = windows.get((resolution, production), [])
+        if isinstance(nodes, Exception):
+            raise nodes
+        return nodes[-n_data:] if n_data else []
+
+    return AsyncMock(side_effect=get_historic_data)
+
+
+def serve_dated_windows(windows: Windows) -> AsyncMock:
+    """Fake ``home.get_historic_data_date``: the first ``n_data`` nodes."""
+
+    async def get_historic_data_date(
+        date_from: datetime,
+        n_data: int,
+        resolution: str = "HOURLY",
+        production: bool = False,
+    ) -> list[dict[str, Any]]:
+        nodes = windows.get((resolution, production), [])
+        if isinstance(nodes, Exception):
+            raise nodes
+        return nodes[:n_data]
+
+    return AsyncMock(side_effect=get_historic_data_date)
+
 
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_success(
@@ -19,7 +68,6 @@ async def test_collect_and_store_success(
 ) -> None:
     """Test successful data collection and storage."""
     # Arrange
-    mock_consumption_node_hourly = {"totalCost": 0.45, "consumption": 1.5}
     mock_consumption_node_daily = {"totalCost": 7.65, "consumption": 25.5}
 
     mock_consumption_nodes_24h = []
@@ -33,35 +81,28 @@ async def test_collect_and_store_success(
         return_value=(1.234, datetime(2024, 2, 16, 20, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [mock_consumption_node_hourly],  # Last hour consumption
-            [],  # Last hour production (no solar)
-            [mock_consumption_node_daily],  # Last day consumption
-            [],  # Last day production (no solar)
-            mock_consumption_nodes_24h,  # Last 24h consumption
-            [],  # Last 24h production (no solar)
-            mock_consumption_nodes_24h[:10],  # This day hourly consumption
-            [],  # This day hourly production (no solar)
-            [mock_consumption_node_hourly],  # This hour consumption
-            [],  # This hour production (no solar)
-            [mock_consumption_node_daily],  # Last month consumption
-            [],  # Last month production (no solar)
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): mock_consumption_nodes_24h,  # this_day, last hour
+            ("DAILY", False): [mock_consumption_node_daily],  # Last day
+            ("MONTHLY", False): [mock_consumption_node_daily],  # Last month
             # Last year: ANNUAL history returns one node per *completed* year.
             # A home with a single completed year gets exactly one node; the
             # code reads ``cost`` (not ``totalCost``) from the last element.
-            [{"cost": 90.0, "totalCost": 100.0, "consumption": 450.0}],
-            [],  # Last year production (no solar)
-        ]
+            ("ANNUAL", False): [
+                {"cost": 90.0, "totalCost": 100.0, "consumption": 450.0}
+            ],
+            # no solar: every production series is empty
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": 5.50, "consumption": 20.0}],  # Day 1 for this_month
-            [{"production": 0.0}],  # Day 1 production for this_month
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [{"cost": 5.50, "consumption": 20.0}],  # Day 1
+            ("DAILY", True): [{"production": 0.0}],  # Day 1 production
             # For this_year: completed months (Jan)
-            [{"cost": 10.0, "consumption": 40.0}],  # January
-            [{"production": 0.0}],  # January production
-        ]
+            ("MONTHLY", False): [{"cost": 10.0, "consumption": 40.0}],
+            ("MONTHLY", True): [{"production": 0.0}],  # January production
+        }
     )
 
     mock_connection = AsyncMock()
@@ -77,12 +118,17 @@ async def test_collect_and_store_success(
 
         # Assert
         mock_influxdb.write_measurements.assert_called_once()
-        measurements = mock_influxdb.write_measurements.call_args[0][0]
-        # 1 price + 3 last_hour + 3 last_day + 3 this_day +
-        # 3 this_month + 3 this_hour + 3 last_month + 3 last_year
-        # Note: this_year is not included in basic test (no year data mocked)
-        expected_count = 22
+        written = mock_influxdb.write_measurements.call_args[0][0]
+        measurements = _collected_points(written)
+        # 1 price + 3 last_hour + 3 last_day + 3 this_day + 3 this_month +
+        # 3 this_year (January completed) + 3 this_hour + 3 last_month +
+        # 3 last_year
+        expected_count = 25
         assert len(measurements) == expected_count
+        (stats,) = (m for m in written if m.measurement == STATS_MEASUREMENT)
+        assert stats.fields["energy_price_euro_p50"] == 1.234
+        assert "consumption_grid_last_hour_p80" in stats.fields
+        assert "cost_this_month_max" in stats.fields
 
 
 @pytest.mark.asyncio(scope="function")
@@ -146,24 +192,13 @@ async def test_collect_and_store_database_error(
         return_value=(1.234, datetime(2024, 2, 16, 20, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [mock_consumption_node],  # Hourly consumption
-            [],  # Hourly production
-            [mock_consumption_node],  # Daily consumption
-            [],  # Daily production
-            [mock_consumption_node] * 24,  # 24h consumption
-            [],  # 24h production
-            [mock_consumption_node] * 10,  # This day hourly consumption
-            [],  # This day hourly production
-        ]
-    )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [],  # This month completed days
-            [],  # This month completed days production
-        ]
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): [mock_consumption_node] * 24,
+            ("DAILY", False): [mock_consumption_node],
+        }
     )
+    mock_home.get_historic_data_date = serve_dated_windows({})
 
     mock_connection = AsyncMock()
     mock_connection.name = "Test User"
@@ -179,6 +214,58 @@ async def test_collect_and_store_database_error(
             await service.collect_and_store()
 
 
+@pytest.mark.asyncio(scope="function")
+async def test_hours_missed_since_last_run_are_filled_in(
+    mocker: MockerFixture,
+    mock_influxdb: AsyncMock,
+    mock_settings: Settings,
+) -> None:
+    """Hours completed during downtime are stored at the end of their hour."""
+    latest_end = align(datetime.now(UTC), timedelta(hours=1))
+    store = WatermarkStore(mock_settings.state_dir / WATERMARK_FILENAME)
+    store.advance("tibber", "hourly_consumption", latest_end - timedelta(hours=3))
+    store.save()
+
+    hourly_nodes = [
+        {
+            "to": (latest_end - timedelta(hours=hours_ago)).isoformat(),
+            "totalCost": 0.3,
+            "consumption": 1.0 + hours_ago,
+        }
+        for hours_ago in range(23, -1, -1)
+    ]
+    mock_home = AsyncMock()
+    mock_home.address1 = "Test Address"
+    mock_home.current_price_data = MagicMock(
+        return_value=(1.234, datetime(2024, 2, 16, 20, 0, 0), 0.5)
+    )
+    mock_home.get_historic_data = serve_windows({("HOURLY", False): hourly_nodes})
+    mock_home.get_historic_data_date = serve_dated_windows({})
+    mock_connection = AsyncMock()
+    mock_connection.time_zone = ZoneInfo("Europe/Berlin")
+    mock_connection.get_homes = MagicMock(return_value=[mock_home])
+
+    with patch("tibber.Tibber", return_value=mock_connection):
+        service = TibberService(settings=mock_settings, repository=mock_influxdb)
+        await service.collect_and_store()
+
+    measurements = mock_influxdb.write_measurements.call_args[0][0]
+    backfilled = {
+        m.timestamp: m.fields["consumption"]
+        for m in measurements
+        if m.measurement == "electricity_consumption_kwh"
+        and m.tags == {"period": "last_hour"}
+        and m.timestamp < latest_end
+    }
+    # the two hours between the mark and the latest completed hour
+    assert backfilled == {
+        latest_end - timedelta(hours=2): 3.0,
+        latest_end - timedelta(hours=1): 2.0,
+    }
+    reopened = WatermarkStore(mock_settings.state_dir / WATERMARK_FILENAME)
+    assert reopened.get("tibber", "hourly_consumption") == latest_end
+
+
 @pytest.mark.asyncio(scope="function")
 async def test_collect_and_store_partial_consumption_failure(
     mocker: MockerFixture,
@@ -194,23 +281,20 @@ async def test_collect_and_store_partial_consumption_failure(
     )
     # All consumption data calls fail
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            Exception("Hourly consumption unavailable"),
-            Exception("Hourly production unavailable"),
-            Exception("Daily consumption unavailable"),
-            Exception("Daily production unavailable"),
-            Exception("24h consumption unavailable"),
-            Exception("24h production unavailable"),
-            Exception("This day hourly consumption unavailable"),
-            Exception("This day hourly production unavailable"),
-        ]
+    unavailable = Exception("Historic data unavailable")
+    mock_home.get_historic_data = serve_windows(
+        {
+            (resolution, production): unavailable
+            for resolution in ("HOURLY", "DAILY", "MONTHLY", "ANNUAL")
+            for production in (False, True)
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            Exception("This month completed days unavailable"),
-            Exception("This month completed days production unavailable"),
-        ]
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            (resolution, production): unavailable
+            for resolution in ("DAILY", "MONTHLY")
+            for production in (False, True)
+        }
     )
 
     mock_connection = AsyncMock()
@@ -226,7 +310,9 @@ async def test_collect_and_store_partial_consumption_failure(
 
         # Assert - should still store price measurement
         mock_influxdb.write_measurements.assert_called_once()
-        measurements = mock_influxdb.write_measurements.call_args[0][0]
+        measurements = _collected_points(
+            mock_influxdb.write_measurements.call_args[0][0]
+        )
         assert len(measurements) == 1  # Only price measurement
         assert measurements[0].measurement == "electricity_prices_euro"
 
@@ -260,38 +346,30 @@ async def test_this_month_equals_last_day_plus_today_on_day_2(
         return_value=(0.30, datetime(2024, 2, 2, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.35, "consumption": 1.2}],  # Last hour
-            [],  # Last hour production
-            [
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): today_hourly_nodes,  # This day (10 hours)
+            ("DAILY", False): [
                 {"totalCost": last_day_cost, "consumption": last_day_consumption}
             ],  # Last day
-            [],  # Last day production
-            today_hourly_nodes,  # This day hourly (10 hours) - moved up
-            [],  # This day hourly production
-            [{"totalCost": 0.35, "consumption": 1.2}],  # This hour
-            [],  # This hour production
-            [{"totalCost": 50.0, "consumption": 200.0}],  # Last month
-            [],  # Last month production
-            [
+            ("MONTHLY", False): [{"totalCost": 50.0, "consumption": 200.0}],
+            ("ANNUAL", False): [
                 {"totalCost": 100.0, "consumption": 500.0},
                 {"totalCost": 90.0, "consumption": 450.0},
             ],  # Last year
-            [
-                {"production": 0.0},
-                {"production": 0.0},
-            ],  # Last year production
-        ]
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": last_day_cost, "consumption": last_day_consumption}],  # Day 1
-            [{"production": 0.0}],  # Day 1 production
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [
+                {"cost": last_day_cost, "consumption": last_day_consumption}
+            ],  # Day 1
+            ("DAILY", True): [{"production": 0.0}],  # Day 1 production
             # For this_year: completed months (Jan)
-            [{"cost": 10.0, "consumption": 40.0}],  # January
-            [{"production": 0.0}],  # January production
-        ]
+            ("MONTHLY", False): [{"cost": 10.0, "consumption": 40.0}],
+            ("MONTHLY", True): [{"production": 0.0}],  # January production
+        }
     )
 
     mock_connection = AsyncMock()
@@ -372,10 +450,6 @@ async def test_this_year_calculation_march_15_10am(
     today_cost = today_hourly_cost * 10  # 5.0
     today_consumption = today_hourly_consumption * 10  # 20.0
 
-    # This hour (current incomplete hour)
-    this_hour_cost = 0.25
-    this_hour_consumption = 1.0
-
     # Expected this_year calculation (does NOT include this_hour)
     expected_year_cost = (
         jan_cost + feb_cost + march_completed_days_cost + today_cost
@@ -394,47 +468,35 @@ async def test_this_year_calculation_march_15_10am(
         return_value=(0.30, datetime(2024, 3, 15, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.5, "consumption": 2.0}],  # Last hour
-            [],  # Last hour production
-            [{"totalCost": 5.0, "consumption": 20.0}],  # Last day
-            [],  # Last day production
-            today_hourly_nodes,  # This day hourly (10 hours: 0-9) - moved up
-            [],  # This day hourly production
-            [
-                {"totalCost": this_hour_cost, "consumption": this_hour_consumption}
-            ],  # This hour
-            [],  # This hour production
-            [{"totalCost": 50.0, "consumption": 200.0}],  # Last month (Feb)
-            [],  # Last month production
-            [
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): today_hourly_nodes,  # This day (10 hours: 0-9)
+            ("DAILY", False): [{"totalCost": 5.0, "consumption": 20.0}],
+            ("MONTHLY", False): [{"totalCost": 50.0, "consumption": 200.0}],
+            ("ANNUAL", False): [
                 {"totalCost": 100.0, "consumption": 500.0},
                 {"totalCost": 90.0, "consumption": 450.0},
             ],  # Last year
-            [
-                {"production": 0.0},
-                {"production": 0.0},
-            ],  # Last year production
-        ]
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
             # For this_month calculation (March 1-14)
-            [
+            ("DAILY", False): [
                 {
                     "cost": march_completed_days_cost,
                     "consumption": march_completed_days_consumption,
                 }
             ],
-            [{"production": 0.0}],
+            ("DAILY", True): [{"production": 0.0}],
             # For this_year calculation - completed months (Jan, Feb)
-            [
+            ("MONTHLY", False): [
                 {"cost": jan_cost, "consumption": jan_consumption},  # January
                 {"cost": feb_cost, "consumption": feb_consumption},  # February
             ],
-            [{"production": 0.0}, {"production": 0.0}],  # Jan, Feb production
-        ]
+            ("MONTHLY", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
 
     mock_connection = AsyncMock()
@@ -495,35 +557,29 @@ async def test_this_hour_missing_data(
         return_value=(0.30, datetime(2024, 3, 15, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.5, "consumption": 2.0}],  # Last hour
-            [],  # Last hour production
-            [{"totalCost": 5.0, "consumption": 20.0}],  # Last day
-            [],  # Last day production
-            [{"totalCost": 0.5, "consumption": 2.0}] * 10,  # This day (moved up)
-            [],  # This day production
-            [{"totalCost": None, "consumption": None}],  # This hour - MISSING DATA
-            [],  # This hour production
-            [{"totalCost": 50.0, "consumption": 200.0}],  # Last month
-            [],  # Last month production
-            [
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): [{"totalCost": 0.5, "consumption": 2.0}] * 9
+            + [{"totalCost": None, "consumption": None}],  # This hour - MISSING,
+            ("DAILY", False): [{"totalCost": 5.0, "consumption": 20.0}],
+            ("MONTHLY", False): [{"totalCost": 50.0, "consumption": 200.0}],
+            ("ANNUAL", False): [
                 {"totalCost": 100.0, "consumption": 500.0},
                 {"totalCost": 90.0, "consumption": 450.0},
             ],  # Last year
-            [{"production": 0.0}, {"production": 0.0}],  # Last year production
-        ]
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": 70.0, "consumption": 280.0}],  # This month completed days
-            [{"production": 0.0}],
-            [
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [{"cost": 70.0, "consumption": 280.0}],
+            ("DAILY", True): [{"production": 0.0}],
+            ("MONTHLY", False): [
                 {"cost": 150.0, "consumption": 600.0},
                 {"cost": 140.0, "consumption": 560.0},
             ],  # This year completed months
-            [{"production": 0.0}, {"production": 0.0}],
-        ]
+            ("MONTHLY", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
 
     mock_connection = AsyncMock()
@@ -563,35 +619,30 @@ async def test_last_month_missing_data(
         return_value=(0.30, datetime(2024, 3, 15, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.5, "consumption": 2.0}],  # Last hour
-            [],  # Last hour production
-            [{"totalCost": 5.0, "consumption": 20.0}],  # Last day
-            [],  # Last day production
-            [{"totalCost": 0.5, "consumption": 2.0}] * 10,  # This day (moved up)
-            [],  # This day production
-            [{"totalCost": 0.25, "consumption": 1.0}],  # This hour
-            [],  # This hour production
-            [{"totalCost": None, "consumption": 200.0}],  # Last month - MISSING COST
-            [],  # Last month production
-            [
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): [{"totalCost": 0.5, "consumption": 2.0}] * 10,
+            ("DAILY", False): [{"totalCost": 5.0, "consumption": 20.0}],
+            ("MONTHLY", False): [
+                {"totalCost": None, "consumption": 200.0}
+            ],  # Last month - MISSING COST,
+            ("ANNUAL", False): [
                 {"totalCost": 100.0, "consumption": 500.0},
                 {"totalCost": 90.0, "consumption": 450.0},
             ],  # Last year
-            [{"production": 0.0}, {"production": 0.0}],  # Last year production
-        ]
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": 70.0, "consumption": 280.0}],  # This month completed days
-            [{"production": 0.0}],
-            [
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [{"cost": 70.0, "consumption": 280.0}],
+            ("DAILY", True): [{"production": 0.0}],
+            ("MONTHLY", False): [
                 {"cost": 150.0, "consumption": 600.0},
                 {"cost": 140.0, "consumption": 560.0},
             ],  # This year completed months
-            [{"production": 0.0}, {"production": 0.0}],
-        ]
+            ("MONTHLY", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
 
     mock_connection = AsyncMock()
@@ -631,32 +682,25 @@ async def test_last_year_insufficient_data(
         return_value=(0.30, datetime(2024, 3, 15, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.5, "consumption": 2.0}],  # Last hour
-            [],  # Last hour production
-            [{"totalCost": 5.0, "consumption": 20.0}],  # Last day
-            [],  # Last day production
-            [{"totalCost": 0.5, "consumption": 2.0}] * 10,  # This day (moved up)
-            [],  # This day production
-            [{"totalCost": 0.25, "consumption": 1.0}],  # This hour
-            [],  # This hour production
-            [{"totalCost": 50.0, "consumption": 200.0}],  # Last month
-            [],  # Last month production
-            [],  # Last year - NO completed year yet
-            [],  # Last year production
-        ]
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): [{"totalCost": 0.5, "consumption": 2.0}] * 10,
+            ("DAILY", False): [{"totalCost": 5.0, "consumption": 20.0}],
+            ("MONTHLY", False): [{"totalCost": 50.0, "consumption": 200.0}],
+            ("ANNUAL", False): [],  # Last year - NO completed year yet
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": 70.0, "consumption": 280.0}],  # This month completed days
-            [{"production": 0.0}],
-            [
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [{"cost": 70.0, "consumption": 280.0}],
+            ("DAILY", True): [{"production": 0.0}],
+            ("MONTHLY", False): [
                 {"cost": 150.0, "consumption": 600.0},
                 {"cost": 140.0, "consumption": 560.0},
             ],  # This year completed months
-            [{"production": 0.0}, {"production": 0.0}],
-        ]
+            ("MONTHLY", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
 
     mock_connection = AsyncMock()
@@ -696,35 +740,28 @@ async def test_this_year_incomplete_months(
         return_value=(0.30, datetime(2024, 3, 15, 10, 0, 0), 0.5)
     )
     mock_home.fetch_consumption_data = AsyncMock(return_value=None)
-    mock_home.get_historic_data = AsyncMock(
-        side_effect=[
-            [{"totalCost": 0.5, "consumption": 2.0}],  # Last hour
-            [],  # Last hour production
-            [{"totalCost": 5.0, "consumption": 20.0}],  # Last day
-            [],  # Last day production
-            [{"totalCost": 0.5, "consumption": 2.0}] * 10,  # This day (moved up)
-            [],  # This day production
-            [{"totalCost": 0.25, "consumption": 1.0}],  # This hour
-            [],  # This hour production
-            [{"totalCost": 50.0, "consumption": 200.0}],  # Last month
-            [],  # Last month production
-            [
+    mock_home.get_historic_data = serve_windows(
+        {
+            ("HOURLY", False): [{"totalCost": 0.5, "consumption": 2.0}] * 10,
+            ("DAILY", False): [{"totalCost": 5.0, "consumption": 20.0}],
+            ("MONTHLY", False): [{"totalCost": 50.0, "consumption": 200.0}],
+            ("ANNUAL", False): [
                 {"totalCost": 100.0, "consumption": 500.0},
                 {"totalCost": 90.0, "consumption": 450.0},
             ],  # Last year
-            [{"production": 0.0}, {"production": 0.0}],  # Last year production
-        ]
+            ("ANNUAL", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
-    mock_home.get_historic_data_date = AsyncMock(
-        side_effect=[
-            [{"cost": 70.0, "consumption": 280.0}],  # This month completed days
-            [{"production": 0.0}],
-            [
+    mock_home.get_historic_data_date = serve_dated_windows(
+        {
+            ("DAILY", False): [{"cost": 70.0, "consumption": 280.0}],
+            ("DAILY", True): [{"production": 0.0}],
+            ("MONTHLY", False): [
                 {"cost": 150.0, "consumption": 600.0},
                 {"cost": None, "consumption": 560.0},  # February - MISSING COST
             ],  # This year completed months - INCOMPLETE
-            [{"production": 0.0}, {"production": 0.0}],
-        ]
+            ("MONTHLY", True): [{"production": 0.0}, {"production": 0.0}],
+        }
     )
 
     mock_connection = AsyncMock()
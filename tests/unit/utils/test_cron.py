@@ -0,0 +1,53 @@
+"""Tests for crontab schedule parsing."""
+
+from datetime import datetime
+
+import pytest
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.utils.cron import CronSpec
+
+
+def test_next_after_follows_crontab_semantics() -> None:
+    """Steps, ranges, lists and day fields resolve like cron."""
+    every_five = CronSpec.parse("*/5 * * * *")
+    assert every_five.next_after(datetime(2024, 1, 1, 12, 3, 59)) == datetime(
+        2024, 1, 1, 12, 5
+    )
+    # strictly after: a due minute is not returned again
+    assert every_five.next_after(datetime(2024, 1, 1, 12, 5)) == datetime(
+        2024, 1, 1, 12, 10
+    )
+
+    hourly = CronSpec.parse("30 * * * *")
+    assert hourly.next_after(datetime(2024, 1, 1, 23, 45)) == datetime(
+        2024, 1, 2, 0, 30
+    )
+
+    # weekdays 1-5 at 06:00 and 18:00; 2024-01-06 is a Saturday
+    workdays = CronSpec.parse("0 6,18 * * 1-5")
+    assert workdays.next_after(datetime(2024, 1, 5, 19, 0)) == datetime(
+        2024, 1, 8, 6, 0
+    )
+
+    # both day fields restricted: either one matching is enough (the 1st or
+    # any Sunday; 2024-01-07 is a Sunday)
+    either = CronSpec.parse("0 0 1 * 7")
+    assert either.next_after(datetime(2024, 1, 2)) == datetime(2024, 1, 7)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["* * * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *"],
+)
+def test_invalid_expression_is_rejected(expression: str) -> None:
+    """Wrong field counts, out-of-range values and bad steps fail to parse."""
+    with pytest.raises(ValidationError):
+        CronSpec.parse(expression)
+
+
+def test_schedule_that_never_matches_raises() -> None:
+    """February 31st never comes; the search gives up instead of looping."""
+    spec = CronSpec.parse("0 0 31 2 *")
+
+    with pytest.raises(ValidationError, match="never matches"):
+        spec.next_after(datetime(2024, 1, 1))
@@ -1,11 +1,13 @@
 """Unit tests for the shared async HTTP helpers."""
 
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 from home_monitoring.utils.http import (
     DEFAULT_TIMEOUT,
+    HttpClientRegistry,
     make_async_client,
     request_with_retries,
 )
@@ -94,3 +96,96 @@ async def test_5xx_persists_returns_last_response() -> None:
 
     assert resp.status_code == 500
     assert client.request.await_count == 2
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 keep-alive server counting accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.port = 0
+        self._server: asyncio.base_events.Server | None = None
+
+    async def __aenter__(self) -> "KeepAliveServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_connections_across_calls() -> None:
+    """Repeated calls to one host share a single pooled connection (happy path)."""
+    registry = HttpClientRegistry()
+    async with KeepAliveServer() as server:
+        url = f"http://127.0.0.1:{server.port}/prices"
+        try:
+            for _ in range(5):
+                client = await registry.client_for(url)
+                resp = await request_with_retries(client, "GET", url, base_delay=0)
+                assert resp.status_code == 200
+        finally:
+            await registry.aclose()
+
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_keeps_one_client_per_host() -> None:
+    """Different hosts get different clients, same host the same client."""
+    registry = HttpClientRegistry(client_factory=lambda **kwargs: MagicMock())
+
+    a1 = await registry.client_for("https://a.example/x")
+    a2 = await registry.client_for("https://a.example/y?z=1")
+    b = await registry.client_for("https://b.example/x")
+
+    assert a1 is a2
+    assert a1 is not b
+
+
+@pytest.mark.asyncio
+async def test_registry_recycles_expired_client() -> None:
+    """A client past its lifetime is replaced and closed (unhappy path)."""
+    clients: list[AsyncMock] = []
+
+    def factory(**kwargs: object) -> AsyncMock:
+        clients.append(AsyncMock())
+        return clients[-1]
+
+    registry = HttpClientRegistry(lifetime=0, timeout=0, client_factory=factory)
+
+    first = await registry.client_for("https://a.example")
+    second = await registry.client_for("https://a.example")
+
+    assert first is not second
+    first.aclose.assert_awaited_once()
+    await registry.aclose()
+    second.aclose.assert_awaited_once()
+
+
+def test_registry_http2_without_h2_falls_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """HTTP/2 is disabled when the h2 package is missing (unhappy path)."""
+    monkeypatch.setattr("home_monitoring.utils.http._http2_available", lambda: False)
+    captured: dict[str, object] = {}
+
+    def factory(**kwargs: object) -> MagicMock:
+        captured.update(kwargs)
+        return MagicMock()
+
+    registry = HttpClientRegistry(http2=True, client_factory=factory)
+    asyncio.run(registry.client_for("https://a.example"))
+
+    assert captured["http2"] is False
@@ -0,0 +1,77 @@
+"""Tests for the incremental JSON event parser."""
+
+import json
+
+import pytest
+from home_monitoring.core.exceptions import ValidationError
+from home_monitoring.utils.json_stream import Event, JsonEventParser
+
+DOCUMENT = {"a": [1, 2.5, {"b": 'say "hi"', "c": [True, None]}], "d": {}, "e": -1e3}
+
+
+def parse(text: str, size: int, materialize: tuple[str, ...] = ()) -> list[Event]:
+    """Parse ``text`` fed in chunks of ``size`` characters."""
+    parser = JsonEventParser(materialize=materialize)
+    events = []
+    for offset in range(0, len(text), size):
+        events.extend(parser.feed(text[offset : offset + size]))
+    events.extend(parser.close())
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_events_do_not_depend_on_chunk_boundaries(size: int) -> None:
+    """Tokens split across chunks produce the same ijson-style events."""
+    events = parse(json.dumps(DOCUMENT), size)
+
+    assert events == [
+        ("", "start_map", None),
+        ("", "map_key", "a"),
+        ("a", "start_array", None),
+        ("a.item", "number", 1),
+        ("a.item", "number", 2.5),
+        ("a.item", "start_map", None),
+        ("a.item", "map_key", "b"),
+        ("a.item.b", "string", 'say "hi"'),
+        ("a.item", "map_key", "c"),
+        ("a.item.c", "start_array", None),
+        ("a.item.c.item", "boolean", True),
+        ("a.item.c.item", "null", None),
+        ("a.item.c", "end_array", None),
+        ("a.item", "end_map", None),
+        ("a", "end_array", None),
+        ("", "map_key", "d"),
+        ("d", "start_map", None),
+        ("d", "end_map", None),
+        ("", "map_key", "e"),
+        ("e", "number", -1000.0),
+        ("", "end_map", None),
+    ]
+
+
+def test_materialized_prefix_is_decoded_whole() -> None:
+    """Values under a materialized prefix arrive as one decoded event."""
+    events = parse(json.dumps(DOCUMENT), 3, materialize=("a.item",))
+
+    assert [value for prefix, event, value in events if event == "value"] == [
+        1,
+        2.5,
+        {"b": 'say "hi"', "c": [True, None]},
+    ]
+    assert ("a.item.b", "string", 'say "hi"') not in events
+
+
+@pytest.mark.parametrize("text", ['{"a" 1}', "[1,]", '{"a": 1}}', "[1.]"])
+def test_malformed_document_raises(text: str) -> None:
+    """Misplaced or invalid tokens raise ValidationError (unhappy path)."""
+    with pytest.raises(ValidationError):
+        parse(text, 1)
+
+
+def test_truncated_document_raises() -> None:
+    """A body that ends mid-document is rejected on close (unhappy path)."""
+    parser = JsonEventParser(materialize=("a.item",))
+    parser.feed('{"a": [{"b": 1')
+
+    with pytest.raises(ValidationError, match="Truncated|Malformed"):
+        parser.close()
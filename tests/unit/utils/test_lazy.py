@@ -0,0 +1,60 @@
+"""Tests for deferred imports of vendor SDKs."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from home_monitoring.utils.lazy import lazy_exports, lazy_import
+
+SRC = Path(__file__).resolve().parents[3] / "src"
+VENDOR_MODULES = ["tibber", "lnetatmo", "gardena.smart_system", "serial", "aioinflux"]
+ENTRY_POINTS = [
+    "collect_gardena_data",
+    "collect_netatmo_data",
+    "collect_sam_digital_data",
+    "collect_solaredge_data",
+    "collect_tankerkoenig_data",
+    "collect_techem_data",
+    "collect_tibber_data",
+    "collector_daemon",
+    "healthcheck",
+]
+
+
+@pytest.mark.parametrize("script", ENTRY_POINTS)
+def test_entry_points_do_not_load_vendor_sdks(script: str) -> None:
+    """Importing a collector script executes none of the vendor SDKs."""
+    code = (
+        f"import home_monitoring.scripts.{script}, json, sys\n"
+        # lazily bound modules stay _LazyModule instances until first use
+        # (type() does not trigger loading, attribute access would)
+        "loaded = [name for name, module in sys.modules.items()\n"
+        "          if type(module).__name__ != '_LazyModule']\n"
+        "print(json.dumps(loaded))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=str(SRC)),
+    )
+
+    assert not set(VENDOR_MODULES) & set(json.loads(result.stdout))
+
+
+def test_lazy_import_of_missing_module_fails_immediately() -> None:
+    """A missing dependency still fails at import, not on first use."""
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("home_monitoring_no_such_sdk")
+
+
+def test_lazy_exports_rejects_unknown_names() -> None:
+    """The package hook raises AttributeError for names it does not export."""
+    hook = lazy_exports("home_monitoring.services.tibber", {"TibberService": "service"})
+
+    with pytest.raises(AttributeError, match="NoSuchService"):
+        hook("NoSuchService")
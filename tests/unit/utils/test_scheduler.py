@@ -0,0 +1,101 @@
+"""Tests for the in-process collector scheduler."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from home_monitoring.utils.cron import CronSpec
+from home_monitoring.utils.scheduler import METRICS_MEASUREMENT, Job, Scheduler
+
+EVERY_MINUTE = CronSpec.parse("* * * * *")
+
+
+@pytest.mark.asyncio
+async def test_run_once_times_job_and_writes_metric() -> None:
+    """A successful run is counted, timed and written as a metric point."""
+    db = AsyncMock()
+    job = Job(name="netatmo", schedule=EVERY_MINUTE, run=AsyncMock())
+    scheduler = Scheduler([job], repository=db)
+
+    await scheduler.run_once(job)
+
+    stats = scheduler.stats["netatmo"]
+    assert (stats.runs, stats.failures, stats.skipped) == (1, 0, 0)
+    assert stats.last_duration is not None
+    [point] = db.write_measurements.await_args.args[0]
+    assert point.measurement == METRICS_MEASUREMENT
+    assert point.tags == {"job": "netatmo", "status": "ok"}
+    assert "duration_seconds" in point.fields
+
+
+@pytest.mark.asyncio
+async def test_overlapping_tick_is_skipped() -> None:
+    """A job still running when it is due again skips that tick (like flock -n)."""
+    release = asyncio.Event()
+    calls = 0
+
+    async def slow() -> None:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    job = Job(name="solaredge", schedule=EVERY_MINUTE, run=slow)
+    scheduler = Scheduler([job])
+
+    assert await scheduler.trigger(job)
+    await asyncio.sleep(0)
+    assert not await scheduler.trigger(job)
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await scheduler.trigger(job)
+    await asyncio.sleep(0.01)
+
+    assert calls == 2
+    assert scheduler.stats["solaredge"].skipped == 1
+    assert scheduler.stats["solaredge"].runs == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_job_is_recorded_not_raised() -> None:
+    """A collector error marks the run failed; metric write errors are swallowed."""
+    db = AsyncMock()
+    db.write_measurements.side_effect = OSError("influx down")
+    job = Job(
+        name="tibber",
+        schedule=EVERY_MINUTE,
+        run=AsyncMock(side_effect=RuntimeError("api down")),
+    )
+    scheduler = Scheduler([job], repository=db)
+
+    await scheduler.run_once(job)
+
+    assert scheduler.stats["tibber"].failures == 1
+    assert db.write_measurements.await_args.args[0][0].tags["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_runs_past_the_grace_period() -> None:
+    """Shutdown waits for in-flight runs, then cancels the ones that hang."""
+    started = asyncio.Event()
+    cancelled = False
+
+    async def hang() -> None:
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    job = Job(name="sam_digital", schedule=EVERY_MINUTE, run=hang)
+    scheduler = Scheduler([job], shutdown_grace=0.01)
+    runner = asyncio.create_task(scheduler.run_forever())
+    await asyncio.sleep(0)
+    await scheduler.trigger(job)
+    await started.wait()
+
+    scheduler.stop()
+    await asyncio.wait_for(runner, timeout=1)
+
+    assert cancelled